@@ -0,0 +1,54 @@
+from datetime import time
+
+import pytest
+from workalendar.registry import registry
+
+from benchmarks.datasets import FIRST_SPRINT_AT, SPRINT_LENGTH, Dataset, build_dataset
+from rebelist.streamline.domain.time import TimeRange, WorkCalendarProtocol, WorkTimeCalculator
+
+DEFAULT_SIZES = '1000,10000,100000'
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Adds the option choosing the dataset sizes to benchmark."""
+    parser.addoption(
+        '--dataset-sizes',
+        default=DEFAULT_SIZES,
+        help=f'Comma separated numbers of tickets of the benchmarked datasets (default: {DEFAULT_SIZES}).',
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Runs every benchmark using the dataset size once per configured size."""
+    if 'size' not in metafunc.fixturenames:
+        return
+
+    sizes = [int(size) for size in str(metafunc.config.getoption('--dataset-sizes')).split(',')]
+    ids = [f'{size // 1000}k' if size % 1000 == 0 else str(size) for size in sizes]
+    metafunc.parametrize('size', sizes, ids=ids, scope='session')
+
+
+@pytest.fixture(scope='session')
+def calendar() -> WorkCalendarProtocol:
+    """Creates the holiday calendar of the default settings."""
+    return registry.get('DE')()
+
+
+@pytest.fixture(scope='session')
+def dataset(size: int, calendar: WorkCalendarProtocol) -> Dataset:
+    """Generates the seeded dataset of the benchmarked size."""
+    return build_dataset(size, calendar)
+
+
+@pytest.fixture(scope='session')
+def time_range() -> TimeRange:
+    """Selects the whole history of the datasets, instead of the latest entities only."""
+    return TimeRange(start=FIRST_SPRINT_AT - SPRINT_LENGTH)
+
+
+@pytest.fixture(scope='session')
+def work_time_calculator(calendar: WorkCalendarProtocol, dataset: Dataset) -> WorkTimeCalculator:
+    """Creates the calculator of the default settings, its holidays computed for the years of the dataset."""
+    calculator = WorkTimeCalculator(calendar, time(8), time(18), 8)
+    calculator.warm_up(dataset.years)
+    return calculator
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, AsyncIterator, Final
+from zoneinfo import ZoneInfo
+
+from rebelist.streamline.config.settings import JiraSettings
+from rebelist.streamline.domain.sprint import AsyncSprintRepository, Sprint, SprintRepository
+from rebelist.streamline.domain.ticket import AsyncTicketRepository, Ticket, TicketRepository
+from rebelist.streamline.domain.time import TimeRange, WorkCalendarProtocol
+from rebelist.streamline.infrastructure.datetime import DateTimeNormalizer
+from rebelist.streamline.infrastructure.jira.synthetic import SyntheticJira
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintRepository
+from rebelist.streamline.infrastructure.mongo.ticket.repositories import MongoTicketRepository
+
+TEAM: Final[str] = 'Benchmark'
+SEED: Final[int] = 20240101
+TIMEZONE: Final[ZoneInfo] = ZoneInfo('Europe/Berlin')
+FIRST_SPRINT_ON: Final[date] = date(2020, 1, 6)
+FIRST_SPRINT_AT: Final[datetime] = datetime.combine(FIRST_SPRINT_ON, time(), tzinfo=timezone.utc)
+SPRINT_LENGTH: Final[timedelta] = SyntheticJira.SPRINT_LENGTH
+SPRINTS: Final[int] = 130
+SETTINGS: Final[JiraSettings] = JiraSettings(
+    team=TEAM, project='BENCH', board_id=1, sprint_offset=0, sprint_close_time=time(18), issue_types=['Story']
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Dataset:
+    """Sprints of a team and the tickets resolved in them, with the documents the jobs store for them."""
+
+    sprints: list[Sprint]
+    tickets: list[Ticket]
+    sprint_documents: list[dict[str, Any]]
+    ticket_documents: list[dict[str, Any]]
+
+    @property
+    def years(self) -> range:
+        """Returns the years the dataset spans, to warm the calendar up with."""
+        return range(FIRST_SPRINT_AT.year - 1, self.sprints[-1].closed_at.year + 2)
+
+
+def build_dataset(size: int, calendar: WorkCalendarProtocol, seed: int = SEED) -> Dataset:
+    """Generates the same synthetic Jira history of five years of two-week sprints for a seed, of about size tickets.
+
+    The documents are shaped like the synchronized ones, and read into entities the way the Mongo repositories do it.
+    """
+    jira = SyntheticJira(SETTINGS, calendar, TIMEZONE, seed, SPRINTS, max(1, round(size / SPRINTS)), FIRST_SPRINT_ON)
+    sprint_documents: list[dict[str, Any]] = []
+    ticket_documents: list[dict[str, Any]] = []
+    for sprint, tickets in jira.documents():
+        sprint_documents.append(sprint)
+        ticket_documents += tickets
+
+    normalizer = DateTimeNormalizer(TIMEZONE)
+    documents_by_key = {document['key']: document for document in ticket_documents}
+    sprints: list[Sprint] = []
+    for document in sprint_documents:
+        issues = [documents_by_key[key] for key in document['tickets'] if key in documents_by_key]
+        if issues:
+            sprints.append(MongoSprintRepository.to_sprint({**document, 'issues': issues}, normalizer))
+    tickets = [MongoTicketRepository.to_ticket(document, normalizer) for document in ticket_documents]
+
+    return Dataset(sprints, tickets, sprint_documents, ticket_documents)
+
+
+def _within(moment: datetime, time_range: TimeRange | None) -> bool:
+    """Tells whether a datetime falls within the half-open time range."""
+    if time_range is None:
+        return True
+    if time_range.start and moment < time_range.start:
+        return False
+    return not (time_range.end and moment >= time_range.end)
+
+
+class InMemoryTicketRepository(TicketRepository):
+    """Ticket repository serving a dataset, so the benchmarks measure the computation alone."""
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.__tickets = dataset.tickets
+
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Returns the tickets resolved within the time range."""
+        return [ticket for ticket in self.__tickets if _within(ticket.resolved_at, time_range)]
+
+
+class InMemorySprintRepository(SprintRepository):
+    """Sprint repository serving a dataset, so the benchmarks measure the computation alone."""
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.__sprints = dataset.sprints
+
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Returns the sprints closed within the time range."""
+        return [sprint for sprint in self.__sprints if _within(sprint.closed_at, time_range)]
+
+
+class AsyncInMemoryTicketRepository(AsyncTicketRepository):
+    """Asynchronous ticket repository serving a dataset."""
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.__repository = InMemoryTicketRepository(dataset)
+
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Returns the tickets resolved within the time range."""
+        return self.__repository.find_by_team_name(team, time_range)
+
+    async def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Ticket]:
+        """Yields the tickets resolved within the time range."""
+        for ticket in self.__repository.find_by_team_name(team, time_range):
+            yield ticket
+
+
+class AsyncInMemorySprintRepository(AsyncSprintRepository):
+    """Asynchronous sprint repository serving a dataset."""
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.__repository = InMemorySprintRepository(dataset)
+
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Returns the sprints closed within the time range."""
+        return self.__repository.find_by_team_name(team, time_range)
+
+    async def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Sprint]:
+        """Yields the sprints closed within the time range."""
+        for sprint in self.__repository.find_by_team_name(team, time_range):
+            yield sprint
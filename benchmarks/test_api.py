@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Generator, cast
+from unittest.mock import create_autospec
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from httpx2 import Response
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.datasets import AsyncInMemorySprintRepository, AsyncInMemoryTicketRepository, Dataset
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import ReloadableSettings
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.handlers.api.metrics import dependencies, flow
+from rebelist.streamline.handlers.api.metrics.flow import router
+from rebelist.streamline.infrastructure.mongo.job import AsyncJobRepository
+
+ROUTES = [
+    '/v1/metrics/flow',
+    '/v1/metrics/flow/sprints-cycle-time',
+    '/v1/metrics/flow/cycle-time',
+    '/v1/metrics/flow/cycle-time?interval=1w',
+    '/v1/metrics/flow/lead-time',
+    '/v1/metrics/flow/throughput',
+    '/v1/metrics/flow/velocity',
+    '/v1/metrics/flow/cycle-time/export',
+    '/v1/metrics/tickets/export',
+]
+
+
+@pytest.fixture(scope='session')
+def client(dataset: Dataset) -> Generator[TestClient]:
+    """Serves the metric routes of the example settings, reading the dataset from memory instead of MongoDB."""
+
+    def find_versions(names: list[str], team: str) -> dict[str, datetime | None]:
+        return dict.fromkeys(names)
+
+    job_repository = create_autospec(AsyncJobRepository, instance=True)
+    job_repository.find_versions.side_effect = find_versions
+
+    container = Container()
+    container.config.from_dict({'mongo_uri': 'mongodb://localhost:27017/streamline'})
+    container.settings_file.override(ReloadableSettings(f'{Container.PROJECT_ROOT}/settings.ini.example'))
+    container.async_sprint_repository.override(AsyncInMemorySprintRepository(dataset))
+    container.async_ticket_repository.override(AsyncInMemoryTicketRepository(dataset))
+    container.async_job_repository.override(job_repository)
+
+    app = FastAPI()
+    app.state.container = container
+    container.wire(modules=[flow, dependencies])
+    app.include_router(router, prefix='/v1/metrics')
+
+    with TestClient(app) as client:
+        yield client
+
+    container.unwire()
+
+
+@pytest.mark.benchmark(group='api')
+@pytest.mark.parametrize('route', ROUTES)
+def test_route(benchmark: BenchmarkFixture, client: TestClient, time_range: TimeRange, route: str) -> None:
+    """Measures a metric route over the whole history, from the request to the last byte of the response."""
+    assert time_range.start
+    separator = '&' if '?' in route else '?'
+    url = f'{route}{separator}from={time_range.start.isoformat().replace("+00:00", "Z")}'
+
+    response = cast(Response, benchmark(client.get, url))
+
+    assert response.status_code == 200
+    assert response.content
@@ -0,0 +1,64 @@
+from datetime import time
+from typing import cast
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.datasets import Dataset
+from rebelist.streamline.domain.metrics.flow import (
+    CycleTimeCalculator,
+    LeadTimeCalculator,
+    ThroughputCalculator,
+    VelocityCalculator,
+)
+from rebelist.streamline.domain.time import WorkTimeCalculator
+
+
+@pytest.mark.benchmark(group='work-time')
+def test_get_working_days_delta(
+    benchmark: BenchmarkFixture, dataset: Dataset, work_time_calculator: WorkTimeCalculator
+) -> None:
+    """Measures the working days between the creation and the resolution of every ticket."""
+    periods = [(ticket.created_at, ticket.resolved_at) for ticket in dataset.tickets]
+
+    def run() -> list[float]:
+        return [work_time_calculator.get_working_days_delta(start_at, end_at) for start_at, end_at in periods]
+
+    durations = cast(list[float], benchmark(run))
+
+    assert len(durations) == len(dataset.tickets)
+
+
+@pytest.mark.benchmark(group='calculators')
+@pytest.mark.parametrize('calculator_class', [CycleTimeCalculator, LeadTimeCalculator])
+def test_ticket_calculator(
+    benchmark: BenchmarkFixture,
+    dataset: Dataset,
+    work_time_calculator: WorkTimeCalculator,
+    calculator_class: type[CycleTimeCalculator | LeadTimeCalculator],
+) -> None:
+    """Measures a duration calculator over every ticket."""
+    calculator = calculator_class(work_time_calculator)
+
+    def run() -> list[float]:
+        return [calculator.calculate(ticket) for ticket in dataset.tickets]
+
+    durations = cast(list[float], benchmark(run))
+
+    assert len(durations) == len(dataset.tickets)
+
+
+@pytest.mark.benchmark(group='calculators')
+@pytest.mark.parametrize('calculator_class', [ThroughputCalculator, VelocityCalculator])
+def test_sprint_calculator(
+    benchmark: BenchmarkFixture, dataset: Dataset, calculator_class: type[ThroughputCalculator | VelocityCalculator]
+) -> None:
+    """Measures a sprint calculator over every sprint, closing them at the time of the default settings."""
+    calculator = calculator_class(time(18))
+
+    def run() -> list[int]:
+        return [calculator.calculate(sprint) for sprint in dataset.sprints]
+
+    counts = cast(list[int], benchmark(run))
+
+    assert len(counts) == len(dataset.sprints)
@@ -0,0 +1,86 @@
+import os
+from typing import Any, Generator, Mapping, cast
+from zoneinfo import ZoneInfo
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from pymongo.synchronous.database import Database
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.datasets import TEAM, Dataset
+from rebelist.streamline.domain.sprint import Sprint
+from rebelist.streamline.domain.ticket import Ticket
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.handlers.cli.commands.database_index import DatabaseIndexer
+from rebelist.streamline.infrastructure.datetime import DateTimeNormalizer
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintRepository
+from rebelist.streamline.infrastructure.mongo.ticket.repositories import MongoTicketRepository
+
+MONGO_URI = os.environ.get('STREAMLINE_BENCHMARK_MONGO_URI', 'mongodb://localhost:27017/streamline_benchmarks')
+
+
+@pytest.fixture(scope='session')
+def mongo_client() -> Generator[MongoClient[Mapping[str, Any]]]:
+    """Connects to the benchmark database, skipping the Mongo benchmarks when it cannot be reached."""
+    client: MongoClient[Mapping[str, Any]] = MongoClient(MONGO_URI, tz_aware=True, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command('ping')
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f'No MongoDB reachable at {MONGO_URI}: {e}')
+
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope='session')
+def database(mongo_client: MongoClient[Mapping[str, Any]], dataset: Dataset) -> Database[Mapping[str, Any]]:
+    """Fills the benchmark database with the dataset, indexed the way the database:index command does it."""
+    database = mongo_client.get_default_database('streamline_benchmarks')
+    for name in (MongoTicketRepository.COLLECTION_NAME, MongoSprintRepository.COLLECTION_NAME):
+        database.drop_collection(name)
+    for task in DatabaseIndexer.declare_tasks(database):
+        task.execute()
+
+    database[MongoTicketRepository.COLLECTION_NAME].insert_many(dataset.ticket_documents, ordered=False)
+    database[MongoSprintRepository.COLLECTION_NAME].insert_many(dataset.sprint_documents, ordered=False)
+    return database
+
+
+@pytest.fixture(scope='session')
+def normalizer() -> DateTimeNormalizer:
+    """Creates the normalizer of the default settings."""
+    return DateTimeNormalizer(ZoneInfo('Europe/Berlin'))
+
+
+@pytest.mark.benchmark(group='mongo')
+def test_find_tickets(
+    benchmark: BenchmarkFixture,
+    database: Database[Mapping[str, Any]],
+    normalizer: DateTimeNormalizer,
+    dataset: Dataset,
+    time_range: TimeRange,
+) -> None:
+    """Measures reading the whole ticket history at once."""
+    repository = MongoTicketRepository(database, normalizer)
+
+    tickets = cast(list[Ticket], benchmark(repository.find_by_team_name, TEAM, time_range))
+
+    assert len(tickets) == len(dataset.tickets)
+
+
+@pytest.mark.benchmark(group='mongo')
+def test_find_sprints(
+    benchmark: BenchmarkFixture,
+    database: Database[Mapping[str, Any]],
+    normalizer: DateTimeNormalizer,
+    dataset: Dataset,
+    time_range: TimeRange,
+) -> None:
+    """Measures the aggregation joining the whole sprint history with its tickets."""
+    repository = MongoSprintRepository(database, normalizer)
+
+    sprints = cast(list[Sprint], benchmark(repository.find_by_team_name, TEAM, time_range))
+
+    assert len(sprints) == len(dataset.sprints)
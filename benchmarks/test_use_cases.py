@@ -0,0 +1,59 @@
+from datetime import time
+from typing import Any, Callable
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.datasets import TEAM, Dataset, InMemorySprintRepository, InMemoryTicketRepository
+from rebelist.streamline.application.compute.use_cases import (
+    GetCycleTimesUseCase,
+    GetLeadTimesUseCase,
+    GetSprintCycleTimesUseCase,
+    GetThroughputUseCase,
+    GetVelocityUseCase,
+)
+from rebelist.streamline.domain.metrics.flow import (
+    CycleTimeCalculator,
+    LeadTimeCalculator,
+    ThroughputCalculator,
+    VelocityCalculator,
+)
+from rebelist.streamline.domain.time import TimeRange, WorkTimeCalculator
+
+SPRINT_CLOSE_TIME = time(18)
+
+type UseCase = Callable[[str, TimeRange | None], list[Any]]
+type UseCaseFactory = Callable[[WorkTimeCalculator, Dataset], UseCase]
+
+USE_CASES: dict[str, UseCaseFactory] = {
+    'sprint-cycle-time': lambda calendar, dataset: GetSprintCycleTimesUseCase(
+        CycleTimeCalculator(calendar), InMemorySprintRepository(dataset), validate=False
+    ),
+    'cycle-time': lambda calendar, dataset: GetCycleTimesUseCase(
+        CycleTimeCalculator(calendar), InMemoryTicketRepository(dataset), validate=False
+    ),
+    'lead-time': lambda calendar, dataset: GetLeadTimesUseCase(
+        LeadTimeCalculator(calendar), InMemoryTicketRepository(dataset), validate=False
+    ),
+    'throughput': lambda calendar, dataset: GetThroughputUseCase(
+        ThroughputCalculator(SPRINT_CLOSE_TIME), InMemorySprintRepository(dataset), validate=False
+    ),
+    'velocity': lambda calendar, dataset: GetVelocityUseCase(
+        VelocityCalculator(SPRINT_CLOSE_TIME), InMemorySprintRepository(dataset), validate=False
+    ),
+}
+
+
+@pytest.mark.benchmark(group='use-cases')
+@pytest.mark.parametrize('name', list(USE_CASES))
+def test_use_case(
+    benchmark: BenchmarkFixture,
+    dataset: Dataset,
+    work_time_calculator: WorkTimeCalculator,
+    time_range: TimeRange,
+    name: str,
+) -> None:
+    """Measures a use case computing the whole history of the dataset, the way production builds the datapoints."""
+    use_case = USE_CASES[name](work_time_calculator, dataset)
+
+    assert benchmark(use_case, TEAM, time_range)
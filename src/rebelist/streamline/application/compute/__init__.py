@@ -1,17 +1,37 @@
+from rebelist.streamline.application.compute.aggregation import bucket_durations
+from rebelist.streamline.application.compute.coalescing import SingleFlight
 from rebelist.streamline.application.compute.models import (
     CycleTimeDataPoint,
+    DurationBucketDataPoint,
+    FlowMetric,
     LeadTimeDataPoint,
     SprintCycleTimeDataPoint,
     ThroughputDataPoint,
     VelocityDataPoint,
 )
-from rebelist.streamline.application.compute.services import FlowMetricsService
+from rebelist.streamline.application.compute.ports import (
+    DatabaseProtocol,
+    LoggerProtocol,
+    MetricsProtocol,
+    TracerProtocol,
+)
+from rebelist.streamline.application.compute.services import AsyncFlowMetricsService
+from rebelist.streamline.application.compute.warmup import Warmup
 
 __all__ = [
-    'FlowMetricsService',
+    'AsyncFlowMetricsService',
+    'bucket_durations',
+    'DurationBucketDataPoint',
+    'FlowMetric',
     'SprintCycleTimeDataPoint',
     'CycleTimeDataPoint',
+    'DatabaseProtocol',
     'ThroughputDataPoint',
     'LeadTimeDataPoint',
+    'LoggerProtocol',
+    'MetricsProtocol',
+    'SingleFlight',
+    'TracerProtocol',
     'VelocityDataPoint',
+    'Warmup',
 ]
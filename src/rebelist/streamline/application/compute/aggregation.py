@@ -0,0 +1,54 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Iterable, Protocol
+
+from rebelist.streamline.application.compute.models import DurationBucketDataPoint
+
+
+class DurationDataPoint(Protocol):
+    """Protocol for datapoints measuring how long a resolved ticket took."""
+
+    @property
+    def duration(self) -> float:
+        """Duration of the ticket (in days)."""
+        ...
+
+    @property
+    def resolved_at(self) -> int:
+        """Epoch timestamp (in seconds) when the ticket was resolved."""
+        ...
+
+
+def percentile(ordered: list[float], rank: float) -> float:
+    """Returns the percentile of sorted values, interpolating linearly between the closest ranks."""
+    position = (len(ordered) - 1) * rank
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def bucket_durations(datapoints: Iterable[DurationDataPoint], interval: timedelta) -> list[DurationBucketDataPoint]:
+    """Aggregates duration datapoints into epoch-aligned intervals of their resolution time."""
+    seconds = int(interval.total_seconds())
+    if seconds <= 0:
+        raise ValueError('Interval must be at least one second long.')
+
+    buckets: defaultdict[int, list[float]] = defaultdict(list)
+    for datapoint in datapoints:
+        buckets[datapoint.resolved_at - datapoint.resolved_at % seconds].append(datapoint.duration)
+
+    aggregates: list[DurationBucketDataPoint] = []
+    for bucket, durations in sorted(buckets.items()):
+        durations.sort()
+        aggregates.append(
+            DurationBucketDataPoint(
+                bucket=bucket,
+                count=len(durations),
+                mean=sum(durations) / len(durations),
+                p50=percentile(durations, 0.5),
+                p85=percentile(durations, 0.85),
+            )
+        )
+
+    return aggregates
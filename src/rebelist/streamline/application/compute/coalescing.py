@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, cast
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key into a single in-flight execution.
+
+    Callers arriving while a call is running await its outcome instead of starting their own, so they all share the
+    same result, or the same exception. Once the call settles the key is released and the next caller runs it again.
+    """
+
+    def __init__(self) -> None:
+        self.__calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do[T](self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Awaits the in-flight call of the key, starting it when there is none."""
+        future = self.__calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            future.add_done_callback(lambda done: self.__release(key, done))
+            self.__calls[key] = future
+
+        # Shielded so a caller giving up, e.g. a client disconnecting, does not cancel the call for everyone else.
+        return cast(T, await asyncio.shield(future))
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        """Tells whether a call of the key is running, so a new caller would join it."""
+        return key in self.__calls
+
+    def in_flight(self) -> int:
+        """Counts the calls currently running."""
+        return len(self.__calls)
+
+    def __release(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        """Forgets a settled call, unless a newer one already took its key."""
+        if self.__calls.get(key) is future:
+            del self.__calls[key]
+        if not future.cancelled():
+            future.exception()  # Marks the exception as retrieved when every caller gave up on the call.
@@ -1,8 +1,28 @@
-from typing import Annotated, Optional
+from enum import StrEnum
+from typing import Annotated, Final, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 
+class FlowMetric(StrEnum):
+    """Enum representing the flow metrics that can be computed."""
+
+    SPRINT_CYCLE_TIME = 'sprint_cycle_time'
+    CYCLE_TIME = 'cycle_time'
+    LEAD_TIME = 'lead_time'
+    THROUGHPUT = 'throughput'
+    VELOCITY = 'velocity'
+
+
+SPRINT_METRICS: Final[frozenset[FlowMetric]] = frozenset(
+    {FlowMetric.SPRINT_CYCLE_TIME, FlowMetric.THROUGHPUT, FlowMetric.VELOCITY}
+)
+TICKET_METRICS: Final[frozenset[FlowMetric]] = frozenset({FlowMetric.CYCLE_TIME, FlowMetric.LEAD_TIME})
+DURATION_METRICS: Final[frozenset[FlowMetric]] = frozenset(
+    {FlowMetric.SPRINT_CYCLE_TIME, FlowMetric.CYCLE_TIME, FlowMetric.LEAD_TIME}
+)
+
+
 class SprintCycleTimeDataPoint(BaseModel):
     """Represents a cycle time in a sprinnt data point."""
 
@@ -54,3 +74,15 @@ class VelocityDataPoint(BaseModel):
     sprint: Annotated[str, Field(description='Name of the sprint.')]
     story_points_residual: Annotated[int, Field(description='Number of story points not completed in the sprint.')]
     story_points_completed: Annotated[int, Field(description='Number of story points completed during the sprint.')]
+
+
+class DurationBucketDataPoint(BaseModel):
+    """Represents the aggregated durations of the tickets resolved within an interval."""
+
+    model_config = ConfigDict(frozen=True)
+
+    bucket: Annotated[int, Field(description='Epoch timestamp (in seconds) when the interval starts.')]
+    count: Annotated[int, Field(description='Number of tickets resolved within the interval.')]
+    mean: Annotated[float, Field(description='Average duration of the tickets (in days).')]
+    p50: Annotated[float, Field(description='Median duration of the tickets (in days).')]
+    p85: Annotated[float, Field(description='85th percentile of the ticket durations (in days).')]
@@ -0,0 +1,42 @@
+from contextlib import AbstractContextManager
+from typing import Any, Mapping, Protocol
+
+
+class MetricsProtocol(Protocol):
+    """Protocol for recording how the flow metrics are computed and served."""
+
+    def measure_compute(self, metric: str) -> AbstractContextManager[None]:
+        """Measures the enclosed computation of a metric."""
+        ...
+
+    def count_cache_lookup(self, cache: str, hit: bool) -> None:
+        """Counts a cache lookup as a hit or a miss."""
+        ...
+
+
+class TracerProtocol(Protocol):
+    """Protocol for recording the computations as spans of the current trace."""
+
+    def span(self, name: str) -> AbstractContextManager[object]:
+        """Records the enclosed block as a span of the current trace."""
+        ...
+
+
+class LoggerProtocol(Protocol):
+    """Protocol for logging the progress of the application services."""
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Logs an informational message."""
+        ...
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Logs a warning message."""
+        ...
+
+
+class DatabaseProtocol(Protocol):
+    """Protocol for running a command against the database the metrics are read from."""
+
+    async def command(self, command: str) -> Mapping[str, Any]:
+        """Runs a database command and returns its reply."""
+        ...
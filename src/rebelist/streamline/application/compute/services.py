@@ -1,10 +1,19 @@
+import asyncio
+from itertools import batched
+from typing import AsyncIterator, Awaitable, Callable, Collection, Final, Hashable, Iterable, Sequence
+
+from pydantic import BaseModel
+
 from rebelist.streamline.application.compute import (
+    FlowMetric,
     LeadTimeDataPoint,
     SprintCycleTimeDataPoint,
     ThroughputDataPoint,
     VelocityDataPoint,
 )
-from rebelist.streamline.application.compute.models import CycleTimeDataPoint
+from rebelist.streamline.application.compute.coalescing import SingleFlight
+from rebelist.streamline.application.compute.models import SPRINT_METRICS, TICKET_METRICS, CycleTimeDataPoint
+from rebelist.streamline.application.compute.ports import MetricsProtocol, TracerProtocol
 from rebelist.streamline.application.compute.use_cases import (
     GetLeadTimesUseCase,
     GetSprintCycleTimesUseCase,
@@ -12,10 +21,20 @@ from rebelist.streamline.application.compute.use_cases import (
     GetVelocityUseCase,
 )
 from rebelist.streamline.application.compute.use_cases.flow import GetCycleTimesUseCase
+from rebelist.streamline.domain.sprint import AsyncSprintRepository, Sprint
+from rebelist.streamline.domain.ticket import AsyncTicketRepository, Ticket
+from rebelist.streamline.domain.time import TimeRange
+
+
+class AsyncFlowMetricsService:
+    """Service that implements the flow metric use cases for the event loop.
 
+    Sprints and tickets are read with the asynchronous repositories, while the calendar math of the use cases runs in
+    worker threads, one batch of entities at a time, so the loop keeps serving other requests meanwhile. Concurrent
+    requests for the same metric, team and time range share a single computation and receive the same datapoints.
+    """
 
-class FlowMetricsService:
-    """Service that implements use cases for flow metrics."""
+    COMPUTE_BATCH_SIZE: Final[int] = 500
 
     def __init__(
         self,
@@ -24,29 +43,170 @@ class FlowMetricsService:
         lead_time_use_case: GetLeadTimesUseCase,
         throughput_use_case: GetThroughputUseCase,
         velocity_use_case: GetVelocityUseCase,
+        sprint_repository: AsyncSprintRepository,
+        ticket_repository: AsyncTicketRepository,
+        metrics: MetricsProtocol,
+        tracer: TracerProtocol,
     ) -> None:
         self.__cycle_time_sprints_use_case = cycle_time_sprints_use_case
         self.__cycle_time_use_case = cycle_time_use_case
         self.__lead_time_use_case = lead_time_use_case
         self.__throughput_use_case = throughput_use_case
         self.__velocity_use_case = velocity_use_case
+        self.__sprint_repository = sprint_repository
+        self.__ticket_repository = ticket_repository
+        self.__metrics = metrics
+        self.__tracer = tracer
+        self.__single_flight = SingleFlight()
 
-    def get_sprints_cycle_times(self, team: str) -> list[SprintCycleTimeDataPoint]:
+    async def get_sprints_cycle_times(
+        self, team: str, time_range: TimeRange | None = None
+    ) -> list[SprintCycleTimeDataPoint]:
         """Returns a list of time series datapoints with the cycle time including the sprint."""
-        return self.__cycle_time_sprints_use_case(team)
 
-    def get_cycle_times(self, team: str) -> list[CycleTimeDataPoint]:
+        async def compute() -> list[SprintCycleTimeDataPoint]:
+            sprints = await self.__sprint_repository.find_by_team_name(team, time_range)
+            return await self.__offload(
+                FlowMetric.SPRINT_CYCLE_TIME, self.__cycle_time_sprints_use_case.compute, sprints
+            )
+
+        return await self.__coalesce((FlowMetric.SPRINT_CYCLE_TIME, team, time_range), compute)
+
+    async def get_cycle_times(self, team: str, time_range: TimeRange | None = None) -> list[CycleTimeDataPoint]:
         """Returns a list of time series datapoints with the cycle time."""
-        return self.__cycle_time_use_case(team)
 
-    def get_lead_times(self, team: str) -> list[LeadTimeDataPoint]:
+        async def compute() -> list[CycleTimeDataPoint]:
+            tickets = await self.__ticket_repository.find_by_team_name(team, time_range)
+            return await self.__offload(FlowMetric.CYCLE_TIME, self.__cycle_time_use_case.compute, tickets)
+
+        return await self.__coalesce((FlowMetric.CYCLE_TIME, team, time_range), compute)
+
+    async def get_lead_times(self, team: str, time_range: TimeRange | None = None) -> list[LeadTimeDataPoint]:
         """Returns a list of time series datapoints with the lead time."""
-        return self.__lead_time_use_case(team)
 
-    def get_throughput(self, team: str) -> list[ThroughputDataPoint]:
+        async def compute() -> list[LeadTimeDataPoint]:
+            tickets = await self.__ticket_repository.find_by_team_name(team, time_range)
+            return await self.__offload(FlowMetric.LEAD_TIME, self.__lead_time_use_case.compute, tickets)
+
+        return await self.__coalesce((FlowMetric.LEAD_TIME, team, time_range), compute)
+
+    async def stream_cycle_times(
+        self, team: str, time_range: TimeRange | None = None
+    ) -> AsyncIterator[CycleTimeDataPoint]:
+        """Yields the cycle time datapoints of the whole ticket history."""
+        async for tickets in self.__batches(self.__ticket_repository.iter_by_team_name(team, time_range)):
+            for datapoint in await self.__compute(FlowMetric.CYCLE_TIME, self.__cycle_time_use_case.compute, tickets):
+                yield datapoint
+
+    async def stream_lead_times(
+        self, team: str, time_range: TimeRange | None = None
+    ) -> AsyncIterator[LeadTimeDataPoint]:
+        """Yields the lead time datapoints of the whole ticket history."""
+        async for tickets in self.__batches(self.__ticket_repository.iter_by_team_name(team, time_range)):
+            for datapoint in await self.__compute(FlowMetric.LEAD_TIME, self.__lead_time_use_case.compute, tickets):
+                yield datapoint
+
+    def stream_tickets(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Ticket]:
+        """Yields the whole ticket history the metrics are computed from."""
+        return self.__ticket_repository.iter_by_team_name(team, time_range)
+
+    def stream_sprints(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Sprint]:
+        """Yields the whole sprint history the metrics are computed from."""
+        return self.__sprint_repository.iter_by_team_name(team, time_range)
+
+    async def get_throughput(self, team: str, time_range: TimeRange | None = None) -> list[ThroughputDataPoint]:
         """Returns a list of datapoints with the throughput of each sprint."""
-        return self.__throughput_use_case(team)
 
-    def get_velocity(self, team: str) -> list[VelocityDataPoint]:
+        async def compute() -> list[ThroughputDataPoint]:
+            sprints = await self.__sprint_repository.find_by_team_name(team, time_range)
+            return await self.__offload(FlowMetric.THROUGHPUT, self.__throughput_use_case.compute, sprints)
+
+        return await self.__coalesce((FlowMetric.THROUGHPUT, team, time_range), compute)
+
+    async def get_velocity(self, team: str, time_range: TimeRange | None = None) -> list[VelocityDataPoint]:
         """Returns a list of datapoints with the velocity of each sprint."""
-        return self.__velocity_use_case(team)
+
+        async def compute() -> list[VelocityDataPoint]:
+            sprints = await self.__sprint_repository.find_by_team_name(team, time_range)
+            return await self.__offload(FlowMetric.VELOCITY, self.__velocity_use_case.compute, sprints)
+
+        return await self.__coalesce((FlowMetric.VELOCITY, team, time_range), compute)
+
+    async def get_flow_metrics(
+        self, team: str, metrics: Collection[FlowMetric], time_range: TimeRange | None = None
+    ) -> dict[FlowMetric, Sequence[BaseModel]]:
+        """Returns the datapoints of several metrics, reading the sprints and the tickets concurrently, once each."""
+        requested = frozenset(metrics)
+
+        return await self.__coalesce(
+            (requested, team, time_range), lambda: self.__compute_flow_metrics(team, requested, time_range)
+        )
+
+    async def __compute_flow_metrics(
+        self, team: str, requested: frozenset[FlowMetric], time_range: TimeRange | None
+    ) -> dict[FlowMetric, Sequence[BaseModel]]:
+        """Reads the sprints and the tickets needed by the requested metrics and computes them."""
+
+        async def find_sprints() -> list[Sprint]:
+            if not SPRINT_METRICS & requested:
+                return []
+            return await self.__sprint_repository.find_by_team_name(team, time_range)
+
+        async def find_tickets() -> list[Ticket]:
+            if not TICKET_METRICS & requested:
+                return []
+            return await self.__ticket_repository.find_by_team_name(team, time_range)
+
+        sprints, tickets = await asyncio.gather(find_sprints(), find_tickets())
+
+        computations: dict[FlowMetric, Callable[[], Awaitable[Sequence[BaseModel]]]] = {
+            FlowMetric.SPRINT_CYCLE_TIME: lambda: self.__offload(
+                FlowMetric.SPRINT_CYCLE_TIME, self.__cycle_time_sprints_use_case.compute, sprints
+            ),
+            FlowMetric.CYCLE_TIME: lambda: self.__offload(
+                FlowMetric.CYCLE_TIME, self.__cycle_time_use_case.compute, tickets
+            ),
+            FlowMetric.LEAD_TIME: lambda: self.__offload(
+                FlowMetric.LEAD_TIME, self.__lead_time_use_case.compute, tickets
+            ),
+            FlowMetric.THROUGHPUT: lambda: self.__offload(
+                FlowMetric.THROUGHPUT, self.__throughput_use_case.compute, sprints
+            ),
+            FlowMetric.VELOCITY: lambda: self.__offload(FlowMetric.VELOCITY, self.__velocity_use_case.compute, sprints),
+        }
+
+        return {metric: await computations[metric]() for metric in FlowMetric if metric in requested}
+
+    async def __coalesce[T](self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs a call once for all the concurrent requests of the same key."""
+        self.__metrics.count_cache_lookup('single_flight', self.__single_flight.is_in_flight(key))
+        return await self.__single_flight.do(key, call)
+
+    async def __offload[E, D](
+        self, metric: FlowMetric, compute: Callable[[Iterable[E]], list[D]], entities: Sequence[E]
+    ) -> list[D]:
+        """Runs a computation in worker threads, one batch of entities at a time."""
+        datapoints: list[D] = []
+        for batch in batched(entities, self.COMPUTE_BATCH_SIZE, strict=False):
+            datapoints += await self.__compute(metric, compute, batch)
+
+        return datapoints
+
+    async def __compute[E, D](
+        self, metric: FlowMetric, compute: Callable[[Iterable[E]], list[D]], entities: Sequence[E]
+    ) -> list[D]:
+        """Runs a computation of a batch of entities in a worker thread, measuring and tracing it."""
+        with self.__metrics.measure_compute(metric), self.__tracer.span(compute.__qualname__):
+            return await asyncio.to_thread(compute, entities)
+
+    async def __batches[E](self, entities: AsyncIterator[E]) -> AsyncIterator[list[E]]:
+        """Groups the entities of an asynchronous iterator into batches."""
+        batch: list[E] = []
+        async for entity in entities:
+            batch.append(entity)
+            if len(batch) == self.COMPUTE_BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
@@ -1,3 +1,5 @@
+from typing import Iterable, Iterator
+
 from rebelist.streamline.application.compute import (
     CycleTimeDataPoint,
     LeadTimeDataPoint,
@@ -11,25 +13,34 @@ from rebelist.streamline.domain.metrics.flow import (
     ThroughputCalculator,
     VelocityCalculator,
 )
-from rebelist.streamline.domain.sprint import SprintRepository
-from rebelist.streamline.domain.ticket import TicketRepository
+from rebelist.streamline.domain.sprint import Sprint, SprintRepository
+from rebelist.streamline.domain.ticket import Ticket, TicketRepository
+from rebelist.streamline.domain.time import TimeRange
 
 
 class GetSprintCycleTimesUseCase:
     """Compute sprint cycle time use case."""
 
-    def __init__(self, calculator: CycleTimeCalculator, sprint_repository: SprintRepository) -> None:
+    def __init__(
+        self, calculator: CycleTimeCalculator, sprint_repository: SprintRepository, validate: bool = True
+    ) -> None:
         self.__calculator = calculator
         self.__repository = sprint_repository
+        self.__validate = validate
 
-    def __call__(self, team: str) -> list[SprintCycleTimeDataPoint]:
+    def __call__(self, team: str, time_range: TimeRange | None = None) -> list[SprintCycleTimeDataPoint]:
         """Compute sprint cycle time for a given team."""
+        return self.compute(self.__repository.find_by_team_name(team, time_range))
+
+    def compute(self, sprints: Iterable[Sprint]) -> list[SprintCycleTimeDataPoint]:
+        """Compute sprint cycle time from already fetched sprints."""
         datapoints: list[SprintCycleTimeDataPoint] = []
-        for sprint in self.__repository.find_by_team_name(team):
+        build = SprintCycleTimeDataPoint if self.__validate else SprintCycleTimeDataPoint.model_construct
+        for sprint in sprints:
             for ticket in sprint.started_within_sprint:
                 duration = self.__calculator.calculate(ticket)
 
-                datapoint = SprintCycleTimeDataPoint(
+                datapoint = build(
                     key=ticket.id,
                     duration=duration,
                     resolved_at=int(ticket.resolved_at.timestamp()),
@@ -44,67 +55,89 @@ class GetSprintCycleTimesUseCase:
 class GetCycleTimesUseCase:
     """Compute cycle time use case class."""
 
-    def __init__(self, calculator: CycleTimeCalculator, ticket_repository: TicketRepository) -> None:
+    def __init__(
+        self, calculator: CycleTimeCalculator, ticket_repository: TicketRepository, validate: bool = True
+    ) -> None:
         self.__calculator = calculator
         self.__repository = ticket_repository
+        self.__validate = validate
 
-    def __call__(self, team: str) -> list[CycleTimeDataPoint]:
+    def __call__(self, team: str, time_range: TimeRange | None = None) -> list[CycleTimeDataPoint]:
         """Compute sprint lead time for a given team."""
-        datapoints: list[CycleTimeDataPoint] = []
-        for ticket in self.__repository.find_by_team_name(team):
+        return self.compute(self.__repository.find_by_team_name(team, time_range))
+
+    def compute(self, tickets: Iterable[Ticket]) -> list[CycleTimeDataPoint]:
+        """Compute cycle time from already fetched tickets."""
+        return list(self.iterate(tickets))
+
+    def iterate(self, tickets: Iterable[Ticket]) -> Iterator[CycleTimeDataPoint]:
+        """Lazily compute cycle time datapoints as the tickets are consumed."""
+        build = CycleTimeDataPoint if self.__validate else CycleTimeDataPoint.model_construct
+        for ticket in tickets:
             duration = self.__calculator.calculate(ticket)
 
-            datapoint = CycleTimeDataPoint(
+            yield build(
                 key=ticket.id,
                 duration=duration,
                 resolved_at=int(ticket.resolved_at.timestamp()),
                 story_points=ticket.story_points,
             )
 
-            datapoints.append(datapoint)
-
-        return datapoints
-
 
 class GetLeadTimesUseCase:
     """Compute lead time use case class."""
 
-    def __init__(self, calculator: LeadTimeCalculator, ticket_repository: TicketRepository) -> None:
+    def __init__(
+        self, calculator: LeadTimeCalculator, ticket_repository: TicketRepository, validate: bool = True
+    ) -> None:
         self.__calculator = calculator
         self.__repository = ticket_repository
+        self.__validate = validate
 
-    def __call__(self, team: str) -> list[LeadTimeDataPoint]:
+    def __call__(self, team: str, time_range: TimeRange | None = None) -> list[LeadTimeDataPoint]:
         """Compute sprint lead time for a given team."""
-        datapoints: list[LeadTimeDataPoint] = []
-        for ticket in self.__repository.find_by_team_name(team):
+        return self.compute(self.__repository.find_by_team_name(team, time_range))
+
+    def compute(self, tickets: Iterable[Ticket]) -> list[LeadTimeDataPoint]:
+        """Compute lead time from already fetched tickets."""
+        return list(self.iterate(tickets))
+
+    def iterate(self, tickets: Iterable[Ticket]) -> Iterator[LeadTimeDataPoint]:
+        """Lazily compute lead time datapoints as the tickets are consumed."""
+        build = LeadTimeDataPoint if self.__validate else LeadTimeDataPoint.model_construct
+        for ticket in tickets:
             duration = self.__calculator.calculate(ticket)
 
-            datapoint = LeadTimeDataPoint(
+            yield build(
                 key=ticket.id,
                 duration=duration,
                 resolved_at=int(ticket.resolved_at.timestamp()),
                 story_points=ticket.story_points,
             )
 
-            datapoints.append(datapoint)
-
-        return datapoints
-
 
 class GetThroughputUseCase:
     """Get throughput use case class."""
 
-    def __init__(self, calculator: ThroughputCalculator, sprint_repository: SprintRepository) -> None:
+    def __init__(
+        self, calculator: ThroughputCalculator, sprint_repository: SprintRepository, validate: bool = True
+    ) -> None:
         self.__calculator = calculator
         self.__repository = sprint_repository
+        self.__validate = validate
 
-    def __call__(self, team: str) -> list[ThroughputDataPoint]:
+    def __call__(self, team: str, time_range: TimeRange | None = None) -> list[ThroughputDataPoint]:
         """Compute sprint throughtput for a given team."""
+        return self.compute(self.__repository.find_by_team_name(team, time_range))
+
+    def compute(self, sprints: Iterable[Sprint]) -> list[ThroughputDataPoint]:
+        """Compute sprint throughput from already fetched sprints."""
         datapoints: list[ThroughputDataPoint] = []
-        for sprint in self.__repository.find_by_team_name(team):
+        build = ThroughputDataPoint if self.__validate else ThroughputDataPoint.model_construct
+        for sprint in sprints:
             throughput = self.__calculator.calculate(sprint)
 
-            datapoint = ThroughputDataPoint(
+            datapoint = build(
                 sprint=sprint.name,
                 completed=throughput,
                 residuals=len(sprint.tickets) - throughput,
@@ -118,17 +151,25 @@ class GetThroughputUseCase:
 class GetVelocityUseCase:
     """Get velocity use case class."""
 
-    def __init__(self, calculator: VelocityCalculator, sprint_repository: SprintRepository) -> None:
+    def __init__(
+        self, calculator: VelocityCalculator, sprint_repository: SprintRepository, validate: bool = True
+    ) -> None:
         self.__calculator = calculator
         self.__repository = sprint_repository
+        self.__validate = validate
 
-    def __call__(self, team: str) -> list[VelocityDataPoint]:
+    def __call__(self, team: str, time_range: TimeRange | None = None) -> list[VelocityDataPoint]:
         """Compute sprint velocity for a given team."""
+        return self.compute(self.__repository.find_by_team_name(team, time_range))
+
+    def compute(self, sprints: Iterable[Sprint]) -> list[VelocityDataPoint]:
+        """Compute sprint velocity from already fetched sprints."""
         datapoints: list[VelocityDataPoint] = []
-        for sprint in self.__repository.find_by_team_name(team):
+        build = VelocityDataPoint if self.__validate else VelocityDataPoint.model_construct
+        for sprint in sprints:
             velocity = self.__calculator.calculate(sprint)
 
-            datapoint = VelocityDataPoint(
+            datapoint = build(
                 sprint=sprint.name,
                 story_points_residual=sum(ticket.story_points for ticket in sprint.tickets) - velocity,
                 story_points_completed=velocity,
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Final
+
+from rebelist.streamline.application.compute.models import FlowMetric
+from rebelist.streamline.application.compute.ports import DatabaseProtocol, LoggerProtocol
+from rebelist.streamline.application.compute.services import AsyncFlowMetricsService
+from rebelist.streamline.domain.time import WorkTimeCalculator
+
+
+class Warmup:
+    """Initializes the cold parts of an API worker before it is reported ready to receive traffic.
+
+    The database connections are opened, the holiday tables of the calendar computed and every metric of the team
+    computed once, so the first request after a deploy or a restart is not the one paying for all of it.
+    """
+
+    CALENDAR_YEARS: Final[int] = 3
+    RETRY_DELAY: Final[float] = 5.0
+
+    def __init__(
+        self,
+        database: DatabaseProtocol,
+        work_time_calculator: WorkTimeCalculator,
+        flow_metrics_service: AsyncFlowMetricsService,
+        team: str,
+        logger: LoggerProtocol,
+    ) -> None:
+        self.__database = database
+        self.__work_time_calculator = work_time_calculator
+        self.__flow_metrics_service = flow_metrics_service
+        self.__team = team
+        self.__logger = logger
+        self.__ready = False
+
+    @property
+    def ready(self) -> bool:
+        """Tells whether the warmup has completed."""
+        return self.__ready
+
+    async def run(self) -> None:
+        """Warms the worker up, trying again until it succeeds, e.g. once the database can be reached."""
+        while not self.ready:
+            try:
+                await self.warm_up()
+            except Exception as e:
+                self.__logger.warning(f'Warmup failed, retrying in {Warmup.RETRY_DELAY} seconds: {e}')
+                await asyncio.sleep(Warmup.RETRY_DELAY)
+
+    async def warm_up(self) -> None:
+        """Pings the database, computes the holidays of the recent years and primes the metrics of the team."""
+        await self.__database.command('ping')
+
+        year = datetime.now(timezone.utc).year
+        years = range(year - Warmup.CALENDAR_YEARS + 1, year + 2)
+        await asyncio.to_thread(self.__work_time_calculator.warm_up, years)
+
+        await self.__flow_metrics_service.get_flow_metrics(self.__team, FlowMetric)
+        self.__ready = True
+        self.__logger.info(f'Warmup completed for the years {years.start} to {years.stop - 1}.')
@@ -1,3 +1,5 @@
-from rebelist.streamline.application.ingestion.jobs.workflow import SprintJob, TicketJob
+from rebelist.streamline.application.ingestion.jobs.models import Executable, JobPhase, JobResult
+from rebelist.streamline.application.ingestion.jobs.worker import IngestWorker
+from rebelist.streamline.application.ingestion.jobs.workflow import BackfillJob, SprintJob, TicketJob
 
-__all__ = ['SprintJob', 'TicketJob']
+__all__ = ['BackfillJob', 'SprintJob', 'TicketJob', 'IngestWorker', 'Executable', 'JobPhase', 'JobResult']
@@ -1,10 +1,35 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+
+class JobPhase(StrEnum):
+    """Phases a job spends its time in."""
+
+    JIRA_FETCH = 'jira_fetch'
+    CHANGELOG_PROCESSING = 'changelog_processing'
+    MONGO_WRITE = 'mongo_write'
+    ENQUEUE = 'enqueue'
+    JOB_RECORD_UPDATE = 'job_record_update'
+
+
+@dataclass
+class JobResult:
+    """Represents the outcome of a job execution."""
+
+    written: int = 0
+    skipped: int = 0
+    enqueued: int = 0
+    items: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+    phases: dict[str, float] = field(default_factory=lambda: {})
 
 
 class Executable(ABC):
     """Executable job interface."""
 
     @abstractmethod
-    def execute(self) -> None:
+    def execute(self) -> JobResult:
         """Executes as job."""
         ...
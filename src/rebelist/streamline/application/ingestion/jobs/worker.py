@@ -0,0 +1,85 @@
+from datetime import timedelta
+from typing import Final
+
+from rebelist.streamline.application.ingestion.jobs.models import JobResult
+from rebelist.streamline.application.ingestion.jobs.workflow import SprintJob, TicketJob
+from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
+from rebelist.streamline.infrastructure.mongo.document import WriteSummary
+from rebelist.streamline.infrastructure.mongo.job import JobRepository
+from rebelist.streamline.infrastructure.mongo.queue import IngestQueueRepository, WorkUnit, WorkUnitKind
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
+from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+from rebelist.streamline.infrastructure.monitoring import Logger, traced
+
+
+class IngestWorker:
+    """Ingest Worker: claims queued work units and synchronizes their Jira data."""
+
+    MAX_ATTEMPTS: Final[int] = 5
+    RETRY_DELAY: Final[timedelta] = timedelta(seconds=30)
+    JOB_NAMES: Final[dict[WorkUnitKind, str]] = {
+        WorkUnitKind.SPRINT_PAGE: SprintJob.JOB_NAME,
+        WorkUnitKind.ISSUE_PAGE: TicketJob.JOB_NAME,
+    }
+
+    def __init__(
+        self,
+        jira_gateway: JiraGateway,
+        sprint_document_repository: MongoSprintDocumentRepository,
+        ticket_document_repository: MongoTicketDocumentRepository,
+        ingest_queue: IngestQueueRepository,
+        job_repository: JobRepository,
+        logger: Logger,
+    ) -> None:
+        self.__jira_gateway = jira_gateway
+        self.__sprint_document_repository = sprint_document_repository
+        self.__ticket_document_repository = ticket_document_repository
+        self.__ingest_queue = ingest_queue
+        self.__job_repository = job_repository
+        self.__logger = logger
+
+    def process_next(self, worker: str, visibility_timeout: timedelta) -> WorkUnit | None:
+        """Claims and processes the next visible unit, returns None when the queue has no visible units."""
+        unit = self.__ingest_queue.claim(worker, visibility_timeout)
+        if not unit:
+            return None
+
+        try:
+            self.process(unit)
+        except Exception as e:
+            self.__logger.error(f'Work unit {unit.id} ({unit.kind}) failed on attempt {unit.attempts}: {e}')
+            self.__ingest_queue.retry(unit, str(e), IngestWorker.RETRY_DELAY, IngestWorker.MAX_ATTEMPTS)
+        else:
+            self.__ingest_queue.ack(unit)
+            self.__complete(unit)
+
+        return unit
+
+    @traced
+    def process(self, unit: WorkUnit) -> JobResult:
+        """Fetches and stores the Jira data described by a work unit, marking the producing job's data as changed."""
+        payload = unit.payload
+
+        match unit.kind:
+            case WorkUnitKind.SPRINT_PAGE:
+                sprints = self.__jira_gateway.find_sprints(payload['start_at'], payload['max_results'])
+                summary: WriteSummary = self.__sprint_document_repository.save_many(sprints)
+            case WorkUnitKind.ISSUE_PAGE:
+                tickets = self.__jira_gateway.find_tickets(
+                    payload['done_at'], payload['start_at'], payload['max_results'], payload.get('sprint_ids')
+                )
+                summary = self.__ticket_document_repository.save_many(tickets)
+
+        if summary.written:
+            self.__job_repository.mark_changed(self.JOB_NAMES[unit.kind], unit.team)
+
+        return JobResult(written=summary.written, skipped=summary.skipped)
+
+    def __complete(self, unit: WorkUnit) -> None:
+        """Moves the cursors of the producing job forward once the last unit of its batch is processed."""
+        if unit.batch and not self.__ingest_queue.remaining(unit.batch):
+            self.__job_repository.advance(self.JOB_NAMES[unit.kind], unit.team, unit.payload['cursor'])
+
+    def pending(self) -> int:
+        """Counts the units waiting in the queue."""
+        return self.__ingest_queue.count()
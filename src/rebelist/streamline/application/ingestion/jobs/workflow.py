@@ -1,18 +1,63 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Final
+from itertools import batched, chain, repeat
+from typing import Any, Callable, Final, Iterator, Sequence
+from uuid import uuid4
 
-from rebelist.streamline.application.ingestion.jobs.models import Executable
+from rebelist.streamline.application.ingestion.jobs.models import Executable, JobPhase, JobResult
 from rebelist.streamline.config.settings import JiraSettings
-from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
+from rebelist.streamline.infrastructure.jira.documents import shape_tickets
+from rebelist.streamline.infrastructure.jira.gateway import GatewayStatistics, JiraGateway
 from rebelist.streamline.infrastructure.mongo.job.repositories import Job, JobRepository
+from rebelist.streamline.infrastructure.mongo.queue import IngestQueueRepository, WorkUnit, WorkUnitKind
 from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
 from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+from rebelist.streamline.infrastructure.monitoring import PhaseTimer, traced
+
+
+def _add_costs(result: JobResult, statistics: GatewayStatistics, timer: PhaseTimer) -> JobResult:
+    """Adds the gateway costs and the measured phases to a job result."""
+    result.bytes_received = statistics.bytes_received
+    result.retries = statistics.retries
+    result.phases = {
+        JobPhase.JIRA_FETCH: statistics.fetch_seconds,
+        JobPhase.CHANGELOG_PROCESSING: statistics.processing_seconds,
+        **timer.durations,
+    }
+
+    return result
+
+
+def _save_and_enqueue(
+    job: Job, units: Sequence[WorkUnit], job_repository: JobRepository, queue: IngestQueueRepository, timer: PhaseTimer
+) -> None:
+    """Saves the producing job, then enqueues its units.
+
+    The job keeps its previous cursors while units are pending: each unit carries the cursors of its batch, and the
+    worker processing the last unit of the batch moves them forward. A batch with a failed unit never does, so the
+    next run enqueues its range again.
+    """
+    with timer.measure(JobPhase.JOB_RECORD_UPDATE):
+        job_repository.save(job)
+    with timer.measure(JobPhase.ENQUEUE):
+        queue.enqueue(units)
+
+
+def _limit_memory(max_bytes: int | None) -> None:
+    """Caps the address space of a process pool worker."""
+    if max_bytes:
+        import resource  # Only available on POSIX systems.
+
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
 
 
 class SprintJob(Executable):
     """Sprint Job: synchronizes Jira's sprint data."""
 
     JOB_NAME: Final[str] = 'jira_sprints'
+    PAGE_SIZE: Final[int] = 5
 
     def __init__(
         self,
@@ -20,13 +65,16 @@ class SprintJob(Executable):
         sprint_document_repository: MongoSprintDocumentRepository,
         job_repository: JobRepository,
         settings: JiraSettings,
+        ingest_queue: IngestQueueRepository | None = None,
     ) -> None:
         self.__jira_gateway = jira_gateway
         self.__sprint_document_repository = sprint_document_repository
         self.__job_repository = job_repository
         self.__settings = settings
+        self.__ingest_queue = ingest_queue
 
-    def execute(self) -> None:
+    @traced
+    def execute(self) -> JobResult:
         """Execute sprint data synchronization."""
         team = self.__settings.team
         job = self.__job_repository.find(SprintJob.JOB_NAME, team)
@@ -34,23 +82,49 @@ class SprintJob(Executable):
         if not job:
             job = Job(name=SprintJob.JOB_NAME, team=team)
 
+        timer = PhaseTimer()
+        statistics = self.__jira_gateway.statistics
         sprint_offset = job.metadata.get('sprint_offset', self.__settings.sprint_offset)
-        sprints = self.__jira_gateway.find_sprints(sprint_offset)
 
-        next_start_at = sprint_offset
-        for sprint in sprints:
-            self.__sprint_document_repository.save(sprint)
-            next_start_at += 1
+        if self.__ingest_queue:
+            total = self.__jira_gateway.count_sprints(sprint_offset)
+            cursor = {'sprint_offset': sprint_offset + total}
+            batch = uuid4().hex
+            units = [
+                WorkUnit(
+                    WorkUnitKind.SPRINT_PAGE,
+                    team,
+                    {'start_at': start_at, 'max_results': SprintJob.PAGE_SIZE, 'cursor': cursor},
+                    batch=batch,
+                )
+                for start_at in range(sprint_offset, sprint_offset + total, SprintJob.PAGE_SIZE)
+            ]
+            job.metadata = {'sprint_offset': sprint_offset} if units else cursor
+            job.executed_at = datetime.now(timezone.utc)
+            _save_and_enqueue(job, units, self.__job_repository, self.__ingest_queue, timer)
+            result = JobResult(enqueued=len(units), items=total)
+        else:
+            sprints = self.__jira_gateway.find_sprints(sprint_offset)
+            total = len(sprints)
+            with timer.measure(JobPhase.MONGO_WRITE):
+                summary = self.__sprint_document_repository.save_many(sprints)
+            result = JobResult(written=summary.written, skipped=summary.skipped, items=total)
 
-        job.metadata = {'sprint_offset': next_start_at}
-        job.executed_at = datetime.now(timezone.utc)
-        self.__job_repository.save(job)
+            job.metadata = {'sprint_offset': sprint_offset + total}
+            job.executed_at = datetime.now(timezone.utc)
+            with timer.measure(JobPhase.JOB_RECORD_UPDATE):
+                self.__job_repository.save(job)
+                if summary.written:
+                    self.__job_repository.mark_changed(SprintJob.JOB_NAME, team)
+
+        return _add_costs(result, self.__jira_gateway.statistics - statistics, timer)
 
 
 class TicketJob(Executable):
     """Ticket Job: synchronizes Jira's ticket data."""
 
     JOB_NAME: Final[str] = 'jira_tickets'
+    PAGE_SIZE: Final[int] = 100
 
     def __init__(
         self,
@@ -58,27 +132,188 @@ class TicketJob(Executable):
         ticket_document_repository: MongoTicketDocumentRepository,
         job_repository: JobRepository,
         settings: JiraSettings,
+        ingest_queue: IngestQueueRepository | None = None,
     ) -> None:
         self.__jira_gateway = jira_gateway
-        self.__sprint_document_repository = ticket_document_repository
+        self.__ticket_document_repository = ticket_document_repository
         self.__job_repository = job_repository
         self.__settings = settings
+        self.__ingest_queue = ingest_queue
 
-    def execute(self) -> None:
-        """Execute sprint data synchronization."""
+    @traced
+    def execute(self) -> JobResult:
+        """Execute ticket data synchronization."""
         team = self.__settings.team
         job = self.__job_repository.find(TicketJob.JOB_NAME, team)
 
         if not job:
             job = Job(name=TicketJob.JOB_NAME, team=team)
 
+        timer = PhaseTimer()
+        statistics = self.__jira_gateway.statistics
         tickets_done_at: datetime | None = job.metadata.get('tickets_done_at')
-        tickets = self.__jira_gateway.find_tickets(tickets_done_at)
         now = datetime.now(timezone.utc)
 
-        for ticket in tickets:
-            self.__sprint_document_repository.save(ticket)
+        if self.__ingest_queue:
+            sprint_ids = self.__jira_gateway.find_sprint_ids()
+            total = self.__jira_gateway.count_tickets(tickets_done_at, sprint_ids)
+            cursor = {'tickets_done_at': now}
+            batch = uuid4().hex
+            units = [
+                WorkUnit(
+                    WorkUnitKind.ISSUE_PAGE,
+                    team,
+                    {
+                        'done_at': tickets_done_at,
+                        'sprint_ids': sprint_ids,
+                        'start_at': start_at,
+                        'max_results': TicketJob.PAGE_SIZE,
+                        'cursor': cursor,
+                    },
+                    batch=batch,
+                )
+                for start_at in range(0, total, TicketJob.PAGE_SIZE)
+            ]
+            job.metadata = {'tickets_done_at': tickets_done_at} if units else cursor
+            job.executed_at = now
+            _save_and_enqueue(job, units, self.__job_repository, self.__ingest_queue, timer)
+            result = JobResult(enqueued=len(units), items=total)
+        else:
+            tickets = self.__jira_gateway.find_tickets(tickets_done_at)
+            with timer.measure(JobPhase.MONGO_WRITE):
+                summary = self.__ticket_document_repository.save_many(tickets)
+            result = JobResult(written=summary.written, skipped=summary.skipped, items=len(tickets))
+
+            job.metadata = {'tickets_done_at': now}
+            job.executed_at = now
+            with timer.measure(JobPhase.JOB_RECORD_UPDATE):
+                self.__job_repository.save(job)
+                if summary.written:
+                    self.__job_repository.mark_changed(TicketJob.JOB_NAME, team)
+
+        return _add_costs(result, self.__jira_gateway.statistics - statistics, timer)
+
+
+type _FetchedRange = tuple[int, list[dict[str, Any]], list[dict[str, Any]]]
+
+
+class BackfillJob(Executable):
+    """Backfill Job: synchronizes the whole sprint history of a team."""
+
+    JOB_NAME: Final[str] = 'jira_backfill'
+    RANGE_SIZE: Final[int] = 10
+    PAGE_SIZE: Final[int] = 100
+    CHUNK_SIZE: Final[int] = 50
+    MAX_TASKS_PER_CHILD: Final[int] = 100
+
+    def __init__(
+        self,
+        jira_gateway: JiraGateway,
+        sprint_document_repository: MongoSprintDocumentRepository,
+        ticket_document_repository: MongoTicketDocumentRepository,
+        job_repository: JobRepository,
+        settings: JiraSettings,
+    ) -> None:
+        self.__jira_gateway = jira_gateway
+        self.__sprint_document_repository = sprint_document_repository
+        self.__ticket_document_repository = ticket_document_repository
+        self.__job_repository = job_repository
+        self.__settings = settings
+
+    @traced
+    def execute(
+        self,
+        threads: int = 4,
+        processes: int | None = None,
+        range_size: int = RANGE_SIZE,
+        max_memory: int | None = None,
+        restart: bool = False,
+        on_range: Callable[[int, int], None] | None = None,
+    ) -> JobResult:
+        """Executes the job, sprint ranges are fetched by threads and their changelogs processed by a process pool.
+
+        Args:
+            threads: Number of sprint ranges fetched from Jira at the same time.
+            processes: Number of changelog processing workers, defaults to the number of CPUs.
+            range_size: Number of sprints per range.
+            max_memory: Address space limit of each processing worker in bytes.
+            restart: Ignore the ranges completed by a previous run.
+            on_range: Called with the completed and total number of ranges after each range is stored.
+        """
+        timer = PhaseTimer()
+        statistics = self.__jira_gateway.statistics
+        team = self.__settings.team
+        job = self.__job_repository.find(BackfillJob.JOB_NAME, team)
+
+        if not job or restart or job.metadata.get('range_size') != range_size:
+            job = Job(name=BackfillJob.JOB_NAME, team=team, metadata={'range_size': range_size, 'completed': []})
+
+        completed: set[int] = set(job.metadata['completed'])
+        starts = range(0, self.__jira_gateway.count_sprints(0), range_size)
+        result = JobResult()
+
+        with (
+            ThreadPoolExecutor(max_workers=threads) as fetchers,
+            ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_limit_memory,
+                initargs=(max_memory,),
+                max_tasks_per_child=BackfillJob.MAX_TASKS_PER_CHILD,
+            ) as processors,
+        ):
+            pending = [start for start in starts if start not in completed]
+            for start, sprints, raw_tickets in self.__fetch_ranges(fetchers, pending, range_size, threads):
+                with timer.measure(JobPhase.CHANGELOG_PROCESSING):
+                    chunks = batched(raw_tickets, BackfillJob.CHUNK_SIZE, strict=False)
+                    tickets = list(chain.from_iterable(processors.map(shape_tickets, chunks, repeat(team))))
+
+                with timer.measure(JobPhase.MONGO_WRITE):
+                    summary = self.__sprint_document_repository.save_many(sprints)
+                    summary += self.__ticket_document_repository.save_many(tickets)
+
+                result.written += summary.written
+                result.skipped += summary.skipped
+                result.items += len(sprints) + len(raw_tickets)
+
+                completed.add(start)
+                job.metadata = {'range_size': range_size, 'completed': sorted(completed)}
+                job.executed_at = datetime.now(timezone.utc)
+                with timer.measure(JobPhase.JOB_RECORD_UPDATE):
+                    self.__job_repository.save(job)
+                    if summary.written:
+                        self.__job_repository.mark_changed(BackfillJob.JOB_NAME, team)
+
+                if on_range:
+                    on_range(len(completed), len(starts))
+
+        return _add_costs(result, self.__jira_gateway.statistics - statistics, timer)
+
+    def __fetch_ranges(
+        self, executor: ThreadPoolExecutor, starts: Sequence[int], range_size: int, window: int
+    ) -> Iterator[_FetchedRange]:
+        """Fetches sprint ranges concurrently, keeping at most window ranges in flight."""
+        queue = deque(starts)
+        futures: set[Future[_FetchedRange]] = set()
+
+        while queue or futures:
+            while queue and len(futures) < window:
+                futures.add(executor.submit(self.__fetch_range, queue.popleft(), range_size))
+
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def __fetch_range(self, start: int, range_size: int) -> _FetchedRange:
+        """Fetches a range of sprints and the raw issues of those sprints."""
+        sprints = self.__jira_gateway.find_sprints(start, range_size)
+        sprint_ids = [sprint['id'] for sprint in sprints]
+        raw_tickets: list[dict[str, Any]] = []
+
+        while True:
+            page = self.__jira_gateway.find_raw_tickets(sprint_ids, len(raw_tickets), BackfillJob.PAGE_SIZE)
+            raw_tickets.extend(page)
+            if len(page) < BackfillJob.PAGE_SIZE:
+                break
 
-        job.metadata = {'tickets_done_at': now}
-        job.executed_at = now
-        self.__job_repository.save(job)
+        return start, sprints, raw_tickets
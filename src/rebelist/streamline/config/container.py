@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Any, Final, Mapping, Type, cast
+from typing import TYPE_CHECKING, Any, Final, Iterator, Mapping, Type, cast
+from weakref import WeakSet
 
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
-from dependency_injector.providers import Configuration, Singleton, ThreadSafeSingleton
+from dependency_injector.providers import (
+    AttributeGetter,
+    BaseSingleton,
+    Callable,
+    Configuration,
+    Delegate,
+    List,
+    ProvidedInstance,
+    Provider,
+    Singleton,
+    ThreadSafeSingleton,
+)
 from dotenv import dotenv_values
-from jira import JIRA
-from loguru import logger
-from pymongo import MongoClient
+from loguru import logger as loguru_logger
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.database import Database
-from workalendar.core import Calendar as WorkCalendar
-from workalendar.registry import registry
 
-from rebelist.streamline.application.compute import FlowMetricsService
+from rebelist.streamline.application.compute import AsyncFlowMetricsService, Warmup
 from rebelist.streamline.application.compute.use_cases import (
     GetLeadTimesUseCase,
     GetSprintCycleTimesUseCase,
@@ -21,8 +32,14 @@ from rebelist.streamline.application.compute.use_cases import (
     GetVelocityUseCase,
 )
 from rebelist.streamline.application.compute.use_cases.flow import GetCycleTimesUseCase
-from rebelist.streamline.application.ingestion.jobs import SprintJob, TicketJob
-from rebelist.streamline.config.settings import Settings, load_settings
+from rebelist.streamline.application.ingestion.jobs import BackfillJob, IngestWorker, SprintJob, TicketJob
+from rebelist.streamline.config.settings import (
+    AppSettings,
+    ReloadableSettings,
+    Settings,
+    TracingSettings,
+    WorkflowSettings,
+)
 from rebelist.streamline.domain.metrics.flow import (
     CycleTimeCalculator,
     LeadTimeCalculator,
@@ -32,11 +49,37 @@ from rebelist.streamline.domain.metrics.flow import (
 from rebelist.streamline.domain.time import WorkTimeCalculator
 from rebelist.streamline.infrastructure.datetime import DateTimeNormalizer
 from rebelist.streamline.infrastructure.jira import JiraGateway
-from rebelist.streamline.infrastructure.mongo.job import JobRepository
-from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository, MongoSprintRepository
-from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+from rebelist.streamline.infrastructure.mongo.job import AsyncJobRepository, JobRepository
+from rebelist.streamline.infrastructure.mongo.queue import IngestQueueRepository
+from rebelist.streamline.infrastructure.mongo.run import SyncRunRepository
+from rebelist.streamline.infrastructure.mongo.sprint import (
+    AsyncMongoSprintRepository,
+    MongoSprintDocumentRepository,
+    MongoSprintRepository,
+)
+from rebelist.streamline.infrastructure.mongo.ticket import AsyncMongoTicketRepository, MongoTicketDocumentRepository
 from rebelist.streamline.infrastructure.mongo.ticket.repositories import MongoTicketRepository
-from rebelist.streamline.infrastructure.monitoring import Logger
+from rebelist.streamline.infrastructure.monitoring import (
+    TRACER,
+    CommandMetricsListener,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Logger,
+    Metrics,
+    QueryStatsListener,
+    SamplingProfiler,
+    SpanExporter,
+    SyncRunCollector,
+    Tracer,
+)
+
+if TYPE_CHECKING:
+    from jira import JIRA
+    from workalendar.core import Calendar as WorkCalendar
+
+
+_CREATED_CONTAINERS: Final[WeakSet[Container]] = WeakSet()
 
 
 class Container(DeclarativeContainer):
@@ -52,50 +95,165 @@ class Container(DeclarativeContainer):
         container.config.from_dict(
             {name.lower(): value for name, value in dotenv_values(f'{Container.PROJECT_ROOT}/.env').items()}
         )
+        _CREATED_CONTAINERS.add(container)
+        container.tracer()
 
         return container
 
+    @staticmethod
+    def reset_created_database_clients() -> None:
+        """Resets the database clients of every container created in this process and still in use, after a fork."""
+        for container in list(_CREATED_CONTAINERS):
+            Container.reset_database_clients(container)
+
+    @staticmethod
+    def reset_database_clients(container: Container) -> None:
+        """Forgets the MongoDB clients and every singleton using them, so a forked process opens its own pools.
+
+        PyMongo clients are not fork-safe, a child process must not reuse the connections and threads of its parent. The
+        query statistics are forgotten too, they own the client explaining the slow queries.
+        """
+        clients: set[Provider[Any]] = {container.__mongo_client, container.__async_mongo_client, container.query_stats}
+        singletons = cast(Iterator[BaseSingleton[Any]], container.traverse(types=[BaseSingleton]))
+        for singleton in singletons:
+            if singleton in clients or clients.intersection(singleton.traverse()):
+                singleton.reset()
+
+    @staticmethod
+    def reload_settings(container: Container) -> frozenset[str]:
+        """Reloads settings.ini when it changed, resetting only the singletons reading one of the changed sections.
+
+        Returns the names of the changed sections, empty when the settings were kept.
+
+        ValueError: If the changed file is invalid, the current settings are kept.
+        """
+        change = container.settings_file().reload()
+        if not change:
+            return frozenset()
+
+        previous, current = change
+        changed = frozenset(name for name in Settings.model_fields if getattr(previous, name) != getattr(current, name))
+        singletons = cast(Iterator[BaseSingleton[Any]], container.traverse(types=[BaseSingleton]))
+        for singleton in singletons:
+            if Container._get_settings_sections(singleton, container.settings) & changed:
+                singleton.reset()
+
+        return changed
+
+    @staticmethod
+    def _get_settings_sections(provider: Provider[Any], settings: Provider[Settings]) -> frozenset[str]:
+        """Names the settings sections a provider reads, directly or through the providers it depends on.
+
+        A delegated provider is resolved on every use by its dependent, which therefore never holds stale settings.
+        """
+        if isinstance(provider, Delegate):
+            return frozenset()
+
+        if provider is settings or (isinstance(provider, ProvidedInstance) and provider.provides is settings):
+            return frozenset(Settings.model_fields)
+
+        if isinstance(provider, AttributeGetter):
+            parent = cast(Provider[Any] | None, provider.provides)
+            if isinstance(parent, ProvidedInstance) and parent.provides is settings and provider.name:
+                return frozenset({provider.name})
+
+        related = cast(Iterator[Provider[Any]], provider.related)
+        return frozenset[str]().union(*(Container._get_settings_sections(other, settings) for other in related))
+
     @staticmethod
     def _get_database(client: MongoClient[Any]) -> Database[Mapping[str, Any]]:
         return client.get_default_database()
 
     @staticmethod
-    def _get_calendar(settings: Settings) -> WorkTimeCalculator:
-        """Provides a work_calendar instance for specific country."""
-        calendar_class = cast(Type[WorkCalendar], registry.get(settings.app.country))
+    def _get_async_database(client: AsyncMongoClient[Any]) -> AsyncDatabase[Mapping[str, Any]]:
+        return client.get_default_database()
+
+    @staticmethod
+    def _get_jira_client(server: str, token_auth: str) -> JIRA:
+        """Provides a Jira client, importing the library only once a service needs it."""
+        from jira import JIRA
+
+        return JIRA(server=server, token_auth=token_auth)
+
+    @staticmethod
+    def _get_tracer(settings: TracingSettings, collector: InMemorySpanExporter) -> Tracer:
+        """Provides the process tracer, exporting the spans to the collector and to the configured file if enabled."""
+        exporters: list[SpanExporter] = []
+        if settings.enabled:
+            exporters.append(collector)
+            if settings.file:
+                exporters.append(FileSpanExporter(settings.file))
+
+        TRACER.configure(exporters)
+        return TRACER
+
+    @staticmethod
+    def get_work_calendar(country: str) -> WorkCalendar:
+        """Provides the holiday calendar of a country, looked up in the workalendar registry."""
+        from workalendar.registry import registry
+
+        calendar_class = cast('Type[WorkCalendar]', registry.get(country))
 
         if not calendar_class:
-            raise ValueError(f'No WorkCalendar class found for region {settings.app.country}')
+            raise ValueError(f'No WorkCalendar class found for region {country}')
 
-        workday_starts_at = settings.workflow.workday_starts_at
-        workday_ends_at = settings.workflow.workday_ends_at
-        workday_duration = settings.workflow.workday_duration
+        return calendar_class()
 
-        return WorkTimeCalculator(calendar_class(), workday_starts_at, workday_ends_at, workday_duration)
+    @staticmethod
+    def _get_calendar(app: AppSettings, workflow: WorkflowSettings) -> WorkTimeCalculator:
+        """Provides a work_calendar instance for specific country."""
+        workday_starts_at = workflow.workday_starts_at
+        workday_ends_at = workflow.workday_ends_at
+        workday_duration = workflow.workday_duration
+
+        return WorkTimeCalculator(
+            Container.get_work_calendar(app.country), workday_starts_at, workday_ends_at, workday_duration
+        )
 
     ### Configuration ###
     config = Configuration(strict=True)
 
-    settings = ThreadSafeSingleton(load_settings, f'{PROJECT_ROOT}/settings.ini')
+    settings_file = ThreadSafeSingleton(ReloadableSettings, f'{PROJECT_ROOT}/settings.ini')
+
+    settings = Callable(ReloadableSettings.snapshot, settings_file)
 
     wiring_config = WiringConfiguration(
         auto_wire=True,
         packages=['rebelist.streamline.handlers.api'],
     )
 
-    ### Private Services ###
+    ### Monitoring ###
+    metrics = Singleton(Metrics)
+
+    logger = Singleton(Logger, loguru_logger, settings.provided.logging)
+
+    span_collector = Singleton(InMemorySpanExporter, settings.provided.tracing.buffer_size)
+
+    tracer = Singleton(_get_tracer, settings.provided.tracing, span_collector)
 
-    __logger = Singleton(Logger, logger)
+    profiler = Singleton(SamplingProfiler, settings.provided.profiling.interval)
+
+    query_stats = Singleton(QueryStatsListener, settings_file.provided.snapshot, logger.provider, config.mongo_uri)
+
+    ### Private Services ###
 
     __datetime_normalizer = Singleton(DateTimeNormalizer, settings.provided.app.timezone)
 
-    __jira_client = Singleton(JIRA, server=config.jira_host, token_auth=config.jira_token)
+    __jira_client = Singleton(_get_jira_client, config.jira_host, config.jira_token)
 
-    __mongo_client = Singleton(MongoClient, host=config.mongo_uri, tz_aware=True)
+    __command_listener = Singleton(CommandMetricsListener, metrics)
 
-    __jira_gateway = Singleton(JiraGateway, __jira_client, settings.provided.jira, __logger)
+    __mongo_client = Singleton(
+        MongoClient, host=config.mongo_uri, tz_aware=True, event_listeners=List(__command_listener, query_stats)
+    )
 
-    __calendar_service = Singleton(_get_calendar, settings.provided)
+    __async_mongo_client = Singleton(
+        AsyncMongoClient, host=config.mongo_uri, tz_aware=True, event_listeners=List(__command_listener, query_stats)
+    )
+
+    __jira_gateway = Singleton(JiraGateway, __jira_client, settings.provided.jira, logger)
+
+    __calendar_service = Singleton(_get_calendar, settings.provided.app, settings.provided.workflow)
 
     __cycle_time_calculator = Singleton(CycleTimeCalculator, __calendar_service)
 
@@ -116,27 +274,58 @@ class Container(DeclarativeContainer):
 
     ticket_document_repository = Singleton(MongoTicketDocumentRepository, database)
 
-    get_cycle_time_sprints_use_case = Singleton(GetSprintCycleTimesUseCase, __cycle_time_calculator, sprint_repository)
+    get_cycle_time_sprints_use_case = Singleton(
+        GetSprintCycleTimesUseCase, __cycle_time_calculator, sprint_repository, settings.provided.app.debug
+    )
 
-    get_cycle_time_use_case = Singleton(GetCycleTimesUseCase, __cycle_time_calculator, ticket_repository)
+    get_cycle_time_use_case = Singleton(
+        GetCycleTimesUseCase, __cycle_time_calculator, ticket_repository, settings.provided.app.debug
+    )
 
-    get_lead_time_use_case = Singleton(GetLeadTimesUseCase, __lead_time_calculator, ticket_repository)
+    get_lead_time_use_case = Singleton(
+        GetLeadTimesUseCase, __lead_time_calculator, ticket_repository, settings.provided.app.debug
+    )
+
+    get_throughput_use_case = Singleton(
+        GetThroughputUseCase, __throughput_calculator, sprint_repository, settings.provided.app.debug
+    )
+
+    get_velocity_use_case = Singleton(
+        GetVelocityUseCase, __velocity_calculator, sprint_repository, settings.provided.app.debug
+    )
 
-    get_throughput_use_case = Singleton(GetThroughputUseCase, __throughput_calculator, sprint_repository)
+    async_database = Singleton(_get_async_database, __async_mongo_client)
 
-    get_velocity_use_case = Singleton(GetVelocityUseCase, __velocity_calculator, sprint_repository)
+    async_sprint_repository = Singleton(AsyncMongoSprintRepository, async_database, __datetime_normalizer)
 
-    flow_metrics_service = Singleton(
-        FlowMetricsService,
+    async_ticket_repository = Singleton(AsyncMongoTicketRepository, async_database, __datetime_normalizer)
+
+    async_flow_metrics_service = Singleton(
+        AsyncFlowMetricsService,
         get_cycle_time_sprints_use_case,
         get_cycle_time_use_case,
         get_lead_time_use_case,
         get_throughput_use_case,
         get_velocity_use_case,
+        async_sprint_repository,
+        async_ticket_repository,
+        metrics,
+        tracer,
+    )
+
+    warmup = Singleton(
+        Warmup,
+        async_database,
+        __calendar_service,
+        async_flow_metrics_service,
+        settings.provided.jira.team,
+        logger,
     )
 
     job_repository = Singleton(JobRepository, database)
 
+    async_job_repository = Singleton(AsyncJobRepository, async_database)
+
     sprint_job = Singleton(
         SprintJob, __jira_gateway, sprint_document_repository, job_repository, settings.provided.jira
     )
@@ -144,3 +333,41 @@ class Container(DeclarativeContainer):
     ticket_job = Singleton(
         TicketJob, __jira_gateway, ticket_document_repository, job_repository, settings.provided.jira
     )
+
+    backfill_job = Singleton(
+        BackfillJob,
+        __jira_gateway,
+        sprint_document_repository,
+        ticket_document_repository,
+        job_repository,
+        settings.provided.jira,
+    )
+
+    database_archive = Singleton(MongoArchive, database)
+
+    sync_run_repository = Singleton(SyncRunRepository, database)
+
+    sync_run_collector = Singleton(SyncRunCollector, sync_run_repository)
+
+    ingest_queue = Singleton(IngestQueueRepository, database)
+
+    sprint_producer_job = Singleton(
+        SprintJob, __jira_gateway, sprint_document_repository, job_repository, settings.provided.jira, ingest_queue
+    )
+
+    ticket_producer_job = Singleton(
+        TicketJob, __jira_gateway, ticket_document_repository, job_repository, settings.provided.jira, ingest_queue
+    )
+
+    ingest_worker = Singleton(
+        IngestWorker,
+        __jira_gateway,
+        sprint_document_repository,
+        ticket_document_repository,
+        ingest_queue,
+        job_repository,
+        logger,
+    )
+
+
+os.register_at_fork(after_in_child=Container.reset_created_database_clients)
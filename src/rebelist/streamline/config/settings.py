@@ -1,8 +1,11 @@
+import hashlib
+import os
 from configparser import ConfigParser
 from datetime import time
 from functools import cached_property
 from importlib import metadata
 from pathlib import Path
+from threading import Lock
 from typing import Any, ClassVar, Final
 from zoneinfo import ZoneInfo
 
@@ -19,6 +22,7 @@ class AppSettings(BaseModel):
 
     country: str
     timezone: ZoneInfo
+    debug: bool = False
 
     @field_validator('timezone', mode='before')
     @classmethod
@@ -79,14 +83,127 @@ class JiraSettings(BaseModel):
         return value
 
 
+class ApiSettings(BaseModel):
+    """Configuration settings for the HTTP API."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    cache_max_age: int = Field(default=300, ge=0)
+
+
+class ServerSettings(BaseModel):
+    """Configuration settings for the production HTTP server."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    host: str = '0.0.0.0'
+    port: int = Field(default=8000, ge=1, le=65535)
+    workers: int = Field(default=0, ge=0)
+    max_requests: int = Field(default=0, ge=0)
+    keep_alive: int = Field(default=5, ge=1)
+    backlog: int = Field(default=2048, ge=1)
+
+    @property
+    def worker_count(self) -> int:
+        """Get the number of worker processes, one per CPU available to the process unless configured."""
+        return self.workers or os.process_cpu_count() or 1
+
+
+class LoggingSettings(BaseModel):
+    """Configuration settings for the application log."""
+
+    LEVELS: ClassVar[Final[frozenset[str]]] = frozenset(
+        {'TRACE', 'DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL'}
+    )
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    file: str = 'var/logs/app.log'
+    level: str = 'INFO'
+    modules: dict[str, str] = Field(default_factory=dict[str, str])
+    serialize: bool = True
+
+    @field_validator('level')
+    @classmethod
+    def known_level(cls, value: str) -> str:
+        """Ensure 'level' names a log level."""
+        return cls.parse_level(value)
+
+    @field_validator('modules', mode='before')
+    @classmethod
+    def split_modules(cls, value: str | dict[str, str]) -> dict[str, str]:
+        """Parses a comma-separated string of module: LEVEL pairs into a mapping."""
+        if isinstance(value, str):
+            pairs = (item.rpartition(':') for item in value.split(',') if item.strip())
+            value = {module.strip(): level for module, _, level in pairs}
+        return {module: cls.parse_level(level) for module, level in value.items()}
+
+    @classmethod
+    def parse_level(cls, value: str) -> str:
+        """Normalizes a log level name, rejecting unknown ones."""
+        level = value.strip().upper()
+        if level not in cls.LEVELS:
+            raise ValueError(f'Unknown log level: {value}')
+        return level
+
+
+class ProfilingSettings(BaseModel):
+    """Configuration settings for the on-demand profiling of the API workers."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    enabled: bool = False
+    interval: float = Field(default=0.005, gt=0)
+    max_duration: int = Field(default=60, ge=1)
+
+
+class QueriesSettings(BaseModel):
+    """Configuration settings for the MongoDB query statistics and slow-query log."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    enabled: bool = False
+    slow_ms: float = Field(default=100.0, ge=0)
+    explain: bool = True
+    max_shapes: int = Field(default=500, ge=1)
+
+
+class TracingSettings(BaseModel):
+    """Configuration settings for the tracing of requests and jobs."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+    enabled: bool = False
+    file: str = ''
+    buffer_size: int = Field(default=2048, ge=1)
+
+
 class Settings(BaseSettings):
     """Main settings class aggregating all configuration sections."""
 
     model_config = SettingsConfigDict(frozen=True)
 
+    METRICS_SECTIONS: ClassVar[Final[frozenset[str]]] = frozenset({'app', 'workflow', 'jira'})
+
     app: AppSettings
     workflow: WorkflowSettings
     jira: JiraSettings
+    api: ApiSettings = ApiSettings()
+    server: ServerSettings = ServerSettings()
+    logging: LoggingSettings = LoggingSettings()
+    tracing: TracingSettings = TracingSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
+    queries: QueriesSettings = QueriesSettings()
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Get a hash of all the settings values."""
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()
+
+    @cached_property
+    def metrics_fingerprint(self) -> str:
+        """Get a hash of the settings values the metrics are computed with."""
+        return hashlib.sha256(self.model_dump_json(include=set(self.METRICS_SECTIONS)).encode()).hexdigest()
 
 
 def load_settings(filepath: str | Path) -> Settings:
@@ -110,3 +227,49 @@ def load_settings(filepath: str | Path) -> Settings:
         return settings
     except (ValidationError, ValueError, TypeError) as e:
         raise ValueError(f'Failed to load settings: {e}') from e
+
+
+class ReloadableSettings:
+    """Settings of an INI file, revalidated whenever the file changes and swapped atomically once valid.
+
+    Readers always get a complete snapshot, either the previous or the new one, never a mix of both.
+    """
+
+    def __init__(self, filepath: str | Path) -> None:
+        self.__filepath = Path(filepath)
+        self.__lock = Lock()
+        self.__stamp = self.__read_stamp()
+        self.__settings = load_settings(self.__filepath)
+
+    def snapshot(self) -> Settings:
+        """Returns the current settings."""
+        return self.__settings
+
+    def reload(self) -> tuple[Settings, Settings] | None:
+        """Revalidates the file when it changed since the last check, swapping the settings when their values changed.
+
+        Returns the previous and the new settings when they were swapped, None otherwise.
+
+        ValueError: If the changed file is invalid, the current settings are kept until the file changes again.
+        """
+        with self.__lock:
+            stamp = self.__read_stamp()
+            if stamp == self.__stamp:
+                return None
+
+            self.__stamp = stamp
+            settings = load_settings(self.__filepath)
+            if settings.fingerprint == self.__settings.fingerprint:
+                return None
+
+            previous, self.__settings = self.__settings, settings
+            return previous, settings
+
+    def __read_stamp(self) -> tuple[int, int] | None:
+        """Identifies the version of the file by its modification time and size, None when it is missing."""
+        try:
+            stat = self.__filepath.stat()
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
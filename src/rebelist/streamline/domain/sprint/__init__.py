@@ -1,4 +1,4 @@
 from rebelist.streamline.domain.sprint.models import Sprint
-from rebelist.streamline.domain.sprint.repository import SprintRepository
+from rebelist.streamline.domain.sprint.repository import AsyncSprintRepository, SprintRepository
 
-__all__ = ['Sprint', 'SprintRepository']
+__all__ = ['AsyncSprintRepository', 'Sprint', 'SprintRepository']
@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from rebelist.streamline.domain.sprint.models import Sprint
+from rebelist.streamline.domain.time import TimeRange
 
 
 class SprintRepository(ABC):
     """Sprint ticket_repository."""
 
     @abstractmethod
-    def find_by_team_name(self, team: str) -> list[Sprint]:
-        """Find all sprints for a team."""
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Find the latest sprints for a team, or all the sprints closed within a time range."""
+        ...
+
+
+class AsyncSprintRepository(ABC):
+    """Sprint repository for asynchronous callers."""
+
+    @abstractmethod
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Find the latest sprints for a team, or all the sprints closed within a time range."""
+        ...
+
+    @abstractmethod
+    def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Sprint]:
+        """Iterate over the whole sprint history of a team, without loading it at once."""
         ...
@@ -1,4 +1,4 @@
 from rebelist.streamline.domain.ticket.models import Ticket
-from rebelist.streamline.domain.ticket.repository import TicketRepository
+from rebelist.streamline.domain.ticket.repository import AsyncTicketRepository, TicketRepository
 
-__all__ = ['Ticket', 'TicketRepository']
+__all__ = ['AsyncTicketRepository', 'Ticket', 'TicketRepository']
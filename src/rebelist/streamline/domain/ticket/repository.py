@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from rebelist.streamline.domain.ticket import Ticket
+from rebelist.streamline.domain.time import TimeRange
 
 
 class TicketRepository(ABC):
     """Ticket ticket_repository."""
 
     @abstractmethod
-    def find_by_team_name(self, team: str) -> list[Ticket]:
-        """Find all tickets for a team."""
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Find the latest tickets for a team, or all the tickets resolved within a time range."""
+        ...
+
+
+class AsyncTicketRepository(ABC):
+    """Ticket repository for asynchronous callers."""
+
+    @abstractmethod
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Find the latest tickets for a team, or all the tickets resolved within a time range."""
+        ...
+
+    @abstractmethod
+    def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Ticket]:
+        """Iterate over the whole ticket history of a team, without loading it at once."""
         ...
@@ -1,3 +1,4 @@
 from rebelist.streamline.domain.time.calculator import WorkCalendarProtocol, WorkTimeCalculator
+from rebelist.streamline.domain.time.models import TimeRange
 
-__all__ = ['WorkTimeCalculator', 'WorkCalendarProtocol']
+__all__ = ['TimeRange', 'WorkTimeCalculator', 'WorkCalendarProtocol']
@@ -1,5 +1,5 @@
 from datetime import date, datetime, time, timedelta
-from typing import Final, Protocol
+from typing import Final, Iterable, Protocol
 
 
 class WorkCalendarProtocol(Protocol):
@@ -75,6 +75,11 @@ class WorkTimeCalculator:
         total_hours = (full_days * self.__workday_duration) + start_partial + end_partial
         return round(total_hours / self.__workday_duration, 2)
 
+    def warm_up(self, years: Iterable[int]) -> None:
+        """Walks the calendar through whole years, so calendars computing their holidays per year have them ready."""
+        for year in years:
+            self.__work_calendar.get_working_days_delta(date(year, 1, 1), date(year, 12, 31))
+
     def __get_partial_hours(self, target: datetime, is_start: bool) -> float:
         """Calculates the overlap in working hours for a partial day."""
         work_start = datetime.combine(target.date(), self.__workday_starts_at, tzinfo=target.tzinfo)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class TimeRange:
+    """Represents a half-open period of time, unbounded on the sides without a datetime."""
+
+    start: datetime | None = None
+    end: datetime | None = None
+
+    def __post_init__(self) -> None:
+        """Validates that the range is not empty."""
+        if self.start and self.end and self.start >= self.end:
+            raise ValueError('Time range must start before it ends.')
@@ -0,0 +1,124 @@
+import asyncio
+import os
+from typing import Annotated, Any, Final, Literal
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import Settings
+from rebelist.streamline.infrastructure.monitoring import (
+    InMemorySpanExporter,
+    ProfileFormat,
+    QueryStatsListener,
+    SamplingProfiler,
+    Tracer,
+)
+
+router = APIRouter(prefix='/debug')
+
+PROFILE_MEDIA_TYPES: Final[dict[ProfileFormat, str]] = {
+    ProfileFormat.SPEEDSCOPE: 'application/json',
+    ProfileFormat.COLLAPSED: 'text/plain; charset=utf-8',
+}
+type QuerySort = Literal['total_ms', 'mean_ms', 'max_ms', 'count', 'documents', 'bytes', 'slow']
+
+PROFILE_EXTENSIONS: Final[dict[ProfileFormat, str]] = {
+    ProfileFormat.SPEEDSCOPE: 'speedscope.json',
+    ProfileFormat.COLLAPSED: 'folded.txt',
+}
+
+
+@router.get('/traces', include_in_schema=False)
+@inject
+def traces(
+    tracer: Annotated[Tracer, Depends(Provide[Container.tracer])],
+    collector: Annotated[InMemorySpanExporter, Depends(Provide[Container.span_collector])],
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    min_duration_ms: Annotated[float, Query(ge=0)] = 0.0,
+) -> list[dict[str, Any]]:
+    """Lists the slowest traces recorded by the worker, answering 404 Not Found when tracing is disabled."""
+    if not tracer.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Tracing is disabled.')
+
+    return collector.traces(limit, min_duration_ms)
+
+
+@router.get('/traces/{trace_id}', include_in_schema=False)
+@inject
+def trace(
+    trace_id: str,
+    tracer: Annotated[Tracer, Depends(Provide[Container.tracer])],
+    collector: Annotated[InMemorySpanExporter, Depends(Provide[Container.span_collector])],
+) -> list[dict[str, Any]]:
+    """Details the spans of a trace recorded by the worker, in the OTLP JSON format."""
+    spans = collector.trace(trace_id) if tracer.enabled else []
+    if not spans:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Trace {trace_id} not found.')
+
+    return [span.to_otlp() for span in spans]
+
+
+@router.get('/profile', include_in_schema=False)
+@inject
+async def profile(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    profiler: Annotated[SamplingProfiler, Depends(Provide[Container.profiler])],
+    seconds: Annotated[float, Query(gt=0)] = 5.0,
+    profile_format: Annotated[ProfileFormat, Query(alias='format')] = ProfileFormat.SPEEDSCOPE,
+) -> Response:
+    """Samples every thread of the worker for a few seconds, returning a speedscope document or folded stacks.
+
+    Answers 404 Not Found when profiling is disabled, and 409 Conflict while another profile of the worker is taken.
+    """
+    if not settings.profiling.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Profiling is disabled.')
+    if seconds > settings.profiling.max_duration:
+        detail = f'A profile lasts at most {settings.profiling.max_duration} seconds.'
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=detail)
+
+    name = f'{settings.app.name} worker {os.getpid()}'
+    try:
+        profiler.start(name)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        result = await asyncio.to_thread(profiler.stop)
+
+    filename = f'profile-{os.getpid()}.{PROFILE_EXTENSIONS[profile_format]}'
+    return Response(
+        content=result.render(profile_format),
+        media_type=PROFILE_MEDIA_TYPES[profile_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get('/queries', include_in_schema=False)
+@inject
+def queries(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    query_stats: Annotated[QueryStatsListener, Depends(Provide[Container.query_stats])],
+    sort: QuerySort = 'total_ms',
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+) -> list[dict[str, Any]]:
+    """Lists the MongoDB query shapes run by the worker, answering 404 Not Found when the statistics are disabled."""
+    if not settings.queries.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Query statistics are disabled.')
+
+    return query_stats.stats(sort, limit)
+
+
+@router.delete('/queries', include_in_schema=False, status_code=status.HTTP_204_NO_CONTENT)
+@inject
+def reset_queries(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    query_stats: Annotated[QueryStatsListener, Depends(Provide[Container.query_stats])],
+) -> None:
+    """Forgets the MongoDB query statistics of the worker, answering 404 Not Found when the statistics are disabled."""
+    if not settings.queries.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Query statistics are disabled.')
+
+    query_stats.reset()
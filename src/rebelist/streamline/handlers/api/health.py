@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException, Request, status
+
+router = APIRouter()
+
+
+@router.get('/health/live', include_in_schema=False)
+def liveness() -> dict[str, str]:
+    """Reports that the worker is running, whether or not it is warm."""
+    return {'status': 'live'}
+
+
+@router.get('/health/ready', include_in_schema=False)
+def readiness(request: Request) -> dict[str, str]:
+    """Reports whether the worker is warm, answering 503 Service Unavailable until it is."""
+    if not getattr(request.app.state, 'ready', False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='Warming up.')
+
+    return {'status': 'ready'}
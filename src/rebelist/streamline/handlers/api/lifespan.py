@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncGenerator, Final
+
+from fastapi import FastAPI
+
+from rebelist.streamline.config.container import Container
+
+SETTINGS_POLL_INTERVAL: Final[float] = 5.0
+
+
+async def warm_up(app: FastAPI, container: Container) -> None:
+    """Warms the worker up, reporting it ready once done.
+
+    Readiness is kept on the app rather than on the warmup, which is replaced whenever the settings it reads change.
+    """
+    await container.warmup().run()
+    app.state.ready = True
+
+
+async def watch_settings(container: Container, interval: float = SETTINGS_POLL_INTERVAL) -> None:
+    """Polls settings.ini, swapping the settings on change, then reconfiguring the tracer and warming the worker up."""
+    rewarm: asyncio.Task[None] | None = None
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = await asyncio.to_thread(Container.reload_settings, container)
+        except ValueError as e:
+            container.logger().error(f'Settings were not reloaded, the current ones are kept: {e}')
+            continue
+
+        if changed:
+            container.logger().info(f'Settings reloaded, changed sections: {", ".join(sorted(changed))}.')
+            container.tracer()
+            if rewarm:
+                rewarm.cancel()
+            rewarm = asyncio.create_task(container.warmup().run())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    """Warms the worker up and watches its settings in the background while it serves, stopping both on shutdown.
+
+    The liveness route answers right away, the readiness route only once the first warmup completed. The database pool
+    is closed on shutdown, so a recycled worker hands its connections back to the server right away, and the queued log
+    records and spans are written before the worker exits.
+    """
+    container: Container = app.state.container
+    app.state.ready = False
+    app.openapi()  # Builds the schemas of every route ahead of the first request.
+    tasks = [asyncio.create_task(warm_up(app, container)), asyncio.create_task(watch_settings(container))]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        await container.async_database().client.close()
+        container.logger().complete()
+        container.tracer().flush()
@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 
 from rebelist.streamline.config.container import Container
+from rebelist.streamline.handlers.api.health import router as health_router
+from rebelist.streamline.handlers.api.lifespan import lifespan
 from rebelist.streamline.handlers.api.metrics.flow import router as metrics_router
+from rebelist.streamline.handlers.api.monitoring import instrument
 
 container = Container.create()
 settings = container.settings()
@@ -10,7 +13,10 @@ app: FastAPI = FastAPI(
     title=settings.app.name,
     version=settings.app.version,
     docs_url='/',
+    lifespan=lifespan,
 )
 
 app.include_router(metrics_router, prefix='/v1/metrics', tags=['metrics'])
+app.include_router(health_router)
 app.state.container = container
+instrument(app, container)
@@ -0,0 +1,108 @@
+# pyarrow ships without type information, so its values stay unknown to the type checker.
+# pyright: reportUnknownVariableType=false, reportUnknownArgumentType=false
+import types
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Final, Union, get_args, get_origin
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from rebelist.streamline.handlers.api.metrics.models import ExportFormat
+
+ARROW_BATCH_SIZE: Final[int] = 10_000
+ARROW_TYPES: Final[dict[type, Any]] = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    datetime: pa.timestamp('us', tz='UTC'),
+}
+
+
+class _ChunkSink:
+    """Write-only file collecting the encoded bytes until the response drains them."""
+
+    def __init__(self) -> None:
+        self.__chunks: list[bytes] = []
+        self.__position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        """Buffers written bytes."""
+        self.__chunks.append(bytes(data))
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Returns the number of bytes written so far, which Parquet relies on to locate its column chunks."""
+        return self.__position
+
+    def flush(self) -> None:
+        """Nothing to flush, the bytes are drained by the response."""
+
+    def close(self) -> None:
+        """Marks the file as closed."""
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """Returns and forgets the bytes written since the last drain."""
+        data = b''.join(self.__chunks)
+        self.__chunks = []
+        return data
+
+
+def arrow_schema(row_type: type[BaseModel]) -> Any:
+    """Derives the Arrow schema of a row model from the annotations of its fields."""
+    fields: list[Any] = []
+    for name, info in row_type.model_fields.items():
+        annotation: Any = info.annotation
+        nullable = False
+        if get_origin(annotation) in (Union, types.UnionType):
+            arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+            nullable = len(arguments) < len(get_args(annotation))
+            annotation = arguments[0]
+
+        if get_origin(annotation) is list:
+            arrow_type = pa.list_(ARROW_TYPES[get_args(annotation)[0]])
+        else:
+            arrow_type = ARROW_TYPES[annotation]
+        fields.append(pa.field(name, arrow_type, nullable=nullable))
+
+    return pa.schema(fields)
+
+
+def record_batch(rows: list[BaseModel], schema: Any) -> Any:
+    """Transposes rows into an Arrow record batch of the schema, one column at a time."""
+    return pa.RecordBatch.from_pydict({name: [getattr(row, name) for row in rows] for name in schema.names}, schema)
+
+
+async def encode(
+    rows: AsyncIterable[BaseModel],
+    row_type: type[BaseModel],
+    export_format: ExportFormat,
+    batch_size: int = ARROW_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Encodes rows as an Arrow IPC stream or a Parquet file, yielding the bytes of each batch once it is written.
+
+    Every batch becomes a record batch of the stream, or a row group of the Parquet file, so memory stays bounded.
+    """
+    schema = arrow_schema(row_type)
+    sink = _ChunkSink()
+    output = pa.PythonFile(sink, mode='w')
+    writer: Any = (
+        pa.ipc.new_stream(output, schema) if export_format is ExportFormat.ARROW else pq.ParquetWriter(output, schema)
+    )
+
+    batch: list[BaseModel] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            writer.write_batch(record_batch(batch, schema))
+            batch = []
+            yield sink.drain()
+
+    if batch:
+        writer.write_batch(record_batch(batch, schema))
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,109 @@
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Final
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends, HTTPException, Query, Request, status
+
+from rebelist.streamline.application.ingestion.jobs import BackfillJob, SprintJob, TicketJob
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import Settings
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.handlers.api.metrics.models import COLUMNAR_MEDIA_TYPE, ResponseFormat
+from rebelist.streamline.infrastructure.mongo.job import AsyncJobRepository
+from rebelist.streamline.infrastructure.monitoring import Metrics
+
+DATA_JOBS: Final[tuple[str, ...]] = (SprintJob.JOB_NAME, TicketJob.JOB_NAME, BackfillJob.JOB_NAME)
+INTERVAL_PATTERN: Final[re.Pattern[str]] = re.compile(r'^(\d+)([smhdw])$')
+INTERVAL_UNITS: Final[dict[str, str]] = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def get_response_format(
+    request: Request,
+    response_format: Annotated[
+        ResponseFormat | None, Query(alias='format', description='Layout of the datapoints.')
+    ] = None,
+) -> ResponseFormat:
+    """Resolves the response layout from the format query parameter, or else from the Accept header."""
+    if response_format:
+        return response_format
+
+    return ResponseFormat.COLUMNAR if COLUMNAR_MEDIA_TYPE in request.headers.get('accept', '') else ResponseFormat.ROWS
+
+
+def get_time_range(
+    start: Annotated[
+        datetime | None,
+        Query(alias='from', description='Start of the period, as an ISO 8601 datetime or epoch milliseconds.'),
+    ] = None,
+    end: Annotated[
+        datetime | None,
+        Query(alias='to', description='End of the period, as an ISO 8601 datetime or epoch milliseconds.'),
+    ] = None,
+) -> TimeRange | None:
+    """Resolves the period to compute the metrics for, None when the default window applies.
+
+    Datetimes without an offset are taken as UTC, the timezone the data is stored in.
+    """
+    if start is None and end is None:
+        return None
+
+    start, end = (
+        moment.replace(tzinfo=timezone.utc) if moment and not moment.tzinfo else moment for moment in (start, end)
+    )
+    try:
+        return TimeRange(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)) from e
+
+
+def get_interval(
+    interval: Annotated[
+        str | None, Query(description='Aggregate the durations per interval, such as 30m, 12h, 1d or 2w.')
+    ] = None,
+) -> timedelta | None:
+    """Parses the bucketing interval, in the notation used by Grafana."""
+    if interval is None:
+        return None
+
+    match = INTERVAL_PATTERN.match(interval)
+    if not match or int(match.group(1)) == 0:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f'Invalid interval "{interval}".')
+
+    return timedelta(**{INTERVAL_UNITS[match.group(2)]: int(match.group(1))})
+
+
+@inject
+async def get_etag(
+    request: Request,
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    job_repository: Annotated[AsyncJobRepository, Depends(Provide[Container.async_job_repository])],
+    metrics: Annotated[Metrics, Depends(Provide[Container.metrics])],
+) -> str:
+    """Computes the entity tag of a metric response, answering 304 Not Modified when the client already has it.
+
+    The tag changes when a synchronization changes the content of stored documents, not on every run, when the settings
+    the metrics are computed with change, or when the request differs.
+    """
+    versions = await job_repository.find_versions(DATA_JOBS, settings.jira.team)
+    parts = [
+        settings.metrics_fingerprint,
+        request.url.path,
+        request.url.query,
+        response_format,
+        *(str(versions[name]) for name in DATA_JOBS),
+    ]
+    etag = f'"{hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]}"'
+
+    candidates = {tag.strip().removeprefix('W/') for tag in request.headers.get('if-none-match', '').split(',')}
+    hit = etag in candidates or '*' in candidates
+    metrics.count_cache_lookup('etag', hit)
+    if hit:
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={'ETag': etag, 'Cache-Control': f'max-age={settings.api.cache_max_age}', 'Vary': 'Accept'},
+        )
+
+    return etag
@@ -1,108 +1,350 @@
-from typing import Annotated
+from datetime import timedelta
+from typing import Annotated, Any, AsyncIterator, Final, Sequence, cast
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from starlette.responses import Response, StreamingResponse
 
 from rebelist.streamline.application.compute import (
-    FlowMetricsService,
+    AsyncFlowMetricsService,
+    DurationBucketDataPoint,
+    FlowMetric,
     LeadTimeDataPoint,
     SprintCycleTimeDataPoint,
     ThroughputDataPoint,
     VelocityDataPoint,
+    bucket_durations,
 )
-from rebelist.streamline.application.compute.models import CycleTimeDataPoint
+from rebelist.streamline.application.compute.aggregation import DurationDataPoint
+from rebelist.streamline.application.compute.models import DURATION_METRICS, CycleTimeDataPoint
 from rebelist.streamline.config.container import Container
 from rebelist.streamline.config.settings import Settings
-from rebelist.streamline.handlers.api.metrics.models import MetricMetadata, MetricResponse
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.handlers.api.metrics.dependencies import (
+    get_etag,
+    get_interval,
+    get_response_format,
+    get_time_range,
+)
+from rebelist.streamline.handlers.api.metrics.models import (
+    ColumnarMetricResponse,
+    ExportFormat,
+    FlowMetricsResponse,
+    MetricMetadata,
+    MetricResponse,
+    ResponseFormat,
+    SprintRecord,
+    TicketRecord,
+)
+from rebelist.streamline.handlers.api.metrics.responses import export, render
 
 router = APIRouter()
 
+METRICS: Final[dict[FlowMetric, tuple[type[BaseModel], MetricMetadata]]] = {
+    FlowMetric.SPRINT_CYCLE_TIME: (
+        SprintCycleTimeDataPoint,
+        MetricMetadata(
+            metric='Sprint Cycle Time',
+            description='Each item represents total working time a ticket spent in progress until completion.',
+        ),
+    ),
+    FlowMetric.CYCLE_TIME: (
+        CycleTimeDataPoint,
+        MetricMetadata(
+            metric='Cycle Time',
+            description='Each item represents total working time a ticket spent in progress until completion.',
+        ),
+    ),
+    FlowMetric.LEAD_TIME: (
+        LeadTimeDataPoint,
+        MetricMetadata(
+            metric='Lead Time',
+            description='Each item represents total working time a ticket spent from creation to completion.',
+        ),
+    ),
+    FlowMetric.THROUGHPUT: (
+        ThroughputDataPoint,
+        MetricMetadata(
+            metric='Sprint Throughput',
+            description='Each item represents the number of tickets completed and not completed during a given sprint.',
+        ),
+    ),
+    FlowMetric.VELOCITY: (
+        VelocityDataPoint,
+        MetricMetadata(
+            metric='Sprint Velocity',
+            description='Each item represents the number of tickets completed and not completed during a given sprint.',
+        ),
+    ),
+}
+
+
+def _bucket(
+    datapoints: Sequence[DurationDataPoint], interval: timedelta, meta: MetricMetadata, response_format: ResponseFormat
+) -> BaseModel:
+    """Builds the response of a duration metric aggregated per interval."""
+    buckets = bucket_durations(datapoints, interval)
+    if response_format is ResponseFormat.COLUMNAR:
+        return ColumnarMetricResponse[MetricMetadata].from_datapoints(DurationBucketDataPoint, buckets, meta)
+
+    return MetricResponse[DurationBucketDataPoint, MetricMetadata].model_construct(datapoints=buckets, meta=meta)
+
 
-@router.get('/flow/sprints-cycle-time')
+@router.get('/flow', response_model=FlowMetricsResponse)
 @inject
-def cycle_time_sprints(
+async def flow_metrics(
     settings: Annotated[Settings, Depends(Provide[Container.settings])],
-    flow_metrics_service: Annotated[FlowMetricsService, Depends(Provide[Container.flow_metrics_service])],
-) -> MetricResponse[SprintCycleTimeDataPoint, MetricMetadata]:
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    interval: Annotated[timedelta | None, Depends(get_interval)],
+    metrics: Annotated[
+        list[FlowMetric] | None, Query(alias='metric', description='Metrics to compute, all of them by default.')
+    ] = None,
+) -> Response:
+    """Get several flow metrics at once, computed from a single fetch of the sprints and tickets.
+
+    The interval only aggregates the duration metrics, throughput and velocity are already per sprint.
+    """
+    results = await flow_metrics_service.get_flow_metrics(settings.jira.team, metrics or list(FlowMetric), time_range)
+
+    responses: dict[FlowMetric, MetricResponse[Any, MetricMetadata] | ColumnarMetricResponse[MetricMetadata]] = {}
+    for metric, datapoints in results.items():
+        datapoint_type, meta = METRICS[metric]
+        if interval and metric in DURATION_METRICS:
+            datapoint_type = DurationBucketDataPoint
+            datapoints = bucket_durations(cast(Sequence[DurationDataPoint], datapoints), interval)
+        if response_format is ResponseFormat.COLUMNAR:
+            responses[metric] = ColumnarMetricResponse[MetricMetadata].from_datapoints(datapoint_type, datapoints, meta)
+        else:
+            responses[metric] = MetricResponse[Any, MetricMetadata].model_construct(datapoints=datapoints, meta=meta)
+
+    response = FlowMetricsResponse.model_construct(metrics=responses)
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
+
+
+@router.get(
+    '/flow/sprints-cycle-time',
+    response_model=MetricResponse[SprintCycleTimeDataPoint, MetricMetadata]
+    | MetricResponse[DurationBucketDataPoint, MetricMetadata]
+    | ColumnarMetricResponse[MetricMetadata],
+)
+@inject
+async def cycle_time_sprints(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    interval: Annotated[timedelta | None, Depends(get_interval)],
+) -> Response:
     """Get the cycle time for all tickets."""
-    datapoints = flow_metrics_service.get_sprints_cycle_times(settings.jira.team)
+    datapoints = await flow_metrics_service.get_sprints_cycle_times(settings.jira.team, time_range)
+    meta = METRICS[FlowMetric.SPRINT_CYCLE_TIME][1]
 
-    return MetricResponse[SprintCycleTimeDataPoint, MetricMetadata](
-        datapoints=datapoints,
-        meta=MetricMetadata(
-            metric='Sprint Cycle Time',
-            description='Each item represents total working time a ticket spent in progress until completion.',
-        ),
-    )
+    response: BaseModel
+    if interval:
+        response = _bucket(datapoints, interval, meta, response_format)
+    elif response_format is ResponseFormat.COLUMNAR:
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(SprintCycleTimeDataPoint, datapoints, meta)
+    else:
+        response = MetricResponse[SprintCycleTimeDataPoint, MetricMetadata].model_construct(
+            datapoints=datapoints, meta=meta
+        )
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
 
 
-@router.get('/flow/cycle-time')
+@router.get(
+    '/flow/cycle-time',
+    response_model=MetricResponse[CycleTimeDataPoint, MetricMetadata]
+    | MetricResponse[DurationBucketDataPoint, MetricMetadata]
+    | ColumnarMetricResponse[MetricMetadata],
+)
 @inject
-def cycle_time(
+async def cycle_time(
     settings: Annotated[Settings, Depends(Provide[Container.settings])],
-    flow_metrics_service: Annotated[FlowMetricsService, Depends(Provide[Container.flow_metrics_service])],
-) -> MetricResponse[CycleTimeDataPoint, MetricMetadata]:
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    interval: Annotated[timedelta | None, Depends(get_interval)],
+) -> Response:
     """Get the cycle time for all tickets."""
-    datapoints = flow_metrics_service.get_cycle_times(settings.jira.team)
+    datapoints = await flow_metrics_service.get_cycle_times(settings.jira.team, time_range)
+    meta = METRICS[FlowMetric.CYCLE_TIME][1]
 
-    return MetricResponse[CycleTimeDataPoint, MetricMetadata](
-        datapoints=datapoints,
-        meta=MetricMetadata(
-            metric='Cycle Time',
-            description='Each item represents total working time a ticket spent in progress until completion.',
-        ),
-    )
+    response: BaseModel
+    if interval:
+        response = _bucket(datapoints, interval, meta, response_format)
+    elif response_format is ResponseFormat.COLUMNAR:
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(CycleTimeDataPoint, datapoints, meta)
+    else:
+        response = MetricResponse[CycleTimeDataPoint, MetricMetadata].model_construct(datapoints=datapoints, meta=meta)
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
 
 
-@router.get('/flow/lead-time')
+@router.get(
+    '/flow/lead-time',
+    response_model=MetricResponse[LeadTimeDataPoint, MetricMetadata]
+    | MetricResponse[DurationBucketDataPoint, MetricMetadata]
+    | ColumnarMetricResponse[MetricMetadata],
+)
 @inject
-def lead_time(
+async def lead_time(
     settings: Annotated[Settings, Depends(Provide[Container.settings])],
-    flow_metrics_service: Annotated[FlowMetricsService, Depends(Provide[Container.flow_metrics_service])],
-) -> MetricResponse[LeadTimeDataPoint, MetricMetadata]:
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    interval: Annotated[timedelta | None, Depends(get_interval)],
+) -> Response:
     """Get the lead time for all tickets."""
-    datapoints = flow_metrics_service.get_lead_times(settings.jira.team)
+    datapoints = await flow_metrics_service.get_lead_times(settings.jira.team, time_range)
+    meta = METRICS[FlowMetric.LEAD_TIME][1]
 
-    return MetricResponse[LeadTimeDataPoint, MetricMetadata](
-        datapoints=datapoints,
-        meta=MetricMetadata(
-            metric='Lead Time',
-            description='Each item represents total working time a ticket spent from creation to completion.',
-        ),
-    )
+    response: BaseModel
+    if interval:
+        response = _bucket(datapoints, interval, meta, response_format)
+    elif response_format is ResponseFormat.COLUMNAR:
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(LeadTimeDataPoint, datapoints, meta)
+    else:
+        response = MetricResponse[LeadTimeDataPoint, MetricMetadata].model_construct(datapoints=datapoints, meta=meta)
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
 
 
-@router.get('/flow/throughput')
+@router.get(
+    '/flow/throughput',
+    response_model=MetricResponse[ThroughputDataPoint, MetricMetadata] | ColumnarMetricResponse[MetricMetadata],
+)
 @inject
-def throughput(
+async def throughput(
     settings: Annotated[Settings, Depends(Provide[Container.settings])],
-    flow_metrics_service: Annotated[FlowMetricsService, Depends(Provide[Container.flow_metrics_service])],
-) -> MetricResponse[ThroughputDataPoint, MetricMetadata]:
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+) -> Response:
     """Get the throughput of each sprint."""
-    datapoints = flow_metrics_service.get_throughput(settings.jira.team)
+    datapoints = await flow_metrics_service.get_throughput(settings.jira.team, time_range)
+    meta = METRICS[FlowMetric.THROUGHPUT][1]
 
-    return MetricResponse[ThroughputDataPoint, MetricMetadata](
-        datapoints=datapoints,
-        meta=MetricMetadata(
-            metric='Sprint Throughput',
-            description='Each item represents the number of tickets completed and not completed during a given sprint.',
-        ),
-    )
+    response: BaseModel
+    if response_format is ResponseFormat.COLUMNAR:
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(ThroughputDataPoint, datapoints, meta)
+    else:
+        response = MetricResponse[ThroughputDataPoint, MetricMetadata].model_construct(datapoints=datapoints, meta=meta)
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
 
 
-@router.get('/flow/velocity')
+@router.get(
+    '/flow/velocity',
+    response_model=MetricResponse[VelocityDataPoint, MetricMetadata] | ColumnarMetricResponse[MetricMetadata],
+)
 @inject
-def velocity(
+async def velocity(
     settings: Annotated[Settings, Depends(Provide[Container.settings])],
-    flow_metrics_service: Annotated[FlowMetricsService, Depends(Provide[Container.flow_metrics_service])],
-) -> MetricResponse[VelocityDataPoint, MetricMetadata]:
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    response_format: Annotated[ResponseFormat, Depends(get_response_format)],
+    etag: Annotated[str, Depends(get_etag)],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+) -> Response:
     """Get the velocity of each sprint."""
-    datapoints = flow_metrics_service.get_velocity(settings.jira.team)
+    datapoints = await flow_metrics_service.get_velocity(settings.jira.team, time_range)
+    meta = METRICS[FlowMetric.VELOCITY][1]
 
-    return MetricResponse[VelocityDataPoint, MetricMetadata](
-        datapoints=datapoints,
-        meta=MetricMetadata(
-            metric='Sprint Velocity',
-            description='Each item represents the number of tickets completed and not completed during a given sprint.',
-        ),
-    )
+    response: BaseModel
+    if response_format is ResponseFormat.COLUMNAR:
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(VelocityDataPoint, datapoints, meta)
+    else:
+        response = MetricResponse[VelocityDataPoint, MetricMetadata].model_construct(datapoints=datapoints, meta=meta)
+
+    return render(response, settings.app.debug, etag, settings.api.cache_max_age)
+
+
+def _export_responses(description: str) -> dict[int | str, dict[str, Any]]:
+    """Documents the encodings an export route can answer with."""
+    return {
+        200: {'content': {export_format.media_type: {} for export_format in ExportFormat}, 'description': description}
+    }
+
+
+ExportFormatQuery = Annotated[
+    ExportFormat, Query(alias='format', description='Encoding of the export, Arrow and Parquet need the arrow extra.')
+]
+
+
+@router.get(
+    '/flow/cycle-time/export',
+    response_class=StreamingResponse,
+    responses=_export_responses('One cycle time datapoint per row.'),
+)
+@inject
+async def export_cycle_time(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    export_format: ExportFormatQuery = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Export the cycle time of the whole ticket history."""
+    datapoints = flow_metrics_service.stream_cycle_times(settings.jira.team, time_range)
+
+    return export(datapoints, CycleTimeDataPoint, export_format, 'cycle-time')
+
+
+@router.get(
+    '/flow/lead-time/export',
+    response_class=StreamingResponse,
+    responses=_export_responses('One lead time datapoint per row.'),
+)
+@inject
+async def export_lead_time(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    export_format: ExportFormatQuery = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Export the lead time of the whole ticket history."""
+    datapoints = flow_metrics_service.stream_lead_times(settings.jira.team, time_range)
+
+    return export(datapoints, LeadTimeDataPoint, export_format, 'lead-time')
+
+
+@router.get('/tickets/export', response_class=StreamingResponse, responses=_export_responses('One ticket per row.'))
+@inject
+async def export_tickets(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    export_format: ExportFormatQuery = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Export the whole ticket history the metrics are computed from."""
+
+    async def records() -> AsyncIterator[TicketRecord]:
+        async for ticket in flow_metrics_service.stream_tickets(settings.jira.team, time_range):
+            yield TicketRecord.from_ticket(ticket)
+
+    return export(records(), TicketRecord, export_format, 'tickets')
+
+
+@router.get('/sprints/export', response_class=StreamingResponse, responses=_export_responses('One sprint per row.'))
+@inject
+async def export_sprints(
+    settings: Annotated[Settings, Depends(Provide[Container.settings])],
+    flow_metrics_service: Annotated[AsyncFlowMetricsService, Depends(Provide[Container.async_flow_metrics_service])],
+    time_range: Annotated[TimeRange | None, Depends(get_time_range)],
+    export_format: ExportFormatQuery = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Export the whole sprint history the metrics are computed from."""
+
+    async def records() -> AsyncIterator[SprintRecord]:
+        async for sprint in flow_metrics_service.stream_sprints(settings.jira.team, time_range):
+            yield SprintRecord.from_sprint(sprint)
+
+    return export(records(), SprintRecord, export_format, 'sprints')
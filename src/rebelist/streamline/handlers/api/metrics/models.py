@@ -1,7 +1,47 @@
-from enum import Enum
+from datetime import datetime
+from enum import Enum, StrEnum
+from typing import Annotated, Any, Final, Optional, Sequence
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from rebelist.streamline.application.compute import FlowMetric
+from rebelist.streamline.domain.sprint import Sprint
+from rebelist.streamline.domain.ticket import Ticket
+
+COLUMNAR_MEDIA_TYPE: Final[str] = 'application/vnd.streamline.columnar+json'
+NDJSON_MEDIA_TYPE: Final[str] = 'application/x-ndjson'
+ARROW_STREAM_MEDIA_TYPE: Final[str] = 'application/vnd.apache.arrow.stream'
+PARQUET_MEDIA_TYPE: Final[str] = 'application/vnd.apache.parquet'
+
+
+class ResponseFormat(StrEnum):
+    """Enum representing the layouts of a metric response."""
+
+    ROWS = 'rows'
+    COLUMNAR = 'columnar'
+
+
+class ExportFormat(StrEnum):
+    """Enum representing the encodings of an export."""
+
+    NDJSON = 'ndjson'
+    ARROW = 'arrow'
+    PARQUET = 'parquet'
+
+    @property
+    def media_type(self) -> str:
+        """Returns the media type of the encoding."""
+        return {
+            ExportFormat.NDJSON: NDJSON_MEDIA_TYPE,
+            ExportFormat.ARROW: ARROW_STREAM_MEDIA_TYPE,
+            ExportFormat.PARQUET: PARQUET_MEDIA_TYPE,
+        }[self]
+
+    @property
+    def extension(self) -> str:
+        """Returns the file extension of the encoding."""
+        return 'arrows' if self is ExportFormat.ARROW else self.value
+
 
 class TimeUnit(Enum):
     """Enum representing time units."""
@@ -35,3 +75,77 @@ class MetricResponse[T, M: MetricMetadata](BaseModel):
 
     datapoints: list[T] = Field(description='List of data points for the metric')
     meta: M = Field(description='Metadata describing the metric and its context')
+
+
+class ColumnarMetricResponse[M: MetricMetadata](BaseModel):
+    """Columnar response model holding one array per datapoint field and the associated metric metadata."""
+
+    model_config = ConfigDict(frozen=True)
+
+    columns: dict[str, list[Any]] = Field(description='Values of each datapoint field, in datapoint order')
+    meta: M = Field(description='Metadata describing the metric and its context')
+
+    @classmethod
+    def from_datapoints(
+        cls, datapoint_type: type[BaseModel], datapoints: Sequence[BaseModel], meta: M
+    ) -> 'ColumnarMetricResponse[M]':
+        """Transposes datapoints into one column per field of the datapoint type."""
+        columns = {name: [getattr(datapoint, name) for datapoint in datapoints] for name in datapoint_type.model_fields}
+
+        return cls.model_construct(columns=columns, meta=meta)
+
+
+class FlowMetricsResponse(BaseModel):
+    """Response model holding several flow metrics computed from the same data."""
+
+    model_config = ConfigDict(frozen=True)
+
+    metrics: dict[FlowMetric, MetricResponse[Any, MetricMetadata] | ColumnarMetricResponse[MetricMetadata]] = Field(
+        description='Response of each requested metric'
+    )
+
+
+class TicketRecord(BaseModel):
+    """Represents an exported ticket."""
+
+    model_config = ConfigDict(frozen=True)
+
+    key: Annotated[str, Field(description='Unique identifier of the ticket.')]
+    created_at: Annotated[datetime, Field(description='When the ticket was created.')]
+    started_at: Annotated[datetime, Field(description='When the work on the ticket started.')]
+    resolved_at: Annotated[datetime, Field(description='When the ticket was resolved.')]
+    story_points: Annotated[Optional[int], Field(description='Estimated story points assigned to the ticket.')]
+
+    @classmethod
+    def from_ticket(cls, ticket: Ticket) -> 'TicketRecord':
+        """Builds the record of a ticket."""
+        return cls.model_construct(
+            key=ticket.id,
+            created_at=ticket.created_at,
+            started_at=ticket.started_at,
+            resolved_at=ticket.resolved_at,
+            story_points=ticket.story_points,
+        )
+
+
+class SprintRecord(BaseModel):
+    """Represents an exported sprint."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: Annotated[str, Field(description='Name of the sprint.')]
+    opened_at: Annotated[datetime, Field(description='When the sprint started.')]
+    closed_at: Annotated[datetime, Field(description='When the sprint was closed.')]
+    tickets: Annotated[list[str], Field(description='Keys of the tickets of the sprint.')]
+    story_points: Annotated[int, Field(description='Story points of the tickets of the sprint.')]
+
+    @classmethod
+    def from_sprint(cls, sprint: Sprint) -> 'SprintRecord':
+        """Builds the record of a sprint."""
+        return cls.model_construct(
+            name=sprint.name,
+            opened_at=sprint.opened_at,
+            closed_at=sprint.closed_at,
+            tickets=[ticket.id for ticket in sprint.tickets],
+            story_points=sum(ticket.story_points or 0 for ticket in sprint.tickets),
+        )
@@ -0,0 +1,69 @@
+from typing import AsyncIterable, AsyncIterator, Final
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from starlette.responses import Response, StreamingResponse
+
+from rebelist.streamline.handlers.api.metrics.models import NDJSON_MEDIA_TYPE, ExportFormat
+
+NDJSON_CHUNK_SIZE: Final[int] = 500
+
+
+def render(content: BaseModel, validate: bool, etag: str, max_age: int) -> Response:
+    """Serializes a response model straight to JSON bytes, re-validating it first when validation is on.
+
+    The layout of the metric responses depends on the Accept header, so caches are told to vary on it.
+    """
+    if validate:
+        content = type(content).model_validate(content.model_dump(warnings=False))
+
+    return Response(
+        content.model_dump_json(),
+        media_type='application/json',
+        headers={'ETag': etag, 'Cache-Control': f'max-age={max_age}', 'Vary': 'Accept'},
+    )
+
+
+def stream(datapoints: AsyncIterable[BaseModel], chunk_size: int = NDJSON_CHUNK_SIZE) -> StreamingResponse:
+    """Streams datapoints as newline-delimited JSON, serializing them as they are produced.
+
+    Lines are sent in chunks so a long history does not cost one write per datapoint.
+    """
+
+    async def lines() -> AsyncIterator[str]:
+        chunk: list[str] = []
+        async for datapoint in datapoints:
+            chunk.append(f'{datapoint.model_dump_json()}\n')
+            if len(chunk) == chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+
+        if chunk:
+            yield ''.join(chunk)
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def export(
+    rows: AsyncIterable[BaseModel], row_type: type[BaseModel], export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    """Streams rows as newline-delimited JSON, an Arrow IPC stream or a Parquet file.
+
+    The binary encodings rely on pyarrow, which comes with the optional arrow extra.
+    """
+    if export_format is ExportFormat.NDJSON:
+        return stream(rows)
+
+    try:
+        import rebelist.streamline.handlers.api.metrics.arrow as arrow
+    except ImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f'The {export_format} format needs pyarrow, install rebelist-streamline[arrow].',
+        ) from e
+
+    return StreamingResponse(
+        arrow.encode(rows, row_type, export_format),
+        media_type=export_format.media_type,
+        headers={'Content-Disposition': f'attachment; filename="{name}.{export_format.extension}"'},
+    )
@@ -0,0 +1,109 @@
+from time import perf_counter
+from typing import Annotated
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, FastAPI, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.handlers.api.debug import router as debug_router
+from rebelist.streamline.infrastructure.monitoring import Metrics, Tracer
+from rebelist.streamline.infrastructure.monitoring.metrics import EXPOSITION_MEDIA_TYPE
+
+router = APIRouter()
+
+
+@router.get('/metrics', include_in_schema=False)
+@inject
+def exposition(metrics: Annotated[Metrics, Depends(Provide[Container.metrics])]) -> Response:
+    """Publishes the runtime metrics in the Prometheus text format."""
+    return Response(content=metrics.export(), media_type=EXPOSITION_MEDIA_TYPE)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording the latency of every HTTP request per route template.
+
+    Requests are labelled with the template of the matched route, e.g. /v1/metrics/flow/cycle-time, rather than the
+    requested path, so the number of series stays bounded.
+    """
+
+    UNMATCHED_ROUTE = 'unmatched'
+
+    def __init__(self, app: ASGIApp, metrics: Metrics) -> None:
+        self.__app = app
+        self.__metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Times the request until its response is fully sent."""
+        if scope['type'] != 'http':
+            await self.__app(scope, receive, send)
+            return
+
+        started_at = perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.__app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get('route'), 'path', self.UNMATCHED_ROUTE)
+            self.__metrics.observe_request(scope['method'], route, status_code, perf_counter() - started_at)
+
+
+class TracingMiddleware:
+    """ASGI middleware recording every HTTP request as the root span of its trace.
+
+    A request carrying a W3C traceparent header continues the trace of its caller, and every response names its own
+    trace in a traceresponse header. The span is named after the template of the matched route, e.g. GET /teams/{team}.
+    """
+
+    UNMATCHED_ROUTE = 'unmatched'
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.__app = app
+        self.__tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Traces the request until its response is fully sent."""
+        if scope['type'] != 'http' or not self.__tracer.enabled:
+            await self.__app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+        traceparent = headers.get(b'traceparent', b'').decode('latin-1')
+        attributes: dict[str, str | int | float | bool] = {
+            'http.request.method': scope['method'],
+            'url.path': scope['path'],
+        }
+        with self.__tracer.span(scope['method'], attributes, traceparent) as span:
+
+            async def send_with_trace(message: Message) -> None:
+                if span and message['type'] == 'http.response.start':
+                    span.attributes['http.response.status_code'] = message['status']
+                    traceresponse = (b'traceresponse', span.traceparent.encode('latin-1'))
+                    message['headers'] = [*message.get('headers', []), traceresponse]
+                await send(message)
+
+            try:
+                await self.__app(scope, receive, send_with_trace)
+            finally:
+                if span:
+                    route = getattr(scope.get('route'), 'path', self.UNMATCHED_ROUTE)
+                    span.name = f'{scope["method"]} {route}'
+                    span.attributes['http.route'] = route
+
+
+def instrument(app: FastAPI, container: Container) -> None:
+    """Times and traces the requests of the app, publishing the runtime metrics on /metrics and traces on /debug."""
+    metrics = container.metrics()
+    metrics.register(container.sync_run_collector())
+
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+    app.add_middleware(TracingMiddleware, tracer=container.tracer())
+    app.include_router(router)
+    app.include_router(debug_router)
@@ -1,5 +0,0 @@
-from rebelist.streamline.handlers.cli.commands.database_clear import database_clear
-from rebelist.streamline.handlers.cli.commands.database_index import database_index
-from rebelist.streamline.handlers.cli.commands.database_synchronize import database_synchronize
-
-__all__ = ['database_synchronize', 'database_clear', 'database_index']
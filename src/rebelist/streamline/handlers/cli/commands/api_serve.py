@@ -0,0 +1,99 @@
+from typing import Final
+
+import rich_click as click
+import uvicorn
+from click import Context
+from rich.console import Console
+
+from rebelist.streamline.config.settings import ServerSettings
+from rebelist.streamline.handlers.cli.commands.command import Command
+
+ENV_PREFIX: Final[str] = 'STREAMLINE_SERVER_'
+
+
+@click.command(name='api:serve')
+@click.option('--host', envvar=f'{ENV_PREFIX}HOST', show_envvar=True, help='Interface to bind.')
+@click.option('--port', type=click.IntRange(1, 65535), envvar=f'{ENV_PREFIX}PORT', show_envvar=True, help='Port.')
+@click.option(
+    '--workers',
+    type=click.IntRange(0),
+    envvar=f'{ENV_PREFIX}WORKERS',
+    show_envvar=True,
+    help='Worker processes, 0 for one per CPU.',
+)
+@click.option(
+    '--max-requests',
+    type=click.IntRange(0),
+    envvar=f'{ENV_PREFIX}MAX_REQUESTS',
+    show_envvar=True,
+    help='Requests after which a worker is replaced, 0 to never recycle workers.',
+)
+@click.option(
+    '--keep-alive',
+    type=click.IntRange(1),
+    envvar=f'{ENV_PREFIX}KEEP_ALIVE',
+    show_envvar=True,
+    help='Seconds an idle connection stays open.',
+)
+@click.option(
+    '--backlog',
+    type=click.IntRange(1),
+    envvar=f'{ENV_PREFIX}BACKLOG',
+    show_envvar=True,
+    help='Connections waiting to be accepted.',
+)
+@click.pass_context
+def api_serve(
+    context: Context,
+    host: str | None,
+    port: int | None,
+    workers: int | None,
+    max_requests: int | None,
+    keep_alive: int | None,
+    backlog: int | None,
+) -> None:
+    """Serves the API with the production profile, options override the [server] section of settings.ini."""
+    container = context.obj
+    overrides = {
+        'host': host,
+        'port': port,
+        'workers': workers,
+        'max_requests': max_requests,
+        'keep_alive': keep_alive,
+        'backlog': backlog,
+    }
+    settings: ServerSettings = container.settings().server
+    command = ApiServer(
+        settings.model_copy(update={name: value for name, value in overrides.items() if value is not None})
+    )
+    command.run()
+
+
+class ApiServer(Command):
+    """Runs the API in several worker processes.
+
+    Workers are spawned rather than forked, so each one imports the app and builds its own container and database pools.
+    """
+
+    APP: Final[str] = 'rebelist.streamline.handlers.api.main:app'
+
+    def __init__(self, settings: ServerSettings) -> None:
+        self.__settings = settings
+
+    def run(self) -> None:
+        """Run command."""
+        settings = self.__settings
+        console = Console()
+        console.print(
+            f'[yellow]Serving the API on {settings.host}:{settings.port} with {settings.worker_count} workers.'
+        )
+
+        uvicorn.run(
+            ApiServer.APP,
+            host=settings.host,
+            port=settings.port,
+            workers=settings.worker_count,
+            limit_max_requests=settings.max_requests or None,
+            timeout_keep_alive=settings.keep_alive,
+            backlog=settings.backlog,
+        )
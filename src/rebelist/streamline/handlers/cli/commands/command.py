@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from time import sleep
-from typing import Protocol, runtime_checkable
+from typing import Protocol, Sequence, runtime_checkable
 
+from rich.console import Console
 from rich.live import Live
 from rich.panel import Panel
 from rich.progress import BarColumn, Progress, TimeElapsedColumn
@@ -28,9 +29,9 @@ class Command(ABC):
         ...
 
     @staticmethod
-    def _execute_tasks(tasks: list[CommandTask]) -> None:
+    def _execute_tasks(tasks: Sequence[CommandTask], console: Console | None = None) -> None:
         """Execute tasks."""
-        progress = Progress(BarColumn(), TimeElapsedColumn())
+        progress = Progress(BarColumn(), TimeElapsedColumn(), console=console)
         rich_task = progress.add_task('', total=len(tasks) + 1)
 
         with Live(console=progress.console) as live:
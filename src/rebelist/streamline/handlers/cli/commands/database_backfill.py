@@ -0,0 +1,60 @@
+import rich_click as click
+from click import Context
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
+
+from rebelist.streamline.application.ingestion.jobs import BackfillJob
+from rebelist.streamline.handlers.cli.commands.command import Command
+
+
+@click.command(name='database:backfill')
+@click.option('--threads', default=4, show_default=True, help='Sprint ranges fetched from Jira at the same time.')
+@click.option('--processes', type=int, help='Changelog processing workers, defaults to the number of CPUs.')
+@click.option('--range-size', default=BackfillJob.RANGE_SIZE, show_default=True, help='Sprints per range.')
+@click.option('--max-memory', default=1024, show_default=True, help='Memory limit of each processing worker in MiB.')
+@click.option('--restart', is_flag=True, help='Start over instead of resuming the ranges of a previous run.')
+@click.pass_context
+def database_backfill(
+    context: Context, threads: int, processes: int | None, range_size: int, max_memory: int, restart: bool
+) -> None:
+    """Downloads the whole sprint history of the team, resuming the ranges of an interrupted run."""
+    container = context.obj
+    command = Backfiller(container.backfill_job(), threads, processes, range_size, max_memory, restart)
+    command.run()
+
+
+class Backfiller(Command):
+    """Runs the backfill job showing the progress per sprint range."""
+
+    def __init__(
+        self, job: BackfillJob, threads: int, processes: int | None, range_size: int, max_memory: int, restart: bool
+    ) -> None:
+        self.__job = job
+        self.__threads = threads
+        self.__processes = processes
+        self.__range_size = range_size
+        self.__max_memory = max_memory
+        self.__restart = restart
+
+    def run(self) -> None:
+        """Run command."""
+        progress = Progress(BarColumn(), MofNCompleteColumn(), TimeElapsedColumn())
+        rich_task = progress.add_task('', total=None)
+
+        def on_range(completed: int, total: int) -> None:
+            progress.update(rich_task, completed=completed, total=total)
+
+        with progress:
+            result = self.__job.execute(
+                self.__threads,
+                self.__processes,
+                self.__range_size,
+                self.__max_memory * 1024 * 1024,
+                self.__restart,
+                on_range,
+            )
+
+        Console().print(
+            f'[yellow]{BackfillJob.__doc__}[/yellow] {result.items} items, '
+            f'{result.written} written, {result.skipped} unchanged.'
+        )
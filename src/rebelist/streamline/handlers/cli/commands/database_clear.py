@@ -6,17 +6,19 @@ from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 
 from rebelist.streamline.handlers.cli.commands.command import Command, CommandTask
+from rebelist.streamline.handlers.cli.commands.database_index import DatabaseIndexer
 
 
 @click.command(name='database:clear')
+@click.option('--fast', is_flag=True, help='Drop the collections and recreate their indexes instead of deleting.')
 @click.pass_context
-def database_clear(context: Context) -> None:
+def database_clear(context: Context, fast: bool) -> None:
     """Delete all database collections."""
     message = 'All data will be ' + click.style('deleted', fg='bright_magenta') + '. Are you sure you want to proceed?'
     container = context.obj
 
     if click.confirm(message):
-        command = DatabaseEraser(container.database())
+        command = DatabaseEraser(container.database(), fast)
         command.run()
     else:
         click.echo('Bye!')
@@ -37,14 +39,34 @@ class ClearTask:
         self.collection.delete_many({})
 
 
+class DropTask:
+    """A task that drops a MongoDB collection along with its indexes."""
+
+    def __init__(self, collection: Collection[Mapping[str, Any]]) -> None:
+        """Initialize the task with a MongoDB collection."""
+        self.collection = collection
+        self.description = f'Dropping the collection "{self.collection.name}"...'
+
+    def execute(self) -> None:
+        """Drop the collection."""
+        self.collection.drop()
+
+
 class DatabaseEraser(Command):
-    """Truncate all collections."""
+    """Truncate all collections, or drop them and recreate their indexes in fast mode."""
 
-    def __init__(self, database: Database[Mapping[str, Any]]) -> None:
+    def __init__(self, database: Database[Mapping[str, Any]], fast: bool = False) -> None:
         self.__database = database
+        self.__fast = fast
 
     def run(self) -> None:
         """Run command."""
         names = self.__database.list_collection_names()
-        tasks: list[CommandTask] = [ClearTask(self.__database[name]) for name in names]
+
+        if self.__fast:
+            tasks: list[CommandTask] = [DropTask(self.__database[name]) for name in names]
+            tasks.extend(DatabaseIndexer.declare_tasks(self.__database))
+        else:
+            tasks = [ClearTask(self.__database[name]) for name in names]
+
         self._execute_tasks(tasks)
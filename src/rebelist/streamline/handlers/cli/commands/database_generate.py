@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+from typing import Any, Final
+
+import rich_click as click
+from click import Context
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
+
+from rebelist.streamline.application.ingestion.jobs import SprintJob, TicketJob
+from rebelist.streamline.domain.time import WorkCalendarProtocol
+from rebelist.streamline.handlers.cli.commands.command import Command
+from rebelist.streamline.infrastructure.jira.synthetic import SyntheticJira
+from rebelist.streamline.infrastructure.mongo.job import JobRepository
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
+from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+
+
+@click.command(name='database:generate')
+@click.option(
+    '--seed', default=0, show_default=True, help='Seed of the history, the same seed generates the same data.'
+)
+@click.option(
+    '--sprints', type=click.IntRange(min=1), default=100, show_default=True, help='Closed sprints to generate.'
+)
+@click.option(
+    '--tickets-per-sprint',
+    type=click.IntRange(min=1),
+    default=12,
+    show_default=True,
+    help='Average tickets planned per sprint.',
+)
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help='Write the Jira REST responses to this file instead of storing the documents.',
+)
+@click.option('--yes', is_flag=True, help='Replace the sprints and tickets of the team without asking.')
+@click.pass_context
+def database_generate(
+    context: Context, seed: int, sprints: int, tickets_per_sprint: int, output: Path | None, yes: bool
+) -> None:
+    """Generate a synthetic Jira history of the team, for load and scale tests."""
+    container = context.obj
+    settings = container.settings()
+    jira = SyntheticJira(
+        settings.jira, get_work_calendar(settings.app.country), settings.app.timezone, seed, sprints, tickets_per_sprint
+    )
+
+    if output:
+        SyntheticResponseWriter(jira, output).run()
+        return
+
+    message = (
+        f'The sprints and tickets of {settings.jira.team} will be '
+        + click.style('replaced', fg='bright_magenta')
+        + '. Are you sure you want to proceed?'
+    )
+    if yes or click.confirm(message):
+        command = SyntheticDatabaseLoader(
+            jira,
+            container.sprint_document_repository(),
+            container.ticket_document_repository(),
+            container.job_repository(),
+            settings.jira.team,
+        )
+        command.run()
+    else:
+        click.echo('Bye!')
+
+
+def get_work_calendar(country: str) -> WorkCalendarProtocol:
+    """Returns the holiday calendar of a country, as the container provides it to the services."""
+    from rebelist.streamline.config.container import Container
+
+    try:
+        return Container.get_work_calendar(country)
+    except ValueError as error:
+        raise click.BadParameter(str(error)) from error
+
+
+class SyntheticDatabaseLoader(Command):
+    """Replaces the sprints and tickets of a team with a synthetic history, inserting them in bulk."""
+
+    BATCH_SIZE: Final[int] = 5000
+
+    def __init__(
+        self,
+        jira: SyntheticJira,
+        sprint_repository: MongoSprintDocumentRepository,
+        ticket_repository: MongoTicketDocumentRepository,
+        job_repository: JobRepository,
+        team: str,
+    ) -> None:
+        self.__jira = jira
+        self.__sprint_repository = sprint_repository
+        self.__ticket_repository = ticket_repository
+        self.__job_repository = job_repository
+        self.__team = team
+
+    def run(self) -> None:
+        """Run command."""
+        progress = Progress(BarColumn(), MofNCompleteColumn(), TimeElapsedColumn())
+        rich_task = progress.add_task('', total=self.__jira.sprint_count)
+        sprints: list[dict[str, Any]] = []
+        tickets: list[dict[str, Any]] = []
+        inserted = 0
+
+        with progress:
+            self.__sprint_repository.delete_by_team_name(self.__team)
+            self.__ticket_repository.delete_by_team_name(self.__team)
+
+            for sprint, sprint_tickets in self.__jira.documents():
+                sprints.append(sprint)
+                tickets += sprint_tickets
+                if len(tickets) >= self.BATCH_SIZE:
+                    inserted += self.__insert(sprints, tickets)
+                    sprints, tickets = [], []
+                progress.advance(rich_task)
+
+            inserted += self.__insert(sprints, tickets)
+            self.__job_repository.mark_changed(SprintJob.JOB_NAME, self.__team)
+            self.__job_repository.mark_changed(TicketJob.JOB_NAME, self.__team)
+
+        Console().print(f'[green]{inserted} documents of {self.__team} generated.')
+
+    def __insert(self, sprints: list[dict[str, Any]], tickets: list[dict[str, Any]]) -> int:
+        """Inserts a batch of sprint and ticket documents."""
+        return self.__sprint_repository.insert_many(sprints) + self.__ticket_repository.insert_many(tickets)
+
+
+class SyntheticResponseWriter(Command):
+    """Writes the Jira REST exchanges of a synthetic history to a file, one JSON request and response per line."""
+
+    def __init__(self, jira: SyntheticJira, path: Path) -> None:
+        self.__jira = jira
+        self.__path = path
+
+    def run(self) -> None:
+        """Run command."""
+        console = Console()
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+
+        with (
+            console.status(f'Writing Jira responses to {self.__path}...'),
+            self.__path.open('w', encoding='utf-8') as file,
+        ):
+            for exchange in self.__jira.exchanges():
+                file.write(json.dumps(exchange, separators=(',', ':')) + '\n')
+                count += 1
+
+        console.print(f'[green]{count} Jira responses written to {self.__path}.')
@@ -2,7 +2,7 @@ from typing import Any, Mapping
 
 import rich_click as click
 from click import Context
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 
@@ -47,19 +47,36 @@ class DatabaseIndexer(Command):
 
     def run(self) -> None:
         """Assemble and execute all index creation tasks."""
+        self._execute_tasks(self.declare_tasks(self.__database))
+
+    @staticmethod
+    def declare_tasks(database: Database[Mapping[str, Any]]) -> list[CommandTask]:
+        """Declares the index creation tasks of every streamline collection."""
         tasks: list[CommandTask] = []
 
-        task = IndexTask(self.__database['jobs'])
+        task = IndexTask(database['jobs'])
         task.add_index([('name', ASCENDING), ('team', ASCENDING)], True, 'jobs_name_team_unique_idx')
         tasks.append(task)
 
-        task = IndexTask(self.__database['jira_sprints'])
+        task = IndexTask(database['jira_sprints'])
         task.add_index([('id', ASCENDING), ('team', ASCENDING)], True, 'jira_sprints_id_team_unique_idx')
         task.add_index([('team', ASCENDING)], False, 'jira_sprints_team_idx')
+        task.add_index([('closed_at', ASCENDING)], False, 'jira_sprints_closed_at_idx')
         tasks.append(task)
 
-        task = IndexTask(self.__database['jira_tickets'])
+        task = IndexTask(database['jira_tickets'])
         task.add_index([('key', ASCENDING), ('team', ASCENDING)], True, 'jira_tickets_key_team_unique_idx')
+        task.add_index([('id', ASCENDING), ('team', ASCENDING)], False, 'jira_tickets_id_team_idx')
+        task.add_index([('team', ASCENDING), ('resolved_at', DESCENDING)], False, 'jira_tickets_team_resolved_at_idx')
+        tasks.append(task)
+
+        task = IndexTask(database['ingest_queue'])
+        task.add_index([('status', ASCENDING), ('visible_at', ASCENDING)], False, 'ingest_queue_status_visible_at_idx')
+        task.add_index([('batch', ASCENDING)], False, 'ingest_queue_batch_idx')
+        tasks.append(task)
+
+        task = IndexTask(database['sync_runs'])
+        task.add_index([('started_at', DESCENDING)], False, 'sync_runs_started_at_idx')
         tasks.append(task)
 
-        self._execute_tasks(tasks)
+        return tasks
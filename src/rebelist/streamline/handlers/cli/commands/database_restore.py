@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import Any, Mapping
+
+import rich_click as click
+from click import Context
+from pymongo.synchronous.database import Database
+from rich.console import Console
+
+from rebelist.streamline.handlers.cli.commands.command import Command
+from rebelist.streamline.handlers.cli.commands.database_index import DatabaseIndexer
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+
+
+@click.command(name='database:restore')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.pass_context
+def database_restore(context: Context, path: Path) -> None:
+    """Replace the archived collections with the content of a snapshot."""
+    message = 'The archived collections will be ' + click.style('replaced', fg='bright_magenta') + '. Are you sure?'
+    container = context.obj
+
+    if click.confirm(message):
+        command = DatabaseRestorer(container.database_archive(), container.database(), path)
+        command.run()
+    else:
+        click.echo('Bye!')
+
+
+class DatabaseRestorer(Command):
+    """Restores collections from a local archive and recreates their indexes."""
+
+    def __init__(self, archive: MongoArchive, database: Database[Mapping[str, Any]], path: Path) -> None:
+        self.__archive = archive
+        self.__database = database
+        self.__path = path
+
+    def run(self) -> None:
+        """Run command."""
+        console = Console()
+
+        def on_collection(name: str, count: int) -> None:
+            console.print(f'Restored [yellow]{name}[/yellow]: {count} documents.')
+
+        with console.status(f'Reading snapshot from {self.__path}...'):
+            self.__archive.restore(self.__path, on_collection)
+
+        self._execute_tasks(DatabaseIndexer.declare_tasks(self.__database))
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import rich_click as click
+from click import Context
+from rich.console import Console
+
+from rebelist.streamline.handlers.cli.commands.command import Command
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+
+
+@click.command(name='database:snapshot')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True, path_type=Path))
+@click.pass_context
+def database_snapshot(context: Context, path: Path) -> None:
+    """Stream all database collections to a compressed BSON archive."""
+    container = context.obj
+    command = DatabaseSnapshot(container.database_archive(), path)
+    command.run()
+
+
+class DatabaseSnapshot(Command):
+    """Dumps all collections to a local archive."""
+
+    def __init__(self, archive: MongoArchive, path: Path) -> None:
+        self.__archive = archive
+        self.__path = path
+
+    def run(self) -> None:
+        """Run command."""
+        console = Console()
+
+        def on_collection(name: str, count: int) -> None:
+            console.print(f'Saved [yellow]{name}[/yellow]: {count} documents.')
+
+        with console.status(f'Writing snapshot to {self.__path}...'):
+            counts = self.__archive.dump(self.__path, on_collection)
+
+        console.print(f'[green]Snapshot of {len(counts)} collections written to {self.__path}.')
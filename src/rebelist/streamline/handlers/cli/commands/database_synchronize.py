@@ -1,19 +1,33 @@
+import json
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any
+
 import rich_click as click
 from click import Context
+from rich.console import Console
+from rich.table import Table
 
-from rebelist.streamline.application.ingestion.jobs.models import Executable
-from rebelist.streamline.handlers.cli.commands.command import Command, CommandTask
+from rebelist.streamline.application.ingestion.jobs.models import Executable, JobPhase, JobResult
+from rebelist.streamline.handlers.cli.commands.command import Command
+from rebelist.streamline.infrastructure.mongo.run import SyncRun, SyncRunRepository
 
 
 @click.command(name='database:synchronize')
+@click.option('--enqueue', is_flag=True, help='Enqueue the work for ingest:worker processes instead of running it.')
+@click.option('--json', 'json_output', is_flag=True, help='Print the run report as JSON.')
 @click.pass_context
-def database_synchronize(context: Context) -> None:
+def database_synchronize(context: Context, enqueue: bool, json_output: bool) -> None:
     """Downloads data from different sources and saves it to the database."""
     container = context.obj
 
-    command = Synchronizer()
-    command.register(container.sprint_job())
-    command.register(container.ticket_job())
+    command = Synchronizer(container.sync_run_repository(), container.settings().app.version, json_output)
+    if enqueue:
+        command.register(container.sprint_producer_job())
+        command.register(container.ticket_producer_job())
+    else:
+        command.register(container.sprint_job())
+        command.register(container.ticket_job())
     command.run()
 
 
@@ -23,17 +37,45 @@ class SyncTask:
     def __init__(self, job: Executable) -> None:
         self.job = job
         self.description = str(job.__doc__)
+        self.result: JobResult | None = None
+        self.duration = 0.0
 
     def execute(self) -> None:
         """Execute a job."""
-        self.job.execute()
+        started = perf_counter()
+        try:
+            self.result = self.job.execute()
+        finally:
+            self.duration = perf_counter() - started
+
+    def report(self) -> dict[str, Any]:
+        """Summarizes the job outcome, its throughput and the time spent per phase."""
+        result = self.result or JobResult()
+
+        return {
+            'job': self.description,
+            'duration': round(self.duration, 3),
+            'items': result.items,
+            'items_per_second': round(result.items / self.duration, 2) if self.duration else 0.0,
+            'written': result.written,
+            'skipped': result.skipped,
+            'enqueued': result.enqueued,
+            'bytes_received': result.bytes_received,
+            'retries': result.retries,
+            'phases': {str(phase): round(seconds, 3) for phase, seconds in result.phases.items()},
+        }
 
 
 class Synchronizer(Command):
     """Orchestrates the data synchronization process using registered jobs."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, run_repository: SyncRunRepository | None = None, version: str = '', json_output: bool = False
+    ) -> None:
         self.__jobs: list[Executable] = []
+        self.__run_repository = run_repository
+        self.__version = version
+        self.__json_output = json_output
 
     def register(self, job: Executable) -> None:
         """Registers an executable job."""
@@ -41,5 +83,40 @@ class Synchronizer(Command):
 
     def run(self) -> None:
         """Run command."""
-        tasks: list[CommandTask] = [SyncTask(job) for job in self.__jobs]
-        self._execute_tasks(tasks)
+        tasks = [SyncTask(job) for job in self.__jobs]
+        started_at = datetime.now(timezone.utc)
+        started = perf_counter()
+        self._execute_tasks(tasks, Console(stderr=self.__json_output))
+
+        run = SyncRun(self.__version, round(perf_counter() - started, 3), [task.report() for task in tasks], started_at)
+        if self.__run_repository:
+            self.__run_repository.save(run)
+
+        if self.__json_output:
+            click.echo(json.dumps(run.to_dict(), default=str, indent=2))
+        else:
+            Console().print(self.__render(run))
+
+    @staticmethod
+    def __render(run: SyncRun) -> Table:
+        """Renders a run report as a table."""
+        table = Table(title=f'Synchronization finished in {run.duration:.2f}s')
+        for column in ('Job', 'Items', 'Items/s', 'Written', 'Unchanged', 'Enqueued', 'KiB', 'Retries'):
+            table.add_column(column, justify='left' if column == 'Job' else 'right')
+        for phase in JobPhase:
+            table.add_column(f'{phase.replace("_", " ").capitalize()} (s)', justify='right')
+
+        for job in run.jobs:
+            table.add_row(
+                f'[yellow]{job["job"]}[/yellow]',
+                str(job['items']),
+                f'{job["items_per_second"]:.1f}',
+                str(job['written']),
+                str(job['skipped']),
+                str(job['enqueued']),
+                f'{job["bytes_received"] / 1024:.1f}',
+                str(job['retries']),
+                *(f'{job["phases"][phase]:.2f}' if phase in job['phases'] else '-' for phase in JobPhase),
+            )
+
+        return table
@@ -0,0 +1,53 @@
+import os
+import socket
+from datetime import timedelta
+from time import sleep
+
+import rich_click as click
+from click import Context
+from rich.console import Console
+
+from rebelist.streamline.application.ingestion.jobs import IngestWorker
+from rebelist.streamline.handlers.cli.commands.command import Command
+
+
+@click.command(name='ingest:worker')
+@click.option('--visibility-timeout', default=300, show_default=True, help='Seconds a claimed unit stays hidden.')
+@click.option('--poll-interval', default=5.0, show_default=True, help='Seconds to wait when the queue is empty.')
+@click.option('--drain', is_flag=True, help='Exit once the queue has no pending units left.')
+@click.pass_context
+def ingest_worker(context: Context, visibility_timeout: int, poll_interval: float, drain: bool) -> None:
+    """Processes queued ingestion work units, several workers can run in parallel."""
+    container = context.obj
+    command = QueueConsumer(container.ingest_worker(), timedelta(seconds=visibility_timeout), poll_interval, drain)
+    command.run()
+
+
+class QueueConsumer(Command):
+    """Consumes the ingestion queue until it is drained or interrupted."""
+
+    def __init__(self, worker: IngestWorker, visibility_timeout: timedelta, poll_interval: float, drain: bool) -> None:
+        self.__worker = worker
+        self.__visibility_timeout = visibility_timeout
+        self.__poll_interval = poll_interval
+        self.__drain = drain
+        self.__name = f'{socket.gethostname()}:{os.getpid()}'
+
+    def run(self) -> None:
+        """Run command."""
+        console = Console()
+        console.print(f'[yellow]Worker {self.__name} waiting for work units...')
+
+        try:
+            while True:
+                unit = self.__worker.process_next(self.__name, self.__visibility_timeout)
+                if unit:
+                    console.print(f'Processed {unit.kind} {unit.payload} (attempt {unit.attempts}).')
+                    continue
+                if self.__drain and not self.__worker.pending():
+                    break
+                sleep(self.__poll_interval)
+        except KeyboardInterrupt:
+            pass
+
+        console.print(f'[yellow]Worker {self.__name} stopped.')
@@ -1,28 +1,112 @@
-from typing import cast
+from __future__ import annotations
+
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Mapping
 
 import rich_click as click
 from click import Command, Context
 
-from rebelist.streamline.config.container import Container
-from rebelist.streamline.handlers.cli.commands import database_clear, database_index, database_synchronize
+if TYPE_CHECKING:
+    from rebelist.streamline.config.container import Container
 
-container = Container.create()
-settings = container.settings()
+# The application name of AppSettings, repeated so `--version` does not import the settings and pydantic.
+PACKAGE_NAME: Final[str] = 'rebelist-streamline'
+COMMANDS_PACKAGE: Final[str] = 'rebelist.streamline.handlers.cli.commands'
+COMMANDS: Final[Mapping[str, str]] = {
+    'api:serve': 'api_serve',
+    'database:backfill': 'database_backfill',
+    'database:clear': 'database_clear',
+    'database:generate': 'database_generate',
+    'database:index': 'database_index',
+    'database:restore': 'database_restore',
+    'database:snapshot': 'database_snapshot',
+    'database:synchronize': 'database_synchronize',
+    'ingest:worker': 'ingest_worker',
+}
 
 
-@click.group()
-@click.version_option(settings.app.version, prog_name=settings.app.name)
-@click.pass_context
-def console(context: Context) -> None:
-    """Provides commands for executing Streamline workflows and utilities."""
-    context.obj = container
+class LazyContainer:
+    """Dependency injection container built on first use, so only the commands actually executed pay for it."""
+
+    def __init__(self) -> None:
+        self.__container: Container | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolves the providers of the container, the commands reach their services through them."""
+        return getattr(self.get(), name)
+
+    def get(self) -> Container:
+        """Returns the container, creating it along with its dependencies on the first call."""
+        if self.__container is None:
+            from rebelist.streamline.config.container import Container
+
+            self.__container = Container.create()
+
+        return self.__container
+
+
+class LazyGroup(click.RichGroup):
+    """Command group importing the module of a command only when the command is looked up.
+
+    Each lazy command maps its name to the module of the commands package defining a function of the same name.
+    """
 
+    def __init__(self, *args: Any, lazy_commands: Mapping[str, str], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.__lazy_commands = lazy_commands
 
-synchronizer: Command = cast(Command, database_synchronize)
-clear: Command = cast(Command, database_clear)
-index: Command = cast(Command, database_index)
+    def list_commands(self, ctx: Context) -> list[str]:
+        """Lists the registered and the lazy commands without importing them."""
+        return sorted({*super().list_commands(ctx), *self.__lazy_commands})
 
-console.container = container
-console.add_command(index)
-console.add_command(clear)
-console.add_command(synchronizer)
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        """Imports a lazy command on lookup."""
+        if cmd_name not in self.__lazy_commands:
+            return super().get_command(ctx, cmd_name)
+
+        module = self.__lazy_commands[cmd_name]
+        command: Command = getattr(import_module(f'{COMMANDS_PACKAGE}.{module}'), module)
+        return command
+
+
+def profile_command(context: Context, path: Path, profile_format: str) -> None:
+    """Samples the command until it exits, then writes its profile to a file."""
+    from rebelist.streamline.infrastructure.monitoring.profiling import ProfileFormat, SamplingProfiler
+
+    profiler = SamplingProfiler()
+    profiler.start(context.invoked_subcommand or context.info_name or PACKAGE_NAME)
+
+    def write_profile() -> None:
+        profile = profiler.stop()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(profile.render(ProfileFormat(profile_format)), encoding='utf-8')
+        click.echo(
+            f'Profile of {profile.sample_count} samples over {profile.duration:.1f}s written to {path}.', err=True
+        )
+
+    context.call_on_close(write_profile)
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+@click.version_option(package_name=PACKAGE_NAME, prog_name=PACKAGE_NAME)
+@click.option(
+    '--profile',
+    'profile_path',
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help='Sample the command while it runs and write its profile to this file.',
+)
+@click.option(
+    '--profile-format',
+    type=click.Choice(['speedscope', 'collapsed']),
+    default='speedscope',
+    show_default=True,
+    help='Format of the profile, a speedscope document or the folded stacks of a flame graph.',
+)
+@click.pass_context
+def console(context: Context, profile_path: Path | None, profile_format: str) -> None:
+    """Provides commands for executing Streamline workflows and utilities."""
+    if context.obj is None:
+        context.obj = LazyContainer()
+    if profile_path:
+        profile_command(context, profile_path, profile_format)
@@ -1,3 +1,3 @@
-from rebelist.streamline.infrastructure.jira.gateway import IssueNotStartedError, JiraGateway
+from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
 
-__all__ = ['JiraGateway', 'IssueNotStartedError']
+__all__ = ['JiraGateway']
@@ -0,0 +1,87 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Mapping, Sequence
+
+from dateutil import parser as date_parser
+
+
+class TicketStatus(Enum):
+    """Represent a Jira ticket status."""
+
+    IN_PROGRESS = 'In Progress'
+    DONE = 'Done'
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parses a Jira datetime, with the ISO 8601 parser first as it is much faster than the lenient one."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return date_parser.parse(value)
+
+
+def get_started_and_resolved(changelog: Mapping[str, Any]) -> tuple[datetime, datetime] | None:
+    """Determines the start and resolution timestamps from a raw changelog, None if never started or finished."""
+    histories = sorted(changelog.get('histories', []), key=lambda history: history['created'])
+    in_progress_times: list[tuple[str, int]] = []
+    done_times: list[tuple[str, int]] = []
+
+    for i, history in enumerate(histories):
+        for item in history.get('items', []):
+            if item.get('field') != 'status':
+                continue
+            if item.get('toString') == TicketStatus.IN_PROGRESS.value:
+                in_progress_times.append((history['created'], i))
+            elif item.get('toString') == TicketStatus.DONE.value:
+                done_times.append((history['created'], i))
+
+    if not in_progress_times or not done_times:
+        return None
+
+    last_in_progress_created, last_in_progress_index = in_progress_times[-1]
+
+    for done_created, done_index in done_times:
+        if done_index > last_in_progress_index:
+            return _parse_datetime(last_in_progress_created), _parse_datetime(done_created)
+
+    return None
+
+
+def shape_ticket(raw: dict[str, Any], team: str) -> dict[str, Any] | None:
+    """Shapes a raw Jira issue into a ticket document, None if it was never started or finished."""
+    dates = get_started_and_resolved(raw.get('changelog', {}))
+    if not dates:
+        return None
+
+    fields = raw['fields']
+    story_points = fields.get('customfield_10002')
+
+    document = raw
+    document['team'] = team
+    document['created_at'] = _parse_datetime(fields['created'])
+    document['started_at'], document['resolved_at'] = dates
+    document['story_points'] = int(story_points) if isinstance(story_points, float) else 0
+    document['status'] = fields['status']['name']
+
+    return document
+
+
+def shape_sprint(raw: dict[str, Any], team: str, keys: Sequence[str]) -> dict[str, Any]:
+    """Shapes a raw closed Jira sprint into a sprint document listing the keys of its issues."""
+    document = raw
+    document['opened_at'] = _parse_datetime(raw['startDate'])
+    document['closed_at'] = _parse_datetime(raw['completeDate'])
+    document['team'] = team
+    document['tickets'] = list(keys)
+
+    del document['endDate']
+    del document['activatedDate']
+    del document['startDate']
+    del document['completeDate']
+
+    return document
+
+
+def shape_tickets(raws: Sequence[dict[str, Any]], team: str) -> list[dict[str, Any]]:
+    """Shapes raw Jira issues into ticket documents, skipping the ones never started or finished."""
+    return [document for raw in raws if (document := shape_ticket(raw, team))]
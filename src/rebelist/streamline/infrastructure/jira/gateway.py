@@ -1,52 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
-from typing import Any
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Final, Sequence
 
-from dateutil import parser as date_parser
-from tenacity import retry, stop_after_attempt
+from requests import Response
+from tenacity import RetryCallState, retry, stop_after_attempt
 
-from jira.client import JIRA
-from jira.resources import Issue
 from rebelist.streamline.config.settings import JiraSettings
-from rebelist.streamline.infrastructure.monitoring import Logger
-
-
-class IssueNotStartedError(Exception):
-    """Exception raised when an issue has never been in progress."""
+from rebelist.streamline.infrastructure.jira.documents import shape_sprint, shape_ticket
+from rebelist.streamline.infrastructure.monitoring import Logger, PhaseTimer, traced
 
-    def __init__(self, issue: Issue) -> None:
-        message = f"Ticket with ID '{issue.key}' has never been in progress."
-        super().__init__(message)
+if TYPE_CHECKING:
+    from jira.client import JIRA
 
 
-class IssueNotFinishedError(Exception):
-    """Exception raised when an issue has never been set to  done."""
+@dataclass(frozen=True, slots=True)
+class GatewayStatistics:
+    """Cumulative cost of the Jira gateway calls."""
 
-    def __init__(self, issue: Issue) -> None:
-        message = f"Ticket with ID '{issue.key}' has never set to done."
-        super().__init__(message)
+    fetch_seconds: float = 0.0
+    processing_seconds: float = 0.0
+    bytes_received: int = 0
+    retries: int = 0
 
+    def __sub__(self, other: GatewayStatistics) -> GatewayStatistics:
+        """Returns the cost incurred between two snapshots."""
+        return GatewayStatistics(
+            self.fetch_seconds - other.fetch_seconds,
+            self.processing_seconds - other.processing_seconds,
+            self.bytes_received - other.bytes_received,
+            self.retries - other.retries,
+        )
 
-class TicketStatus(Enum):
-    """Represent a Jira ticket status."""
 
-    IN_PROGRESS = 'In Progress'
-    DONE = 'Done'
+class JiraGateway:
+    """Jira gateway is a service that fetches raw sprints and issues.
 
+    The statistics are counted under a lock, as the backfill calls the same gateway from several threads.
+    """
 
-class JiraGateway:
-    """Jira gateway is a service that fetches raw sprints and issues."""
+    FETCH_PHASE: Final[str] = 'fetch'
+    PROCESSING_PHASE: Final[str] = 'processing'
 
     def __init__(self, jira: JIRA, settings: JiraSettings, logger: Logger) -> None:
         self.__jira: JIRA = jira
         self.__settings = settings
         self.__logger = logger
         self.__issue_types = ', '.join(f'"{status}"' for status in self.__settings.issue_types)
+        self.__timer = PhaseTimer()
+        self.__lock = Lock()
+        self.__bytes_received = 0
+        self.__retries = 0
+
+        session = getattr(jira, '_session', None)
+        if session is not None:
+            session.hooks['response'].append(self.__count_bytes)
+
+    @property
+    def statistics(self) -> GatewayStatistics:
+        """Returns a snapshot of the time spent, bytes received and retries of all calls so far."""
+        durations = self.__timer.durations
+        with self.__lock:
+            bytes_received, retries = self.__bytes_received, self.__retries
+
+        return GatewayStatistics(
+            durations.get(self.FETCH_PHASE, 0.0),
+            durations.get(self.PROCESSING_PHASE, 0.0),
+            bytes_received,
+            retries,
+        )
 
-    @retry(stop=stop_after_attempt(3))
-    def find_sprints(self, start_at: int = 0) -> list[dict[str, Any]]:
-        """Find all sprints."""
-        sprints = self.__jira.sprints(self.__settings.board_id, startAt=start_at, maxResults=False, state='closed')
+    @staticmethod
+    def __count_retry(state: RetryCallState) -> None:
+        """Counts a failed attempt that is about to be retried."""
+        gateway: JiraGateway = state.args[0]
+        with gateway.__lock:
+            gateway.__retries += 1
+
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def count_sprints(self, start_at: int = 0) -> int:
+        """Count the closed sprints after an offset."""
+        with self.__timer.measure(self.FETCH_PHASE):
+            sprints = self.__jira.sprints(self.__settings.board_id, startAt=start_at, maxResults=False, state='closed')
+
+        return len(sprints)
+
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def find_sprints(self, start_at: int = 0, max_results: int | bool = False) -> list[dict[str, Any]]:
+        """Find all sprints, or a page of them when max_results is given."""
+        with self.__timer.measure(self.FETCH_PHASE):
+            sprints = self.__jira.sprints(
+                self.__settings.board_id, startAt=start_at, maxResults=max_results, state='closed'
+            )
         documents: list[dict[str, Any]] = []
         self.__logger.info(f'Found {len(sprints)} sprints.')
 
@@ -58,110 +107,134 @@ class JiraGateway:
                 f'AND issuetype IN ({self.__issue_types}) '
             )
 
-            self.__logger.info(f'Querying sprints tickets to JIRA: {jql_str}')
+            with self.__timer.measure(self.FETCH_PHASE) as fetch:
+                issues = self.__jira.search_issues(
+                    jql_str=jql_str,
+                    fields='key',
+                )
+            self.__logger.debug(
+                'Queried sprint tickets to JIRA.',
+                jql=jql_str,
+                issues=len(issues),
+                duration_ms=round(fetch.seconds * 1000, 1),
+            )
+
+            with self.__timer.measure(self.PROCESSING_PHASE):
+                documents.append(shape_sprint(sprint.raw, self.__settings.team, [issue.key for issue in issues]))
 
+        return documents
+
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def find_sprint_ids(self) -> list[int]:
+        """Find the ids of the tracked closed sprints, those after the configured sprint offset."""
+        with self.__timer.measure(self.FETCH_PHASE):
+            sprints = self.__jira.sprints(
+                self.__settings.board_id, startAt=self.__settings.sprint_offset, maxResults=False, state='closed'
+            )
+
+        return [sprint.id for sprint in sprints]
+
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def count_tickets(self, done_at: datetime | None = None, sprint_ids: Sequence[int] | None = None) -> int:
+        """Count the done tickets after specific date, of the given sprints or of every tracked sprint."""
+        jql_str = self.__get_tickets_jql(done_at, sprint_ids)
+
+        with self.__timer.measure(self.FETCH_PHASE):
+            # maxResults=0 makes the client fetch every page, a single issue is enough to read the total.
+            issues = self.__jira.search_issues(jql_str=jql_str, fields='key', maxResults=1)
+
+        return issues.total
+
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def find_tickets(
+        self,
+        done_at: datetime | None = None,
+        start_at: int = 0,
+        max_results: int | bool = False,
+        sprint_ids: Sequence[int] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Find all done tickets after specific date, or a page of them when max_results is given.
+
+        The tickets of every tracked sprint are searched, unless the sprint ids are given.
+        """
+        documents: list[dict[str, Any]] = []
+        jql_str = self.__get_tickets_jql(done_at, sprint_ids)
+
+        with self.__timer.measure(self.FETCH_PHASE) as fetch:
             issues = self.__jira.search_issues(
                 jql_str=jql_str,
-                fields='key',
+                fields='key, status, summary, changelog, created, customfield_10002',
+                expand='changelog',
+                startAt=start_at,
+                maxResults=max_results,
             )
+        self.__logger.debug(
+            'Queried tickets to JIRA.',
+            jql=jql_str,
+            issues=len(issues),
+            duration_ms=round(fetch.seconds * 1000, 1),
+        )
 
-            document = sprint.raw
-            document['opened_at'] = datetime.fromisoformat(sprint.startDate)
-            document['closed_at'] = datetime.fromisoformat(sprint.completeDate)
-            document['team'] = self.__settings.team
-            document['tickets'] = [issue.key for issue in issues]
-
-            del document['endDate']
-            del document['activatedDate']
-            del document['startDate']
-            del document['completeDate']
+        with self.__timer.measure(self.PROCESSING_PHASE):
+            for issue in issues:
+                document = shape_ticket(issue.raw, self.__settings.team)
+                if document is not None:
+                    documents.append(document)
 
-            documents.append(document)
+        self.__logger.info(f'Found {len(documents)} tickets.')
 
         return documents
 
-    @retry(stop=stop_after_attempt(3))
-    def find_tickets(self, done_at: datetime | None = None) -> list[dict[str, Any]]:
-        """Find all done tickets after specific date."""
-        documents: list[dict[str, Any]] = []
-        sprints = self.__jira.sprints(
-            self.__settings.board_id, startAt=self.__settings.sprint_offset, maxResults=False, state='closed'
-        )
-        filter_sprints = ','.join(str(sprint.id) for sprint in sprints)
-        filter_done_at = f'AND status changed to Done AFTER "{done_at:%Y-%m-%d}"' if done_at else ''
+    @traced
+    @retry(stop=stop_after_attempt(3), before_sleep=__count_retry)
+    def find_raw_tickets(
+        self, sprint_ids: Sequence[int], start_at: int = 0, max_results: int = 100
+    ) -> list[dict[str, Any]]:
+        """Find a page of the team's raw issues, with changelog, of the given sprints without shaping them."""
+        if not sprint_ids:
+            return []
 
         jql_str = (
             f'project = {self.__settings.project} '
-            f'AND Sprint IN ({filter_sprints}) '
+            f'AND Sprint IN ({",".join(str(sprint_id) for sprint_id in sprint_ids)}) '
             f'AND Teams = "{self.__settings.team}" '
             f'AND issuetype IN ({self.__issue_types}) '
-            f'{filter_done_at} '
             'ORDER BY created ASC'
         )
 
-        self.__logger.info(f'Querying tickets to JIRA: {jql_str}')
-
-        issues = self.__jira.search_issues(
-            jql_str=jql_str,
-            fields='key, status, summary, changelog, created, customfield_10002',
-            expand='changelog',
-            maxResults=False,
-        )
-
-        for issue in issues:
-            try:
-                started_at, resolved_at = self.__get_started_and_resolved(issue)
-            except (IssueNotStartedError, IssueNotFinishedError):
-                continue
-
-            try:
-                story_points = issue.fields.customfield_10002
-                story_points = int(story_points) if isinstance(story_points, float) else None
-            except (AttributeError, ValueError):
-                story_points = None
-
-            document = issue.raw
-            document['team'] = self.__settings.team
-            document['created_at'] = date_parser.parse(issue.fields.created)
-            document['started_at'] = started_at
-            document['resolved_at'] = resolved_at
-            document['story_points'] = story_points or 0
-            document['status'] = document['fields']['status']['name']
+        with self.__timer.measure(self.FETCH_PHASE):
+            result = self.__jira.search_issues(
+                jql_str=jql_str,
+                fields='key, status, summary, changelog, created, customfield_10002',
+                expand='changelog',
+                startAt=start_at,
+                maxResults=max_results,
+                json_result=True,
+            )
 
-            documents.append(document)
+        return result['issues']
 
-        self.__logger.info(f'Found {len(documents)} tickets.')
+    def __count_bytes(self, response: Response, *args: Any, **kwargs: Any) -> None:
+        """Counts the payload size of every Jira HTTP response."""
+        size = len(response.content)
+        with self.__lock:
+            self.__bytes_received += size
 
-        return documents
-
-    @staticmethod
-    def __get_started_and_resolved(issue: Issue) -> tuple[datetime, datetime]:
-        """Determines the start and resolution timestamps of a Jira issue based on its status changes."""
-        changelog = sorted(issue.changelog.histories, key=lambda h: h.created)
-        in_progress_times: list[tuple[str, int]] = []
-        done_times: list[tuple[str, int]] = []
-
-        for i, history in enumerate(changelog):
-            for item in history.items:
-                if item.field != 'status':
-                    continue
-                if item.toString == TicketStatus.IN_PROGRESS.value:
-                    in_progress_times.append((history.created, i))
-                elif item.toString == TicketStatus.DONE.value:
-                    done_times.append((history.created, i))
-
-        if not in_progress_times:
-            raise IssueNotStartedError(issue)
-        if not done_times:
-            raise IssueNotFinishedError(issue)
-
-        last_in_progress_created, last_in_progress_index = in_progress_times[-1]
-
-        for done_created, done_index in done_times:
-            if done_index > last_in_progress_index:
-                return (
-                    date_parser.parse(last_in_progress_created),
-                    date_parser.parse(done_created),
-                )
+    def __get_tickets_jql(self, done_at: datetime | None, sprint_ids: Sequence[int] | None) -> str:
+        """Builds the JQL query matching the team's done tickets of the given sprints, or of the tracked sprints."""
+        if sprint_ids is None:
+            sprint_ids = self.find_sprint_ids()
+        filter_sprints = ','.join(str(sprint_id) for sprint_id in sprint_ids)
+        filter_done_at = f'AND status changed to Done AFTER "{done_at:%Y-%m-%d}"' if done_at else ''
 
-        raise IssueNotFinishedError(issue)
+        return (
+            f'project = {self.__settings.project} '
+            f'AND Sprint IN ({filter_sprints}) '
+            f'AND Teams = "{self.__settings.team}" '
+            f'AND issuetype IN ({self.__issue_types}) '
+            f'{filter_done_at} '
+            'ORDER BY created ASC'
+        )
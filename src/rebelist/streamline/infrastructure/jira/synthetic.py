@@ -0,0 +1,356 @@
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Final, Iterator
+from zoneinfo import ZoneInfo
+
+from rebelist.streamline.config.settings import JiraSettings
+from rebelist.streamline.domain.time import WorkCalendarProtocol
+from rebelist.streamline.infrastructure.jira.documents import shape_sprint, shape_ticket
+
+BASE_URL: Final[str] = 'https://jira.example.com'
+SEARCH_FIELDS: Final[str] = 'key, status, summary, changelog, created, customfield_10002'
+WORKDAY_STARTS_AT: Final[time] = time(9)
+WORKDAY_ENDS_AT: Final[time] = time(17)
+STATUS_IDS: Final[dict[str, str]] = {
+    'To Do': '10000',
+    'In Progress': '3',
+    'In Review': '10100',
+    'Blocked': '10200',
+    'Done': '10001',
+}
+STORY_POINTS: Final[tuple[float | None, ...]] = (None, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0)
+STORY_POINT_WEIGHTS: Final[tuple[int, ...]] = (10, 14, 22, 24, 17, 9, 4)
+
+type Transition = tuple[datetime, str, str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSprint:
+    """A closed sprint with the raw issues planned in it and those spilled over from the previous sprints."""
+
+    raw: dict[str, Any]
+    issues: list[dict[str, Any]]
+    spillovers: list[dict[str, Any]]
+
+    @property
+    def keys(self) -> list[str]:
+        """Returns the keys of every issue of the sprint, the way Jira lists them."""
+        return [issue['key'] for issue in (*self.spillovers, *self.issues)]
+
+
+class SyntheticJira:
+    """Generates the history of a team the way the Jira REST API returns it: closed sprints and issues with changelogs.
+
+    The same seed always generates the same history. Issues only change during working hours, skipping weekends and the
+    holidays of the calendar, and take longer the more story points they have. Some are blocked, sent back from review
+    or reopened, a few are never started, and those unfinished when their sprint closes spill over into the next one.
+    """
+
+    SPRINT_LENGTH: Final[timedelta] = timedelta(days=14)
+    SPRINT_DAYS: Final[int] = 11
+    SPRINT_PAGE_SIZE: Final[int] = 50
+    SEARCH_PAGE_SIZE: Final[int] = 100
+    FIRST_ISSUE_ID: Final[int] = 10000
+    FIRST_SPRINT_ID: Final[int] = 1000
+    UNPLANNED_RATE: Final[float] = 0.2
+    NOT_STARTED_RATE: Final[float] = 0.04
+    BLOCKED_RATE: Final[float] = 0.08
+    REJECTED_RATE: Final[float] = 0.25
+    REOPENED_RATE: Final[float] = 0.05
+    LATE_CLOSE_RATE: Final[float] = 0.05
+
+    def __init__(
+        self,
+        settings: JiraSettings,
+        calendar: WorkCalendarProtocol,
+        timezone: ZoneInfo,
+        seed: int = 0,
+        sprints: int = 100,
+        tickets_per_sprint: int = 12,
+        first_sprint_on: date = date(2020, 1, 6),
+    ) -> None:
+        if sprints <= 0 or tickets_per_sprint <= 0:
+            raise ValueError('The history needs at least one sprint and one ticket per sprint.')
+
+        self.__settings = settings
+        self.__calendar = calendar
+        self.__timezone = timezone
+        self.__seed = seed
+        self.__tickets_per_sprint = tickets_per_sprint
+        self.__working_days: dict[date, bool] = {}
+        self.__sprints = self.__schedule(random.Random(f'{seed}:sprints'), sprints, first_sprint_on)
+
+    @property
+    def sprint_count(self) -> int:
+        """Returns the number of sprints of the history."""
+        return len(self.__sprints)
+
+    def history(self) -> Iterator[SyntheticSprint]:
+        """Yields the sprints in the order they closed, generating their issues along the way."""
+        generator = random.Random(f'{self.__seed}:issues')
+        history_end = self.__sprints[-1][2]
+        carried: list[tuple[dict[str, Any], datetime]] = []
+        number = 0
+
+        for raw, opened_at, closed_at in self.__sprints:
+            spillovers = [issue for issue, _ in carried]
+            issues: list[dict[str, Any]] = []
+            count = max(1, round(generator.gauss(self.__tickets_per_sprint, self.__tickets_per_sprint * 0.2)))
+            for _ in range(count):
+                number += 1
+                issue, open_until = self.__issue(generator, number, opened_at, history_end)
+                issues.append(issue)
+                carried.append((issue, open_until))
+
+            yield SyntheticSprint(raw, issues, spillovers)
+            carried = [(issue, open_until) for issue, open_until in carried if open_until > closed_at]
+
+    def documents(self) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Yields the document of each sprint with the documents of the finished tickets first planned in it.
+
+        The documents are shaped by the same functions as the synchronized ones.
+        """
+        team = self.__settings.team
+        for sprint in self.history():
+            tickets = [document for issue in sprint.issues if (document := shape_ticket(dict(issue), team))]
+            yield shape_sprint(dict(sprint.raw), team, sprint.keys), tickets
+
+    def exchanges(self) -> Iterator[dict[str, Any]]:
+        """Yields the requests reading the history from Jira, each with the page of the response Jira would send."""
+        sprints = [raw for raw, _, _ in self.__sprints]
+        for start in range(0, len(sprints), self.SPRINT_PAGE_SIZE):
+            page = sprints[start : start + self.SPRINT_PAGE_SIZE]
+            yield {
+                'request': {
+                    'method': 'GET',
+                    'path': f'/rest/agile/1.0/board/{self.__settings.board_id}/sprint',
+                    'params': {'state': 'closed', 'startAt': start, 'maxResults': self.SPRINT_PAGE_SIZE},
+                },
+                'response': {
+                    'maxResults': self.SPRINT_PAGE_SIZE,
+                    'startAt': start,
+                    'isLast': start + len(page) >= len(sprints),
+                    'values': page,
+                },
+            }
+
+        for sprint in self.history():
+            issues = [*sprint.spillovers, *sprint.issues]
+            jql = (
+                f'project = {self.__settings.project} '
+                f'AND Sprint = {sprint.raw["id"]} '
+                f'AND Teams = "{self.__settings.team}" '
+                'ORDER BY created ASC'
+            )
+            for start in range(0, len(issues), self.SEARCH_PAGE_SIZE):
+                yield {
+                    'request': {
+                        'method': 'GET',
+                        'path': '/rest/api/2/search',
+                        'params': {
+                            'jql': jql,
+                            'startAt': start,
+                            'maxResults': self.SEARCH_PAGE_SIZE,
+                            'fields': SEARCH_FIELDS,
+                            'expand': 'changelog',
+                        },
+                    },
+                    'response': {
+                        'expand': 'names,schema',
+                        'startAt': start,
+                        'maxResults': self.SEARCH_PAGE_SIZE,
+                        'total': len(issues),
+                        'issues': issues[start : start + self.SEARCH_PAGE_SIZE],
+                    },
+                }
+
+    def __schedule(
+        self, generator: random.Random, count: int, first_sprint_on: date
+    ) -> list[tuple[dict[str, Any], datetime, datetime]]:
+        """Plans a sprint every two weeks, opened on the morning of its first working day.
+
+        A sprint closes on the afternoon of its last working day, or sometimes the next morning.
+        """
+        sprints: list[tuple[dict[str, Any], datetime, datetime]] = []
+        closed_at: datetime | None = None
+
+        for number in range(count):
+            starts_at = datetime.combine(
+                first_sprint_on + number * self.SPRINT_LENGTH, WORKDAY_STARTS_AT, tzinfo=self.__timezone
+            )
+            opened_at = self.__working(starts_at + timedelta(minutes=generator.randint(15, 90)))
+            if closed_at and opened_at <= closed_at:
+                opened_at = closed_at + timedelta(minutes=generator.randint(15, 30))
+
+            ends_at = datetime.combine(
+                starts_at.date() + timedelta(days=self.SPRINT_DAYS), WORKDAY_ENDS_AT, tzinfo=self.__timezone
+            )
+            closed_at = self.__working(ends_at - timedelta(minutes=generator.randint(30, 180)))
+            if generator.random() < self.LATE_CLOSE_RATE:
+                closed_at = self.__working(ends_at) + timedelta(minutes=generator.randint(0, 30))
+
+            sprint_id = self.FIRST_SPRINT_ID + number
+            raw = {
+                'id': sprint_id,
+                'self': f'{BASE_URL}/rest/agile/1.0/sprint/{sprint_id}',
+                'state': 'closed',
+                'name': f'{self.__settings.team} Sprint {number + 1}',
+                'startDate': _agile_datetime(opened_at),
+                'endDate': _agile_datetime(ends_at),
+                'activatedDate': _agile_datetime(opened_at),
+                'completeDate': _agile_datetime(closed_at),
+                'originBoardId': self.__settings.board_id,
+                'goal': '',
+            }
+            sprints.append((raw, opened_at, closed_at))
+
+        return sprints
+
+    def __issue(
+        self, generator: random.Random, number: int, opened_at: datetime, history_end: datetime
+    ) -> tuple[dict[str, Any], datetime]:
+        """Generates an issue planned in a sprint, and the moment until which it stays open.
+
+        The changelog stops at the end of the history, so the issues still in progress then remain unfinished.
+        """
+        if generator.random() < self.UNPLANNED_RATE:
+            created_at = self.__after(opened_at, generator.uniform(0, 32))
+        else:
+            created_at = self.__working(opened_at - timedelta(hours=generator.uniform(1, 720)))
+
+        story_points = generator.choices(STORY_POINTS, STORY_POINT_WEIGHTS)[0]
+        assignee = f'developer.{generator.randint(1, 8)}'
+        changes: list[Transition] = [(self.__after(created_at, generator.uniform(0.1, 2)), 'assignee', assignee)]
+        if story_points is not None:
+            changes.append((self.__after(created_at, generator.uniform(0.1, 4)), 'Story Points', str(story_points)))
+
+        if generator.random() >= self.NOT_STARTED_RATE:
+            changes += self.__workflow(generator, max(created_at, opened_at), story_points)
+
+        changes = sorted((change for change in changes if change[0] <= history_end), key=lambda change: change[0])
+        statuses = [(moment, status) for moment, field, status in changes if field == 'status' and status]
+        status = statuses[-1][1] if statuses else 'To Do'
+        if status == 'Done':
+            open_until = statuses[-1][0]
+        elif statuses:
+            open_until = history_end + self.SPRINT_LENGTH
+        else:
+            open_until = opened_at
+
+        issue_id = str(self.FIRST_ISSUE_ID + number)
+        issue = {
+            'expand': 'operations,versionedRepresentations,editmeta,changelog,renderedFields',
+            'id': issue_id,
+            'self': f'{BASE_URL}/rest/api/2/issue/{issue_id}',
+            'key': f'{self.__settings.project}-{number}',
+            'fields': {
+                'summary': f'Synthetic issue {number} of {self.__settings.team}',
+                'status': {'name': status, 'id': STATUS_IDS[status]},
+                'created': _rest_datetime(created_at),
+                'customfield_10002': story_points,
+            },
+            'changelog': _changelog(issue_id, changes),
+        }
+        return issue, open_until
+
+    def __workflow(self, generator: random.Random, ready_at: datetime, story_points: float | None) -> list[Transition]:
+        """Moves an issue from in progress to done, with an effort growing with its story points."""
+        effort = generator.lognormvariate(math.log(4 + 5 * (story_points or 2)), 0.6)
+        moment = self.__after(ready_at, generator.uniform(0, 40))
+        transitions: list[Transition] = [(moment, 'status', 'In Progress')]
+
+        def move(hours: float, status: str) -> None:
+            nonlocal moment
+            moment = self.__after(moment, hours)
+            transitions.append((moment, 'status', status))
+
+        if generator.random() < self.BLOCKED_RATE:
+            move(effort * generator.uniform(0.1, 0.5), 'Blocked')
+            move(generator.lognormvariate(math.log(16), 0.7), 'In Progress')
+        move(effort * 0.7, 'In Review')
+        while generator.random() < self.REJECTED_RATE:
+            move(generator.uniform(1, 8), 'In Progress')
+            move(effort * 0.3, 'In Review')
+        move(generator.uniform(1, 12), 'Done')
+
+        if generator.random() < self.REOPENED_RATE:
+            move(generator.uniform(4, 40), 'In Progress')
+            move(effort * 0.3, 'Done')
+
+        return transitions
+
+    def __after(self, moment: datetime, hours: float) -> datetime:
+        """Moves a moment forward by working hours, skipping the nights, the weekends and the holidays."""
+        moment = self.__working(moment)
+        remaining = timedelta(hours=hours)
+
+        while True:
+            left = datetime.combine(moment.date(), WORKDAY_ENDS_AT, tzinfo=self.__timezone) - moment
+            if remaining < left:
+                return moment + remaining
+            remaining -= left
+            moment = self.__working(moment + left)
+
+    def __working(self, moment: datetime) -> datetime:
+        """Moves a moment forward to the closest working time."""
+        day = moment.date()
+        if moment.time() >= WORKDAY_ENDS_AT:
+            day += timedelta(days=1)
+        elif moment.time() >= WORKDAY_STARTS_AT and self.__is_working_day(day):
+            return moment
+
+        while not self.__is_working_day(day):
+            day += timedelta(days=1)
+
+        return datetime.combine(day, WORKDAY_STARTS_AT, tzinfo=self.__timezone)
+
+    def __is_working_day(self, day: date) -> bool:
+        """Checks whether a day is a working day, asking the calendar once per day."""
+        working = self.__working_days.get(day)
+        if working is None:
+            working = self.__working_days[day] = self.__calendar.is_working_day(day)
+
+        return working
+
+
+def _changelog(issue_id: str, changes: list[Transition]) -> dict[str, Any]:
+    """Builds the changelog of an issue from its changes, in the order they happened."""
+    histories: list[dict[str, Any]] = []
+    status = 'To Do'
+
+    for index, (moment, field, value) in enumerate(changes):
+        if field == 'status' and value:
+            item = {
+                'field': 'status',
+                'fieldtype': 'jira',
+                'from': STATUS_IDS[status],
+                'fromString': status,
+                'to': STATUS_IDS[value],
+                'toString': value,
+            }
+            status = value
+        else:
+            item = {
+                'field': field,
+                'fieldtype': 'custom',
+                'from': None,
+                'fromString': None,
+                'to': value,
+                'toString': value,
+            }
+
+        histories.append({'id': f'{issue_id}{index:03d}', 'created': _rest_datetime(moment), 'items': [item]})
+
+    return {'startAt': 0, 'maxResults': len(histories), 'total': len(histories), 'histories': histories}
+
+
+def _rest_datetime(moment: datetime) -> str:
+    """Formats a datetime the way the Jira REST API does, with the offset of the Jira user."""
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000%z')
+
+
+def _agile_datetime(moment: datetime) -> str:
+    """Formats a datetime the way the Jira Agile API does, in UTC."""
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
@@ -0,0 +1,3 @@
+from rebelist.streamline.infrastructure.mongo.archive.archives import MongoArchive
+
+__all__ = ['MongoArchive']
@@ -0,0 +1,71 @@
+import gzip
+from itertools import batched, groupby
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Final, Mapping, cast
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo.synchronous.database import Database
+
+
+class MongoArchive:
+    """Streams collections to and from a gzip compressed BSON archive.
+
+    The archive is a sequence of BSON records: a ``{'c': name}`` header opens every collection and is followed by one
+    ``{'c': name, 'd': document}`` record per document. Documents are copied as raw BSON, without decoding them.
+    """
+
+    BATCH_SIZE: Final[int] = 1000
+    COMPRESS_LEVEL: Final[int] = 6
+    RAW_BSON: Final[CodecOptions[RawBSONDocument]] = CodecOptions(document_class=RawBSONDocument)
+
+    def __init__(self, database: Database[Mapping[str, Any]]) -> None:
+        self.__database = database
+
+    def dump(self, path: Path, on_collection: Callable[[str, int], None] | None = None) -> dict[str, int]:
+        """Writes every collection to the archive and returns the number of documents per collection."""
+        counts: dict[str, int] = {}
+        partial = path.with_name(f'{path.name}.part')
+
+        with gzip.open(partial, 'wb', compresslevel=self.COMPRESS_LEVEL) as stream:
+            for name in sorted(self.__database.list_collection_names()):
+                collection = self.__database.get_collection(name, codec_options=self.RAW_BSON)
+                stream.write(bson.encode({'c': name}))
+                counts[name] = 0
+
+                for document in collection.find({}, batch_size=self.BATCH_SIZE):
+                    stream.write(bson.encode({'c': name, 'd': document}))
+                    counts[name] += 1
+
+                if on_collection:
+                    on_collection(name, counts[name])
+
+        partial.replace(path)
+
+        return counts
+
+    def restore(self, path: Path, on_collection: Callable[[str, int], None] | None = None) -> dict[str, int]:
+        """Replaces the archived collections with their archived documents and returns the counts per collection."""
+        counts: dict[str, int] = {}
+
+        with gzip.open(path, 'rb') as stream:
+            records = bson.decode_file_iter(cast(BinaryIO, stream), codec_options=self.RAW_BSON)
+            for name, group in groupby(records, key=lambda record: record['c']):
+                self.__database.drop_collection(name)
+                counts[name] = 0
+
+                documents = (record['d'] for record in group if 'd' in record)
+                for batch in batched(documents, self.BATCH_SIZE, strict=False):
+                    counts[name] += self.__insert(name, list(batch))
+
+                if on_collection:
+                    on_collection(name, counts[name])
+
+        return counts
+
+    def __insert(self, name: str, documents: list[RawBSONDocument]) -> int:
+        """Inserts a batch of raw documents into a collection."""
+        self.__database.get_collection(name, codec_options=self.RAW_BSON).insert_many(documents, ordered=False)
+
+        return len(documents)
@@ -0,0 +1,4 @@
+from rebelist.streamline.infrastructure.mongo.document.filters import time_range_filter
+from rebelist.streamline.infrastructure.mongo.document.repositories import MongoDocumentRepository, WriteSummary
+
+__all__ = ['MongoDocumentRepository', 'WriteSummary', 'time_range_filter']
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from rebelist.streamline.domain.time import TimeRange
+
+
+def time_range_filter(time_range: TimeRange) -> dict[str, datetime]:
+    """Builds the query operators selecting the datetimes within a time range."""
+    operators: dict[str, datetime] = {}
+    if time_range.start:
+        operators['$gte'] = time_range.start
+    if time_range.end:
+        operators['$lt'] = time_range.end
+
+    return operators
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from hashlib import sha256
+from itertools import batched
+from typing import Any, Final, Mapping, Sequence
+
+from pymongo import ReplaceOne
+from pymongo.synchronous.collection import Collection
+
+from rebelist.streamline.infrastructure.monitoring import traced
+
+
+@dataclass(frozen=True, slots=True)
+class WriteSummary:
+    """Outcome of a bulk document write."""
+
+    written: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: WriteSummary) -> WriteSummary:
+        """Combines two summaries."""
+        return WriteSummary(self.written + other.written, self.skipped + other.skipped)
+
+
+class MongoDocumentRepository:
+    """Base repository for raw documents that only writes documents whose content has changed."""
+
+    HASH_FIELD: Final[str] = 'content_hash'
+    BATCH_SIZE: Final[int] = 500
+
+    def __init__(self, collection: Collection[Mapping[str, Any]]) -> None:
+        self._collection = collection
+
+    @traced
+    def save(self, document: Mapping[str, Any]) -> None:
+        """Adds a single document."""
+        self.save_many([document])
+
+    @traced
+    def save_many(self, documents: Sequence[Mapping[str, Any]]) -> WriteSummary:
+        """Upserts documents in batches, skipping those whose stored content hash is unchanged."""
+        summary = WriteSummary()
+        for batch in batched(documents, self.BATCH_SIZE, strict=False):
+            summary += self.__save_batch(batch)
+
+        return summary
+
+    @traced
+    def insert_many(self, documents: Sequence[Mapping[str, Any]]) -> int:
+        """Inserts new documents in bulk without comparing them with the stored ones, e.g. generated datasets."""
+        if not documents:
+            return 0
+
+        result = self._collection.insert_many(
+            [{**self.__content(document), self.HASH_FIELD: self.content_hash(document)} for document in documents],
+            ordered=False,
+        )
+        return len(result.inserted_ids)
+
+    @traced
+    def delete_by_team_name(self, team: str) -> int:
+        """Deletes every document of a team."""
+        return self._collection.delete_many({'team': team}).deleted_count
+
+    @classmethod
+    def content_hash(cls, document: Mapping[str, Any]) -> str:
+        """Computes a stable hash of the document content, ignoring storage-only fields."""
+        encoded = json.dumps(cls.__content(document), sort_keys=True, separators=(',', ':'), default=str)
+
+        return sha256(encoded.encode()).hexdigest()
+
+    @classmethod
+    def __content(cls, document: Mapping[str, Any]) -> dict[str, Any]:
+        """Returns the document without the fields managed by the storage layer."""
+        return {key: value for key, value in document.items() if key not in ('_id', cls.HASH_FIELD)}
+
+    def __save_batch(self, documents: Sequence[Mapping[str, Any]]) -> WriteSummary:
+        """Compares the batch against the stored hashes with a single query and writes the changed documents."""
+        stored = self._collection.find(
+            {
+                'id': {'$in': [document['id'] for document in documents]},
+                'team': {'$in': list({document['team'] for document in documents})},
+            },
+            {'_id': False, 'id': True, 'team': True, self.HASH_FIELD: True},
+        )
+        stored_hashes = {(document['id'], document['team']): document.get(self.HASH_FIELD) for document in stored}
+
+        operations: list[ReplaceOne[Mapping[str, Any]]] = []
+        for document in documents:
+            content_hash = self.content_hash(document)
+            if stored_hashes.get((document['id'], document['team'])) == content_hash:
+                continue
+
+            operations.append(
+                ReplaceOne(
+                    {'id': document['id'], 'team': document['team']},
+                    {**self.__content(document), self.HASH_FIELD: content_hash},
+                    upsert=True,
+                )
+            )
+
+        if operations:
+            self._collection.bulk_write(operations, ordered=False)
+
+        return WriteSummary(written=len(operations), skipped=len(documents) - len(operations))
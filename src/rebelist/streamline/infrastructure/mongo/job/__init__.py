@@ -1,3 +1,3 @@
-from rebelist.streamline.infrastructure.mongo.job.repositories import Job, JobRepository
+from rebelist.streamline.infrastructure.mongo.job.repositories import AsyncJobRepository, Job, JobRepository
 
-__all__ = ['JobRepository', 'Job']
+__all__ = ['AsyncJobRepository', 'JobRepository', 'Job']
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Final, Mapping, cast
+from typing import Any, Final, Iterable, Mapping, Sequence, cast
+from uuid import uuid4
 
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 
+from rebelist.streamline.infrastructure.monitoring import traced
+
 
 @dataclass
 class Job:
@@ -45,11 +50,12 @@ class JobRepository:
     def __init__(self, database: Database[Mapping[str, Any]]) -> None:
         self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
 
+    @traced
     def save(self, job: Job) -> None:
-        """Saves a job."""
-        self.__collection.delete_one({'team': job.team, 'name': job.name})
-        self.__collection.insert_one(job.to_dict())
+        """Saves a job, leaving the version of its data to mark_changed."""
+        self.__collection.update_one({'team': job.team, 'name': job.name}, {'$set': job.to_dict()}, upsert=True)
 
+    @traced
     def find(self, name: str, team: str) -> Job | None:
         """Find a job."""
         job: Job | None = None
@@ -60,3 +66,50 @@ class JobRepository:
                 job = Job.from_dict(document)
 
         return job
+
+    @traced
+    def mark_changed(self, name: str, team: str) -> None:
+        """Gives the data of a job a new version, once a write changed its documents."""
+        self.__collection.update_one({'name': name, 'team': team}, {'$set': {'data_version': uuid4().hex}}, upsert=True)
+
+    @traced
+    def advance(self, name: str, team: str, cursor: Mapping[str, Any]) -> None:
+        """Moves the cursors of a job forward, a cursor already past the given value is left untouched."""
+        self.__collection.update_one(
+            {'name': name, 'team': team}, {'$max': {f'metadata.{key}': value for key, value in cursor.items()}}
+        )
+
+    @traced
+    def find_versions(self, names: Sequence[str], team: str) -> dict[str, str | None]:
+        """Find the data version of several jobs with a single query."""
+        documents = self.__collection.find(*self.versions_query(names, team))
+
+        return self.to_versions(names, documents)
+
+    @staticmethod
+    def versions_query(names: Sequence[str], team: str) -> tuple[dict[str, Any], dict[str, bool]]:
+        """Builds the filter and projection reading the data version of several jobs."""
+        return {'name': {'$in': list(names)}, 'team': team}, {'_id': False, 'name': True, 'data_version': True}
+
+    @staticmethod
+    def to_versions(names: Sequence[str], documents: Iterable[Mapping[str, Any]]) -> dict[str, str | None]:
+        """Maps each job name to its data version, None for the jobs that never changed any document."""
+        versions: dict[str, str | None] = dict.fromkeys(names)
+        for document in documents:
+            versions[document['name']] = document.get('data_version')
+
+        return versions
+
+
+class AsyncJobRepository:
+    """Job repository reading through the asynchronous MongoDB driver."""
+
+    def __init__(self, database: AsyncDatabase[Mapping[str, Any]]) -> None:
+        self.__collection: AsyncCollection[Mapping[str, Any]] = database.get_collection(JobRepository.COLLECTION_NAME)
+
+    @traced
+    async def find_versions(self, names: Sequence[str], team: str) -> dict[str, str | None]:
+        """Find the data version of several jobs with a single query."""
+        cursor = self.__collection.find(*JobRepository.versions_query(names, team))
+
+        return JobRepository.to_versions(names, await cursor.to_list())
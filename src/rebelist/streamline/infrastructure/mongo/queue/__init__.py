@@ -0,0 +1,8 @@
+from rebelist.streamline.infrastructure.mongo.queue.repositories import (
+    IngestQueueRepository,
+    WorkUnit,
+    WorkUnitKind,
+    WorkUnitStatus,
+)
+
+__all__ = ['IngestQueueRepository', 'WorkUnit', 'WorkUnitKind', 'WorkUnitStatus']
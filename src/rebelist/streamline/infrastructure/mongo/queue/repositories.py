@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import StrEnum
+from typing import Any, Final, Mapping, Sequence, cast
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+
+from rebelist.streamline.infrastructure.monitoring import traced
+
+
+class WorkUnitKind(StrEnum):
+    """Kind of ingestion work a unit represents."""
+
+    SPRINT_PAGE = 'sprint_page'
+    ISSUE_PAGE = 'issue_page'
+
+
+class WorkUnitStatus(StrEnum):
+    """Lifecycle status of a work unit."""
+
+    PENDING = 'pending'
+    FAILED = 'failed'
+
+
+@dataclass
+class WorkUnit:
+    """Represents a unit of ingestion work stored in the queue."""
+
+    kind: WorkUnitKind
+    team: str
+    payload: dict[str, Any] = field(default_factory=lambda: {})
+    status: WorkUnitStatus = WorkUnitStatus.PENDING
+    attempts: int = 0
+    visible_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    claimed_by: str | None = None
+    error: str | None = None
+    batch: str | None = None
+    id: ObjectId | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for MongoDB insertion."""
+        return {
+            'kind': self.kind.value,
+            'team': self.team,
+            'payload': self.payload,
+            'status': self.status.value,
+            'attempts': self.attempts,
+            'visible_at': self.visible_at,
+            'claimed_by': self.claimed_by,
+            'error': self.error,
+            'batch': self.batch,
+        }
+
+    @staticmethod
+    def from_dict(data: Mapping[str, Any]) -> WorkUnit:
+        """Deserialize from MongoDB document."""
+        return WorkUnit(
+            kind=WorkUnitKind(data['kind']),
+            team=cast(str, data.get('team')),
+            payload=cast(dict[str, Any], data.get('payload', {})),
+            status=WorkUnitStatus(data.get('status', WorkUnitStatus.PENDING)),
+            attempts=cast(int, data.get('attempts', 0)),
+            visible_at=cast(datetime, data.get('visible_at')),
+            claimed_by=data.get('claimed_by'),
+            error=data.get('error'),
+            batch=data.get('batch'),
+            id=data.get('_id'),
+        )
+
+
+class IngestQueueRepository:
+    """Work queue for ingestion units with atomic claims and visibility timeouts."""
+
+    COLLECTION_NAME: Final[str] = 'ingest_queue'
+
+    def __init__(self, database: Database[Mapping[str, Any]]) -> None:
+        self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
+
+    @traced
+    def enqueue(self, units: Sequence[WorkUnit]) -> None:
+        """Adds work units to the queue."""
+        if units:
+            self.__collection.insert_many([unit.to_dict() for unit in units], ordered=False)
+
+    @traced
+    def claim(self, worker: str, visibility_timeout: timedelta) -> WorkUnit | None:
+        """Atomically claims the oldest visible unit, hiding it from other workers until the timeout expires."""
+        now = datetime.now(timezone.utc)
+        document = self.__collection.find_one_and_update(
+            {'status': WorkUnitStatus.PENDING.value, 'visible_at': {'$lte': now}},
+            {'$set': {'visible_at': now + visibility_timeout, 'claimed_by': worker}, '$inc': {'attempts': 1}},
+            sort=[('visible_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+        return WorkUnit.from_dict(document) if document else None
+
+    @traced
+    def ack(self, unit: WorkUnit) -> None:
+        """Removes a processed unit from the queue."""
+        self.__collection.delete_one({'_id': unit.id})
+
+    @traced
+    def retry(self, unit: WorkUnit, error: str, delay: timedelta, max_attempts: int) -> None:
+        """Makes a unit visible again after a delay, or marks it as failed once it runs out of attempts."""
+        if unit.attempts >= max_attempts:
+            update = {'status': WorkUnitStatus.FAILED.value, 'error': error, 'claimed_by': None}
+        else:
+            update = {'visible_at': datetime.now(timezone.utc) + delay, 'error': error, 'claimed_by': None}
+
+        self.__collection.update_one({'_id': unit.id}, {'$set': update})
+
+    @traced
+    def remaining(self, batch: str) -> int:
+        """Counts the units of a batch still in the queue, pending or failed."""
+        return self.__collection.count_documents({'batch': batch})
+
+    @traced
+    def count(self, status: WorkUnitStatus = WorkUnitStatus.PENDING) -> int:
+        """Counts the units with a given status."""
+        return self.__collection.count_documents({'status': status.value})
@@ -0,0 +1,3 @@
+from rebelist.streamline.infrastructure.mongo.run.repositories import SyncRun, SyncRunRepository
+
+__all__ = ['SyncRun', 'SyncRunRepository']
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Final, Mapping, cast
+
+from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+
+from rebelist.streamline.infrastructure.monitoring import traced
+
+
+@dataclass
+class SyncRun:
+    """Represents the report of a synchronization run."""
+
+    version: str
+    duration: float
+    jobs: list[dict[str, Any]] = field(default_factory=lambda: [])
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    id: ObjectId | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for MongoDB insertion."""
+        return {
+            'version': self.version,
+            'duration': self.duration,
+            'jobs': self.jobs,
+            'started_at': self.started_at,
+        }
+
+    @staticmethod
+    def from_dict(data: Mapping[str, Any]) -> SyncRun:
+        """Deserialize from MongoDB document."""
+        return SyncRun(
+            version=cast(str, data.get('version')),
+            duration=cast(float, data.get('duration', 0.0)),
+            jobs=cast(list[dict[str, Any]], data.get('jobs', [])),
+            started_at=cast(datetime, data.get('started_at')),
+            id=data.get('_id'),
+        )
+
+
+class SyncRunRepository:
+    """Synchronization run repository to keep the reports of past runs."""
+
+    COLLECTION_NAME: Final[str] = 'sync_runs'
+
+    def __init__(self, database: Database[Mapping[str, Any]]) -> None:
+        self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
+
+    @traced
+    def save(self, run: SyncRun) -> None:
+        """Saves a run report."""
+        self.__collection.insert_one(run.to_dict())
+
+    @traced
+    def find_recent(self, limit: int = 10) -> list[SyncRun]:
+        """Finds the most recent run reports, newest first."""
+        documents = self.__collection.find({}).sort('started_at', DESCENDING).limit(limit)
+
+        return [SyncRun.from_dict(document) for document in documents]
@@ -1,6 +1,7 @@
 from rebelist.streamline.infrastructure.mongo.sprint.repositories import (
+    AsyncMongoSprintRepository,
     MongoSprintDocumentRepository,
     MongoSprintRepository,
 )
 
-__all__ = ['MongoSprintDocumentRepository', 'MongoSprintRepository']
+__all__ = ['AsyncMongoSprintRepository', 'MongoSprintDocumentRepository', 'MongoSprintRepository']
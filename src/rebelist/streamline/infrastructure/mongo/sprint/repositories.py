@@ -1,13 +1,18 @@
-from typing import Any, Final, Mapping
+from typing import Any, AsyncIterator, Final, Mapping
 
 from pymongo import ASCENDING, DESCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 
-from rebelist.streamline.domain.sprint import Sprint, SprintRepository
+from rebelist.streamline.domain.sprint import AsyncSprintRepository, Sprint, SprintRepository
 from rebelist.streamline.domain.ticket import Ticket
+from rebelist.streamline.domain.time import TimeRange
 from rebelist.streamline.infrastructure.datetime import DateTimeNormalizer
+from rebelist.streamline.infrastructure.mongo.document import MongoDocumentRepository, time_range_filter
 from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+from rebelist.streamline.infrastructure.monitoring import traced
 
 
 class MongoSprintRepository(SprintRepository):
@@ -15,15 +20,31 @@ class MongoSprintRepository(SprintRepository):
 
     COLLECTION_NAME: Final[str] = 'jira_sprints'
     LIMIT_SPRINTS: Final[int] = 20
+    BATCH_SIZE: Final[int] = 200
 
     def __init__(self, database: Database[Mapping[str, Any]], datetime_normalizer: DateTimeNormalizer) -> None:
         self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
         self.__datetime_normalizer = datetime_normalizer
 
-    def find_by_team_name(self, team: str) -> list[Sprint]:
-        """Returns all sprints with its tickets."""
-        sprints: list[Sprint] = []
-        pipeline = [
+    @traced
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Returns the latest sprints with its tickets, or every sprint closed within the time range."""
+        documents = self.__collection.aggregate(self.pipeline(team, time_range))
+
+        return [self.to_sprint(document, self.__datetime_normalizer) for document in documents]
+
+    @staticmethod
+    def pipeline(team: str, time_range: TimeRange | None, limit: int | None = LIMIT_SPRINTS) -> list[dict[str, Any]]:
+        """Builds the aggregation joining the sprints of a team with their tickets.
+
+        Without a time range only the latest sprints are kept, unless the limit is None.
+        """
+        pipeline: list[dict[str, Any]] = []
+        if time_range is not None and (operators := time_range_filter(time_range)):
+            # Filter before the lookup so only the sprints in range are joined, using the closed_at index.
+            pipeline.append({'$match': {'closed_at': operators}})
+
+        pipeline += [
             {
                 '$lookup': {
                     'from': MongoTicketDocumentRepository.COLLECTION_NAME,
@@ -45,44 +66,65 @@ class MongoSprintRepository(SprintRepository):
                     'issues.resolved_at': True,
                 }
             },
-            {'$sort': {'closed_at': DESCENDING}},
-            {'$limit': MongoSprintRepository.LIMIT_SPRINTS},
-            {'$sort': {'closed_at': ASCENDING}},
         ]
-        documents = self.__collection.aggregate(pipeline)
-
-        for document in documents:
-            tickets: list[Ticket] = []
-            for issue in document['issues']:
-                ticket = Ticket(
-                    issue['key'],
-                    self.__datetime_normalizer.normalize(issue['created_at']),
-                    self.__datetime_normalizer.normalize(issue['started_at']),
-                    self.__datetime_normalizer.normalize(issue['resolved_at']),
-                    issue['story_points'],
-                )
-                tickets.append(ticket)
-
-            sprint = Sprint(
-                document['name'],
-                self.__datetime_normalizer.normalize(document['opened_at']),
-                self.__datetime_normalizer.normalize(document['closed_at']),
-                tickets,
+        if time_range is None and limit is not None:
+            pipeline += [{'$sort': {'closed_at': DESCENDING}}, {'$limit': limit}]
+        pipeline.append({'$sort': {'closed_at': ASCENDING}})
+
+        return pipeline
+
+    @staticmethod
+    def to_sprint(document: Mapping[str, Any], datetime_normalizer: DateTimeNormalizer) -> Sprint:
+        """Builds a sprint and its tickets from an aggregated document."""
+        tickets: list[Ticket] = []
+        for issue in document['issues']:
+            ticket = Ticket(
+                issue['key'],
+                datetime_normalizer.normalize(issue['created_at']),
+                datetime_normalizer.normalize(issue['started_at']),
+                datetime_normalizer.normalize(issue['resolved_at']),
+                issue['story_points'],
             )
-            sprints.append(sprint)
+            tickets.append(ticket)
+
+        return Sprint(
+            document['name'],
+            datetime_normalizer.normalize(document['opened_at']),
+            datetime_normalizer.normalize(document['closed_at']),
+            tickets,
+        )
+
 
-        return sprints
+class AsyncMongoSprintRepository(AsyncSprintRepository):
+    """Sprint repository reading through the asynchronous MongoDB driver."""
 
+    def __init__(self, database: AsyncDatabase[Mapping[str, Any]], datetime_normalizer: DateTimeNormalizer) -> None:
+        self.__collection: AsyncCollection[Mapping[str, Any]] = database.get_collection(
+            MongoSprintRepository.COLLECTION_NAME
+        )
+        self.__datetime_normalizer = datetime_normalizer
+
+    @traced
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Sprint]:
+        """Returns the latest sprints with its tickets, or every sprint closed within the time range."""
+        cursor = await self.__collection.aggregate(MongoSprintRepository.pipeline(team, time_range))
+
+        return [MongoSprintRepository.to_sprint(document, self.__datetime_normalizer) async for document in cursor]
+
+    async def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Sprint]:
+        """Yields every sprint of a team, or those closed within the time range, reading the cursor in batches."""
+        cursor = await self.__collection.aggregate(
+            MongoSprintRepository.pipeline(team, time_range, None), batchSize=MongoSprintRepository.BATCH_SIZE
+        )
 
-class MongoSprintDocumentRepository:
+        async for document in cursor:
+            yield MongoSprintRepository.to_sprint(document, self.__datetime_normalizer)
+
+
+class MongoSprintDocumentRepository(MongoDocumentRepository):
     """Sprint document ticket_repository to store raw jira sprint documents."""
 
     COLLECTION_NAME: Final[str] = 'jira_sprints'
 
     def __init__(self, database: Database[Mapping[str, Any]]) -> None:
-        self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
-
-    def save(self, sprint_document: Mapping[str, Any]) -> None:
-        """Adds a jira sprint document."""
-        self.__collection.delete_one({'id': sprint_document['id'], 'team': sprint_document['team']})
-        self.__collection.insert_one(sprint_document)
+        super().__init__(database.get_collection(self.COLLECTION_NAME))
@@ -1,5 +1,6 @@
 from rebelist.streamline.infrastructure.mongo.ticket.repositories import (
+    AsyncMongoTicketRepository,
     MongoTicketDocumentRepository,
 )
 
-__all__ = ['MongoTicketDocumentRepository']
+__all__ = ['AsyncMongoTicketRepository', 'MongoTicketDocumentRepository']
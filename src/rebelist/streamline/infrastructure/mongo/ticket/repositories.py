@@ -1,50 +1,106 @@
-from typing import Any, Final, Mapping
+from typing import Any, AsyncIterator, Final, Mapping
 
 from pymongo import DESCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 
-from rebelist.streamline.domain.ticket import Ticket, TicketRepository
+from rebelist.streamline.domain.ticket import AsyncTicketRepository, Ticket, TicketRepository
+from rebelist.streamline.domain.time import TimeRange
 from rebelist.streamline.infrastructure.datetime import DateTimeNormalizer
+from rebelist.streamline.infrastructure.mongo.document import MongoDocumentRepository, time_range_filter
+from rebelist.streamline.infrastructure.monitoring import traced
 
 
-class MongoTicketDocumentRepository:
+class MongoTicketDocumentRepository(MongoDocumentRepository):
     """Ticket document ticket_repository to store raw jira ticket documents."""
 
     COLLECTION_NAME: Final[str] = 'jira_tickets'
 
     def __init__(self, database: Database[Mapping[str, Any]]) -> None:
-        self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
-
-    def save(self, ticket_document: Mapping[str, Any]) -> None:
-        """Adds a jira ticket document."""
-        self.__collection.delete_one({'id': ticket_document['id'], 'team': ticket_document['team']})
-        self.__collection.insert_one(ticket_document)
+        super().__init__(database.get_collection(self.COLLECTION_NAME))
 
 
 class MongoTicketRepository(TicketRepository):
     """Ticket ticket_repository."""
 
     COLLECTION_NAME: Final[str] = 'jira_tickets'
+    LIMIT_TICKETS: Final[int] = 200
+    BATCH_SIZE: Final[int] = 1000
+    PROJECTION: Final[Mapping[str, bool]] = {
+        '_id': False,
+        'key': True,
+        'created_at': True,
+        'started_at': True,
+        'resolved_at': True,
+        'story_points': True,
+    }
 
     def __init__(self, database: Database[Mapping[str, Any]], datetime_normalizer: DateTimeNormalizer) -> None:
         self.__collection: Collection[Mapping[str, Any]] = database.get_collection(self.COLLECTION_NAME)
         self.__datetime_normalizer = datetime_normalizer
 
-    def find_by_team_name(self, team: str) -> list[Ticket]:
-        """Returns all tickets of a team."""
-        limit: Final[int] = 200
-        documents = self.__collection.find({'team': team}).sort('resolved_at', DESCENDING).limit(limit)
-        tickets: list[Ticket] = []
-
-        for document in documents:
-            ticket = Ticket(
-                document['key'],
-                self.__datetime_normalizer.normalize(document['created_at']),
-                self.__datetime_normalizer.normalize(document['started_at']),
-                self.__datetime_normalizer.normalize(document['resolved_at']),
-                document['story_points'],
+    @traced
+    def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Returns the latest tickets of a team, or every ticket resolved within the time range."""
+        if time_range is None:
+            documents = self.__collection.find({'team': team}).sort('resolved_at', DESCENDING).limit(self.LIMIT_TICKETS)
+        else:
+            documents = self.__collection.find(self.query(team, time_range)).sort('resolved_at', DESCENDING)
+
+        return [self.to_ticket(document, self.__datetime_normalizer) for document in documents]
+
+    @staticmethod
+    def query(team: str, time_range: TimeRange | None) -> dict[str, Any]:
+        """Builds the query selecting the tickets of a team resolved within the time range."""
+        query: dict[str, Any] = {'team': team}
+        if time_range and (operators := time_range_filter(time_range)):
+            query['resolved_at'] = operators
+
+        return query
+
+    @staticmethod
+    def to_ticket(document: Mapping[str, Any], datetime_normalizer: DateTimeNormalizer) -> Ticket:
+        """Builds a ticket from its document."""
+        return Ticket(
+            document['key'],
+            datetime_normalizer.normalize(document['created_at']),
+            datetime_normalizer.normalize(document['started_at']),
+            datetime_normalizer.normalize(document['resolved_at']),
+            document['story_points'],
+        )
+
+
+class AsyncMongoTicketRepository(AsyncTicketRepository):
+    """Ticket repository reading through the asynchronous MongoDB driver."""
+
+    def __init__(self, database: AsyncDatabase[Mapping[str, Any]], datetime_normalizer: DateTimeNormalizer) -> None:
+        self.__collection: AsyncCollection[Mapping[str, Any]] = database.get_collection(
+            MongoTicketRepository.COLLECTION_NAME
+        )
+        self.__datetime_normalizer = datetime_normalizer
+
+    @traced
+    async def find_by_team_name(self, team: str, time_range: TimeRange | None = None) -> list[Ticket]:
+        """Returns the latest tickets of a team, or every ticket resolved within the time range."""
+        cursor = self.__collection.find(
+            MongoTicketRepository.query(team, time_range), projection=MongoTicketRepository.PROJECTION
+        ).sort('resolved_at', DESCENDING)
+        if time_range is None:
+            cursor = cursor.limit(MongoTicketRepository.LIMIT_TICKETS)
+
+        return [MongoTicketRepository.to_ticket(document, self.__datetime_normalizer) async for document in cursor]
+
+    async def iter_by_team_name(self, team: str, time_range: TimeRange | None = None) -> AsyncIterator[Ticket]:
+        """Yields every ticket of a team, or those resolved within the time range, reading the cursor in batches."""
+        cursor = (
+            self.__collection.find(
+                MongoTicketRepository.query(team, time_range), projection=MongoTicketRepository.PROJECTION
             )
-            tickets.append(ticket)
+            .sort('resolved_at', DESCENDING)
+            .batch_size(MongoTicketRepository.BATCH_SIZE)
+        )
 
-        return tickets
+        async for document in cursor:
+            yield MongoTicketRepository.to_ticket(document, self.__datetime_normalizer)
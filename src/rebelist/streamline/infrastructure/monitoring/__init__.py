@@ -1,3 +1,35 @@
 from rebelist.streamline.infrastructure.monitoring.logger import Logger
+from rebelist.streamline.infrastructure.monitoring.metrics import CommandMetricsListener, Metrics, SyncRunCollector
+from rebelist.streamline.infrastructure.monitoring.profiling import Profile, ProfileFormat, SamplingProfiler
+from rebelist.streamline.infrastructure.monitoring.queries import QueryShapeStats, QueryStatsListener, query_shape
+from rebelist.streamline.infrastructure.monitoring.timing import PhaseTimer
+from rebelist.streamline.infrastructure.monitoring.tracing import (
+    TRACER,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+    traced,
+)
 
-__all__ = ['Logger']
+__all__ = [
+    'CommandMetricsListener',
+    'FileSpanExporter',
+    'InMemorySpanExporter',
+    'Logger',
+    'Metrics',
+    'PhaseTimer',
+    'Profile',
+    'ProfileFormat',
+    'QueryShapeStats',
+    'QueryStatsListener',
+    'SamplingProfiler',
+    'Span',
+    'SpanExporter',
+    'SyncRunCollector',
+    'TRACER',
+    'Tracer',
+    'query_shape',
+    'traced',
+]
@@ -4,27 +4,42 @@ from typing import Any
 
 import loguru
 
+from rebelist.streamline.config.settings import LoggingSettings
+
 
 class Logger:
     """Wrapper around the Loguru logger with dependency injection."""
 
-    def __init__(self, logger: loguru.Logger):
+    TEXT_FORMAT = '{time:YYYY-MM-DD at HH:mm:ss} | {name}:{line} | {level} | {message}'
+
+    def __init__(self, logger: loguru.Logger, settings: LoggingSettings):
         """Initializes the Logger.
 
+        The records are written by a background thread, so neither the disk nor the rotation and compression of the
+        file ever stall the caller. Each module logs at the level configured for the closest of its packages.
+
         Args:
             logger: An instance of the Loguru Logger.
+            settings: The logging settings.
         """
         self.__logger = logger.opt(depth=1)
         self.__logger.remove()
         self.__logger.add(
-            'var/logs/app.log',
+            settings.file,
             rotation='10 MB',
             retention='10 days',
             compression='zip',
-            format='{time:YYYY-MM-DD at HH:mm:ss} | {file.name}:{line} | {message}',
-            level='INFO',
+            format=self.TEXT_FORMAT,
+            serialize=settings.serialize,
+            enqueue=True,
+            filter={'': settings.level, **settings.modules},
+            level=0,
         )
 
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log debug messages."""
+        self.__logger.debug(message, *args, **kwargs)
+
     def info(self, message: str, *args: Any, **kwargs: Any) -> None:
         """Log information messages."""
         self.__logger.info(message, *args, **kwargs)
@@ -36,3 +51,7 @@ class Logger:
     def error(self, message: str, *args: Any, **kwargs: Any) -> None:
         """Log error messages."""
         self.__logger.error(message, *args, **kwargs)
+
+    def complete(self) -> None:
+        """Waits until the queued records are written."""
+        self.__logger.complete()
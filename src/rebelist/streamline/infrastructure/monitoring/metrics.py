@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import TYPE_CHECKING, Final, Generator, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+if TYPE_CHECKING:
+    from rebelist.streamline.infrastructure.mongo.run import SyncRunRepository
+
+NAMESPACE: Final[str] = 'streamline'
+EXPOSITION_MEDIA_TYPE: Final[str] = CONTENT_TYPE_LATEST
+MONGO_BUCKETS: Final[tuple[float, ...]] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Metrics:
+    """Runtime instruments of the application, published in the Prometheus text format.
+
+    Every instance keeps its own registry, so the instruments never clash with those of other instances or libraries.
+    """
+
+    def __init__(self) -> None:
+        self.__registry = CollectorRegistry()
+        self.__request_duration = Histogram(
+            'http_request_duration_seconds',
+            'Latency of the API requests per route template.',
+            ['method', 'route', 'status'],
+            namespace=NAMESPACE,
+            registry=self.__registry,
+        )
+        self.__command_duration = Histogram(
+            'mongo_command_duration_seconds',
+            'Duration of the MongoDB commands per collection and command.',
+            ['collection', 'command', 'outcome'],
+            namespace=NAMESPACE,
+            registry=self.__registry,
+            buckets=MONGO_BUCKETS,
+        )
+        self.__compute_duration = Histogram(
+            'compute_duration_seconds',
+            'Time spent computing the datapoints of a metric, excluding the database reads.',
+            ['metric'],
+            namespace=NAMESPACE,
+            registry=self.__registry,
+        )
+        self.__cache_lookups = Counter(
+            'cache_lookups',
+            'Lookups of the response caches per outcome.',
+            ['cache', 'result'],
+            namespace=NAMESPACE,
+            registry=self.__registry,
+        )
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Records the latency of an API request."""
+        self.__request_duration.labels(method, route, str(status)).observe(seconds)
+
+    def observe_command(self, collection: str, command: str, succeeded: bool, seconds: float) -> None:
+        """Records the duration of a MongoDB command."""
+        self.__command_duration.labels(collection, command, 'success' if succeeded else 'failure').observe(seconds)
+
+    @contextmanager
+    def measure_compute(self, metric: str) -> Generator[None]:
+        """Measures the enclosed computation of a metric."""
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self.__compute_duration.labels(metric).observe(perf_counter() - started_at)
+
+    def count_cache_lookup(self, cache: str, hit: bool) -> None:
+        """Counts a cache lookup as a hit or a miss."""
+        self.__cache_lookups.labels(cache, 'hit' if hit else 'miss').inc()
+
+    def register(self, collector: Collector) -> None:
+        """Publishes the metrics of a custom collector along with the instruments."""
+        self.__registry.register(collector)
+
+    def export(self) -> bytes:
+        """Renders every metric in the Prometheus text format."""
+        return generate_latest(self.__registry)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """MongoDB command listener recording the duration of every command per collection."""
+
+    def __init__(self, metrics: Metrics) -> None:
+        self.__metrics = metrics
+        self.__collections: dict[tuple[object, int, int | None], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remembers the collection of a command, which only the started event carries."""
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = event.command.get('collection')  # getMore names the cursor first and the collection after.
+        self.__collections[self.__key(event)] = collection if isinstance(collection, str) else ''
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Records the duration of a successful command."""
+        self.__observe(event, True)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Records the duration of a failed command."""
+        self.__observe(event, False)
+
+    def __observe(
+        self, event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent, succeeded: bool
+    ) -> None:
+        """Records the duration of a finished command."""
+        collection = self.__collections.pop(self.__key(event), '')
+        self.__metrics.observe_command(collection, event.command_name, succeeded, event.duration_micros / 1_000_000)
+
+    @staticmethod
+    def __key(
+        event: monitoring.CommandStartedEvent | monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent,
+    ) -> tuple[object, int, int | None]:
+        """Identifies a command across its started and finished events."""
+        return event.connection_id, event.request_id, event.operation_id
+
+
+class SyncRunCollector(Collector):
+    """Collector publishing the start time and the duration of each job of the latest synchronization run.
+
+    Synchronizations run in the CLI, so the figures are read from their stored reports on every scrape.
+    """
+
+    def __init__(self, run_repository: SyncRunRepository) -> None:
+        self.__run_repository = run_repository
+
+    def collect(self) -> Iterator[Metric]:
+        """Reads the latest run report and yields its gauges."""
+        started_at, duration = self.__families()
+        try:
+            runs = self.__run_repository.find_recent(1)
+        except PyMongoError:
+            runs = []  # The other metrics are still worth scraping while the database is unreachable.
+
+        for run in runs:
+            for job in run.jobs:
+                started_at.add_metric([job['job']], run.started_at.timestamp())
+                duration.add_metric([job['job']], job['duration'])
+
+        yield started_at
+        yield duration
+
+    def describe(self) -> Iterator[Metric]:
+        """Yields the gauges without samples, so registering the collector does not hit the database."""
+        yield from self.__families()
+
+    @staticmethod
+    def __families() -> tuple[GaugeMetricFamily, GaugeMetricFamily]:
+        """Creates the empty gauges of the collector."""
+        return (
+            GaugeMetricFamily(
+                f'{NAMESPACE}_sync_last_run_timestamp_seconds',
+                'Start time of the latest synchronization run per job.',
+                labels=['job'],
+            ),
+            GaugeMetricFamily(
+                f'{NAMESPACE}_sync_last_run_duration_seconds',
+                'Duration of each job in the latest synchronization run.',
+                labels=['job'],
+            ),
+        )
@@ -0,0 +1,168 @@
+import json
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import StrEnum
+from time import perf_counter, sleep
+from types import FrameType
+from typing import Any, Final
+
+SPEEDSCOPE_SCHEMA: Final[str] = 'https://www.speedscope.app/file-format-schema.json'
+
+type Frame = tuple[str, str, int]
+type Stack = tuple[Frame, ...]
+
+
+class ProfileFormat(StrEnum):
+    """Formats a profile can be rendered in."""
+
+    SPEEDSCOPE = 'speedscope'
+    COLLAPSED = 'collapsed'
+
+
+@dataclass
+class Profile:
+    """Stacks sampled per thread, counted by how many times each was seen."""
+
+    name: str
+    duration: float = 0.0
+    rounds: int = 0
+    samples: dict[str, Counter[Stack]] = field(default_factory=dict[str, Counter[Stack]])
+
+    @property
+    def period(self) -> float:
+        """Get the average time between two samples of a thread, in seconds.
+
+        It is longer than the interval of the profiler when a busy thread holds the GIL.
+        """
+        return self.duration / self.rounds if self.rounds else 0.0
+
+    @property
+    def sample_count(self) -> int:
+        """Get the number of stacks sampled across all threads."""
+        return sum(sum(stacks.values()) for stacks in self.samples.values())
+
+    def render(self, profile_format: ProfileFormat) -> str:
+        """Renders the profile in the given format."""
+        if profile_format is ProfileFormat.COLLAPSED:
+            return self.to_collapsed()
+        return self.to_speedscope()
+
+    def to_collapsed(self) -> str:
+        """Renders the folded stacks read by flamegraph.pl, inferno and speedscope, one 'a;b;c count' line per stack."""
+        lines = [
+            ';'.join([thread, *(Profile.label(frame) for frame in stack)]) + f' {count}'
+            for thread, stacks in sorted(self.samples.items())
+            for stack, count in stacks.most_common()
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def to_speedscope(self) -> str:
+        """Renders a speedscope document, with one sampled profile per thread."""
+        frames: dict[Frame, int] = {}
+        profiles: list[dict[str, Any]] = []
+        for thread, stacks in sorted(self.samples.items()):
+            samples = [[frames.setdefault(frame, len(frames)) for frame in stack] for stack in stacks]
+            weights = [count * self.period for count in stacks.values()]
+            profiles.append(
+                {
+                    'type': 'sampled',
+                    'name': thread,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': sum(weights),
+                    'samples': samples,
+                    'weights': weights,
+                }
+            )
+
+        document = {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': self.name,
+            'exporter': 'streamline',
+            'activeProfileIndex': 0,
+            'shared': {'frames': [{'name': name, 'file': file, 'line': line} for name, file, line in frames]},
+            'profiles': profiles,
+        }
+        return json.dumps(document, separators=(',', ':'))
+
+    @staticmethod
+    def label(frame: Frame) -> str:
+        """Names a frame after its function, file and line."""
+        name, file, line = frame
+        return f'{name} ({file}:{line})'
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the stacks of every thread of the process from a background thread.
+
+    Unlike a deterministic profiler, the profiled code runs untouched, so it can be sampled in production at a cost
+    bounded by the interval. Nothing runs while no profile is being taken.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.__interval = interval
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__profile: Profile | None = None
+
+    @property
+    def running(self) -> bool:
+        """Tells whether a profile is being taken."""
+        return self.__thread is not None
+
+    def start(self, name: str) -> None:
+        """Starts sampling in the background.
+
+        RuntimeError: If a profile is already being taken, only one can run at a time.
+        """
+        with self.__lock:
+            if self.__thread is not None:
+                raise RuntimeError('A profile is already being taken.')
+
+            self.__profile = Profile(name)
+            self.__stopped.clear()
+            self.__thread = threading.Thread(
+                target=self.__sample, args=(self.__profile,), name='streamline-profiler', daemon=True
+            )
+            self.__thread.start()
+
+    def stop(self) -> Profile:
+        """Stops sampling, returning the profile taken since the start.
+
+        RuntimeError: If no profile is being taken.
+        """
+        with self.__lock:
+            if self.__thread is None or self.__profile is None:
+                raise RuntimeError('No profile is being taken.')
+
+            self.__stopped.set()
+            self.__thread.join()
+            profile, self.__thread, self.__profile = self.__profile, None, None
+            return profile
+
+    def __sample(self, profile: Profile) -> None:
+        """Records the stack of every other thread until stopped."""
+        own_id = threading.get_ident()
+        started_at = perf_counter()
+        while not self.__stopped.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():  # pyright: ignore[reportPrivateUsage]
+                if thread_id != own_id:
+                    thread = names.get(thread_id, str(thread_id))
+                    profile.samples.setdefault(thread, Counter())[SamplingProfiler.stack(frame)] += 1
+            profile.rounds += 1
+            sleep(self.__interval)
+        profile.duration = perf_counter() - started_at
+
+    @staticmethod
+    def stack(frame: FrameType | None) -> Stack:
+        """Walks a frame up to the root, returning its calls from the outermost."""
+        frames: list[Frame] = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(frames))
@@ -0,0 +1,332 @@
+import json
+import threading
+from dataclasses import dataclass
+from queue import Full, Queue
+from typing import Any, Callable, Final, Mapping, cast
+
+from bson import encode
+from pymongo import MongoClient, monitoring
+
+from rebelist.streamline.config.settings import QueriesSettings, Settings
+from rebelist.streamline.infrastructure.monitoring.logger import Logger
+
+ENVELOPE_FIELDS: Final[frozenset[str]] = frozenset(
+    {
+        '$clusterTime',
+        '$db',
+        '$readPreference',
+        'apiDeprecationErrors',
+        'apiStrict',
+        'apiVersion',
+        'autocommit',
+        'batchSize',
+        'bypassDocumentValidation',
+        'comment',
+        'cursor',
+        'documents',
+        'lsid',
+        'maxTimeMS',
+        'ordered',
+        'readConcern',
+        'startTransaction',
+        'txnNumber',
+        'writeConcern',
+    }
+)
+LITERAL_FIELDS: Final[frozenset[str]] = frozenset(
+    {'$limit', '$lookup', '$project', '$skip', '$sort', '$unwind', 'limit', 'projection', 'skip', 'sort'}
+)
+IGNORED_COMMANDS: Final[frozenset[str]] = frozenset({'explain', 'killCursors', 'endSessions'})
+EXPLAINABLE_COMMANDS: Final[frozenset[str]] = frozenset(
+    {'aggregate', 'count', 'delete', 'distinct', 'find', 'findAndModify', 'update'}
+)
+OTHER_SHAPE: Final[str] = '<other>'
+MAX_LOGGED_COMMAND: Final[int] = 2000
+
+
+def query_shape(command_name: str, command: Mapping[str, Any]) -> str:
+    """Names the shape of a command, its collection and its filter or pipeline with the compared values left out.
+
+    Two queries differing only by the values they look for, e.g. the team or the dates, share their shape.
+    """
+    collection = command.get(command_name)
+    body = {key: value for key, value in command.items() if key != command_name and key not in ENVELOPE_FIELDS}
+    return f'{command_name} {collection} {json.dumps(_shape(body, False), default=str)}'
+
+
+def _shape(value: Any, literal: bool, field: str = '') -> Any:
+    """Replaces the values of a document with placeholders, except the field paths and the structural stages."""
+    if isinstance(value, Mapping):
+        fields = cast(Mapping[str, Any], value)
+        if field == 'u' and not any(key.startswith('$') for key in fields):
+            return '?'  # The replacement document of an update is data, not a query.
+        return {key: _shape(item, literal or key in LITERAL_FIELDS, key) for key, item in fields.items()}
+    if isinstance(value, list):
+        items = cast(list[Any], value)
+        if all(not isinstance(item, Mapping | list) for item in items):
+            return items if literal else '?'
+        shapes: list[Any] = []
+        for item in items:
+            if (shape := _shape(item, literal, field)) not in shapes:
+                shapes.append(shape)
+        return shapes
+    if literal or (isinstance(value, str) and value.startswith('$')):
+        return value
+    return '?'
+
+
+def summarize_plan(explain: Mapping[str, Any]) -> str:
+    """Condenses the winning plan of an explain output, e.g. 'FETCH > IXSCAN team_1_resolved_at_-1'."""
+    planner: Mapping[str, Any] | None = explain.get('queryPlanner')
+    stages: list[str] = []
+    if planner is None:
+        for stage in explain.get('stages', []):
+            cursor = stage.get('$cursor')
+            if cursor and 'queryPlanner' in cursor:
+                planner = cursor['queryPlanner']
+            else:
+                stages.extend(key for key in stage if key.startswith('$'))
+
+    if planner is None:
+        return ' > '.join(stages) or 'unknown'
+
+    plan: Mapping[str, Any] | None = planner.get('winningPlan')
+    plan = plan.get('queryPlan', plan) if plan else None
+    steps: list[str] = []
+    while plan:
+        stage = str(plan.get('stage', '?'))
+        steps.append(f'{stage} {plan["indexName"]}' if 'indexName' in plan else stage)
+        inputs = cast(list[Mapping[str, Any] | None], plan.get('inputStages') or [plan.get('inputStage')])
+        plan = inputs[0]
+
+    return ' > '.join(steps + stages)
+
+
+@dataclass(slots=True)
+class QueryShapeStats:
+    """Figures of the commands sharing a query shape."""
+
+    shape: str
+    command: str
+    collection: str
+    count: int = 0
+    failures: int = 0
+    round_trips: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    documents: int = 0
+    bytes: int = 0
+    slow: int = 0
+    plan: str | None = None
+
+    @property
+    def mean_ms(self) -> float:
+        """Get the average duration of a command, its cursor round trips included."""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Describes the figures."""
+        return {
+            'shape': self.shape,
+            'command': self.command,
+            'collection': self.collection,
+            'count': self.count,
+            'failures': self.failures,
+            'round_trips': self.round_trips,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.mean_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'documents': self.documents,
+            'bytes': self.bytes,
+            'slow': self.slow,
+            'plan': self.plan,
+        }
+
+
+@dataclass(slots=True)
+class _PendingCommand:
+    """Command started but not yet finished."""
+
+    stats: QueryShapeStats
+    command: dict[str, Any] | None
+    database: str
+    settings: QueriesSettings
+    cursor_id: int | None = None
+
+
+class QueryStatsListener(monitoring.CommandListener):
+    """MongoDB command listener aggregating the duration, documents and bytes returned per query shape.
+
+    The getMore round trips of a cursor count towards the query that opened it. Commands slower than the threshold are
+    logged along with the plan MongoDB chose for them, explained once per shape by a background thread through its own
+    client, so neither the caller nor the monitored client ever waits for it.
+
+    The settings are read once per command and the logger on use, so a reload takes effect without replacing the
+    client listened to. While the statistics are disabled, nothing is pending and finished commands are ignored
+    before their reply is looked at.
+    """
+
+    EXPLAIN_QUEUE_SIZE: Final[int] = 100
+
+    def __init__(self, settings: Callable[[], Settings], logger: Callable[[], Logger], mongo_uri: str) -> None:
+        self.__settings = settings
+        self.__logger = logger
+        self.__mongo_uri = mongo_uri
+        self.__lock = threading.Lock()
+        self.__stats: dict[str, QueryShapeStats] = {}
+        self.__pending: dict[tuple[object, int, int | None], _PendingCommand] = {}
+        self.__cursors: dict[int, QueryShapeStats] = {}
+        self.__explains: Queue[tuple[_PendingCommand, float]] = Queue(self.EXPLAIN_QUEUE_SIZE)
+        self.__explainer: threading.Thread | None = None
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Resolves the query shape of a command, or the query of the cursor a getMore reads."""
+        settings = self.__settings().queries
+        if not settings.enabled or event.command_name in IGNORED_COMMANDS:
+            return
+
+        with self.__lock:
+            if event.command_name == 'getMore':
+                cursor_id = int(event.command['getMore'])
+                stats = self.__cursors.get(cursor_id)
+                if stats:
+                    self.__pending[self.__key(event)] = _PendingCommand(
+                        stats, None, event.database_name, settings, cursor_id
+                    )
+                return
+
+            collection = event.command.get(event.command_name)
+            if not isinstance(collection, str):
+                return  # Admin and handshake commands, e.g. ping, do not target any collection.
+
+            shape = query_shape(event.command_name, event.command)
+            stats = self.__stats.get(shape)
+            if stats is None:
+                if len(self.__stats) >= settings.max_shapes:
+                    shape, collection = OTHER_SHAPE, ''
+                stats = self.__stats.setdefault(shape, QueryShapeStats(shape, event.command_name, collection))
+
+            command = dict(event.command) if event.command_name in EXPLAINABLE_COMMANDS else None
+            self.__pending[self.__key(event)] = _PendingCommand(stats, command, event.database_name, settings)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Records the duration, documents and bytes of a successful command."""
+        pending = self.__pop(event)
+        if pending is None:
+            return
+
+        reply: Mapping[str, Any] = event.reply
+        cursor: Mapping[str, Any] = reply.get('cursor') or {}
+        batch: list[Any] | None = cursor.get('firstBatch', cursor.get('nextBatch'))
+        documents = len(batch) if batch is not None else int(reply.get('n', 0))
+        self.__observe(pending, event, True, documents, len(encode(reply)), int(cursor.get('id', 0)))
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Records the duration of a failed command."""
+        pending = self.__pop(event)
+        if pending is not None:
+            self.__observe(pending, event, False, 0, 0, 0)
+
+    def stats(self, sort: str = 'total_ms', limit: int = 50) -> list[dict[str, Any]]:
+        """Describes the figures of the query shapes, the greatest first by the sort figure."""
+        with self.__lock:
+            figures = [stats.to_dict() for stats in self.__stats.values()]
+        return sorted(figures, key=lambda figure: figure[sort], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Forgets the figures recorded so far."""
+        with self.__lock:
+            self.__stats.clear()
+            self.__cursors.clear()
+
+    def __pop(self, event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent) -> _PendingCommand | None:
+        """Takes the pending entry of a finished command, None when the command is not followed."""
+        if not self.__pending:
+            return None  # Nothing is followed while the statistics are disabled, no need to take the lock.
+
+        with self.__lock:
+            return self.__pending.pop(self.__key(event), None)
+
+    def __observe(
+        self,
+        pending: _PendingCommand,
+        event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent,
+        succeeded: bool,
+        documents: int,
+        size: int,
+        cursor_id: int,
+    ) -> None:
+        """Adds a finished command to the figures of its shape, logging it when slow."""
+        duration_ms = event.duration_micros / 1000
+        settings = pending.settings
+        with self.__lock:
+            stats = pending.stats
+            stats.count += pending.cursor_id is None
+            stats.failures += not succeeded
+            stats.round_trips += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.documents += documents
+            stats.bytes += size
+            if cursor_id:
+                self.__cursors[cursor_id] = stats
+            elif pending.cursor_id is not None:
+                self.__cursors.pop(pending.cursor_id, None)  # The cursor is exhausted or failed.
+
+            slow = duration_ms >= settings.slow_ms
+            stats.slow += slow
+
+        if not slow:
+            return
+        if settings.explain and pending.command is not None and stats.plan is None and stats.shape != OTHER_SHAPE:
+            self.__explain(pending, duration_ms)
+        else:
+            self.__log_slow(pending, duration_ms)
+
+    def __explain(self, pending: _PendingCommand, duration_ms: float) -> None:
+        """Hands a slow command over to the explaining thread, logging it right away when that one is busy."""
+        try:
+            self.__explains.put_nowait((pending, duration_ms))
+        except Full:
+            self.__log_slow(pending, duration_ms)
+            return
+
+        with self.__lock:
+            if self.__explainer is None:
+                self.__explainer = threading.Thread(target=self.__run_explainer, name='streamline-explain', daemon=True)
+                self.__explainer.start()
+
+    def __run_explainer(self) -> None:
+        """Explains the queued slow commands with a client of its own, which is not listened to."""
+        client: MongoClient[Mapping[str, Any]] = MongoClient(self.__mongo_uri, tz_aware=True, maxPoolSize=1)
+        while True:
+            pending, duration_ms = self.__explains.get()
+            if pending.stats.plan is None and pending.command is not None:
+                command = {key: value for key, value in pending.command.items() if key not in ENVELOPE_FIELDS}
+                if pending.stats.command == 'aggregate':
+                    command['cursor'] = {}
+                try:
+                    explain = client[pending.database].command({'explain': command, 'verbosity': 'queryPlanner'})
+                    pending.stats.plan = summarize_plan(explain)
+                except Exception as e:
+                    pending.stats.plan = f'unavailable: {e}'
+            self.__log_slow(pending, duration_ms)
+
+    def __log_slow(self, pending: _PendingCommand, duration_ms: float) -> None:
+        """Logs a slow command with its shape, its plan and what it asked for."""
+        command = pending.command or {}
+        body = {key: value for key, value in command.items() if key not in ENVELOPE_FIELDS}
+        self.__logger().warning(
+            'Slow MongoDB command.',
+            shape=pending.stats.shape,
+            duration_ms=round(duration_ms, 3),
+            plan=pending.stats.plan,
+            command=json.dumps(body, default=str)[:MAX_LOGGED_COMMAND],
+        )
+
+    @staticmethod
+    def __key(
+        event: monitoring.CommandStartedEvent | monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent,
+    ) -> tuple[object, int, int | None]:
+        """Identifies a command across its started and finished events."""
+        return event.connection_id, event.request_id, event.operation_id
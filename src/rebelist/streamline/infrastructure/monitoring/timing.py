@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import Generator
+
+from rebelist.streamline.infrastructure.monitoring.tracing import TRACER
+
+
+@dataclass(slots=True)
+class Measurement:
+    """Duration, in seconds, of a single measured block, set once the block exits."""
+
+    seconds: float = 0.0
+
+
+class PhaseTimer:
+    """Accumulates wall-clock durations, in seconds, per named phase, recording each measurement as a span.
+
+    The durations are added up under a lock, so several threads can measure with the same timer.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        self.__durations: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Generator[Measurement]:
+        """Measures the enclosed block and adds its duration to the phase."""
+        measurement = Measurement()
+        started_at = perf_counter()
+        try:
+            with TRACER.span(phase):
+                yield measurement
+        finally:
+            measurement.seconds = perf_counter() - started_at
+            with self.__lock:
+                self.__durations[phase] = self.__durations.get(phase, 0.0) + measurement.seconds
+
+    @property
+    def durations(self) -> dict[str, float]:
+        """Returns a copy of the accumulated durations."""
+        with self.__lock:
+            return dict(self.__durations)
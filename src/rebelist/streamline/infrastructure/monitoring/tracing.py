@@ -0,0 +1,297 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import re
+import secrets
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Full, Queue
+from threading import Lock, Thread
+from time import time_ns
+from typing import Any, Callable, Final, Generator, Protocol, Sequence, cast
+
+SCOPE_NAME: Final[str] = 'rebelist.streamline'
+SERVICE_NAME: Final[str] = 'streamline'
+TRACEPARENT_PATTERN: Final[re.Pattern[str]] = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+
+@dataclass(slots=True)
+class Span:
+    """Timed operation of a trace, following the OpenTelemetry span model."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, str | int | float | bool] = field(default_factory=dict[str, str | int | float | bool])
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Get the duration of the span in milliseconds."""
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    @property
+    def traceparent(self) -> str:
+        """Get the W3C trace context header identifying the span."""
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Converts the span to its OTLP JSON representation."""
+        status = {'code': 'STATUS_CODE_ERROR', 'message': self.error} if self.error else {'code': 'STATUS_CODE_OK'}
+        span: dict[str, Any] = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 'SPAN_KIND_INTERNAL',
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in self.attributes.items()],
+            'status': status,
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+def _otlp_value(value: str | int | float | bool) -> dict[str, Any]:
+    """Wraps an attribute value in its OTLP JSON type."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': value}
+
+
+class SpanExporter(Protocol):
+    """Destination of the finished spans."""
+
+    def export(self, span: Span) -> None:
+        """Receives a finished span."""
+        ...
+
+    def flush(self) -> None:
+        """Waits until the received spans are stored."""
+        ...
+
+
+class InMemorySpanExporter:
+    """Keeps the latest finished spans in memory, so the traces of the process can be browsed through the API."""
+
+    def __init__(self, capacity: int) -> None:
+        self.__spans: deque[Span] = deque(maxlen=capacity)
+
+    def export(self, span: Span) -> None:
+        """Stores a finished span, forgetting the oldest one once full."""
+        self.__spans.append(span)
+
+    def flush(self) -> None:
+        """Does nothing, the spans are stored as soon as they are received."""
+
+    def traces(self, limit: int = 50, min_duration_ms: float = 0.0) -> list[dict[str, Any]]:
+        """Summarizes the slowest of the collected traces, by the span that started first in each of them."""
+        roots: dict[str, Span] = {}
+        counts: dict[str, int] = {}
+        for span in list(self.__spans):
+            counts[span.trace_id] = counts.get(span.trace_id, 0) + 1
+            root = roots.get(span.trace_id)
+            if root is None or span.start_ns < root.start_ns:
+                roots[span.trace_id] = span
+
+        slowest = sorted(roots.values(), key=lambda root: root.duration_ms, reverse=True)
+        return [
+            {
+                'trace_id': root.trace_id,
+                'name': root.name,
+                'start_ns': root.start_ns,
+                'duration_ms': root.duration_ms,
+                'spans': counts[root.trace_id],
+                'error': root.error,
+            }
+            for root in slowest
+            if root.duration_ms >= min_duration_ms
+        ][:limit]
+
+    def trace(self, trace_id: str) -> list[Span]:
+        """Returns the collected spans of a trace, in the order they started."""
+        return sorted((span for span in list(self.__spans) if span.trace_id == trace_id), key=lambda s: s.start_ns)
+
+
+class FileSpanExporter:
+    """Appends every finished span to a file, one OTLP JSON export request per line.
+
+    The OpenTelemetry Collector reads that format with its otlpjsonfile receiver, so the spans can be forwarded to any
+    tracing backend later on. The spans are queued and written in batches by a background thread, so neither the disk
+    nor the serialization ever stall the caller, e.g. the event loop of an API worker. Spans finishing while the queue
+    is full are dropped and counted.
+    """
+
+    QUEUE_SIZE: Final[int] = 10_000
+    BATCH_SIZE: Final[int] = 500
+
+    def __init__(self, path: str | Path) -> None:
+        self.__path = Path(path)
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        self.__lock = Lock()
+        self.__spans: Queue[Span] = Queue(self.QUEUE_SIZE)
+        self.__writer: Thread | None = None
+        self.__writer_pid = 0
+        self.__dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Get the number of spans lost because the queue was full or the file could not be written."""
+        return self.__dropped
+
+    def export(self, span: Span) -> None:
+        """Queues a finished span for writing."""
+        if self.__writer_pid != os.getpid():
+            self.__start_writer()
+
+        try:
+            self.__spans.put_nowait(span)
+        except Full:
+            self.__dropped += 1
+
+    def flush(self) -> None:
+        """Waits until the queued spans are written."""
+        if self.__writer_pid == os.getpid():
+            self.__spans.join()
+
+    def __start_writer(self) -> None:
+        """Starts the writing thread of the process, a forked process starts its own with an empty queue."""
+        with self.__lock:
+            if self.__writer_pid == os.getpid():
+                return
+            if self.__writer is not None:
+                self.__spans = Queue(self.QUEUE_SIZE)  # The thread filling the inherited queue is not forked.
+            self.__writer = Thread(target=self.__write, args=(self.__spans,), name='streamline-spans', daemon=True)
+            self.__writer.start()
+            self.__writer_pid = os.getpid()
+
+    def __write(self, spans: Queue[Span]) -> None:
+        """Writes the queued spans, as many as available at once up to a batch."""
+        while True:
+            batch = [spans.get()]
+            while len(batch) < self.BATCH_SIZE and not spans.empty():
+                batch.append(spans.get_nowait())
+
+            try:
+                lines = [json.dumps(_export_request(span), separators=(',', ':')) + '\n' for span in batch]
+                with self.__path.open('a', encoding='utf-8') as file:
+                    file.writelines(lines)
+            except OSError:
+                self.__dropped += len(batch)
+            finally:
+                for _ in batch:
+                    spans.task_done()
+
+
+def _export_request(span: Span) -> dict[str, Any]:
+    """Wraps a span in an OTLP JSON export request of the service."""
+    return {
+        'resourceSpans': [
+            {
+                'resource': {'attributes': [{'key': 'service.name', 'value': _otlp_value(SERVICE_NAME)}]},
+                'scopeSpans': [{'scope': {'name': SCOPE_NAME}, 'spans': [span.to_otlp()]}],
+            }
+        ]
+    }
+
+
+_current_span: ContextVar[Span | None] = ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """Records spans nested after the context they are opened in, which follows the requests into threads and tasks.
+
+    Without exporters nothing is recorded, so instrumented code only pays for a context manager.
+    """
+
+    def __init__(self) -> None:
+        self.__exporters: tuple[SpanExporter, ...] = ()
+
+    @property
+    def enabled(self) -> bool:
+        """Tells whether the spans are recorded."""
+        return bool(self.__exporters)
+
+    def configure(self, exporters: Sequence[SpanExporter]) -> None:
+        """Replaces the exporters receiving the finished spans, none disables tracing."""
+        self.__exporters = tuple(exporters)
+
+    def flush(self) -> None:
+        """Waits until the exporters stored the finished spans."""
+        for exporter in self.__exporters:
+            exporter.flush()
+
+    @staticmethod
+    def current_span() -> Span | None:
+        """Returns the span of the running operation."""
+        return _current_span.get()
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: dict[str, str | int | float | bool] | None = None, traceparent: str | None = None
+    ) -> Generator[Span | None]:
+        """Records the enclosed block as a child of the current span, or of the remote span of a traceparent header."""
+        exporters = self.__exporters
+        if not exporters:
+            yield None
+            return
+
+        parent = _current_span.get()
+        remote = TRACEPARENT_PATTERN.match(traceparent or '')
+        if remote:
+            trace_id, parent_id = remote.group(1), remote.group(2)
+        elif parent:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+
+        span = Span(name, trace_id, secrets.token_hex(8), parent_id, time_ns(), attributes=dict(attributes or {}))
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            span.end_ns = time_ns()
+            _current_span.reset(token)
+            for exporter in exporters:
+                exporter.export(span)
+
+
+TRACER: Final[Tracer] = Tracer()
+atexit.register(TRACER.flush)
+
+
+def traced[**P, R](function: Callable[P, R]) -> Callable[P, R]:
+    """Records every call of a function or coroutine function as a span named after it."""
+    name = function.__qualname__
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def traced_coroutine(*args: P.args, **kwargs: P.kwargs) -> Any:
+            with TRACER.span(name):
+                return await function(*args, **kwargs)
+
+        return cast(Callable[P, R], traced_coroutine)
+
+    @functools.wraps(function)
+    def traced_function(*args: P.args, **kwargs: P.kwargs) -> R:
+        with TRACER.span(name):
+            return function(*args, **kwargs)
+
+    return traced_function
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+import pytest
+
+from rebelist.streamline.application.compute import CycleTimeDataPoint, DurationBucketDataPoint, bucket_durations
+from rebelist.streamline.application.compute.aggregation import percentile
+
+DAY = 86400
+
+
+def datapoint(resolved_at: int, duration: float) -> CycleTimeDataPoint:
+    """Builds a cycle time datapoint resolved at an epoch timestamp."""
+    return CycleTimeDataPoint(duration=duration, resolved_at=resolved_at, key=f'ABC-{resolved_at}', story_points=None)
+
+
+def test_percentile_interpolates_between_ranks() -> None:
+    """Tests percentiles interpolate linearly and handle a single value."""
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.85) == pytest.approx(3.55)
+    assert percentile([7.0], 0.85) == 7.0
+
+
+def test_bucket_durations_aggregates_per_interval() -> None:
+    """Tests datapoints are grouped by epoch-aligned interval and aggregated in chronological order."""
+    datapoints = [
+        datapoint(10 * DAY + 5, 4.0),
+        datapoint(3 * DAY + 100, 1.0),
+        datapoint(3 * DAY + 200, 3.0),
+        datapoint(3 * DAY + 300, 2.0),
+    ]
+
+    buckets = bucket_durations(datapoints, timedelta(days=7))
+
+    assert [bucket.bucket for bucket in buckets] == [0, 7 * DAY]
+    assert buckets[0].model_dump(exclude={'p85'}) == {'bucket': 0, 'count': 3, 'mean': 2.0, 'p50': 2.0}
+    assert buckets[0].p85 == pytest.approx(2.7)
+    assert buckets[1] == DurationBucketDataPoint(bucket=7 * DAY, count=1, mean=4.0, p50=4.0, p85=4.0)
+
+
+def test_bucket_durations_without_datapoints() -> None:
+    """Tests an empty history produces no buckets."""
+    assert bucket_durations([], timedelta(hours=1)) == []
+
+
+def test_bucket_durations_rejects_sub_second_intervals() -> None:
+    """Tests the interval has to be at least one second long."""
+    with pytest.raises(ValueError):
+        bucket_durations([datapoint(0, 1.0)], timedelta(milliseconds=10))
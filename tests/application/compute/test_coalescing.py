@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from rebelist.streamline.application.compute import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    """Tests callers of the same key await a single execution and share its result."""
+    calls: list[str] = []
+
+    async def compute(key: str) -> list[str]:
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return [key]
+
+    async def scenario() -> list[list[str]]:
+        single_flight = SingleFlight()
+        results = await asyncio.gather(
+            *(single_flight.do('alpha', lambda: compute('alpha')) for _ in range(10)),
+            single_flight.do('beta', lambda: compute('beta')),
+        )
+        assert single_flight.in_flight() == 0
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert sorted(calls) == ['alpha', 'beta']
+    assert all(result is results[0] for result in results[:10])
+    assert results[10] == ['beta']
+
+
+def test_settled_calls_run_again() -> None:
+    """Tests the key is released once the call settles, so later callers get fresh results."""
+    calls: list[int] = []
+
+    async def compute() -> int:
+        calls.append(len(calls))
+        return len(calls)
+
+    async def scenario() -> tuple[int, int]:
+        single_flight = SingleFlight()
+        return await single_flight.do('alpha', compute), await single_flight.do('alpha', compute)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_exceptions_are_shared() -> None:
+    """Tests every concurrent caller receives the exception of the shared call."""
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError('Mongo is down')
+
+    async def scenario() -> list[BaseException | None]:
+        single_flight = SingleFlight()
+        return await asyncio.gather(*(single_flight.do('alpha', fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert results[0] is results[1] is results[2]
+
+
+def test_cancelled_caller_does_not_cancel_the_call() -> None:
+    """Tests a caller giving up leaves the shared call running for the others."""
+
+    async def compute() -> str:
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    async def scenario() -> str:
+        single_flight = SingleFlight()
+        impatient = asyncio.ensure_future(single_flight.do('alpha', compute))
+        patient = asyncio.ensure_future(single_flight.do('alpha', compute))
+        await asyncio.sleep(0)
+        impatient.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(scenario()) == 'done'
@@ -1,16 +1,16 @@
-from typing import Any, List
-from unittest.mock import MagicMock, Mock, create_autospec
+import asyncio
+from typing import Any, AsyncIterator
+from unittest.mock import MagicMock, Mock, call, create_autospec
 
 import pytest
+from pytest_mock import MockerFixture
 
 from rebelist.streamline.application.compute import (
     CycleTimeDataPoint,
-    LeadTimeDataPoint,
-    SprintCycleTimeDataPoint,
-    ThroughputDataPoint,
+    FlowMetric,
     VelocityDataPoint,
 )
-from rebelist.streamline.application.compute.services import FlowMetricsService
+from rebelist.streamline.application.compute.services import AsyncFlowMetricsService
 from rebelist.streamline.application.compute.use_cases import (
     GetCycleTimesUseCase,
     GetLeadTimesUseCase,
@@ -18,6 +18,9 @@ from rebelist.streamline.application.compute.use_cases import (
     GetThroughputUseCase,
     GetVelocityUseCase,
 )
+from rebelist.streamline.domain.sprint import AsyncSprintRepository
+from rebelist.streamline.domain.ticket import AsyncTicketRepository
+from rebelist.streamline.infrastructure.monitoring import InMemorySpanExporter, Metrics, Tracer
 
 
 @pytest.fixture
@@ -50,120 +53,188 @@ def velocity_use_case() -> MagicMock:
     return create_autospec(GetVelocityUseCase, instance=True)
 
 
-@pytest.fixture
-def flow_metrics_service(
-    cycle_time_sprints_use_case: MagicMock,
-    cycle_time_use_case: Mock,
-    lead_time_use_case: Mock,
-    throughput_use_case: Mock,
-    velocity_use_case: Mock,
-) -> FlowMetricsService:
-    """Fixture to create FlowMetricsService with all mocked dependencies."""
-    return FlowMetricsService(
-        cycle_time_sprints_use_case,
-        cycle_time_use_case,
-        lead_time_use_case,
-        throughput_use_case,
-        velocity_use_case,
-    )
-
-
-class TestFlowMetricsService:
-    """Tests for FlowMetricsService methods."""
-
-    def test_get_cycle_times_sprints(
+class TestAsyncFlowMetricsService:
+    """Tests for AsyncFlowMetricsService methods."""
+
+    @pytest.fixture
+    def async_sprint_repository(self) -> MagicMock:
+        """Fixture for mocking AsyncSprintRepository."""
+        return create_autospec(AsyncSprintRepository, instance=True)
+
+    @pytest.fixture
+    def async_ticket_repository(self) -> MagicMock:
+        """Fixture for mocking AsyncTicketRepository."""
+        return create_autospec(AsyncTicketRepository, instance=True)
+
+    @pytest.fixture
+    def metrics(self) -> Metrics:
+        """Fixture for the runtime metrics recorded by the service."""
+        return Metrics()
+
+    @pytest.fixture
+    def spans(self) -> InMemorySpanExporter:
+        """Fixture for the spans recorded by the service."""
+        return InMemorySpanExporter(100)
+
+    @pytest.fixture
+    def tracer(self, spans: InMemorySpanExporter) -> Tracer:
+        """Fixture for the tracer recording the computations."""
+        tracer = Tracer()
+        tracer.configure([spans])
+        return tracer
+
+    @pytest.fixture
+    def service(
         self,
-        flow_metrics_service: FlowMetricsService,
         cycle_time_sprints_use_case: MagicMock,
+        cycle_time_use_case: Mock,
+        lead_time_use_case: Mock,
+        throughput_use_case: Mock,
+        velocity_use_case: Mock,
+        async_sprint_repository: Mock,
+        async_ticket_repository: Mock,
+        metrics: Metrics,
+        tracer: Tracer,
+    ) -> AsyncFlowMetricsService:
+        """Fixture to create AsyncFlowMetricsService with all mocked dependencies."""
+        return AsyncFlowMetricsService(
+            cycle_time_sprints_use_case,
+            cycle_time_use_case,
+            lead_time_use_case,
+            throughput_use_case,
+            velocity_use_case,
+            async_sprint_repository,
+            async_ticket_repository,
+            metrics,
+            tracer,
+        )
+
+    def test_get_velocity_offloads_compute(
+        self,
+        service: AsyncFlowMetricsService,
+        async_sprint_repository: Mock,
+        velocity_use_case: Mock,
+        spans: InMemorySpanExporter,
     ) -> None:
-        """Tests get_cycle_times_sprints returns correct data and calls use case."""
-        expected: List[SprintCycleTimeDataPoint] = [
-            SprintCycleTimeDataPoint(
-                duration=3.0,
-                resolved_at=1234567890,
-                key='ABC-1',
-                sprint='Sprint 1',
-            ),
-        ]
-        cycle_time_sprints_use_case.return_value = expected
-
-        assert flow_metrics_service.get_sprints_cycle_times('team-x') == expected
-        self.assert_call_method_called_once_with(cycle_time_sprints_use_case, 'team-x')
-
-    def test_get_cycle_times(
+        """Tests the sprints are read asynchronously and the datapoints computed from them in a traced thread."""
+        sprints = [Mock()]
+        expected = [VelocityDataPoint(sprint='Sprint 1', story_points_residual=4, story_points_completed=20)]
+        async_sprint_repository.find_by_team_name.return_value = sprints
+        velocity_use_case.compute.return_value = expected
+        velocity_use_case.compute.__qualname__ = GetVelocityUseCase.compute.__qualname__
+
+        assert asyncio.run(service.get_velocity('team-x')) == expected
+        async_sprint_repository.find_by_team_name.assert_awaited_once_with('team-x', None)
+        velocity_use_case.compute.assert_called_once_with(tuple(sprints))
+        velocity_use_case.assert_not_called()
+        assert [trace['name'] for trace in spans.traces()] == ['GetVelocityUseCase.compute']
+
+    def test_get_cycle_times_computes_in_batches(
         self,
-        flow_metrics_service: FlowMetricsService,
+        service: AsyncFlowMetricsService,
+        async_ticket_repository: Mock,
         cycle_time_use_case: Mock,
+        mocker: MockerFixture,
     ) -> None:
-        """Tests get_cycle_times returns correct data and calls use case."""
-        expected: List[CycleTimeDataPoint] = [
-            CycleTimeDataPoint(
-                duration=4.0,
-                resolved_at=1234567891,
-                key='ABC-2',
-                story_points=None,
-            ),
-        ]
-        cycle_time_use_case.return_value = expected
+        """Tests large histories are computed one batch at a time."""
+        mocker.patch.object(AsyncFlowMetricsService, 'COMPUTE_BATCH_SIZE', 2)
+        async_ticket_repository.find_by_team_name.return_value = [Mock() for _ in range(5)]
 
-        assert flow_metrics_service.get_cycle_times('team-x') == expected
-        self.assert_call_method_called_once_with(cycle_time_use_case, 'team-x')
+        def compute(tickets: list[Mock]) -> list[Mock]:
+            return [Mock() for _ in tickets]
 
-    def test_get_lead_times(
+        cycle_time_use_case.compute.side_effect = compute
+
+        assert len(asyncio.run(service.get_cycle_times('team-x'))) == 5
+        assert [len(call.args[0]) for call in cycle_time_use_case.compute.call_args_list] == [2, 2, 1]
+
+    def test_stream_lead_times(
         self,
-        flow_metrics_service: FlowMetricsService,
+        service: AsyncFlowMetricsService,
+        async_ticket_repository: Mock,
         lead_time_use_case: Mock,
+        mocker: MockerFixture,
     ) -> None:
-        """Tests get_lead_times returns correct data and calls use case."""
-        expected: List[LeadTimeDataPoint] = [
-            LeadTimeDataPoint(
-                duration=5.0,
-                resolved_at=1234567892,
-                key='ABC-3',
-                story_points=8,
-            ),
-        ]
-        lead_time_use_case.return_value = expected
+        """Tests the ticket history is streamed in batches."""
+        mocker.patch.object(AsyncFlowMetricsService, 'COMPUTE_BATCH_SIZE', 2)
+        tickets = [Mock() for _ in range(3)]
+
+        async def iter_by_team_name(team: str, time_range: Any) -> AsyncIterator[Mock]:
+            for ticket in tickets:
+                yield ticket
+
+        async def collect() -> list[Any]:
+            return [datapoint async for datapoint in service.stream_lead_times('team-x')]
 
-        assert flow_metrics_service.get_lead_times('team-x') == expected
-        self.assert_call_method_called_once_with(lead_time_use_case, 'team-x')
+        async_ticket_repository.iter_by_team_name.side_effect = iter_by_team_name
 
-    def test_get_throughput(
+        def compute(batch: list[Mock]) -> list[Any]:
+            return [ticket.name for ticket in batch]
+
+        lead_time_use_case.compute.side_effect = compute
+
+        assert asyncio.run(collect()) == [ticket.name for ticket in tickets]
+        assert [call.args[0] for call in lead_time_use_case.compute.call_args_list] == [tickets[:2], tickets[2:]]
+
+    def test_get_flow_metrics_reads_once(
         self,
-        flow_metrics_service: FlowMetricsService,
+        service: AsyncFlowMetricsService,
+        async_sprint_repository: Mock,
+        async_ticket_repository: Mock,
         throughput_use_case: Mock,
+        velocity_use_case: Mock,
     ) -> None:
-        """Tests get_throughput returns correct data and calls use case."""
-        expected: List[ThroughputDataPoint] = [
-            ThroughputDataPoint(
-                sprint='Sprint 1',
-                completed=10,
-                residuals=2,
-            ),
+        """Tests the sprints are read once for every sprint metric and the tickets are not read at all."""
+        async_sprint_repository.find_by_team_name.return_value = [Mock()]
+        throughput_use_case.compute.return_value = []
+        velocity_use_case.compute.return_value = []
+
+        metrics = asyncio.run(service.get_flow_metrics('team-x', [FlowMetric.VELOCITY, FlowMetric.THROUGHPUT]))
+
+        assert list(metrics) == [FlowMetric.THROUGHPUT, FlowMetric.VELOCITY]
+        async_sprint_repository.find_by_team_name.assert_awaited_once_with('team-x', None)
+        async_ticket_repository.find_by_team_name.assert_not_called()
+
+    def test_concurrent_requests_share_one_computation(
+        self, service: AsyncFlowMetricsService, async_ticket_repository: Mock, cycle_time_use_case: Mock
+    ) -> None:
+        """Tests identical concurrent requests read and compute once, while other queries run on their own."""
+        async_ticket_repository.find_by_team_name.return_value = [Mock()]
+        cycle_time_use_case.compute.return_value = [Mock()]
+
+        async def scenario() -> tuple[list[CycleTimeDataPoint], ...]:
+            return await asyncio.gather(
+                service.get_cycle_times('team-x'),
+                service.get_cycle_times('team-x'),
+                service.get_cycle_times('team-y'),
+            )
+
+        first, second, other = asyncio.run(scenario())
+
+        assert first is second
+        assert other is not first
+        assert async_ticket_repository.find_by_team_name.await_args_list == [
+            call('team-x', None),
+            call('team-y', None),
         ]
-        throughput_use_case.return_value = expected
-        assert flow_metrics_service.get_throughput('team-x') == expected
-        self.assert_call_method_called_once_with(throughput_use_case, 'team-x')
 
-    def test_get_velocity(
+    def test_records_compute_time_and_coalesced_requests(
         self,
-        flow_metrics_service: FlowMetricsService,
-        velocity_use_case: Mock,
+        service: AsyncFlowMetricsService,
+        async_sprint_repository: Mock,
+        throughput_use_case: Mock,
+        metrics: Metrics,
     ) -> None:
-        """Tests get_velocity returns correct data and calls use case."""
-        expected: List[VelocityDataPoint] = [
-            VelocityDataPoint(
-                sprint='Sprint 1',
-                story_points_residual=4,
-                story_points_completed=20,
-            ),
-        ]
-        velocity_use_case.return_value = expected
+        """Tests the compute time is measured per metric and joined requests are counted as single-flight hits."""
+        async_sprint_repository.find_by_team_name.return_value = [Mock()]
+        throughput_use_case.compute.return_value = []
+
+        async def scenario() -> None:
+            await asyncio.gather(service.get_throughput('team-x'), service.get_throughput('team-x'))
 
-        assert flow_metrics_service.get_velocity('team-x') == expected
-        self.assert_call_method_called_once_with(velocity_use_case, 'team-x')
+        asyncio.run(scenario())
+        exposition = metrics.export().decode()
 
-    def assert_call_method_called_once_with(self, target: Any, team: str) -> None:
-        """Assert the use case is called with the team name once."""
-        target.assert_called_once()
-        assert target.call_args[0][0] == team
+        assert 'streamline_compute_duration_seconds_count{metric="throughput"} 1.0' in exposition
+        assert 'streamline_cache_lookups_total{cache="single_flight",result="hit"} 1.0' in exposition
+        assert 'streamline_cache_lookups_total{cache="single_flight",result="miss"} 1.0' in exposition
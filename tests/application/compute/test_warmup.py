@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import ConnectionFailure
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.application.compute import AsyncFlowMetricsService, FlowMetric, Warmup
+from rebelist.streamline.domain.time import WorkTimeCalculator
+from rebelist.streamline.infrastructure.monitoring import Logger
+
+
+@pytest.fixture
+def mocks(mocker: MockerFixture) -> dict[str, MagicMock]:
+    """Mocks the dependencies warmed up."""
+    database = mocker.MagicMock(spec=AsyncDatabase)
+    database.command = mocker.AsyncMock(return_value={'ok': 1})
+    service = mocker.MagicMock(spec=AsyncFlowMetricsService)
+    service.get_flow_metrics = mocker.AsyncMock(return_value={})
+    return {
+        'database': database,
+        'calculator': mocker.MagicMock(spec=WorkTimeCalculator),
+        'service': service,
+        'logger': mocker.MagicMock(spec=Logger),
+    }
+
+
+@pytest.fixture
+def warmup(mocks: dict[str, MagicMock]) -> Warmup:
+    """Creates a warmup of mocked dependencies."""
+    return Warmup(mocks['database'], mocks['calculator'], mocks['service'], 'Loki', mocks['logger'])
+
+
+def test_warm_up_initializes_the_worker(warmup: Warmup, mocks: dict[str, MagicMock]) -> None:
+    """Tests the database is pinged, the recent calendar years computed and every metric primed."""
+    assert not warmup.ready
+
+    asyncio.run(warmup.run())
+
+    year = datetime.now(timezone.utc).year
+    assert warmup.ready
+    mocks['database'].command.assert_awaited_once_with('ping')
+    mocks['calculator'].warm_up.assert_called_once_with(range(year - Warmup.CALENDAR_YEARS + 1, year + 2))
+    mocks['service'].get_flow_metrics.assert_awaited_once_with('Loki', FlowMetric)
+
+
+def test_warm_up_retries_until_the_database_answers(
+    warmup: Warmup, mocks: dict[str, MagicMock], mocker: MockerFixture
+) -> None:
+    """Tests a failed warmup is logged and tried again, the worker staying unready meanwhile."""
+    mocks['database'].command.side_effect = [ConnectionFailure('unreachable'), {'ok': 1}]
+    sleep = mocker.patch('rebelist.streamline.application.compute.warmup.asyncio.sleep', mocker.AsyncMock())
+
+    asyncio.run(warmup.run())
+
+    assert warmup.ready
+    assert mocks['database'].command.await_count == 2
+    sleep.assert_awaited_once_with(Warmup.RETRY_DELAY)
+    mocks['logger'].warning.assert_called_once()
+    mocks['service'].get_flow_metrics.assert_awaited_once()
@@ -2,6 +2,7 @@ from datetime import datetime
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
+from pydantic import ValidationError
 
 from rebelist.streamline.application.compute import (
     CycleTimeDataPoint,
@@ -129,7 +130,7 @@ class TestGetSprintCycleTimesUseCase:
         assert datapoint.resolved_at == int(resolved_at.timestamp())
 
         cycle_time_calculator_mock.calculate.assert_called_once_with(ticket)
-        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name)
+        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name, None)
 
     def test_get_cycle_times_with_no_sprints_returns_empty_list(
         self,
@@ -142,7 +143,7 @@ class TestGetSprintCycleTimesUseCase:
         result: list[SprintCycleTimeDataPoint] = sprint_cycle_time_use_case('team-x')
 
         assert result == []
-        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x')
+        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x', None)
 
 
 class TestGetCycleTimesUseCase:
@@ -174,7 +175,30 @@ class TestGetCycleTimesUseCase:
         assert datapoint.resolved_at == int(resolved_at.timestamp())
 
         cycle_time_calculator_mock.calculate.assert_called_once_with(ticket)
-        ticket_repository_mock.find_by_team_name.assert_called_once_with(team_name)
+        ticket_repository_mock.find_by_team_name.assert_called_once_with(team_name, None)
+
+    def test_get_cycle_times_without_validation(
+        self,
+        cycle_time_calculator_mock: MagicMock,
+        ticket_repository_mock: MagicMock,
+    ) -> None:
+        """Test that GetCycleTimesUseCase builds datapoints without validating them when validation is off."""
+        created_at = started_at = datetime(2024, 4, 1, 12, 0)
+        resolved_at = datetime(2024, 5, 1, 12, 0)
+        ticket = Ticket('ABC-123', created_at, started_at, resolved_at, 1)
+
+        ticket_repository_mock.find_by_team_name.return_value = [ticket]
+        cycle_time_calculator_mock.calculate.return_value = 'not a number'
+
+        use_case = GetCycleTimesUseCase(cycle_time_calculator_mock, ticket_repository_mock, validate=False)
+        result = use_case('backend')
+
+        assert result[0].duration == 'not a number'
+        assert result[0].key == 'ABC-123'
+        assert result[0].story_points == 1
+
+        with pytest.raises(ValidationError):
+            GetCycleTimesUseCase(cycle_time_calculator_mock, ticket_repository_mock)('backend')
 
 
 class TestGetLeadTimesUseCase:
@@ -206,7 +230,7 @@ class TestGetLeadTimesUseCase:
         assert datapoint.resolved_at == int(resolved_at.timestamp())
 
         lead_time_calculator_mock.calculate.assert_called_once_with(ticket)
-        ticket_repository_mock.find_by_team_name.assert_called_once_with(team_name)
+        ticket_repository_mock.find_by_team_name.assert_called_once_with(team_name, None)
 
     def test_get_lead_times_returns_empty_list(
         self,
@@ -219,7 +243,7 @@ class TestGetLeadTimesUseCase:
         result: list[LeadTimeDataPoint] = lead_time_use_case('team-x')
 
         assert result == []
-        ticket_repository_mock.find_by_team_name.assert_called_once_with('team-x')
+        ticket_repository_mock.find_by_team_name.assert_called_once_with('team-x', None)
 
 
 class TestGetThroughputUseCase:
@@ -251,7 +275,7 @@ class TestGetThroughputUseCase:
         assert datapoint.completed == 1
 
         throughput_calculator_mock.calculate.assert_called_once_with(sprint)
-        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name)
+        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name, None)
 
     def test_get_throughput_returns_empty_list(
         self,
@@ -264,7 +288,7 @@ class TestGetThroughputUseCase:
         result: list[ThroughputDataPoint] = throughput_use_case('team-x')
 
         assert result == []
-        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x')
+        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x', None)
 
 
 class TestGetVelocityUseCase:
@@ -296,7 +320,7 @@ class TestGetVelocityUseCase:
         assert datapoint.story_points_completed == 10
 
         velocity_calculator_mock.calculate.assert_called_once_with(sprint)
-        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name)
+        sprint_repository_mock.find_by_team_name.assert_called_once_with(team_name, None)
 
     def test_get_velocity_returns_empty_list(
         self,
@@ -309,4 +333,23 @@ class TestGetVelocityUseCase:
         result: list[VelocityDataPoint] = velocity_use_case('team-x')
 
         assert result == []
-        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x')
+        sprint_repository_mock.find_by_team_name.assert_called_once_with('team-x', None)
+
+    def test_compute_uses_given_sprints(
+        self,
+        velocity_use_case: GetVelocityUseCase,
+        velocity_calculator_mock: MagicMock,
+        sprint_repository_mock: MagicMock,
+    ) -> None:
+        """Test that GetVelocityUseCase.compute works on already fetched sprints without querying the repository."""
+        created_at = datetime(2024, 4, 1, 12, 0)
+        resolved_at = datetime(2024, 5, 1, 12, 0)
+        sprint = Sprint(
+            'Sprint 1', created_at, resolved_at, [Ticket('ABC-123', created_at, created_at, resolved_at, 5)]
+        )
+        velocity_calculator_mock.calculate.return_value = 3
+
+        result = velocity_use_case.compute([sprint])
+
+        assert result == [VelocityDataPoint(sprint='Sprint 1', story_points_residual=2, story_points_completed=3)]
+        sprint_repository_mock.find_by_team_name.assert_not_called()
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.application.ingestion.jobs import IngestWorker, JobResult, SprintJob
+from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
+from rebelist.streamline.infrastructure.mongo.document import WriteSummary
+from rebelist.streamline.infrastructure.mongo.job import JobRepository
+from rebelist.streamline.infrastructure.mongo.queue import IngestQueueRepository, WorkUnit, WorkUnitKind
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
+from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+from rebelist.streamline.infrastructure.monitoring import Logger
+
+
+class TestIngestWorker:
+    """Tests for the IngestWorker class."""
+
+    @pytest.fixture
+    def mocks(self, mocker: MockerFixture) -> dict[str, MagicMock]:
+        """Mock the worker dependencies."""
+        return {
+            'gateway': mocker.Mock(spec=JiraGateway),
+            'sprints': mocker.Mock(spec=MongoSprintDocumentRepository),
+            'tickets': mocker.Mock(spec=MongoTicketDocumentRepository),
+            'queue': mocker.Mock(spec=IngestQueueRepository),
+            'jobs': mocker.Mock(spec=JobRepository),
+            'logger': mocker.Mock(spec=Logger),
+        }
+
+    @pytest.fixture
+    def worker(self, mocks: dict[str, MagicMock]) -> IngestWorker:
+        """Create a worker with mocked dependencies."""
+        return IngestWorker(
+            mocks['gateway'], mocks['sprints'], mocks['tickets'], mocks['queue'], mocks['jobs'], mocks['logger']
+        )
+
+    def test_process_sprint_page(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should fetch and store a page of sprints."""
+        mocks['gateway'].find_sprints.return_value = [{'id': 1}]
+        mocks['sprints'].save_many.return_value = WriteSummary(written=1)
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 30, 'max_results': 5})
+
+        result = worker.process(unit)
+
+        mocks['gateway'].find_sprints.assert_called_once_with(30, 5)
+        mocks['sprints'].save_many.assert_called_once_with([{'id': 1}])
+        assert result == JobResult(written=1)
+        mocks['jobs'].mark_changed.assert_called_once_with(SprintJob.JOB_NAME, 'Loki')
+
+    def test_process_issue_page(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should fetch and store a page of issues."""
+        done_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+        mocks['gateway'].find_tickets.return_value = [{'id': 'A-1'}]
+        mocks['tickets'].save_many.return_value = WriteSummary(skipped=1)
+        unit = WorkUnit(
+            WorkUnitKind.ISSUE_PAGE,
+            'Loki',
+            {'done_at': done_at, 'sprint_ids': [7, 8], 'start_at': 100, 'max_results': 100},
+        )
+
+        result = worker.process(unit)
+
+        mocks['gateway'].find_tickets.assert_called_once_with(done_at, 100, 100, [7, 8])
+        mocks['tickets'].save_many.assert_called_once_with([{'id': 'A-1'}])
+        assert result == JobResult(skipped=1)
+        mocks['jobs'].mark_changed.assert_not_called()
+
+    def test_process_next_acks_processed_unit(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should acknowledge a unit once it is processed."""
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 0, 'max_results': 5}, attempts=1)
+        mocks['queue'].claim.return_value = unit
+        mocks['sprints'].save_many.return_value = WriteSummary()
+
+        assert worker.process_next('worker-1', timedelta(minutes=5)) is unit
+
+        mocks['queue'].claim.assert_called_once_with('worker-1', timedelta(minutes=5))
+        mocks['queue'].ack.assert_called_once_with(unit)
+        mocks['queue'].retry.assert_not_called()
+
+    def test_process_next_advances_cursor_after_last_unit(
+        self, worker: IngestWorker, mocks: dict[str, MagicMock]
+    ) -> None:
+        """Should move the job cursors forward once no unit of the batch is left in the queue."""
+        cursor = {'sprint_offset': 35}
+        unit = WorkUnit(
+            WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 30, 'max_results': 5, 'cursor': cursor}, batch='b1'
+        )
+        mocks['queue'].claim.return_value = unit
+        mocks['queue'].remaining.return_value = 0
+        mocks['sprints'].save_many.return_value = WriteSummary()
+
+        worker.process_next('worker-1', timedelta(minutes=5))
+
+        mocks['queue'].remaining.assert_called_once_with('b1')
+        mocks['jobs'].advance.assert_called_once_with(SprintJob.JOB_NAME, 'Loki', cursor)
+
+    def test_process_next_keeps_cursor_while_batch_is_pending(
+        self, worker: IngestWorker, mocks: dict[str, MagicMock]
+    ) -> None:
+        """Should not move the job cursors while other units of the batch are pending or failed."""
+        unit = WorkUnit(
+            WorkUnitKind.ISSUE_PAGE,
+            'Loki',
+            {'done_at': None, 'start_at': 0, 'max_results': 100, 'cursor': {'tickets_done_at': None}},
+            batch='b1',
+        )
+        mocks['queue'].claim.return_value = unit
+        mocks['queue'].remaining.return_value = 1
+        mocks['tickets'].save_many.return_value = WriteSummary()
+
+        worker.process_next('worker-1', timedelta(minutes=5))
+
+        mocks['queue'].ack.assert_called_once_with(unit)
+        mocks['jobs'].advance.assert_not_called()
+
+    def test_process_next_retries_failed_unit(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should hand a failed unit back to the queue for a retry."""
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 0, 'max_results': 5}, attempts=2)
+        mocks['queue'].claim.return_value = unit
+        mocks['gateway'].find_sprints.side_effect = RuntimeError('Jira is down')
+
+        assert worker.process_next('worker-1', timedelta(minutes=5)) is unit
+
+        mocks['queue'].ack.assert_not_called()
+        mocks['queue'].retry.assert_called_once_with(
+            unit, 'Jira is down', IngestWorker.RETRY_DELAY, IngestWorker.MAX_ATTEMPTS
+        )
+        mocks['logger'].error.assert_called_once()
+        mocks['jobs'].advance.assert_not_called()
+
+    def test_process_next_empty_queue(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should return None when there is no visible unit."""
+        mocks['queue'].claim.return_value = None
+
+        assert worker.process_next('worker-1', timedelta(minutes=5)) is None
+        mocks['queue'].ack.assert_not_called()
+
+    def test_pending(self, worker: IngestWorker, mocks: dict[str, MagicMock]) -> None:
+        """Should report the number of pending units."""
+        mocks['queue'].count.return_value = 7
+
+        assert worker.pending() == 7
@@ -1,11 +1,17 @@
+from dataclasses import replace
 from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock
 
+import pytest
 from pytest_mock import MockerFixture
 
-from rebelist.streamline.application.ingestion.jobs import SprintJob, TicketJob
+from rebelist.streamline.application.ingestion.jobs import BackfillJob, JobPhase, JobResult, SprintJob, TicketJob
 from rebelist.streamline.config.settings import JiraSettings
-from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
+from rebelist.streamline.infrastructure.jira.gateway import GatewayStatistics, JiraGateway
+from rebelist.streamline.infrastructure.mongo.document import WriteSummary
 from rebelist.streamline.infrastructure.mongo.job.repositories import Job, JobRepository
+from rebelist.streamline.infrastructure.mongo.queue import IngestQueueRepository, WorkUnit, WorkUnitKind
 from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
 from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
 
@@ -16,6 +22,7 @@ class TestSprintJob:
     def test_execute_new_job(self, mocker: MockerFixture) -> None:
         """Tests the execute method when no previous job exists."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_sprint_repo = mocker.Mock(spec=MongoSprintDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -36,25 +43,29 @@ class TestSprintJob:
                 'end_date': datetime.now(timezone.utc),
             },
         ]
+        mock_sprint_repo.save_many.return_value = WriteSummary(written=1, skipped=1)
         mock_job_repo.find.return_value = None
         mock_job_repo.save.return_value = None
 
         job = SprintJob(mock_jira_gateway, mock_sprint_repo, mock_job_repo, mock_settings)
-        job.execute()
+        result = job.execute()
 
         mock_job_repo.find.assert_called_once_with(SprintJob.JOB_NAME, 'test_team')
         mock_jira_gateway.find_sprints.assert_called_once_with(100)
-        assert mock_sprint_repo.save.call_count == 2
+        mock_sprint_repo.save_many.assert_called_once_with(mock_jira_gateway.find_sprints.return_value)
+        assert replace(result, phases={}) == JobResult(written=1, skipped=1, items=2)
         mock_job_repo.save.assert_called_once()
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.name == SprintJob.JOB_NAME
         assert saved_job.team == 'test_team'
         assert saved_job.metadata == {'sprint_offset': 102}
         assert saved_job.executed_at is not None
+        mock_job_repo.mark_changed.assert_called_once_with(SprintJob.JOB_NAME, 'test_team')
 
     def test_execute_existing_job(self, mocker: MockerFixture) -> None:
         """Tests the execute method when a previous job exists."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_sprint_repo = mocker.Mock(spec=MongoSprintDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -71,6 +82,7 @@ class TestSprintJob:
                 'end_date': datetime.now(timezone.utc),
             },
         ]
+        mock_sprint_repo.save_many.return_value = WriteSummary(written=1)
         mock_job_repo.find.return_value = mock_existing_job
         mock_job_repo.save.return_value = None
 
@@ -79,7 +91,7 @@ class TestSprintJob:
 
         mock_job_repo.find.assert_called_once_with(SprintJob.JOB_NAME, 'another_team')
         mock_jira_gateway.find_sprints.assert_called_once_with(105)
-        mock_sprint_repo.save.assert_called_once()
+        mock_sprint_repo.save_many.assert_called_once()
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.metadata == {'sprint_offset': 106}
         assert saved_job.executed_at is not None
@@ -87,6 +99,7 @@ class TestSprintJob:
     def test_execute_no_new_sprints(self, mocker: MockerFixture) -> None:
         """Tests the execute method when no new sprints are found."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_sprint_repo = mocker.Mock(spec=MongoSprintDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -96,19 +109,103 @@ class TestSprintJob:
         mock_settings.sprint_offset = 200
         mock_existing_job.metadata = {'sprint_offset': 200}
         mock_jira_gateway.find_sprints.return_value = []
+        mock_sprint_repo.save_many.return_value = WriteSummary()
         mock_job_repo.find.return_value = mock_existing_job
         mock_job_repo.save.return_value = None
 
         job = SprintJob(mock_jira_gateway, mock_sprint_repo, mock_job_repo, mock_settings)
-        job.execute()
+        result = job.execute()
 
         mock_job_repo.find.assert_called_once_with(SprintJob.JOB_NAME, 'yet_another_team')
         mock_jira_gateway.find_sprints.assert_called_once_with(200)
-        mock_sprint_repo.save.assert_not_called()
+        mock_sprint_repo.save_many.assert_called_once_with([])
+        assert replace(result, phases={}) == JobResult()
         mock_job_repo.save.assert_called_once()
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.metadata == {'sprint_offset': 200}
         assert saved_job.executed_at is not None
+        mock_job_repo.mark_changed.assert_not_called()
+
+    def test_execute_enqueues_sprint_pages(self, mocker: MockerFixture) -> None:
+        """Tests the execute method enqueues sprint pages when an ingest queue is configured."""
+        mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
+        mock_sprint_repo = mocker.Mock(spec=MongoSprintDocumentRepository)
+        mock_job_repo = mocker.Mock(spec=JobRepository)
+        mock_queue = mocker.Mock(spec=IngestQueueRepository)
+        mock_settings = mocker.Mock(spec=JiraSettings)
+
+        mock_settings.team = 'queue_team'
+        mock_settings.sprint_offset = 10
+        mock_jira_gateway.count_sprints.return_value = 12
+        mock_job_repo.find.return_value = None
+
+        job = SprintJob(mock_jira_gateway, mock_sprint_repo, mock_job_repo, mock_settings, mock_queue)
+        result = job.execute()
+
+        mock_jira_gateway.count_sprints.assert_called_once_with(10)
+        mock_jira_gateway.find_sprints.assert_not_called()
+        mock_sprint_repo.save_many.assert_not_called()
+        units: list[WorkUnit] = mock_queue.enqueue.call_args[0][0]
+        assert [unit.payload['start_at'] for unit in units] == [10, 15, 20]
+        assert all(unit.kind == WorkUnitKind.SPRINT_PAGE for unit in units)
+        assert all(unit.payload['max_results'] == SprintJob.PAGE_SIZE for unit in units)
+        assert all(unit.team == 'queue_team' for unit in units)
+        assert all(unit.payload['cursor'] == {'sprint_offset': 22} for unit in units)
+        assert len({unit.batch for unit in units}) == 1 and units[0].batch
+        assert replace(result, phases={}) == JobResult(enqueued=3, items=12)
+        saved_job: Job = mock_job_repo.save.call_args[0][0]
+        assert saved_job.metadata == {'sprint_offset': 10}
+
+    def test_execute_enqueues_nothing_without_new_sprints(self, mocker: MockerFixture) -> None:
+        """Tests the execute method moves the cursor itself when there is no unit to enqueue."""
+        mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
+        mock_job_repo = mocker.Mock(spec=JobRepository)
+        mock_queue = mocker.Mock(spec=IngestQueueRepository)
+        mock_settings = mocker.Mock(spec=JiraSettings)
+
+        mock_settings.team = 'queue_team'
+        mock_settings.sprint_offset = 10
+        mock_jira_gateway.count_sprints.return_value = 0
+        mock_job_repo.find.return_value = None
+
+        job = SprintJob(
+            mock_jira_gateway, mocker.Mock(spec=MongoSprintDocumentRepository), mock_job_repo, mock_settings, mock_queue
+        )
+        job.execute()
+
+        mock_queue.enqueue.assert_called_once_with([])
+        saved_job: Job = mock_job_repo.save.call_args[0][0]
+        assert saved_job.metadata == {'sprint_offset': 10}
+
+    def test_execute_reports_costs(self, mocker: MockerFixture) -> None:
+        """Tests the execute method reports the gateway costs of this run and the time spent per phase."""
+        mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_sprint_repo = mocker.Mock(spec=MongoSprintDocumentRepository)
+        mock_job_repo = mocker.Mock(spec=JobRepository)
+        mock_settings = mocker.Mock(spec=JiraSettings)
+
+        mock_settings.team = 'cost_team'
+        mock_settings.sprint_offset = 0
+        type(mock_jira_gateway).statistics = mocker.PropertyMock(
+            side_effect=[
+                GatewayStatistics(fetch_seconds=1.0, processing_seconds=0.5, bytes_received=100, retries=1),
+                GatewayStatistics(fetch_seconds=3.0, processing_seconds=0.75, bytes_received=600, retries=3),
+            ]
+        )
+        mock_jira_gateway.find_sprints.return_value = [{'id': 1}]
+        mock_sprint_repo.save_many.return_value = WriteSummary(written=1)
+        mock_job_repo.find.return_value = None
+
+        result = SprintJob(mock_jira_gateway, mock_sprint_repo, mock_job_repo, mock_settings).execute()
+
+        assert result.bytes_received == 500
+        assert result.retries == 2
+        assert result.phases[JobPhase.JIRA_FETCH] == 2.0
+        assert result.phases[JobPhase.CHANGELOG_PROCESSING] == 0.25
+        assert JobPhase.MONGO_WRITE in result.phases
+        assert JobPhase.JOB_RECORD_UPDATE in result.phases
 
 
 class TestTicketJob:
@@ -117,6 +214,7 @@ class TestTicketJob:
     def test_execute_new_job(self, mocker: MockerFixture) -> None:
         """Tests the execute method when no previous ticket job exists."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_ticket_repo = mocker.Mock(spec=MongoTicketDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -134,22 +232,27 @@ class TestTicketJob:
             mocker.Mock(now=mocker.Mock(return_value=mock_now)),
         )
 
+        mock_ticket_repo.save_many.return_value = WriteSummary(written=2)
+
         job = TicketJob(mock_jira_gateway, mock_ticket_repo, mock_job_repo, mock_settings)
-        job.execute()
+        result = job.execute()
 
         mock_job_repo.find.assert_called_once_with(TicketJob.JOB_NAME, 'alpha_team')
         mock_jira_gateway.find_tickets.assert_called_once_with(None)
-        assert mock_ticket_repo.save.call_count == 2
+        mock_ticket_repo.save_many.assert_called_once_with(mock_jira_gateway.find_tickets.return_value)
+        assert replace(result, phases={}) == JobResult(written=2, items=2)
         mock_job_repo.save.assert_called_once()
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.name == TicketJob.JOB_NAME
         assert saved_job.team == 'alpha_team'
         assert saved_job.metadata == {'tickets_done_at': mock_now}
         assert saved_job.executed_at == mock_now
+        mock_job_repo.mark_changed.assert_called_once_with(TicketJob.JOB_NAME, 'alpha_team')
 
     def test_execute_existing_job(self, mocker: MockerFixture) -> None:
         """Tests the execute method when a previous ticket job exists."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_ticket_repo = mocker.Mock(spec=MongoTicketDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -169,19 +272,24 @@ class TestTicketJob:
             mocker.Mock(now=mocker.Mock(return_value=mock_now)),
         )
 
+        mock_ticket_repo.save_many.return_value = WriteSummary(skipped=1)
+
         job = TicketJob(mock_jira_gateway, mock_ticket_repo, mock_job_repo, mock_settings)
-        job.execute()
+        result = job.execute()
 
         mock_job_repo.find.assert_called_once_with(TicketJob.JOB_NAME, 'beta_team')
         mock_jira_gateway.find_tickets.assert_called_once_with(previous_done_at)
-        mock_ticket_repo.save.assert_called_once()
+        mock_ticket_repo.save_many.assert_called_once()
+        assert replace(result, phases={}) == JobResult(skipped=1, items=1)
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.metadata == {'tickets_done_at': mock_now}
         assert saved_job.executed_at == mock_now
+        mock_job_repo.mark_changed.assert_not_called()
 
     def test_execute_no_new_tickets(self, mocker: MockerFixture) -> None:
         """Tests the execute method when no new tickets are found."""
         mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
         mock_ticket_repo = mocker.Mock(spec=MongoTicketDocumentRepository)
         mock_job_repo = mocker.Mock(spec=JobRepository)
         mock_settings = mocker.Mock(spec=JiraSettings)
@@ -199,13 +307,186 @@ class TestTicketJob:
             mocker.Mock(now=mocker.Mock(return_value=mock_now)),
         )
 
+        mock_ticket_repo.save_many.return_value = WriteSummary()
+
         job = TicketJob(mock_jira_gateway, mock_ticket_repo, mock_job_repo, mock_settings)
         job.execute()
 
         mock_job_repo.find.assert_called_once_with(TicketJob.JOB_NAME, 'gamma_team')
         mock_jira_gateway.find_tickets.assert_called_once_with(previous_done_at)
-        mock_ticket_repo.save.assert_not_called()
+        mock_ticket_repo.save_many.assert_called_once_with([])
         mock_job_repo.save.assert_called_once()
         saved_job: Job = mock_job_repo.save.call_args[0][0]
         assert saved_job.metadata == {'tickets_done_at': mock_now}
         assert saved_job.executed_at == mock_now
+
+    def test_execute_enqueues_issue_pages(self, mocker: MockerFixture) -> None:
+        """Tests the execute method enqueues issue pages when an ingest queue is configured."""
+        mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
+        mock_ticket_repo = mocker.Mock(spec=MongoTicketDocumentRepository)
+        mock_job_repo = mocker.Mock(spec=JobRepository)
+        mock_queue = mocker.Mock(spec=IngestQueueRepository)
+        mock_settings = mocker.Mock(spec=JiraSettings)
+        mock_existing_job = mocker.Mock(spec=Job)
+        previous_done_at = datetime(2025, 5, 4, 9, 0, 0, tzinfo=timezone.utc)
+        mock_now = datetime.now(timezone.utc)
+
+        mock_settings.team = 'queue_team'
+        mock_existing_job.metadata = {'tickets_done_at': previous_done_at}
+        mock_jira_gateway.find_sprint_ids.return_value = [41, 42]
+        mock_jira_gateway.count_tickets.return_value = 250
+        mock_job_repo.find.return_value = mock_existing_job
+        mocker.patch(
+            'rebelist.streamline.application.ingestion.jobs.workflow.datetime',
+            mocker.Mock(now=mocker.Mock(return_value=mock_now)),
+        )
+
+        calls = mocker.Mock()
+        calls.attach_mock(mock_job_repo.save, 'save')
+        calls.attach_mock(mock_queue.enqueue, 'enqueue')
+
+        job = TicketJob(mock_jira_gateway, mock_ticket_repo, mock_job_repo, mock_settings, mock_queue)
+        result = job.execute()
+
+        mock_jira_gateway.find_sprint_ids.assert_called_once_with()
+        mock_jira_gateway.count_tickets.assert_called_once_with(previous_done_at, [41, 42])
+        mock_jira_gateway.find_tickets.assert_not_called()
+        mock_ticket_repo.save_many.assert_not_called()
+        units: list[WorkUnit] = mock_queue.enqueue.call_args[0][0]
+        assert [unit.payload['start_at'] for unit in units] == [0, 100, 200]
+        assert all(unit.kind == WorkUnitKind.ISSUE_PAGE for unit in units)
+        assert all(unit.payload['done_at'] == previous_done_at for unit in units)
+        assert all(unit.payload['sprint_ids'] == [41, 42] for unit in units)
+        assert all(unit.payload['cursor'] == {'tickets_done_at': mock_now} for unit in units)
+        assert len({unit.batch for unit in units}) == 1
+        assert replace(result, phases={}) == JobResult(enqueued=3, items=250)
+        saved_job: Job = mock_job_repo.save.call_args[0][0]
+        assert saved_job.metadata == {'tickets_done_at': previous_done_at}
+        assert [name for name, *_ in calls.mock_calls] == ['save', 'enqueue']
+
+    def test_execute_enqueues_nothing_without_new_tickets(self, mocker: MockerFixture) -> None:
+        """Tests the execute method moves the cursor itself when there is no unit to enqueue."""
+        mock_jira_gateway = mocker.Mock(spec=JiraGateway)
+        mock_jira_gateway.statistics = GatewayStatistics()
+        mock_job_repo = mocker.Mock(spec=JobRepository)
+        mock_queue = mocker.Mock(spec=IngestQueueRepository)
+        mock_settings = mocker.Mock(spec=JiraSettings)
+        mock_now = datetime.now(timezone.utc)
+
+        mock_settings.team = 'queue_team'
+        mock_jira_gateway.count_tickets.return_value = 0
+        mock_job_repo.find.return_value = None
+        mocker.patch(
+            'rebelist.streamline.application.ingestion.jobs.workflow.datetime',
+            mocker.Mock(now=mocker.Mock(return_value=mock_now)),
+        )
+
+        job = TicketJob(
+            mock_jira_gateway, mocker.Mock(spec=MongoTicketDocumentRepository), mock_job_repo, mock_settings, mock_queue
+        )
+        job.execute()
+
+        saved_job: Job = mock_job_repo.save.call_args[0][0]
+        assert saved_job.metadata == {'tickets_done_at': mock_now}
+
+
+class TestBackfillJob:
+    """Tests for the BackfillJob class."""
+
+    @staticmethod
+    def raw_ticket(key: str) -> dict[str, Any]:
+        """Build a raw Jira issue that was started and finished."""
+        return {
+            'key': key,
+            'fields': {'created': '2025-04-10T00:00:00.000+0000', 'status': {'name': 'Done'}},
+            'changelog': {
+                'histories': [
+                    {
+                        'created': '2025-05-01T00:00:00.000+0000',
+                        'items': [{'field': 'status', 'toString': 'In Progress'}],
+                    },
+                    {'created': '2025-05-02T00:00:00.000+0000', 'items': [{'field': 'status', 'toString': 'Done'}]},
+                ]
+            },
+        }
+
+    @pytest.fixture
+    def mocks(self, mocker: MockerFixture) -> dict[str, MagicMock]:
+        """Mock the backfill dependencies."""
+        mocks = {
+            'gateway': mocker.Mock(spec=JiraGateway),
+            'sprints': mocker.Mock(spec=MongoSprintDocumentRepository),
+            'tickets': mocker.Mock(spec=MongoTicketDocumentRepository),
+            'jobs': mocker.Mock(spec=JobRepository),
+            'settings': mocker.Mock(spec=JiraSettings),
+        }
+        mocks['settings'].team = 'Loki'
+        mocks['gateway'].statistics = GatewayStatistics()
+        mocks['gateway'].count_sprints.return_value = 5
+
+        def find_sprints(start: int, size: int) -> list[dict[str, Any]]:
+            return [{'id': index} for index in range(start, min(start + size, 5))]
+
+        def find_raw_tickets(sprint_ids: list[int], start_at: int, max_results: int) -> list[dict[str, Any]]:
+            return [self.raw_ticket(f'A-{sprint_id}') for sprint_id in sprint_ids] if start_at == 0 else []
+
+        def save_many(documents: list[dict[str, Any]]) -> WriteSummary:
+            return WriteSummary(written=len(documents))
+
+        mocks['gateway'].find_sprints.side_effect = find_sprints
+        mocks['gateway'].find_raw_tickets.side_effect = find_raw_tickets
+        mocks['sprints'].save_many.side_effect = save_many
+        mocks['tickets'].save_many.side_effect = save_many
+        return mocks
+
+    @pytest.fixture
+    def job(self, mocks: dict[str, MagicMock]) -> BackfillJob:
+        """Create a backfill job with mocked dependencies."""
+        return BackfillJob(mocks['gateway'], mocks['sprints'], mocks['tickets'], mocks['jobs'], mocks['settings'])
+
+    def test_execute_all_ranges(self, job: BackfillJob, mocks: dict[str, MagicMock]) -> None:
+        """Tests every range is fetched, processed and recorded as completed."""
+        mocks['jobs'].find.return_value = None
+        progress = MagicMock()
+
+        result = job.execute(threads=2, processes=1, range_size=2, on_range=progress)
+
+        mocks['gateway'].count_sprints.assert_called_once_with(0)
+        assert sorted(call.args[0] for call in mocks['gateway'].find_sprints.call_args_list) == [0, 2, 4]
+        tickets = [document for call in mocks['tickets'].save_many.call_args_list for document in call.args[0]]
+        assert sorted(ticket['key'] for ticket in tickets) == ['A-0', 'A-1', 'A-2', 'A-3', 'A-4']
+        assert all(ticket['team'] == 'Loki' and ticket['started_at'] for ticket in tickets)
+        assert result.written == 10
+        assert result.items == 10
+        assert JobPhase.CHANGELOG_PROCESSING in result.phases
+        saved_job: Job = mocks['jobs'].save.call_args[0][0]
+        assert saved_job.name == BackfillJob.JOB_NAME
+        assert saved_job.metadata == {'range_size': 2, 'completed': [0, 2, 4]}
+        assert progress.call_args_list[-1].args == (3, 3)
+        assert mocks['jobs'].mark_changed.call_count == 3
+
+    def test_execute_resumes_completed_ranges(self, job: BackfillJob, mocks: dict[str, MagicMock]) -> None:
+        """Tests the ranges completed by a previous run are skipped."""
+        mocks['jobs'].find.return_value = Job(
+            name=BackfillJob.JOB_NAME, team='Loki', metadata={'range_size': 2, 'completed': [0, 4]}
+        )
+
+        job.execute(threads=1, processes=1, range_size=2)
+
+        mocks['gateway'].find_sprints.assert_called_once_with(2, 2)
+        saved_job: Job = mocks['jobs'].save.call_args[0][0]
+        assert saved_job.metadata['completed'] == [0, 2, 4]
+
+    def test_execute_restart(self, job: BackfillJob, mocks: dict[str, MagicMock]) -> None:
+        """Tests a restart, or a different range size, ignores the previous run."""
+        mocks['jobs'].find.return_value = Job(
+            name=BackfillJob.JOB_NAME, team='Loki', metadata={'range_size': 2, 'completed': [0, 2, 4]}
+        )
+
+        job.execute(threads=1, processes=1, range_size=2, restart=True)
+        assert mocks['gateway'].find_sprints.call_count == 3
+
+        mocks['gateway'].find_sprints.reset_mock()
+        job.execute(threads=1, processes=1, range_size=5)
+        mocks['gateway'].find_sprints.assert_called_once_with(0, 5)
@@ -0,0 +1,169 @@
+import gc
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import ReloadableSettings
+from rebelist.streamline.infrastructure.monitoring import TRACER
+
+SETTINGS = """
+[app]
+country = DE
+timezone = Europe/Berlin
+
+[workflow]
+workday_starts_at = 08:00
+workday_ends_at = 18:00
+workday_duration = 8
+
+[jira]
+team = Loki
+project = HIVE
+board_id = 533
+sprint_offset = 30
+sprint_close_time = 18:00
+issue_types = Bug, Task
+
+[api]
+cache_max_age = 300
+"""
+
+
+@pytest.fixture
+def settings_file(tmp_path: Path) -> Path:
+    """Writes a valid settings file."""
+    path = tmp_path / 'settings.ini'
+    path.write_text(SETTINGS)
+    return path
+
+
+@pytest.fixture
+def container(settings_file: Path) -> Container:
+    """Creates a container reading the settings file."""
+    container = Container()
+    container.config.from_dict({'mongo_uri': 'mongodb://localhost:27017/streamline'})
+    container.settings_file.override(ReloadableSettings(settings_file))
+    return container
+
+
+def rewrite(path: Path, content: str) -> None:
+    """Rewrites a file, making sure its modification time moves forward."""
+    stamp = path.stat().st_mtime_ns + 1_000_000_000
+    path.write_text(content)
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_reload_settings_resets_only_dependent_singletons(container: Container, settings_file: Path) -> None:
+    """Tests that a changed section only resets the singletons reading it."""
+    use_case = container.get_throughput_use_case()
+    repository = container.ticket_repository()
+
+    rewrite(settings_file, SETTINGS.replace('sprint_close_time = 18:00', 'sprint_close_time = 17:00'))
+
+    assert Container.reload_settings(container) == frozenset({'jira'})
+    assert container.settings().jira.sprint_close_time.hour == 17
+    assert container.get_throughput_use_case() is not use_case
+    assert container.ticket_repository() is repository
+
+
+def test_reload_settings_keeps_everything_when_unchanged(container: Container, settings_file: Path) -> None:
+    """Tests that rewriting the same values keeps the settings and the singletons."""
+    settings = container.settings()
+    use_case = container.get_throughput_use_case()
+
+    rewrite(settings_file, SETTINGS.replace('[api]', '\n[api]'))
+
+    assert Container.reload_settings(container) == frozenset()
+    assert container.settings() is settings
+    assert container.get_throughput_use_case() is use_case
+
+
+def test_reload_settings_keeps_current_settings_when_invalid(container: Container, settings_file: Path) -> None:
+    """Tests that an invalid file is reported once and the current settings are kept."""
+    settings = container.settings()
+
+    rewrite(settings_file, SETTINGS.replace('workday_duration = 8', 'workday_duration = 0'))
+
+    with pytest.raises(ValueError, match='Failed to load settings'):
+        Container.reload_settings(container)
+    assert Container.reload_settings(container) == frozenset()
+    assert container.settings() is settings
+
+
+def test_reload_settings_keeps_clients_of_delegated_settings(container: Container, settings_file: Path) -> None:
+    """Tests that the query statistics follow their section without the clients they listen to being replaced."""
+    database = container.database()
+    query_stats = container.query_stats()
+
+    rewrite(settings_file, SETTINGS + '\n[queries]\nenabled = true\n\n[logging]\nlevel = WARNING\n')
+
+    assert Container.reload_settings(container) == frozenset({'queries', 'logging'})
+    assert container.database() is database
+    assert container.query_stats() is query_stats
+    assert container.settings().queries.enabled
+
+
+def test_reset_database_clients_renews_the_pools(container: Container) -> None:
+    """Tests that the database clients and their users are rebuilt, the other singletons kept."""
+    database = container.database()
+    repository = container.ticket_repository()
+    settings_file = container.settings_file()
+    metrics = container.metrics()
+
+    Container.reset_database_clients(container)
+
+    assert container.database() is not database
+    assert container.ticket_repository() is not repository
+    assert container.settings_file() is settings_file
+    assert container.metrics() is metrics
+
+
+def test_created_containers_reset_their_clients_after_fork(mocker: MockerFixture) -> None:
+    """Tests that creating containers adds no fork hook, the module hook resets the containers still in use."""
+    register_at_fork = mocker.patch('rebelist.streamline.config.container.os.register_at_fork')
+    reset_database_clients = mocker.patch.object(Container, 'reset_database_clients')
+    first, second = Container.create(), Container.create()
+
+    Container.reset_created_database_clients()
+    reset_database_clients.assert_any_call(first)
+    reset_database_clients.assert_any_call(second)
+    created = reset_database_clients.call_count
+    reset_database_clients.reset_mock()
+    del first
+    gc.collect()
+    Container.reset_created_database_clients()
+
+    register_at_fork.assert_not_called()
+    reset_database_clients.assert_any_call(second)
+    assert reset_database_clients.call_count == created - 1
+
+
+def test_tracer_follows_the_tracing_settings(container: Container, settings_file: Path, tmp_path: Path) -> None:
+    """Tests that the process tracer is enabled, exporting to the collector and a file, once the settings say so."""
+    assert not container.tracer().enabled
+
+    spans = tmp_path / 'spans.jsonl'
+    rewrite(settings_file, SETTINGS + f'\n[tracing]\nenabled = true\nfile = {spans}\n')
+    try:
+        assert Container.reload_settings(container) == frozenset({'tracing'})
+        with container.tracer().span('job') as span:
+            pass
+
+        container.tracer().flush()
+
+        assert span and container.span_collector().trace(span.trace_id) == [span]
+        assert span.trace_id in spans.read_text()
+    finally:
+        TRACER.configure([])
+
+
+def test_get_work_calendar_looks_up_the_country() -> None:
+    """Test the holiday calendar of a country comes from the workalendar registry."""
+    from workalendar.europe import Germany
+
+    assert isinstance(Container.get_work_calendar('DE'), Germany)
+    with pytest.raises(ValueError, match='No WorkCalendar class found for region XX'):
+        Container.get_work_calendar('XX')
@@ -1,3 +1,4 @@
+import os
 from datetime import time
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -5,7 +6,16 @@ from zoneinfo import ZoneInfo
 import pytest
 from pydantic import ValidationError
 
-from rebelist.streamline.config.settings import AppSettings, JiraSettings, Settings, WorkflowSettings, load_settings
+from rebelist.streamline.config.settings import (
+    AppSettings,
+    JiraSettings,
+    LoggingSettings,
+    QueriesSettings,
+    ReloadableSettings,
+    Settings,
+    WorkflowSettings,
+    load_settings,
+)
 
 
 class TestAppSettings:
@@ -17,6 +27,7 @@ class TestAppSettings:
         assert settings.name == 'rebelist-streamline'
         assert settings.country == 'US'
         assert settings.timezone == ZoneInfo('Europe/Berlin')
+        assert settings.debug is False
 
     def test_app_settings_immutability(self: 'TestAppSettings') -> None:
         """Tests that an AppSettings instance is immutable."""
@@ -103,6 +114,25 @@ class TestJiraSettings:
             settings.project = 'NEW_PROJ'
 
 
+class TestLoggingSettings:
+    """Tests for the LoggingSettings Pydantic model."""
+
+    def test_logging_settings_split_module_levels(self: 'TestLoggingSettings') -> None:
+        """Tests parsing the per-module levels from a comma-separated string, normalizing the level names."""
+        settings = LoggingSettings.model_validate(
+            {'level': 'warning', 'modules': 'rebelist.streamline.infrastructure.jira: debug, pymongo:Error'}
+        )
+        assert settings.level == 'WARNING'
+        assert settings.modules == {'rebelist.streamline.infrastructure.jira': 'DEBUG', 'pymongo': 'ERROR'}
+
+    def test_logging_settings_reject_unknown_levels(self: 'TestLoggingSettings') -> None:
+        """Tests that an unknown level, globally or for a module, is rejected."""
+        with pytest.raises(ValidationError):
+            LoggingSettings(level='loud')
+        with pytest.raises(ValidationError):
+            LoggingSettings.model_validate({'modules': 'pymongo: loud'})
+
+
 class TestSettings:
     """Tests for the main Settings Pydantic model."""
 
@@ -124,6 +154,61 @@ class TestSettings:
         assert settings.app == app_settings
         assert settings.workflow == workflow_settings
         assert settings.jira == jira_settings
+        assert settings.api.cache_max_age == 300
+
+    def test_settings_fingerprint(self: 'TestSettings') -> None:
+        """Tests that the fingerprint follows the configured values."""
+        app_settings = AppSettings(country='EU', timezone=ZoneInfo('Europe/Berlin'))
+        workflow_settings = WorkflowSettings(
+            workday_starts_at=time(8, 0), workday_ends_at=time(16, 0), workday_duration=8
+        )
+        jira_settings = JiraSettings(
+            team='backend',
+            project='BE',
+            board_id=555,
+            sprint_offset=600,
+            sprint_close_time=time(),
+            issue_types=['Backlog', 'Dev'],
+        )
+        settings = Settings(app=app_settings, workflow=workflow_settings, jira=jira_settings)
+        same = Settings(app=app_settings, workflow=workflow_settings, jira=jira_settings)
+        other = Settings(
+            app=app_settings, workflow=workflow_settings, jira=jira_settings.model_copy(update={'team': 'X'})
+        )
+
+        assert settings.fingerprint == same.fingerprint
+        assert settings.fingerprint != other.fingerprint
+
+    def test_settings_metrics_fingerprint(self: 'TestSettings') -> None:
+        """Tests that the metrics fingerprint only follows the sections the metrics are computed with."""
+        app_settings = AppSettings(country='EU', timezone=ZoneInfo('Europe/Berlin'))
+        workflow_settings = WorkflowSettings(
+            workday_starts_at=time(8, 0), workday_ends_at=time(16, 0), workday_duration=8
+        )
+        jira_settings = JiraSettings(
+            team='backend',
+            project='BE',
+            board_id=555,
+            sprint_offset=600,
+            sprint_close_time=time(),
+            issue_types=['Backlog', 'Dev'],
+        )
+        settings = Settings(app=app_settings, workflow=workflow_settings, jira=jira_settings)
+        logging = Settings(
+            app=app_settings, workflow=workflow_settings, jira=jira_settings, logging=LoggingSettings(level='DEBUG')
+        )
+        queries = Settings(
+            app=app_settings, workflow=workflow_settings, jira=jira_settings, queries=QueriesSettings(enabled=True)
+        )
+        workflow = Settings(
+            app=app_settings,
+            workflow=workflow_settings.model_copy(update={'workday_duration': 7}),
+            jira=jira_settings,
+        )
+
+        assert logging.fingerprint != settings.fingerprint
+        assert logging.metrics_fingerprint == queries.metrics_fingerprint == settings.metrics_fingerprint
+        assert workflow.metrics_fingerprint != settings.metrics_fingerprint
 
     def test_settings_immutability(self: 'TestSettings') -> None:
         """Tests that a Settings instance is immutable."""
@@ -262,3 +347,55 @@ class TestLoadSettings:
 
         with pytest.raises(ValueError, match='Field required'):
             load_settings(config_file)
+
+
+class TestReloadableSettings:
+    """Tests for the ReloadableSettings class."""
+
+    CONTENT = """
+        [app]
+        country = US
+        timezone = Europe/Berlin
+
+        [workflow]
+        workday_starts_at = 09:30
+        workday_ends_at = 17:30
+        workday_duration = 8
+
+        [jira]
+        team = analytics
+        project = ANALYTICS
+        board_id = 999
+        sprint_offset = 800
+        sprint_close_time = 14:00
+        issue_types = Open, In Review
+        """
+
+    def test_reload_swaps_changed_settings(self, tmp_path: Path) -> None:
+        """Tests that a changed file is revalidated and swapped, and an untouched one is not read again."""
+        config_file = tmp_path / 'settings.ini'
+        config_file.write_text(self.CONTENT)
+        settings = ReloadableSettings(config_file)
+        previous = settings.snapshot()
+
+        assert settings.reload() is None
+
+        config_file.write_text(self.CONTENT.replace('workday_duration = 8', 'workday_duration = 7'))
+        stamp = config_file.stat().st_mtime_ns + 1_000_000_000
+        os.utime(config_file, ns=(stamp, stamp))
+
+        assert settings.reload() == (previous, settings.snapshot())
+        assert settings.snapshot().workflow.workday_duration == 7
+
+    def test_reload_keeps_settings_of_missing_file(self, tmp_path: Path) -> None:
+        """Tests that removing the file keeps the current settings."""
+        config_file = tmp_path / 'settings.ini'
+        config_file.write_text(self.CONTENT)
+        settings = ReloadableSettings(config_file)
+        previous = settings.snapshot()
+        config_file.unlink()
+
+        with pytest.raises(ValueError, match='Failed to read settings file'):
+            settings.reload()
+        assert settings.reload() is None
+        assert settings.snapshot() is previous
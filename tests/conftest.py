@@ -1,19 +1,37 @@
+import sys
+from typing import Generator
 from unittest.mock import create_autospec
 
 import pytest
 from pytest_mock import MockerFixture
 
-from rebelist.streamline.application.compute import FlowMetricsService
+from rebelist.streamline.application.compute import AsyncFlowMetricsService
 from rebelist.streamline.config.settings import Settings
 
 
 @pytest.fixture
 def mock_settings(mocker: MockerFixture) -> Settings:
-    """Create a mocked Settings instance with a fake Jira team."""
-    return create_autospec(Settings, jira=mocker.MagicMock(team='FakeTeam'))
+    """Create a mocked Settings instance with a fake Jira team and response validation on."""
+    return create_autospec(
+        Settings,
+        jira=mocker.MagicMock(team='FakeTeam'),
+        app=mocker.MagicMock(debug=True),
+        api=mocker.MagicMock(cache_max_age=60),
+        fingerprint='fake-fingerprint',
+        metrics_fingerprint='fake-metrics-fingerprint',
+    )
 
 
 @pytest.fixture
-def mock_flow_metrics_service() -> FlowMetricsService:
-    """Create a mocked FlowMetricsService instance."""
-    return create_autospec(FlowMetricsService, instance=True)
+def mock_flow_metrics_service() -> AsyncFlowMetricsService:
+    """Create a mocked AsyncFlowMetricsService instance."""
+    return create_autospec(AsyncFlowMetricsService, instance=True)
+
+
+@pytest.fixture
+def frequent_thread_switches() -> Generator[None]:
+    """Makes the interpreter switch threads as often as it can, so unguarded shared counters lose updates."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
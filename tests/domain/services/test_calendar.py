@@ -197,3 +197,15 @@ class TestCalendarService:
         end_non_working = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
         delta_non_working = service.get_working_days_delta(start_non_working, end_non_working)
         assert delta_non_working == 0.0
+
+    def test_warm_up_walks_each_year(self, mocker: MockerFixture) -> None:
+        """Tests that warming up asks the calendar about every day of each year."""
+        mock_calendar = mocker.Mock(spec=WorkCalendarProtocol)
+        service = WorkTimeCalculator(mock_calendar, time(9, 0), time(17, 0), 8)
+
+        service.warm_up(range(2024, 2026))
+
+        assert mock_calendar.get_working_days_delta.call_args_list == [
+            mocker.call(date(2024, 1, 1), date(2024, 12, 31)),
+            mocker.call(date(2025, 1, 1), date(2025, 12, 31)),
+        ]
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from rebelist.streamline.domain.time import TimeRange
+
+
+class TestTimeRange:
+    """Tests for the TimeRange dataclass."""
+
+    def test_time_range_bounds(self: 'TestTimeRange') -> None:
+        """Tests a time range keeps its bounds and may be open on either side."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+        assert TimeRange(start, end).start == start
+        assert TimeRange(end=end).start is None
+        assert TimeRange().end is None
+
+    def test_time_range_must_start_before_it_ends(self: 'TestTimeRange') -> None:
+        """Tests a time range cannot be empty or reversed."""
+        moment = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        with pytest.raises(ValueError):
+            TimeRange(moment, moment)
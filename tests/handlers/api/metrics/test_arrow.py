@@ -0,0 +1,88 @@
+import asyncio
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from rebelist.streamline.handlers.api.metrics.models import ExportFormat
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+arrow = pytest.importorskip('rebelist.streamline.handlers.api.metrics.arrow')
+
+
+class DummyRecord(BaseModel):
+    """Record covering every supported field type."""
+
+    key: str
+    count: int
+    ratio: float
+    done: bool
+    at: datetime
+    labels: list[str]
+    points: Optional[int]
+
+
+def records(count: int) -> list[DummyRecord]:
+    """Builds distinct records."""
+    at = datetime(2025, 5, 6, tzinfo=timezone.utc)
+    return [
+        DummyRecord(key=f'A-{i}', count=i, ratio=i / 2, done=i % 2 == 0, at=at, labels=['x'] * i, points=i or None)
+        for i in range(count)
+    ]
+
+
+def encode(rows: list[DummyRecord], export_format: ExportFormat, batch_size: int) -> list[bytes]:
+    """Collects the chunks written by the encoder."""
+
+    async def source() -> AsyncIterator[DummyRecord]:
+        for row in rows:
+            yield row
+
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in arrow.encode(source(), DummyRecord, export_format, batch_size)]
+
+    return asyncio.run(collect())
+
+
+def test_arrow_schema_follows_the_field_annotations() -> None:
+    """Test the schema maps every field to its Arrow type and keeps optional fields nullable."""
+    schema = arrow.arrow_schema(DummyRecord)
+
+    assert schema.names == ['key', 'count', 'ratio', 'done', 'at', 'labels', 'points']
+    assert schema.field('at').type == pa.timestamp('us', tz='UTC')
+    assert schema.field('labels').type == pa.list_(pa.string())
+    assert schema.field('points').nullable
+    assert not schema.field('count').nullable
+
+
+def test_encode_arrow_stream_in_batches() -> None:
+    """Test rows are written as one record batch per batch, each sent as soon as it is encoded."""
+    chunks = encode(records(5), ExportFormat.ARROW, batch_size=2)
+
+    reader = pa.ipc.open_stream(b''.join(chunks))
+    batches = list(reader)
+
+    assert len(chunks) == 3
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    assert pa.Table.from_batches(batches).to_pylist() == [record.model_dump() for record in records(5)]
+
+
+def test_encode_parquet_in_row_groups() -> None:
+    """Test rows are written as one row group per batch of a single Parquet file."""
+    chunks = encode(records(5), ExportFormat.PARQUET, batch_size=2)
+
+    file = pq.ParquetFile(io.BytesIO(b''.join(chunks)))
+
+    assert file.metadata.num_row_groups == 3
+    assert file.read().to_pylist() == [record.model_dump() for record in records(5)]
+
+
+def test_encode_empty_export() -> None:
+    """Test an empty export is still a readable stream with the schema."""
+    table = pa.ipc.open_stream(b''.join(encode([], ExportFormat.ARROW, batch_size=2))).read_all()
+
+    assert table.num_rows == 0
+    assert table.schema.names == arrow.arrow_schema(DummyRecord).names
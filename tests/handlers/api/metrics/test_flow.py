@@ -1,5 +1,9 @@
-from typing import Any, cast
-from unittest.mock import MagicMock, Mock
+import io
+import json
+from datetime import datetime, time, timezone
+from typing import Any, AsyncIterator, cast
+from unittest.mock import MagicMock, Mock, create_autospec
+from zoneinfo import ZoneInfo
 
 import pytest
 from fastapi import FastAPI
@@ -7,30 +11,62 @@ from fastapi.testclient import TestClient
 from httpx2 import Response
 
 from rebelist.streamline.application.compute import (
+    AsyncFlowMetricsService,
     CycleTimeDataPoint,
-    FlowMetricsService,
+    FlowMetric,
     LeadTimeDataPoint,
     SprintCycleTimeDataPoint,
     ThroughputDataPoint,
     VelocityDataPoint,
 )
 from rebelist.streamline.config.container import Container
-from rebelist.streamline.config.settings import Settings
-from rebelist.streamline.handlers.api.metrics import flow
+from rebelist.streamline.config.settings import (
+    AppSettings,
+    JiraSettings,
+    LoggingSettings,
+    Settings,
+    WorkflowSettings,
+)
+from rebelist.streamline.domain.sprint import Sprint
+from rebelist.streamline.domain.ticket import Ticket
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.handlers.api.metrics import dependencies, flow
 from rebelist.streamline.handlers.api.metrics.flow import router
+from rebelist.streamline.handlers.api.metrics.models import COLUMNAR_MEDIA_TYPE
+from rebelist.streamline.infrastructure.mongo.job import AsyncJobRepository
+
+
+async def iterate[T](*items: T) -> AsyncIterator[T]:
+    """Yields items from an asynchronous iterator, like the streaming service methods."""
+    for item in items:
+        yield item
 
 
 @pytest.fixture
-def mock_app(mock_settings: Settings, mock_flow_metrics_service: FlowMetricsService) -> FastAPI:
+def mock_job_repository() -> MagicMock:
+    """Creates a mocked job repository without any synchronization recorded."""
+    job_repository = create_autospec(AsyncJobRepository, instance=True)
+
+    def find_versions(names: list[str], team: str) -> dict[str, str | None]:
+        return dict.fromkeys(names)
+
+    job_repository.find_versions.side_effect = find_versions
+    return job_repository
+
+
+@pytest.fixture
+def mock_app(
+    mock_settings: Settings, mock_flow_metrics_service: AsyncFlowMetricsService, mock_job_repository: MagicMock
+) -> FastAPI:
     """Creates a FastAPI app with the flow endpoints and overrides for testing."""
     container = Container()
     container.settings.override(mock_settings)
-    container.flow_metrics_service.override(mock_flow_metrics_service)
-    container.flow_metrics_service.override(mock_flow_metrics_service)
+    container.async_flow_metrics_service.override(mock_flow_metrics_service)
+    container.async_job_repository.override(mock_job_repository)
 
     app = FastAPI()
     app.state.container = container
-    container.wire(modules=[flow])
+    container.wire(modules=[flow, dependencies])
     app.include_router(router)
     return app
 
@@ -158,3 +194,335 @@ class TestVelocityEndpoint:
         assert len(data['datapoints']) == 1
         assert data['datapoints'][0]['sprint'] == 'Sprint 5'
         assert data['datapoints'][0]['story_points_completed'] == 21
+
+
+class TestFlowMetricsEndpoint:
+    """Test suite for the /flow batch endpoint."""
+
+    def test_returns_requested_metrics(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that /flow returns every requested metric from a single service call."""
+        mock_flow_metrics_service.get_flow_metrics.return_value = {
+            FlowMetric.THROUGHPUT: [ThroughputDataPoint(sprint='Sprint 5', completed=8, residuals=2)],
+            FlowMetric.VELOCITY: [
+                VelocityDataPoint(sprint='Sprint 5', story_points_residual=3, story_points_completed=21)
+            ],
+        }
+
+        client = TestClient(mock_app)
+        response = client.get('/flow', params={'metric': ['velocity', 'throughput']})
+
+        assert response.status_code == 200
+        metrics = response.json()['metrics']
+        assert metrics['throughput']['datapoints'] == [{'sprint': 'Sprint 5', 'completed': 8, 'residuals': 2}]
+        assert metrics['throughput']['meta']['metric'] == 'Sprint Throughput'
+        assert metrics['velocity']['datapoints'][0]['story_points_completed'] == 21
+        mock_flow_metrics_service.get_flow_metrics.assert_called_once_with(
+            'FakeTeam', [FlowMetric.VELOCITY, FlowMetric.THROUGHPUT], None
+        )
+
+    def test_defaults_to_all_metrics_in_columnar_format(
+        self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock
+    ) -> None:
+        """Verify that /flow computes every metric when none is requested and honours the columnar format."""
+        mock_flow_metrics_service.get_flow_metrics.return_value = {
+            FlowMetric.THROUGHPUT: [ThroughputDataPoint(sprint='Sprint 5', completed=8, residuals=2)],
+        }
+
+        client = TestClient(mock_app)
+        response = client.get('/flow', params={'format': 'columnar'})
+
+        assert response.status_code == 200
+        assert response.json()['metrics']['throughput']['columns'] == {
+            'sprint': ['Sprint 5'],
+            'completed': [8],
+            'residuals': [2],
+        }
+        mock_flow_metrics_service.get_flow_metrics.assert_called_once_with('FakeTeam', list(FlowMetric), None)
+
+    def test_unknown_metric(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that unknown metric names are rejected."""
+        client = TestClient(mock_app)
+
+        assert client.get('/flow', params={'metric': 'happiness'}).status_code == 422
+        mock_flow_metrics_service.get_flow_metrics.assert_not_called()
+
+
+class TestTimeRangeAndInterval:
+    """Test suite for the from, to and interval query parameters."""
+
+    def test_time_range_is_passed_to_the_service(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that from and to accept epoch milliseconds and ISO datetimes, defaulting to UTC."""
+        mock_flow_metrics_service.get_velocity.return_value = []
+
+        response = TestClient(mock_app).get('/flow/velocity', params={'from': 1735689600000, 'to': '2025-02-01T00:00'})
+
+        assert response.status_code == 200
+        mock_flow_metrics_service.get_velocity.assert_called_once_with(
+            'FakeTeam',
+            TimeRange(datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 2, 1, tzinfo=timezone.utc)),
+        )
+
+    def test_default_window_without_time_range(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that the service keeps its default window when no time range is requested."""
+        mock_flow_metrics_service.get_throughput.return_value = []
+
+        assert TestClient(mock_app).get('/flow/throughput').status_code == 200
+        mock_flow_metrics_service.get_throughput.assert_called_once_with('FakeTeam', None)
+
+    def test_reversed_time_range(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that a time range ending before it starts is rejected."""
+        response = TestClient(mock_app).get('/flow/velocity', params={'from': '2025-02-01', 'to': '2025-01-01'})
+
+        assert response.status_code == 422
+        mock_flow_metrics_service.get_velocity.assert_not_called()
+
+    def test_interval_buckets_durations(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that an interval aggregates the datapoints per bucket."""
+        mock_flow_metrics_service.get_cycle_times.return_value = [
+            CycleTimeDataPoint(duration=1.0, resolved_at=86400 + 60, key='JIRA-1', story_points=1),
+            CycleTimeDataPoint(duration=3.0, resolved_at=86400 + 120, key='JIRA-2', story_points=2),
+        ]
+
+        response = TestClient(mock_app).get('/flow/cycle-time', params={'interval': '1d'})
+
+        assert response.status_code == 200
+        assert response.json()['datapoints'] == [{'bucket': 86400, 'count': 2, 'mean': 2.0, 'p50': 2.0, 'p85': 2.7}]
+
+    @pytest.mark.parametrize('interval', ['0d', '1y', 'soon'])
+    def test_invalid_interval(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock, interval: str) -> None:
+        """Verify that intervals outside the supported notation are rejected."""
+        response = TestClient(mock_app).get('/flow/lead-time', params={'interval': interval})
+
+        assert response.status_code == 422
+        mock_flow_metrics_service.get_lead_times.assert_not_called()
+
+    def test_batch_interval_only_buckets_durations(
+        self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock
+    ) -> None:
+        """Verify that the batch endpoint buckets duration metrics and leaves sprint metrics untouched."""
+        mock_flow_metrics_service.get_flow_metrics.return_value = {
+            FlowMetric.LEAD_TIME: [LeadTimeDataPoint(duration=2.0, resolved_at=3600, key='JIRA-1', story_points=1)],
+            FlowMetric.THROUGHPUT: [ThroughputDataPoint(sprint='Sprint 5', completed=8, residuals=2)],
+        }
+
+        response = TestClient(mock_app).get('/flow', params={'interval': '1h'})
+
+        metrics = response.json()['metrics']
+        assert metrics['lead_time']['datapoints'] == [{'bucket': 3600, 'count': 1, 'mean': 2.0, 'p50': 2.0, 'p85': 2.0}]
+        assert metrics['throughput']['datapoints'] == [{'sprint': 'Sprint 5', 'completed': 8, 'residuals': 2}]
+
+
+class TestExportEndpoints:
+    """Test suite for the export endpoints."""
+
+    def test_cycle_time_export(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that /flow/cycle-time/export writes one JSON document per line."""
+        mock_flow_metrics_service.stream_cycle_times.return_value = iterate(
+            CycleTimeDataPoint(duration=2.5, resolved_at=1714924800, key='JIRA-1', story_points=3),
+            CycleTimeDataPoint(duration=1.0, resolved_at=1715011200, key='JIRA-2', story_points=None),
+        )
+
+        response = TestClient(mock_app).get('/flow/cycle-time/export')
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = response.text.splitlines()
+        assert [json.loads(line)['key'] for line in lines] == ['JIRA-1', 'JIRA-2']
+        mock_flow_metrics_service.stream_cycle_times.assert_called_once_with('FakeTeam', None)
+
+    def test_lead_time_export(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that /flow/lead-time/export streams the lead time history."""
+        mock_flow_metrics_service.stream_lead_times.return_value = iterate(
+            LeadTimeDataPoint(duration=4.0, resolved_at=1714924800, key='JIRA-3', story_points=5)
+        )
+
+        response = TestClient(mock_app).get('/flow/lead-time/export')
+
+        assert response.status_code == 200
+        assert json.loads(response.text) == {
+            'duration': 4.0,
+            'resolved_at': 1714924800,
+            'key': 'JIRA-3',
+            'story_points': 5,
+        }
+
+    def test_cycle_time_export_as_arrow(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that the export is encoded as an Arrow IPC stream on request."""
+        ipc = pytest.importorskip('pyarrow.ipc')
+        mock_flow_metrics_service.stream_cycle_times.return_value = iterate(
+            CycleTimeDataPoint(duration=2.5, resolved_at=1714924800, key='JIRA-1', story_points=3),
+            CycleTimeDataPoint(duration=1.0, resolved_at=1715011200, key='JIRA-2', story_points=None),
+        )
+
+        response = TestClient(mock_app).get('/flow/cycle-time/export', params={'format': 'arrow'})
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/vnd.apache.arrow.stream'
+        assert response.headers['content-disposition'] == 'attachment; filename="cycle-time.arrows"'
+        table = ipc.open_stream(response.content).read_all()
+        assert table.column('key').to_pylist() == ['JIRA-1', 'JIRA-2']
+        assert table.column('story_points').to_pylist() == [3, None]
+
+    def test_tickets_export(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that /tickets/export writes the raw tickets of the team."""
+        at = datetime(2025, 5, 6, tzinfo=timezone.utc)
+        mock_flow_metrics_service.stream_tickets.return_value = iterate(Ticket('JIRA-1', at, at, at, 3))
+
+        response = TestClient(mock_app).get('/tickets/export', params={'from': '2025-01-01T00:00:00Z'})
+
+        assert response.status_code == 200
+        assert json.loads(response.text) == {
+            'key': 'JIRA-1',
+            'created_at': '2025-05-06T00:00:00Z',
+            'started_at': '2025-05-06T00:00:00Z',
+            'resolved_at': '2025-05-06T00:00:00Z',
+            'story_points': 3,
+        }
+        mock_flow_metrics_service.stream_tickets.assert_called_once_with(
+            'FakeTeam', TimeRange(datetime(2025, 1, 1, tzinfo=timezone.utc))
+        )
+
+    def test_sprints_export_as_parquet(self, mock_app: FastAPI, mock_flow_metrics_service: MagicMock) -> None:
+        """Verify that /sprints/export writes one row per sprint as a Parquet file on request."""
+        parquet = pytest.importorskip('pyarrow.parquet')
+        at = datetime(2025, 5, 6, tzinfo=timezone.utc)
+        tickets = [Ticket('JIRA-1', at, at, at, 3), Ticket('JIRA-2', at, at, at, 5)]
+        mock_flow_metrics_service.stream_sprints.return_value = iterate(Sprint('Sprint 1', at, at, tickets))
+
+        response = TestClient(mock_app).get('/sprints/export', params={'format': 'parquet'})
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/vnd.apache.parquet'
+        table = parquet.read_table(io.BytesIO(response.content))
+        assert table.to_pylist() == [
+            {'name': 'Sprint 1', 'opened_at': at, 'closed_at': at, 'tickets': ['JIRA-1', 'JIRA-2'], 'story_points': 8}
+        ]
+
+
+class TestColumnarFormat:
+    """Tests for the columnar layout of the flow endpoints."""
+
+    @pytest.fixture
+    def client(self, mock_app: FastAPI, mock_flow_metrics_service: Mock) -> TestClient:
+        """Create a client with two cycle time datapoints."""
+        mock_flow_metrics_service.get_cycle_times.return_value = [
+            CycleTimeDataPoint(duration=5.5, resolved_at=1714924800, key='JIRA-123', story_points=3),
+            CycleTimeDataPoint(duration=3.2, resolved_at=1715011200, key='JIRA-456', story_points=None),
+        ]
+        return TestClient(mock_app)
+
+    def test_format_query_parameter(self, client: TestClient) -> None:
+        """Checks that ?format=columnar returns one array per field."""
+        response = client.get('/flow/cycle-time', params={'format': 'columnar'})
+        data = cast(dict[str, Any], response.json())
+
+        assert response.status_code == 200
+        assert 'datapoints' not in data
+        assert data['meta']['metric'] == 'Cycle Time'
+        assert data['columns'] == {
+            'duration': [5.5, 3.2],
+            'resolved_at': [1714924800, 1715011200],
+            'key': ['JIRA-123', 'JIRA-456'],
+            'story_points': [3, None],
+        }
+        assert response.headers['vary'] == 'Accept'
+
+    def test_accept_media_type(self, client: TestClient) -> None:
+        """Checks that the columnar media type selects the columnar layout."""
+        response = client.get('/flow/cycle-time', headers={'Accept': COLUMNAR_MEDIA_TYPE})
+
+        assert response.json()['columns']['key'] == ['JIRA-123', 'JIRA-456']
+
+    def test_query_parameter_wins_over_accept(self, client: TestClient) -> None:
+        """Checks that an explicit format overrides the Accept header."""
+        response = client.get('/flow/cycle-time', params={'format': 'rows'}, headers={'Accept': COLUMNAR_MEDIA_TYPE})
+
+        assert len(response.json()['datapoints']) == 2
+
+    def test_empty_datapoints(self, mock_app: FastAPI, mock_flow_metrics_service: Mock) -> None:
+        """Checks that columns are present even without datapoints."""
+        mock_flow_metrics_service.get_throughput.return_value = []
+
+        response = TestClient(mock_app).get('/flow/throughput', params={'format': 'columnar'})
+
+        assert response.json()['columns'] == {'sprint': [], 'completed': [], 'residuals': []}
+
+    def test_invalid_format(self, client: TestClient) -> None:
+        """Checks that unknown formats are rejected."""
+        assert client.get('/flow/cycle-time', params={'format': 'xml'}).status_code == 422
+
+
+class TestConditionalGet:
+    """Tests for the ETag and Cache-Control handling of the flow endpoints."""
+
+    @pytest.fixture
+    def client(self, mock_app: FastAPI, mock_flow_metrics_service: Mock) -> TestClient:
+        """Create a client with one velocity datapoint."""
+        mock_flow_metrics_service.get_velocity.return_value = [
+            VelocityDataPoint(sprint='Sprint 5', story_points_residual=3, story_points_completed=21),
+        ]
+        mock_flow_metrics_service.get_throughput.return_value = []
+        return TestClient(mock_app)
+
+    def test_sends_validators(self, client: TestClient) -> None:
+        """Checks that responses carry a strong ETag and the configured max-age."""
+        response = client.get('/flow/velocity')
+
+        assert response.status_code == 200
+        assert response.headers['etag'].startswith('"')
+        assert response.headers['cache-control'] == 'max-age=60'
+
+    def test_not_modified(self, client: TestClient, mock_flow_metrics_service: Mock) -> None:
+        """Checks that a matching If-None-Match is answered without computing the metric."""
+        etag = client.get('/flow/velocity').headers['etag']
+        mock_flow_metrics_service.get_velocity.reset_mock()
+
+        response = client.get('/flow/velocity', headers={'If-None-Match': f'"other", {etag}'})
+
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        mock_flow_metrics_service.get_velocity.assert_not_called()
+
+    def test_etag_changes_with_data_and_layout(self, client: TestClient, mock_job_repository: MagicMock) -> None:
+        """Checks that a synchronization changing the data or another layout produces another ETag."""
+        etag = client.get('/flow/velocity').headers['etag']
+
+        assert client.get('/flow/velocity', params={'format': 'columnar'}).headers['etag'] != etag
+        assert client.get('/flow/throughput').headers['etag'] != etag
+
+        def find_versions(names: list[str], team: str) -> dict[str, str | None]:
+            return dict.fromkeys(names, 'c0ffee')
+
+        mock_job_repository.find_versions.side_effect = find_versions
+        response = client.get('/flow/velocity', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.headers['etag'] != etag
+
+    def test_etag_survives_unrelated_settings(self, client: TestClient, mock_app: FastAPI) -> None:
+        """Checks that reloading a section the metrics do not read keeps the ETag, unlike the metric settings."""
+        container: Container = mock_app.state.container
+
+        def etag(country: str = 'DE', **sections: Any) -> str:
+            container.settings.override(
+                Settings(
+                    app=AppSettings(country=country, timezone=ZoneInfo('Europe/Berlin')),
+                    workflow=WorkflowSettings(workday_starts_at=time(9), workday_ends_at=time(17), workday_duration=8),
+                    jira=JiraSettings(
+                        team='FakeTeam',
+                        project='FT',
+                        board_id=1,
+                        sprint_offset=0,
+                        sprint_close_time=time(),
+                        issue_types=[],
+                    ),
+                    **sections,
+                )
+            )
+            return client.get('/flow/velocity').headers['etag']
+
+        original = etag()
+
+        assert etag(logging=LoggingSettings(level='DEBUG')) == original
+        assert etag(country='AT') != original
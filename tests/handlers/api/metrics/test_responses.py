@@ -0,0 +1,68 @@
+import json
+import sys
+from typing import AsyncIterator
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.handlers.api.metrics.models import ExportFormat
+from rebelist.streamline.handlers.api.metrics.responses import export, render, stream
+
+
+class DummyDataPoint(BaseModel):
+    """Simple datapoint used to build responses."""
+
+    value: int
+
+
+def test_render_serializes_without_validation() -> None:
+    """Test the fast path serializes constructed models as they are."""
+    response = render(DummyDataPoint.model_construct(value=3), validate=False, etag='"abc"', max_age=60)
+
+    assert response.media_type == 'application/json'
+    assert response.headers['vary'] == 'Accept'
+    assert response.headers['etag'] == '"abc"'
+    assert response.headers['cache-control'] == 'max-age=60'
+    assert json.loads(bytes(response.body)) == {'value': 3}
+
+
+def test_render_validates_when_enabled() -> None:
+    """Test the response is validated before serializing when validation is on."""
+    assert json.loads(
+        bytes(render(DummyDataPoint.model_construct(value='7'), validate=True, etag='"abc"', max_age=60).body)
+    ) == {'value': 7}
+
+    with pytest.raises(ValidationError):
+        render(DummyDataPoint.model_construct(value='unchecked'), validate=True, etag='"abc"', max_age=60)
+
+
+def test_stream_writes_chunked_ndjson() -> None:
+    """Test datapoints are consumed lazily and sent as newline-delimited JSON chunks."""
+    consumed: list[int] = []
+
+    async def datapoints() -> AsyncIterator[DummyDataPoint]:
+        for value in range(5):
+            consumed.append(value)
+            yield DummyDataPoint(value=value)
+
+    response = stream(datapoints(), chunk_size=2)
+
+    assert response.media_type == 'application/x-ndjson'
+    assert consumed == []
+
+
+def test_export_without_pyarrow(mocker: MockerFixture) -> None:
+    """Test binary exports are refused with a hint when the arrow extra is not installed."""
+    mocker.patch.dict(sys.modules, {'rebelist.streamline.handlers.api.metrics.arrow': None})
+
+    async def datapoints() -> AsyncIterator[DummyDataPoint]:
+        yield DummyDataPoint(value=1)
+
+    assert export(datapoints(), DummyDataPoint, ExportFormat.NDJSON, 'dummy').media_type == 'application/x-ndjson'
+    with pytest.raises(HTTPException) as error:
+        export(datapoints(), DummyDataPoint, ExportFormat.PARQUET, 'dummy')
+
+    assert error.value.status_code == 406
+    assert 'rebelist-streamline[arrow]' in error.value.detail
@@ -0,0 +1,102 @@
+import json
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import ProfilingSettings, QueriesSettings
+from rebelist.streamline.handlers.api import debug
+from rebelist.streamline.infrastructure.monitoring import QueryStatsListener, SamplingProfiler
+
+
+def create_client(
+    profiling: ProfilingSettings | None = None,
+    profiler: SamplingProfiler | None = None,
+    queries: QueriesSettings | None = None,
+    query_stats: QueryStatsListener | None = None,
+) -> TestClient:
+    """Creates a client of an app exposing the debug routes, with the given profiling and query settings."""
+    settings = MagicMock()
+    settings.profiling = profiling or ProfilingSettings()
+    settings.queries = queries or QueriesSettings()
+    settings.app.name = 'Streamline'
+    container = Container()
+    container.settings.override(settings)
+    container.profiler.override(profiler or SamplingProfiler(interval=0.001))
+    container.query_stats.override(query_stats or MagicMock(spec=QueryStatsListener))
+    container.wire(modules=[debug])
+
+    app = FastAPI()
+    app.include_router(debug.router)
+    return TestClient(app)
+
+
+def test_profile_is_not_found_while_profiling_is_disabled() -> None:
+    """Test that the worker cannot be profiled unless profiling is enabled."""
+    response = create_client(ProfilingSettings()).get('/debug/profile', params={'seconds': 0.01})
+
+    assert response.status_code == 404
+
+
+def test_profile_returns_speedscope_document() -> None:
+    """Test that the worker is sampled for the requested time and the profile returned as an attachment."""
+    response = create_client(ProfilingSettings(enabled=True)).get('/debug/profile', params={'seconds': 0.05})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['content-disposition'].endswith('.speedscope.json"')
+    document = json.loads(response.content)
+    assert document['name'].startswith('Streamline worker ')
+    assert document['profiles']
+
+
+def test_profile_returns_folded_stacks() -> None:
+    """Test that the profile can be rendered as the folded stacks of a flame graph."""
+    client = create_client(ProfilingSettings(enabled=True))
+
+    response = client.get('/debug/profile', params={'seconds': 0.05, 'format': 'collapsed'})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert response.text.endswith('\n')
+
+
+def test_profile_is_bounded_and_exclusive() -> None:
+    """Test that a profile longer than allowed is rejected, as is a profile while another one is taken."""
+    profiler = SamplingProfiler()
+    client = create_client(ProfilingSettings(enabled=True, max_duration=1), profiler)
+
+    assert client.get('/debug/profile', params={'seconds': 2}).status_code == 422
+
+    profiler.start('running')
+    try:
+        assert client.get('/debug/profile', params={'seconds': 0.01}).status_code == 409
+    finally:
+        profiler.stop()
+
+
+def test_queries_list_the_query_shapes() -> None:
+    """Test that the query statistics are listed by the requested figure, and can be reset."""
+    query_stats = MagicMock(spec=QueryStatsListener)
+    query_stats.stats.return_value = [{'shape': 'find jira_tickets {"filter": {"team": "?"}}', 'count': 3}]
+    client = create_client(queries=QueriesSettings(enabled=True), query_stats=query_stats)
+
+    response = client.get('/debug/queries', params={'sort': 'max_ms', 'limit': 5})
+
+    assert response.status_code == 200
+    assert response.json() == query_stats.stats.return_value
+    query_stats.stats.assert_called_once_with('max_ms', 5)
+    assert client.get('/debug/queries', params={'sort': 'shape'}).status_code == 422
+    assert client.delete('/debug/queries').status_code == 204
+    query_stats.reset.assert_called_once()
+
+
+def test_queries_are_not_found_while_disabled() -> None:
+    """Test that the query statistics cannot be read nor reset unless enabled."""
+    query_stats = MagicMock(spec=QueryStatsListener)
+    client = create_client(query_stats=query_stats)
+
+    assert client.get('/debug/queries').status_code == 404
+    assert client.delete('/debug/queries').status_code == 404
+    query_stats.reset.assert_not_called()
@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rebelist.streamline.handlers.api import health
+
+
+def create_client(ready: bool | None) -> TestClient:
+    """Creates a client of an app exposing the health routes, in the given readiness state."""
+    app = FastAPI()
+    if ready is not None:
+        app.state.ready = ready
+    app.include_router(health.router)
+    return TestClient(app)
+
+
+def test_worker_is_live_but_not_ready_while_warming_up() -> None:
+    """Test that readiness is withheld until the warmup completed, liveness is not."""
+    for client in (create_client(None), create_client(False)):
+        assert client.get('/health/live').json() == {'status': 'live'}
+        response = client.get('/health/ready')
+        assert response.status_code == 503
+        assert response.json() == {'detail': 'Warming up.'}
+
+
+def test_worker_is_ready_once_warm() -> None:
+    """Test that readiness is reported once the warmup completed."""
+    response = create_client(True).get('/health/ready')
+
+    assert response.status_code == 200
+    assert response.json() == {'status': 'ready'}
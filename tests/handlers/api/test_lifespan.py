@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.handlers.api import health, lifespan
+from rebelist.streamline.infrastructure.monitoring import Logger
+
+
+@pytest.fixture
+def container(mocker: MockerFixture) -> MagicMock:
+    """Mocks a container with a warmup completing right away."""
+    container = mocker.MagicMock(spec=Container)
+    container.warmup.return_value.run = mocker.AsyncMock()
+    container.logger.return_value = mocker.MagicMock(spec=Logger)
+    container.async_database.return_value.client.close = mocker.AsyncMock()
+    return container
+
+
+def test_lifespan_reports_ready_once_warm(container: MagicMock, mocker: MockerFixture) -> None:
+    """Test that starting the app warms it up and only then reports it ready."""
+    mocker.patch.object(Container, 'reload_settings', return_value=frozenset())
+    app = FastAPI(lifespan=lifespan.lifespan)
+    app.state.container = container
+    app.include_router(health.router)
+
+    with TestClient(app) as client:
+        assert client.get('/health/ready').status_code == 200
+
+    container.warmup.return_value.run.assert_awaited_once()
+    container.async_database.return_value.client.close.assert_awaited_once()
+    container.logger.return_value.complete.assert_called_once()
+
+
+def test_watch_settings_warms_replaced_services_up(container: MagicMock, mocker: MockerFixture) -> None:
+    """Test that changed settings are logged and warmed up again, and invalid ones are logged and skipped."""
+    outcomes = iter([ValueError('invalid'), frozenset({'jira'})])
+
+    def reload(_: Container) -> frozenset[str]:
+        outcome = next(outcomes, frozenset[str]())
+        if isinstance(outcome, ValueError):
+            raise outcome
+        return outcome
+
+    reload_settings = mocker.patch.object(Container, 'reload_settings', side_effect=reload)
+
+    async def scenario() -> None:
+        watcher = asyncio.create_task(lifespan.watch_settings(container, interval=0))
+        while reload_settings.call_count < 3:
+            await asyncio.sleep(0)
+        watcher.cancel()
+
+    asyncio.run(scenario())
+
+    container.logger.return_value.error.assert_called_once()
+    container.logger.return_value.info.assert_called_once_with('Settings reloaded, changed sections: jira.')
+    container.tracer.assert_called_once()
+    container.warmup.return_value.run.assert_called_once()
+
+
+def test_warm_up_sets_readiness(container: MagicMock) -> None:
+    """Test that the app is reported ready once the warmup ran."""
+    app = FastAPI()
+
+    asyncio.run(lifespan.warm_up(app, container))
+
+    assert app.state.ready is True
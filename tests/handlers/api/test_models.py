@@ -4,7 +4,13 @@ import pytest
 from pydantic import BaseModel
 from pydantic_core import ValidationError
 
-from rebelist.streamline.handlers.api.metrics.models import MetricMetadata, MetricResponse, TimeMetricMetadata, TimeUnit
+from rebelist.streamline.handlers.api.metrics.models import (
+    ColumnarMetricResponse,
+    MetricMetadata,
+    MetricResponse,
+    TimeMetricMetadata,
+    TimeUnit,
+)
 
 
 class DummyDataPoint(BaseModel):
@@ -39,6 +45,16 @@ class TestTimeSeriesModels:
         assert response.datapoints == datapoints
         assert response.meta.metric == 'Dummy'
 
+    def test_columnar_metric_response_from_datapoints(self) -> None:
+        """Test transposing datapoints into columns."""
+        meta = MetricMetadata(metric='Dummy', description='Test')
+        datapoints = [DummyDataPoint(value=1), DummyDataPoint(value=2)]
+
+        response = ColumnarMetricResponse[MetricMetadata].from_datapoints(DummyDataPoint, datapoints, meta)
+
+        assert response.columns == {'value': [1, 2]}
+        assert response.meta == meta
+
     def test_time_metric_response_immutable(self) -> None:
         """Test that MetricResponse is immutable (frozen=True)."""
         response = MetricResponse[DummyDataPoint, MetricMetadata](
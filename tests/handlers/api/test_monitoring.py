@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.handlers.api import debug, monitoring
+from rebelist.streamline.infrastructure.mongo.run import SyncRunRepository
+from rebelist.streamline.infrastructure.monitoring import InMemorySpanExporter, Metrics, SyncRunCollector, Tracer
+
+
+@pytest.fixture
+def collector() -> InMemorySpanExporter:
+    """Creates an in-memory span collector."""
+    return InMemorySpanExporter(100)
+
+
+@pytest.fixture
+def tracer(collector: InMemorySpanExporter) -> Tracer:
+    """Creates a tracer exporting its spans to the collector."""
+    tracer = Tracer()
+    tracer.configure([collector])
+    return tracer
+
+
+@pytest.fixture
+def client(tracer: Tracer, collector: InMemorySpanExporter) -> TestClient:
+    """Creates an instrumented FastAPI app without any synchronization recorded."""
+    run_repository = MagicMock(spec=SyncRunRepository)
+    run_repository.find_recent.return_value = []
+    container = Container()
+    container.metrics.override(Metrics())
+    container.sync_run_collector.override(SyncRunCollector(run_repository))
+    container.tracer.override(tracer)
+    container.span_collector.override(collector)
+    container.wire(modules=[monitoring, debug])
+
+    app = FastAPI()
+
+    @app.get('/teams/{team}')
+    def team(team: str) -> dict[str, str]:
+        return {'team': team}
+
+    monitoring.instrument(app, container)
+    return TestClient(app)
+
+
+def test_metrics_endpoint_exposes_request_latency_per_route(client: TestClient) -> None:
+    """Test that requests are recorded with their route template and published in the text format."""
+    client.get('/teams/loki')
+    client.get('/teams/thor')
+    client.get('/missing')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'streamline_http_request_duration_seconds_count{method="GET",route="/teams/{team}",status="200"} 2.0' in (
+        response.text
+    )
+    assert 'route="unmatched",status="404"' in response.text
+    assert '# TYPE streamline_sync_last_run_timestamp_seconds gauge' in response.text
+
+
+def test_requests_are_traced_per_route(client: TestClient, collector: InMemorySpanExporter) -> None:
+    """Test that a request is recorded as a root span named after its route, continuing the trace of its caller."""
+    trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+
+    response = client.get('/teams/loki', headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'})
+
+    [span] = collector.trace(trace_id)
+    assert span.name == 'GET /teams/{team}'
+    assert span.parent_id == '00f067aa0ba902b7'
+    assert span.attributes == {
+        'http.request.method': 'GET',
+        'url.path': '/teams/loki',
+        'http.response.status_code': 200,
+        'http.route': '/teams/{team}',
+    }
+    assert response.headers['traceresponse'] == span.traceparent
+
+
+def test_debug_traces_list_and_detail_recorded_traces(client: TestClient) -> None:
+    """Test that the recorded traces are listed, slowest first, and detailed in the OTLP JSON format."""
+    client.get('/teams/loki')
+    client.get('/missing')
+
+    traces = client.get('/debug/traces', params={'limit': 10}).json()
+    trace_id = next(trace['trace_id'] for trace in traces if trace['name'] == 'GET /teams/{team}')
+    spans = client.get(f'/debug/traces/{trace_id}').json()
+
+    assert {trace['name'] for trace in traces} == {'GET /teams/{team}', 'GET unmatched'}
+    assert [span['name'] for span in spans] == ['GET /teams/{team}']
+    assert client.get(f'/debug/traces/{"0" * 32}').status_code == 404
+
+
+def test_debug_traces_are_not_found_when_tracing_is_disabled(client: TestClient, tracer: Tracer) -> None:
+    """Test that requests are not traced and the debug routes answer 404 Not Found while tracing is disabled."""
+    tracer.configure([])
+
+    response = client.get('/teams/loki')
+
+    assert 'traceresponse' not in response.headers
+    assert client.get('/debug/traces').status_code == 404
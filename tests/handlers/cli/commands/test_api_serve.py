@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.config.settings import ServerSettings
+from rebelist.streamline.handlers.cli.commands.api_serve import ApiServer, api_serve
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+@pytest.fixture
+def container() -> MagicMock:
+    """Mock a container configured with the default server settings."""
+    container = MagicMock()
+    container.settings.return_value.server = ServerSettings(workers=4, max_requests=1000)
+    return container
+
+
+def test_api_serve_command(runner: CliRunner, container: MagicMock, mocker: MockerFixture) -> None:
+    """Test the options and the environment override the configured server settings."""
+    server = mocker.patch('rebelist.streamline.handlers.cli.commands.api_serve.ApiServer')
+
+    result = runner.invoke(
+        api_serve, ['--workers', '2', '--port', '9000'], obj=container, env={'STREAMLINE_SERVER_BACKLOG': '512'}
+    )
+
+    assert result.exit_code == 0
+    server.assert_called_once_with(ServerSettings(port=9000, workers=2, max_requests=1000, backlog=512))
+    server.return_value.run.assert_called_once()
+
+
+def test_api_serve_command_rejects_invalid_options(runner: CliRunner, container: MagicMock) -> None:
+    """Test out of range options are rejected before the server starts."""
+    result = runner.invoke(api_serve, ['--workers', '-1'], obj=container)
+
+    assert result.exit_code == 2
+
+
+def test_api_server_runs_uvicorn(mocker: MockerFixture) -> None:
+    """Test the server profile is handed over to uvicorn."""
+    run = mocker.patch('rebelist.streamline.handlers.cli.commands.api_serve.uvicorn.run')
+
+    ApiServer(ServerSettings(workers=3, keep_alive=10)).run()
+
+    run.assert_called_once_with(
+        ApiServer.APP,
+        host='0.0.0.0',
+        port=8000,
+        workers=3,
+        limit_max_requests=None,
+        timeout_keep_alive=10,
+        backlog=2048,
+    )
+
+
+def test_worker_count_defaults_to_cpus(mocker: MockerFixture) -> None:
+    """Test one worker per available CPU is used unless configured."""
+    mocker.patch('rebelist.streamline.config.settings.os.process_cpu_count', return_value=6)
+
+    assert ServerSettings().worker_count == 6
+    assert ServerSettings(workers=2).worker_count == 2
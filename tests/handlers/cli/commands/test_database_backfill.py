@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.application.ingestion.jobs import BackfillJob, JobResult
+from rebelist.streamline.handlers.cli.commands.database_backfill import Backfiller, database_backfill
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+def test_database_backfill_command(runner: CliRunner, mocker: MockerFixture) -> None:
+    """Test the 'database:backfill' command runs the backfiller."""
+    mock_run = mocker.patch.object(Backfiller, 'run')
+    container = MagicMock()
+
+    result = runner.invoke(database_backfill, ['--threads', '2', '--restart'], obj=container)
+
+    assert result.exit_code == 0
+    container.backfill_job.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_backfiller_run() -> None:
+    """Test the backfiller passes its options to the job."""
+    job = MagicMock(spec=BackfillJob)
+    job.execute.return_value = JobResult(written=3, items=4)
+
+    Backfiller(job, 2, 3, 10, 512, True).run()
+
+    args = job.execute.call_args[0]
+    assert args[:5] == (2, 3, 10, 512 * 1024 * 1024, True)
+    args[5](1, 2)  # the progress callback
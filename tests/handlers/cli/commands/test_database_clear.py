@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from click.testing import CliRunner
 
+from rebelist.streamline.handlers.cli.commands.command import CommandTask
 from rebelist.streamline.handlers.cli.commands.database_clear import DatabaseEraser, database_clear
 
 
@@ -59,3 +60,38 @@ def test_database_eraser_run(mocker: pytest.MonkeyPatch) -> None:
     mock_delete_many = MagicMock()
     mock_collection1.delete_many = mock_delete_many
     mock_collection2.delete_many = mock_delete_many
+
+
+def test_clear_command_fast(runner: CliRunner, mock_container: MagicMock) -> None:
+    """Test the 'database:clear --fast' command creates a fast eraser."""
+    with patch('rebelist.streamline.handlers.cli.commands.database_clear.DatabaseEraser') as mock_database_eraser:
+        result = runner.invoke(database_clear, ['--fast'], obj=mock_container, input='y\n')
+
+        assert result.exit_code == 0
+        mock_database_eraser.assert_called_once_with(mock_container.database.return_value, True)
+        mock_database_eraser.return_value.run.assert_called_once()
+
+
+def test_database_eraser_run_fast() -> None:
+    """Test the fast DatabaseEraser drops the collections and recreates the declared indexes."""
+    mock_database = MagicMock()
+    mock_database.list_collection_names.return_value = ['jira_sprints', 'legacy']
+    collections: dict[str, MagicMock] = {}
+
+    def get_collection(name: str) -> MagicMock:
+        return collections.setdefault(name, MagicMock(name=name))
+
+    mock_database.__getitem__.side_effect = get_collection
+
+    def execute_tasks(tasks: list[CommandTask]) -> None:
+        for task in tasks:
+            task.execute()
+
+    with patch.object(DatabaseEraser, '_execute_tasks', side_effect=execute_tasks):
+        DatabaseEraser(mock_database, fast=True).run()
+
+    collections['jira_sprints'].drop.assert_called_once()
+    collections['legacy'].drop.assert_called_once()
+    collections['jira_sprints'].delete_many.assert_not_called()
+    collections['jira_sprints'].create_index.assert_called()
+    collections['legacy'].create_index.assert_not_called()
@@ -0,0 +1,156 @@
+import json
+from datetime import date, time
+from pathlib import Path
+from typing import Any, Sequence
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+import pytest
+from click.testing import CliRunner
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.application.ingestion.jobs import SprintJob, TicketJob
+from rebelist.streamline.config.settings import JiraSettings
+from rebelist.streamline.handlers.cli.commands.database_generate import SyntheticDatabaseLoader, database_generate
+from rebelist.streamline.infrastructure.jira.synthetic import SyntheticJira
+from rebelist.streamline.infrastructure.mongo.job import JobRepository
+from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository
+from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+@pytest.fixture
+def jira_settings() -> JiraSettings:
+    """Creates the Jira settings of the team."""
+    return JiraSettings(
+        team='Loki', project='HIVE', board_id=533, sprint_offset=0, sprint_close_time=time(18), issue_types=['Bug']
+    )
+
+
+@pytest.fixture
+def mock_container(jira_settings: JiraSettings) -> MagicMock:
+    """Mock the container object with the settings of a German team."""
+    container = MagicMock()
+    container.settings.return_value.jira = jira_settings
+    container.settings.return_value.app.country = 'DE'
+    container.settings.return_value.app.timezone = ZoneInfo('Europe/Berlin')
+    return container
+
+
+class WeekdayCalendar:
+    """Calendar of the weekdays."""
+
+    def is_working_day(self, day: date) -> bool:
+        """Checks whether a day is a weekday."""
+        return day.weekday() < 5
+
+    def get_working_days_delta(self, start: date, end: date) -> int:
+        """Unused by the generator."""
+        raise NotImplementedError
+
+
+def test_generate_command_writes_the_responses(runner: CliRunner, mock_container: MagicMock, tmp_path: Path) -> None:
+    """Test the 'database:generate --output' command writes the Jira exchanges without touching the database."""
+    path = tmp_path / 'jira' / 'responses.ndjson'
+
+    result = runner.invoke(
+        database_generate, ['--sprints', '3', '--tickets-per-sprint', '4', '--output', str(path)], obj=mock_container
+    )
+
+    assert result.exit_code == 0
+    exchanges = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert len(exchanges) == 4
+    assert exchanges[0]['response']['values'][0]['name'] == 'Loki Sprint 1'
+    mock_container.ticket_document_repository.assert_not_called()
+
+
+def test_generate_command_yes(runner: CliRunner, mock_container: MagicMock, mocker: MockerFixture) -> None:
+    """Test the 'database:generate --yes' command loads the history without asking."""
+    mock_run = mocker.patch.object(SyntheticDatabaseLoader, 'run')
+    mock_confirm = mocker.patch('rebelist.streamline.handlers.cli.commands.database_generate.click.confirm')
+
+    result = runner.invoke(database_generate, ['--yes', '--seed', '3'], obj=mock_container)
+
+    assert result.exit_code == 0
+    mock_confirm.assert_not_called()
+    mock_container.sprint_document_repository.assert_called_once()
+    mock_container.ticket_document_repository.assert_called_once()
+    mock_container.job_repository.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_generate_command_no(runner: CliRunner, mock_container: MagicMock, mocker: MockerFixture) -> None:
+    """Test the 'database:generate' command keeps the data when the user declines."""
+    mock_run = mocker.patch.object(SyntheticDatabaseLoader, 'run')
+
+    result = runner.invoke(database_generate, obj=mock_container, input='n\n')
+
+    assert result.exit_code == 0
+    assert 'Bye!' in result.output
+    mock_run.assert_not_called()
+
+
+def test_generate_command_unknown_country(runner: CliRunner, mock_container: MagicMock) -> None:
+    """Test the 'database:generate' command rejects a country without a calendar."""
+    mock_container.settings.return_value.app.country = 'XX'
+
+    result = runner.invoke(database_generate, ['--yes'], obj=mock_container)
+
+    assert result.exit_code == 2
+    assert 'No WorkCalendar class found for region XX' in result.output
+
+
+def test_loader_replaces_the_team_documents(jira_settings: JiraSettings, mocker: MockerFixture) -> None:
+    """Test the loader deletes the documents of the team, then inserts the history in batches."""
+    mocker.patch.object(SyntheticDatabaseLoader, 'BATCH_SIZE', 10)
+    jira = SyntheticJira(jira_settings, WeekdayCalendar(), ZoneInfo('Europe/Berlin'), sprints=6, tickets_per_sprint=8)
+    sprint_repository = MagicMock(spec=MongoSprintDocumentRepository)
+    ticket_repository = MagicMock(spec=MongoTicketDocumentRepository)
+
+    def insert_many(documents: Sequence[Any]) -> int:
+        return len(documents)
+
+    sprint_repository.insert_many.side_effect = insert_many
+    ticket_repository.insert_many.side_effect = insert_many
+
+    SyntheticDatabaseLoader(jira, sprint_repository, ticket_repository, MagicMock(spec=JobRepository), 'Loki').run()
+
+    sprint_repository.delete_by_team_name.assert_called_once_with('Loki')
+    ticket_repository.delete_by_team_name.assert_called_once_with('Loki')
+    sprints = [sprint for call in sprint_repository.insert_many.call_args_list for sprint in call.args[0]]
+    tickets = [ticket for call in ticket_repository.insert_many.call_args_list for ticket in call.args[0]]
+    assert [sprint['name'] for sprint in sprints] == [f'Loki Sprint {number}' for number in range(1, 7)]
+    assert tickets == [ticket for _, sprint_tickets in jira.documents() for ticket in sprint_tickets]
+    assert ticket_repository.insert_many.call_count > 1
+
+
+def test_loader_changes_the_data_version(jira_settings: JiraSettings) -> None:
+    """Test the loader stores a new data version of the sprint and ticket jobs, so the cached metrics are recomputed."""
+    jira = SyntheticJira(jira_settings, WeekdayCalendar(), ZoneInfo('Europe/Berlin'), sprints=2, tickets_per_sprint=3)
+    collection = MagicMock(spec=Collection)
+    database = MagicMock(spec=Database)
+    database.get_collection.return_value = collection
+    loader = SyntheticDatabaseLoader(
+        jira,
+        MagicMock(spec=MongoSprintDocumentRepository),
+        MagicMock(spec=MongoTicketDocumentRepository),
+        JobRepository(database),
+        'Loki',
+    )
+
+    loader.run()
+    loader.run()
+
+    stored: dict[str, list[str]] = {SprintJob.JOB_NAME: [], TicketJob.JOB_NAME: []}
+    for call in collection.update_one.call_args_list:
+        assert call.args[0]['team'] == 'Loki'
+        assert call.kwargs == {'upsert': True}
+        stored[call.args[0]['name']].append(call.args[1]['$set']['data_version'])
+    assert all(len(set(versions)) == 2 for versions in stored.values())
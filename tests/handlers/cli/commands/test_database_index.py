@@ -29,6 +29,8 @@ def mock_database() -> MagicMock:
         'jobs': MagicMock(name='jobs'),
         'jira_sprints': MagicMock(name='jira_sprints'),
         'jira_tickets': MagicMock(name='jira_tickets'),
+        'ingest_queue': MagicMock(name='ingest_queue'),
+        'sync_runs': MagicMock(name='sync_runs'),
     }[name]
     return db
 
@@ -58,12 +60,14 @@ def test_database_indexer_run(mock_database: MagicMock):
     with patch.object(IndexTask, 'execute') as mock_execute:
         indexer.run()
 
-        # Should be called 3 times: jobs, jira_sprints, jira_tickets
-        assert mock_execute.call_count == 3
+        # Should be called 5 times: jobs, jira_sprints, jira_tickets, ingest_queue, sync_runs
+        assert mock_execute.call_count == 5
 
         mock_database.__getitem__.assert_any_call('jobs')
         mock_database.__getitem__.assert_any_call('jira_sprints')
         mock_database.__getitem__.assert_any_call('jira_tickets')
+        mock_database.__getitem__.assert_any_call('ingest_queue')
+        mock_database.__getitem__.assert_any_call('sync_runs')
 
 
 def test_database_index_command(runner: CliRunner, mock_database: MagicMock):
@@ -0,0 +1,58 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from rebelist.streamline.handlers.cli.commands.database_restore import DatabaseRestorer, database_restore
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> Path:
+    """Create an empty snapshot file."""
+    path = tmp_path / 'snapshot.bson.gz'
+    path.touch()
+    return path
+
+
+def test_restore_command_yes(runner: CliRunner, snapshot: Path) -> None:
+    """Test the 'database:restore' command when the user confirms."""
+    container = MagicMock()
+
+    with patch.object(DatabaseRestorer, 'run') as mock_run:
+        result = runner.invoke(database_restore, [str(snapshot)], obj=container, input='y\n')
+
+    assert result.exit_code == 0
+    container.database_archive.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_restore_command_no(runner: CliRunner, snapshot: Path) -> None:
+    """Test the 'database:restore' command when the user declines."""
+    container = MagicMock()
+
+    with patch.object(DatabaseRestorer, 'run') as mock_run:
+        result = runner.invoke(database_restore, [str(snapshot)], obj=container, input='n\n')
+
+    assert result.exit_code == 0
+    assert 'Bye!' in result.output
+    mock_run.assert_not_called()
+
+
+def test_database_restorer_run(snapshot: Path) -> None:
+    """Test the restorer restores the archive and recreates the declared indexes."""
+    archive = MagicMock(spec=MongoArchive)
+    database = MagicMock()
+
+    with patch.object(DatabaseRestorer, '_execute_tasks') as mock_execute_tasks:
+        DatabaseRestorer(archive, database, snapshot).run()
+
+    assert archive.restore.call_args[0][0] == snapshot
+    assert len(mock_execute_tasks.call_args[0][0]) == 5
@@ -0,0 +1,38 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.handlers.cli.commands.database_snapshot import DatabaseSnapshot, database_snapshot
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+def test_database_snapshot_command(runner: CliRunner, mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the 'database:snapshot' command runs a snapshot."""
+    mock_run = mocker.patch.object(DatabaseSnapshot, 'run')
+    container = MagicMock()
+
+    result = runner.invoke(database_snapshot, [str(tmp_path / 'snapshot.bson.gz')], obj=container)
+
+    assert result.exit_code == 0
+    container.database_archive.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_database_snapshot_run(tmp_path: Path) -> None:
+    """Test the snapshot dumps the archive to the given path."""
+    archive = MagicMock(spec=MongoArchive)
+    archive.dump.return_value = {'jobs': 1}
+    path = tmp_path / 'snapshot.bson.gz'
+
+    DatabaseSnapshot(archive, path).run()
+
+    assert archive.dump.call_args[0][0] == path
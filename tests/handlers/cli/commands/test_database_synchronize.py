@@ -1,11 +1,13 @@
+import json
 from unittest.mock import MagicMock
 
 import pytest
 from click.testing import CliRunner
 from pytest_mock import MockerFixture
 
-from rebelist.streamline.application.ingestion.jobs.models import Executable
-from rebelist.streamline.handlers.cli.commands.database_synchronize import Synchronizer, database_synchronize
+from rebelist.streamline.application.ingestion.jobs.models import Executable, JobPhase, JobResult
+from rebelist.streamline.handlers.cli.commands.database_synchronize import Synchronizer, SyncTask, database_synchronize
+from rebelist.streamline.infrastructure.mongo.run import SyncRun, SyncRunRepository
 
 
 @pytest.fixture
@@ -20,6 +22,10 @@ def mock_container():
     container = MagicMock()
     container.sprint_job.return_value = MagicMock(spec=Executable, __doc__='Mock Sprint Job')
     container.ticket_job.return_value = MagicMock(spec=Executable, __doc__='Mock Ticket Job')
+    container.sprint_producer_job.return_value = MagicMock(spec=Executable, __doc__='Mock Sprint Producer')
+    container.ticket_producer_job.return_value = MagicMock(spec=Executable, __doc__='Mock Ticket Producer')
+    container.sync_run_repository.return_value = MagicMock(spec=SyncRunRepository)
+    container.settings.return_value.app.version = '0.7.1'
     return container
 
 
@@ -32,6 +38,21 @@ def test_synchronizer_command(runner: CliRunner, mock_container: MagicMock, mock
     assert result.exit_code == 0
     mock_container.sprint_job.assert_called_once()
     mock_container.ticket_job.assert_called_once()
+    mock_container.sprint_producer_job.assert_not_called()
+    mock_synchronizer_run.assert_called_once()
+
+
+def test_synchronizer_command_enqueue(runner: CliRunner, mock_container: MagicMock, mocker: MockerFixture) -> None:
+    """Test the 'database:synchronize --enqueue' command registers the producer jobs."""
+    mock_synchronizer_run = mocker.patch.object(Synchronizer, 'run')
+
+    result = runner.invoke(database_synchronize, ['--enqueue'], obj=mock_container)
+
+    assert result.exit_code == 0
+    mock_container.sprint_producer_job.assert_called_once()
+    mock_container.ticket_producer_job.assert_called_once()
+    mock_container.sprint_job.assert_not_called()
+    mock_container.ticket_job.assert_not_called()
     mock_synchronizer_run.assert_called_once()
 
 
@@ -39,9 +60,63 @@ def test_synchronizer_run(mocker: MockerFixture):
     """Test the Synchronizer.run method."""
     mock_job1 = MagicMock(spec=Executable, __doc__='Job 1')
     mock_job2 = MagicMock(spec=Executable, __doc__='Job 2')
+    mock_job1.execute.return_value = JobResult()
+    mock_job2.execute.return_value = JobResult()
     sync = Synchronizer()
     sync.register(mock_job1)
     sync.register(mock_job2)
     sync.run()
     mock_job1.execute.assert_called_once()
     mock_job2.execute.assert_called_once()
+
+
+def test_synchronizer_run_persists_report() -> None:
+    """Test that the run report is saved with the application version."""
+    result = JobResult(written=3, items=4, bytes_received=2048, retries=1, phases={JobPhase.MONGO_WRITE: 0.25})
+    mock_job = MagicMock(spec=Executable, __doc__='Sprint Job')
+    mock_job.execute.return_value = result
+    mock_run_repository = MagicMock(spec=SyncRunRepository)
+
+    sync = Synchronizer(mock_run_repository, '0.7.1')
+    sync.register(mock_job)
+    sync.run()
+
+    run: SyncRun = mock_run_repository.save.call_args[0][0]
+    assert run.version == '0.7.1'
+    assert len(run.jobs) == 1
+    report = run.jobs[0]
+    assert report['job'] == 'Sprint Job'
+    assert report['items'] == 4
+    assert report['written'] == 3
+    assert report['bytes_received'] == 2048
+    assert report['retries'] == 1
+    assert report['phases'] == {'mongo_write': 0.25}
+
+
+def test_sync_task_report_throughput(mocker: MockerFixture) -> None:
+    """Test that the task report derives items per second from the measured duration."""
+    mocker.patch(
+        'rebelist.streamline.handlers.cli.commands.database_synchronize.perf_counter', side_effect=[10.0, 12.0]
+    )
+    mock_job = MagicMock(spec=Executable, __doc__='Ticket Job')
+    mock_job.execute.return_value = JobResult(items=100)
+
+    task = SyncTask(mock_job)
+    task.execute()
+
+    assert task.duration == 2.0
+    assert task.report()['items_per_second'] == 50.0
+
+
+def test_synchronizer_command_json(runner: CliRunner, mock_container: MagicMock) -> None:
+    """Test the 'database:synchronize --json' command prints the report as JSON."""
+    mock_container.sprint_job.return_value.execute.return_value = JobResult(written=1, items=1)
+    mock_container.ticket_job.return_value.execute.return_value = JobResult(skipped=2, items=2)
+
+    result = runner.invoke(database_synchronize, ['--json'], obj=mock_container)
+
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report['version'] == '0.7.1'
+    assert [job['job'] for job in report['jobs']] == ['Mock Sprint Job', 'Mock Ticket Job']
+    mock_container.sync_run_repository.return_value.save.assert_called_once()
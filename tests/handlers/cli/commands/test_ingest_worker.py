@@ -0,0 +1,43 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.application.ingestion.jobs import IngestWorker
+from rebelist.streamline.handlers.cli.commands.ingest_worker import QueueConsumer, ingest_worker
+from rebelist.streamline.infrastructure.mongo.queue import WorkUnit, WorkUnitKind
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create CLI runner instance."""
+    return CliRunner()
+
+
+def test_ingest_worker_command(runner: CliRunner, mocker: MockerFixture) -> None:
+    """Test the 'ingest:worker' command starts a queue consumer."""
+    mock_run = mocker.patch.object(QueueConsumer, 'run')
+    container = MagicMock()
+
+    result = runner.invoke(ingest_worker, ['--drain', '--visibility-timeout', '60'], obj=container)
+
+    assert result.exit_code == 0
+    container.ingest_worker.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_queue_consumer_drains_queue(mocker: MockerFixture) -> None:
+    """Test the consumer processes units until the queue is drained."""
+    mock_sleep = mocker.patch('rebelist.streamline.handlers.cli.commands.ingest_worker.sleep')
+    worker = MagicMock(spec=IngestWorker)
+    unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 0})
+    worker.process_next.side_effect = [unit, unit, None, None]
+    worker.pending.side_effect = [1, 0]
+
+    QueueConsumer(worker, timedelta(seconds=60), 0.1, drain=True).run()
+
+    assert worker.process_next.call_count == 4
+    assert worker.process_next.call_args[0][1] == timedelta(seconds=60)
+    mock_sleep.assert_called_once_with(0.1)
@@ -1,7 +1,20 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
 import pytest
 from click.testing import CliRunner
+from pytest_mock import MockerFixture
 
+from rebelist.streamline.config.container import Container
+from rebelist.streamline.config.settings import AppSettings
 from rebelist.streamline.handlers.cli import console
+from rebelist.streamline.handlers.cli.console import COMMANDS, LazyContainer
+
+DEFERRED_MODULES = ('rebelist.streamline.config.container', 'jira', 'workalendar', 'pymongo', 'fastapi')
 
 
 @pytest.fixture
@@ -15,10 +28,64 @@ def test_console_help(runner: CliRunner) -> None:
     result = runner.invoke(console, ['--help'])
     assert result.exit_code == 0
     assert 'Provides commands for executing Streamline workflows' in result.output
+    for name in COMMANDS:
+        assert name in result.output
 
 
 def test_version_output(runner: CliRunner) -> None:
-    """Check that `--version` returns the correct version output."""
+    """Check that `--version` prints the application name and version, as the settings report them."""
+    app = AppSettings(country='DE', timezone=ZoneInfo('Europe/Berlin'))
+
     result = runner.invoke(console, ['--version'])
+
+    assert result.exit_code == 0
+    assert result.output == f'{app.name}, version {app.version}\n'
+
+
+def test_unknown_command(runner: CliRunner) -> None:
+    """Check that an unknown command is still rejected."""
+    result = runner.invoke(console, ['database:unknown'])
+    assert result.exit_code != 0
+    assert 'No such command' in result.output
+
+
+def test_lazy_container_is_built_on_first_use(mocker: MockerFixture) -> None:
+    """Check that the container is created once, on the first attribute access."""
+    container = mocker.Mock(spec=Container)
+    create = mocker.patch.object(Container, 'create', return_value=container)
+
+    lazy_container = LazyContainer()
+    create.assert_not_called()
+
+    assert lazy_container.database is container.database
+    assert lazy_container.get() is container
+    create.assert_called_once_with()
+
+
+def test_import_defers_heavy_modules() -> None:
+    """Check that importing the CLI leaves the heavy modules to the commands that need them."""
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys, rebelist.streamline.handlers.cli; print(*sys.modules, sep="\\n")'],
+        capture_output=True,
+        check=True,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+        text=True,
+    )
+
+    imported = set(result.stdout.splitlines())
+    assert 'rebelist.streamline.handlers.cli' in imported
+    assert not set(DEFERRED_MODULES) & imported
+
+
+def test_profile_option_writes_profile_of_the_command(runner: CliRunner, tmp_path: Path) -> None:
+    """Check that `--profile` samples the command and writes its profile once it exits."""
+    path = tmp_path / 'profiles' / 'index.txt'
+    container = MagicMock(database=lambda: MagicMock())
+
+    result = runner.invoke(
+        console, ['--profile', str(path), '--profile-format', 'collapsed', 'database:index'], obj=container
+    )
+
     assert result.exit_code == 0
-    assert 'streamline, version' in result.output.lower()
+    assert f'written to {path}' in result.output
+    assert path.read_text().endswith('\n')
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from dateutil.tz import tzutc
+
+from rebelist.streamline.infrastructure.jira.documents import (
+    get_started_and_resolved,
+    shape_sprint,
+    shape_ticket,
+    shape_tickets,
+)
+
+
+def raw_issue(key: str, *transitions: tuple[str, str]) -> dict[str, Any]:
+    """Build a raw Jira issue with the given status transitions."""
+    return {
+        'key': key,
+        'fields': {'created': '2025-04-10T00:00:00.000+0000', 'status': {'name': 'Done'}, 'customfield_10002': 3.0},
+        'changelog': {
+            'histories': [
+                {'created': created, 'items': [{'field': 'status', 'toString': status}]}
+                for created, status in transitions
+            ]
+        },
+    }
+
+
+def test_get_started_and_resolved() -> None:
+    """Test the last start before done is used, regardless of the history order."""
+    changelog = raw_issue(
+        'TEST-1',
+        ('2025-05-03T00:00:00.000+0000', 'Done'),
+        ('2025-05-01T00:00:00.000+0000', 'In Progress'),
+        ('2025-05-02T00:00:00.000+0000', 'In Progress'),
+    )['changelog']
+
+    assert get_started_and_resolved(changelog) == (
+        datetime(2025, 5, 2, tzinfo=tzutc()),
+        datetime(2025, 5, 3, tzinfo=tzutc()),
+    )
+
+
+def test_get_started_and_resolved_unfinished() -> None:
+    """Test issues never started or reopened are not resolved."""
+    assert get_started_and_resolved(raw_issue('TEST-1', ('2025-05-03T00:00:00.000+0000', 'Done'))['changelog']) is None
+    assert (
+        get_started_and_resolved(
+            raw_issue(
+                'TEST-2',
+                ('2025-05-01T00:00:00.000+0000', 'Done'),
+                ('2025-05-02T00:00:00.000+0000', 'In Progress'),
+            )['changelog']
+        )
+        is None
+    )
+
+
+def test_shape_ticket() -> None:
+    """Test a raw issue is shaped like the gateway documents."""
+    document = shape_ticket(
+        raw_issue('TEST-1', ('2025-05-01T00:00:00.000+0000', 'In Progress'), ('2025-05-03T00:00:00.000+0000', 'Done')),
+        'Loki',
+    )
+
+    assert document is not None
+    assert document['team'] == 'Loki'
+    assert document['created_at'] == datetime(2025, 4, 10, tzinfo=tzutc())
+    assert document['started_at'] == datetime(2025, 5, 1, tzinfo=tzutc())
+    assert document['resolved_at'] == datetime(2025, 5, 3, tzinfo=tzutc())
+    assert document['story_points'] == 3
+    assert document['status'] == 'Done'
+
+
+def test_shape_tickets_skips_unfinished() -> None:
+    """Test only started and finished issues are shaped."""
+    documents = shape_tickets(
+        [
+            raw_issue(
+                'TEST-1', ('2025-05-01T00:00:00.000+0000', 'In Progress'), ('2025-05-03T00:00:00.000+0000', 'Done')
+            ),
+            raw_issue('TEST-2', ('2025-05-01T00:00:00.000+0000', 'In Progress')),
+        ],
+        'Loki',
+    )
+
+    assert [document['key'] for document in documents] == ['TEST-1']
+
+
+def test_shape_sprint() -> None:
+    """Test a raw closed sprint is shaped like the gateway documents."""
+    raw: dict[str, Any] = {
+        'id': 7,
+        'name': 'Sprint 7',
+        'startDate': '2025-05-05T08:00:00.000Z',
+        'endDate': '2025-05-16T16:00:00.000Z',
+        'activatedDate': '2025-05-05T08:00:00.000Z',
+        'completeDate': '2025-05-16T15:00:00.000Z',
+    }
+
+    document = shape_sprint(raw, 'Loki', ['TEST-1', 'TEST-2'])
+
+    assert document == {
+        'id': 7,
+        'name': 'Sprint 7',
+        'opened_at': datetime(2025, 5, 5, 8, tzinfo=timezone.utc),
+        'closed_at': datetime(2025, 5, 16, 15, tzinfo=timezone.utc),
+        'team': 'Loki',
+        'tickets': ['TEST-1', 'TEST-2'],
+    }
+
+
+def test_shape_ticket_parses_non_iso_datetimes() -> None:
+    """Test the datetimes outside ISO 8601 are still parsed."""
+    raw = raw_issue('TEST-1', ('2025-05-01T00:00:00.000+0000', 'In Progress'), ('2025-05-03T00:00:00.000+0000', 'Done'))
+    raw['fields']['created'] = 'Thu, 10 Apr 2025 00:00:00 +0000'
+
+    document = shape_ticket(raw, 'Loki')
+
+    assert document is not None
+    assert document['created_at'] == datetime(2025, 4, 10, tzinfo=timezone.utc)
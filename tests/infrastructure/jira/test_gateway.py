@@ -1,41 +1,18 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
 import pytest
 from dateutil.tz import tzutc
-from jira.client import JIRA
+from jira.client import JIRA, ResultList
 from jira.resources import Issue
-from pytest_mock import MockerFixture
 
 from rebelist.streamline.config.settings import JiraSettings
-from rebelist.streamline.infrastructure.jira.gateway import IssueNotFinishedError, IssueNotStartedError, JiraGateway
+from rebelist.streamline.infrastructure.jira.gateway import JiraGateway
 from rebelist.streamline.infrastructure.monitoring import Logger
 
 
-class TestIssueNotStartedError:
-    """Tests for the IssueNotStartedError exception."""
-
-    def test_error_message(self, mocker: MockerFixture) -> None:
-        """Should include issue key in the error message."""
-        issue = mocker.Mock()
-        issue.key = 'ABC-123'
-
-        with pytest.raises(IssueNotStartedError):
-            raise IssueNotStartedError(issue)
-
-
-class TestIssueNotFinishedError:
-    """Tests for the IssueNotFinishedError exception."""
-
-    def test_error_message(self, mocker: MockerFixture) -> None:
-        """Should include issue key in the error message."""
-        issue = mocker.Mock()
-        issue.key = 'XYZ-789'
-
-        with pytest.raises(IssueNotFinishedError):
-            raise IssueNotFinishedError(issue)
-
-
 class TestGateway:
     """Test Jira Gateway class."""
 
@@ -67,16 +44,14 @@ class TestGateway:
         """Test finding sprints successfully."""
         mock_sprint = MagicMock()
         mock_sprint.id = 1
-        mock_sprint.startDate = '2025-05-01T00:00:00.000+0000'
-        mock_sprint.completeDate = '2025-05-15T00:00:00.000+0000'
         mock_sprint.raw = {
             'id': 1,
             'name': 'Sprint 1',
-            'endDate': '...',
-            'activatedDate': '...',
-            'startDate': '...',
-            'completeDate': '...',
-        }  # Include keys being deleted
+            'endDate': '2025-05-15T00:00:00.000+0000',
+            'activatedDate': '2025-05-01T00:00:00.000+0000',
+            'startDate': '2025-05-01T00:00:00.000+0000',
+            'completeDate': '2025-05-15T00:00:00.000+0000',
+        }
 
         mock_issue = MagicMock()
         mock_issue.key = 'TEST-1'
@@ -93,7 +68,11 @@ class TestGateway:
         assert sprints[0]['closed_at'] == datetime(2025, 5, 15, 0, 0, tzinfo=timezone.utc)
         assert sprints[0]['team'] == 'TestTeam'
         assert sprints[0]['tickets'] == ['TEST-1']
-        assert mock_logger.info.call_count == 2
+        mock_logger.info.assert_called_once()
+        mock_logger.debug.assert_called_once()
+        assert mock_logger.debug.call_args.kwargs['jql'].startswith('Sprint = 1 ')
+        assert mock_logger.debug.call_args.kwargs['issues'] == 1
+        assert mock_logger.debug.call_args.kwargs['duration_ms'] >= 0
         mock_jira_client.sprints.assert_called_once()
         mock_jira_client.search_issues.assert_called_once()
         mock_jira_client.sprints.assert_called_once()
@@ -118,17 +97,19 @@ class TestGateway:
         """Test finding tickets successfully."""
         mock_issue = MagicMock(spec=Issue)
         mock_issue.key = 'TEST-2'
-        mock_issue.fields = MagicMock()
-        mock_issue.fields.resolutiondate = '2025-05-10T00:00:00.000+0000'
-        mock_issue.fields.created = '2025-04-10T00:00:00.000+0000'
-        mock_issue.raw = {'key': 'TEST-2', 'fields': {'summary': 'Test Ticket', 'status': {'name': 'Done'}}}
-        mock_issue.changelog = MagicMock()
-        mock_issue.changelog.histories = [
-            MagicMock(
-                created='2025-05-05T09:00:00.000+0000', items=[MagicMock(field='status', toString='In Progress')]
-            ),
-            MagicMock(created='2025-05-05T12:00:00.000+0000', items=[MagicMock(field='status', toString='Done')]),
-        ]
+        mock_issue.raw = {
+            'key': 'TEST-2',
+            'fields': {'summary': 'Test Ticket', 'status': {'name': 'Done'}, 'created': '2025-04-10T00:00:00.000+0000'},
+            'changelog': {
+                'histories': [
+                    {
+                        'created': '2025-05-05T09:00:00.000+0000',
+                        'items': [{'field': 'status', 'toString': 'In Progress'}],
+                    },
+                    {'created': '2025-05-05T12:00:00.000+0000', 'items': [{'field': 'status', 'toString': 'Done'}]},
+                ]
+            },
+        }
 
         mock_jira_client.search_issues.return_value = [mock_issue]
 
@@ -140,7 +121,8 @@ class TestGateway:
         assert tickets[0]['team'] == 'TestTeam'
         assert tickets[0]['started_at'] == datetime(2025, 5, 5, 9, 0, tzinfo=tzutc())
         assert tickets[0]['resolved_at'] == datetime(2025, 5, 5, 12, 0, tzinfo=tzutc())
-        assert mock_logger.info.call_count == 2
+        mock_logger.info.assert_called_once()
+        mock_logger.debug.assert_called_once()
         mock_jira_client.search_issues.assert_called_once()
 
     def test_jira_gateway_find_tickets_no_done_at(
@@ -149,17 +131,23 @@ class TestGateway:
         """Test finding tickets without a done_at filter."""
         mock_issue = MagicMock(spec=Issue)
         mock_issue.key = 'TEST-3'
-        mock_issue.fields = MagicMock()
-        mock_issue.fields.resolutiondate = '2025-05-12T00:00:00.000+0000'
-        mock_issue.fields.created = '2025-04-10T00:00:00.000+0000'
-        mock_issue.raw = {'key': 'TEST-3', 'fields': {'summary': 'Another Ticket', 'status': {'name': 'Done'}}}
-        mock_issue.changelog = MagicMock()
-        mock_issue.changelog.histories = [
-            MagicMock(
-                created='2025-05-07T10:00:00.000+0000', items=[MagicMock(field='status', toString='In Progress')]
-            ),
-            MagicMock(created='2025-05-07T11:00:00.000+0000', items=[MagicMock(field='status', toString='Done')]),
-        ]
+        mock_issue.raw = {
+            'key': 'TEST-3',
+            'fields': {
+                'summary': 'Another Ticket',
+                'status': {'name': 'Done'},
+                'created': '2025-04-10T00:00:00.000+0000',
+            },
+            'changelog': {
+                'histories': [
+                    {
+                        'created': '2025-05-07T10:00:00.000+0000',
+                        'items': [{'field': 'status', 'toString': 'In Progress'}],
+                    },
+                    {'created': '2025-05-07T11:00:00.000+0000', 'items': [{'field': 'status', 'toString': 'Done'}]},
+                ]
+            },
+        }
 
         mock_jira_client.search_issues.return_value = [mock_issue]
 
@@ -167,7 +155,8 @@ class TestGateway:
         tickets = gateway.find_tickets()
 
         assert len(tickets) == 1
-        assert mock_logger.info.call_count == 2
+        mock_logger.info.assert_called_once()
+        mock_logger.debug.assert_called_once()
         mock_jira_client.search_issues.assert_called_once()
 
     def test_jira_gateway_find_tickets_issue_not_started(
@@ -176,14 +165,19 @@ class TestGateway:
         """Test handling of an issue that was never in progress."""
         mock_issue = MagicMock(spec=Issue)
         mock_issue.key = 'TEST-4'
-        mock_issue.fields = MagicMock()
-        mock_issue.fields.resolutiondate = '2025-05-15T00:00:00.000+0000'
-        mock_issue.fields.created = '2025-04-10T00:00:00.000+0000'
-        mock_issue.raw = {'key': 'TEST-4', 'fields': {'summary': 'Never Started', 'status': {'name': 'Done'}}}
-        mock_issue.changelog = MagicMock()
-        mock_issue.changelog.histories = [
-            MagicMock(created='2025-05-01T08:00:00.000+0000', items=[MagicMock(field='status', toString='Done')])
-        ]
+        mock_issue.raw = {
+            'key': 'TEST-4',
+            'fields': {
+                'summary': 'Never Started',
+                'status': {'name': 'Done'},
+                'created': '2025-04-10T00:00:00.000+0000',
+            },
+            'changelog': {
+                'histories': [
+                    {'created': '2025-05-01T08:00:00.000+0000', 'items': [{'field': 'status', 'toString': 'Done'}]},
+                ]
+            },
+        }
 
         mock_jira_client.search_issues.return_value = [mock_issue]
 
@@ -191,5 +185,133 @@ class TestGateway:
         tickets = gateway.find_tickets()
 
         assert not tickets
-        assert mock_logger.info.call_count == 2
+        mock_logger.info.assert_called_once()
+        mock_logger.debug.assert_called_once()
         mock_jira_client.search_issues.assert_called_once()
+
+    def test_jira_gateway_find_sprints_page(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test finding a page of sprints."""
+        mock_jira_client.sprints.return_value = []
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+        gateway.find_sprints(10, 5)
+
+        mock_jira_client.sprints.assert_called_once_with(123, startAt=10, maxResults=5, state='closed')
+
+    def test_jira_gateway_count_sprints(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test counting sprints without querying their tickets."""
+        mock_jira_client.sprints.return_value = [MagicMock(), MagicMock()]
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        assert gateway.count_sprints(30) == 2
+        mock_jira_client.search_issues.assert_not_called()
+
+    def test_jira_gateway_count_tickets(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test counting tickets reads the total without fetching issues."""
+        mock_jira_client.search_issues.return_value = ResultList([], _total=420)
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        assert gateway.count_tickets() == 420
+        assert mock_jira_client.search_issues.call_args[1]['maxResults'] == 1
+
+    def test_jira_gateway_find_tickets_page(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test finding a page of tickets."""
+        mock_jira_client.search_issues.return_value = []
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+        gateway.find_tickets(None, 200, 100)
+
+        kwargs = mock_jira_client.search_issues.call_args[1]
+        assert kwargs['startAt'] == 200
+        assert kwargs['maxResults'] == 100
+
+    def test_jira_gateway_find_tickets_of_given_sprints(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test the tickets of the given sprints are searched without listing the sprints again."""
+        mock_jira_client.search_issues.return_value = ResultList([], _total=3)
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+        gateway.find_tickets(None, 0, 100, [7, 8])
+
+        assert gateway.count_tickets(None, [7, 8]) == 3
+        for call in mock_jira_client.search_issues.call_args_list:
+            assert 'Sprint IN (7,8)' in call[1]['jql_str']
+        mock_jira_client.sprints.assert_not_called()
+
+    def test_jira_gateway_find_sprint_ids(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test finding the ids of the tracked sprints."""
+        mock_jira_client.sprints.return_value = [MagicMock(id=31), MagicMock(id=32)]
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        assert gateway.find_sprint_ids() == [31, 32]
+        mock_jira_client.sprints.assert_called_once_with(123, startAt=30, maxResults=False, state='closed')
+
+    def test_jira_gateway_find_raw_tickets(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test finding a page of raw tickets of some sprints."""
+        mock_jira_client.search_issues.return_value = {'total': 1, 'issues': [{'key': 'TEST-1'}]}
+
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        assert gateway.find_raw_tickets([1, 2], 100, 50) == [{'key': 'TEST-1'}]
+        kwargs = mock_jira_client.search_issues.call_args[1]
+        assert 'Sprint IN (1,2)' in kwargs['jql_str']
+        assert kwargs['startAt'] == 100
+        assert kwargs['maxResults'] == 50
+        assert kwargs['json_result'] is True
+        mock_jira_client.sprints.assert_not_called()
+
+    def test_jira_gateway_find_raw_tickets_without_sprints(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Test no query is sent without sprints."""
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        assert gateway.find_raw_tickets([]) == []
+        mock_jira_client.search_issues.assert_not_called()
+
+    @pytest.mark.usefixtures('frequent_thread_switches')
+    def test_jira_gateway_statistics_from_several_threads(
+        self, mock_jira_client: MagicMock, mock_jira_settings: MagicMock, mock_logger: MagicMock
+    ) -> None:
+        """Should count every retry and received byte when threads share the gateway, as the backfill does."""
+        mock_jira_client._session = MagicMock(hooks={'response': []})
+        attempts = threading.local()
+
+        def sprints(*args: object, **kwargs: object) -> list[MagicMock]:
+            hook = mock_jira_client._session.hooks['response'][0]
+            hook(MagicMock(content=b'abc'))
+            attempts.failed = not getattr(attempts, 'failed', False)
+            if attempts.failed:
+                raise ConnectionError('reset')
+            return [MagicMock()]
+
+        mock_jira_client.sprints.side_effect = sprints
+        gateway = JiraGateway(mock_jira_client, mock_jira_settings, mock_logger)
+
+        def count(_: int) -> None:
+            for _ in range(200):
+                gateway.count_sprints()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(count, range(8)))
+
+        statistics = gateway.statistics
+        assert statistics.retries == 8 * 200
+        assert statistics.bytes_received == 8 * 200 * 2 * 3
+        assert statistics.fetch_seconds > 0
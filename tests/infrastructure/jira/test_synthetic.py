@@ -0,0 +1,106 @@
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from rebelist.streamline.config.settings import JiraSettings
+from rebelist.streamline.infrastructure.jira.documents import get_started_and_resolved
+from rebelist.streamline.infrastructure.jira.synthetic import WORKDAY_ENDS_AT, WORKDAY_STARTS_AT, SyntheticJira
+
+TIMEZONE = ZoneInfo('Europe/Berlin')
+HOLIDAYS = {date(2020, 1, 1), date(2020, 4, 10), date(2020, 4, 13), date(2020, 5, 1), date(2020, 5, 21)}
+
+
+class WeekdayCalendar:
+    """Calendar of the weekdays, without the holidays."""
+
+    def is_working_day(self, day: date) -> bool:
+        """Checks whether a day is a weekday and not a holiday."""
+        return day.weekday() < 5 and day not in HOLIDAYS
+
+    def get_working_days_delta(self, start: date, end: date) -> int:
+        """Unused by the generator."""
+        raise NotImplementedError
+
+
+@pytest.fixture
+def settings() -> JiraSettings:
+    """Creates the Jira settings of the team."""
+    return JiraSettings(
+        team='loki', project='HIVE', board_id=533, sprint_offset=0, sprint_close_time=time(18), issue_types=['Bug']
+    )
+
+
+def create_jira(settings: JiraSettings, seed: int = 7) -> SyntheticJira:
+    """Creates a generator of ten sprints starting in January 2020."""
+    return SyntheticJira(settings, WeekdayCalendar(), TIMEZONE, seed, sprints=10, tickets_per_sprint=20)
+
+
+def test_history_is_deterministic(settings: JiraSettings) -> None:
+    """Tests that a seed always generates the same documents, and another seed other documents."""
+    documents = list(create_jira(settings).documents())
+
+    assert list(create_jira(settings).documents()) == documents
+    assert list(create_jira(settings, seed=8).documents()) != documents
+
+
+def test_documents_are_shaped_like_the_synchronized_ones(settings: JiraSettings) -> None:
+    """Tests that the sprint and ticket documents have the fields the jobs store."""
+    sprint, tickets = next(create_jira(settings).documents())
+
+    assert sprint['id'] == SyntheticJira.FIRST_SPRINT_ID
+    assert sprint['team'] == 'Loki'
+    assert sprint['opened_at'] < sprint['closed_at']
+    assert 'startDate' not in sprint and 'completeDate' not in sprint
+    assert tickets
+    for ticket in tickets:
+        assert ticket['key'] in sprint['tickets']
+        assert ticket['team'] == 'Loki'
+        assert ticket['status'] == 'Done'
+        assert ticket['created_at'] <= ticket['started_at'] < ticket['resolved_at']
+        assert ticket['story_points'] in (0, 1, 2, 3, 5, 8, 13)
+
+
+def test_status_changes_happen_during_working_hours(settings: JiraSettings) -> None:
+    """Tests that the issues change status on working days within the workday, skipping holidays."""
+    for sprint in create_jira(settings).history():
+        for issue in sprint.issues:
+            for history in issue['changelog']['histories']:
+                moment = datetime.fromisoformat(history['created'])
+                assert WeekdayCalendar().is_working_day(moment.date())
+                assert WORKDAY_STARTS_AT <= moment.time() < WORKDAY_ENDS_AT
+
+
+def test_unfinished_issues_spill_over(settings: JiraSettings) -> None:
+    """Tests that the issues still open when a sprint closes are listed in the next sprint."""
+    sprints = list(create_jira(settings).history())
+
+    for previous, sprint in zip(sprints, sprints[1:], strict=False):
+        closed_at = datetime.fromisoformat(previous.raw['completeDate'])
+        for issue in sprint.spillovers:
+            assert issue['key'] in previous.keys
+            dates = get_started_and_resolved(issue['changelog'])
+            assert dates is None or dates[1] > closed_at
+    assert any(sprint.spillovers for sprint in sprints)
+
+
+def test_exchanges_page_the_responses(settings: JiraSettings) -> None:
+    """Tests that the sprints and the issues of each sprint are returned in pages, like the Jira API does."""
+    jira = create_jira(settings)
+
+    exchanges = list(jira.exchanges())
+
+    sprint_page = exchanges[0]
+    assert sprint_page['request']['path'] == '/rest/agile/1.0/board/533/sprint'
+    assert sprint_page['response']['isLast'] is True
+    assert len(sprint_page['response']['values']) == jira.sprint_count
+    searches = exchanges[1:]
+    assert len(searches) == jira.sprint_count
+    assert all(search['request']['params']['expand'] == 'changelog' for search in searches)
+    assert searches[0]['response']['total'] == len(searches[0]['response']['issues'])
+
+
+def test_history_needs_sprints_and_tickets(settings: JiraSettings) -> None:
+    """Tests that an empty history is rejected."""
+    with pytest.raises(ValueError, match='at least one sprint'):
+        SyntheticJira(settings, WeekdayCalendar(), TIMEZONE, sprints=0)
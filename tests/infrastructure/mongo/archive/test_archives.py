@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.mongo.archive import MongoArchive
+
+
+class TestMongoArchive:
+    """Tests for the MongoArchive class."""
+
+    @pytest.fixture
+    def mock_database(self, mocker: MockerFixture) -> MagicMock:
+        """Mock a database with a collection of sprints and an empty queue."""
+        documents: dict[str, list[dict[str, Any]]] = {'jira_sprints': [{'id': 1}, {'id': 2}, {'id': 3}], 'queue': []}
+        collections: dict[str, MagicMock] = {}
+
+        def get_collection(name: str, **kwargs: Any) -> MagicMock:
+            collection = collections.setdefault(name, mocker.MagicMock(spec=Collection))
+            collection.find.return_value = documents.get(name, [])
+            return collection
+
+        database: MagicMock = mocker.MagicMock(spec=Database)
+        database.list_collection_names.return_value = list(documents)
+        database.get_collection.side_effect = get_collection
+        return database
+
+    def test_dump_and_restore(self, mock_database: MagicMock, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Should stream every collection into the archive and restore it in batches."""
+        mocker.patch.object(MongoArchive, 'BATCH_SIZE', 2)
+        path = tmp_path / 'snapshot.bson.gz'
+        archive = MongoArchive(mock_database)
+        on_collection = MagicMock()
+
+        assert archive.dump(path, on_collection) == {'jira_sprints': 3, 'queue': 0}
+        assert path.exists()
+        assert not path.with_name('snapshot.bson.gz.part').exists()
+        on_collection.assert_any_call('jira_sprints', 3)
+
+        assert archive.restore(path, on_collection) == {'jira_sprints': 3, 'queue': 0}
+        assert [call.args[0] for call in mock_database.drop_collection.call_args_list] == ['jira_sprints', 'queue']
+        sprints = mock_database.get_collection('jira_sprints')
+        batches = [[dict(document) for document in call.args[0]] for call in sprints.insert_many.call_args_list]
+        assert batches == [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+        mock_database.get_collection('queue').insert_many.assert_not_called()
+
+    def test_dump_failure_keeps_previous_archive(self, mock_database: MagicMock, tmp_path: Path) -> None:
+        """Should only replace the archive once the dump is complete."""
+        path = tmp_path / 'snapshot.bson.gz'
+        path.write_bytes(b'previous')
+        mock_database.list_collection_names.side_effect = RuntimeError('connection lost')
+
+        with pytest.raises(RuntimeError):
+            MongoArchive(mock_database).dump(path)
+
+        assert path.read_bytes() == b'previous'
@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.infrastructure.mongo.document import time_range_filter
+
+
+def test_time_range_filter() -> None:
+    """Should translate each bound of the range into a comparison operator."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    assert time_range_filter(TimeRange(start, end)) == {'$gte': start, '$lt': end}
+    assert time_range_filter(TimeRange(end=end)) == {'$lt': end}
+    assert time_range_filter(TimeRange()) == {}
@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+from typing import Any, Final, Mapping
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo import ReplaceOne
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.mongo.document import MongoDocumentRepository, WriteSummary
+
+
+class FakeDocumentRepository(MongoDocumentRepository):
+    """Concrete document repository used for testing the base class."""
+
+    COLLECTION_NAME: Final[str] = 'fake_documents'
+
+    def __init__(self, database: Database[Mapping[str, Any]]) -> None:
+        super().__init__(database.get_collection(self.COLLECTION_NAME))
+
+
+class TestMongoDocumentRepository:
+    """Tests for the MongoDocumentRepository class."""
+
+    @pytest.fixture
+    def mock_dependencies(self, mocker: MockerFixture) -> tuple[MagicMock, MagicMock]:
+        """Fixture that sets up mocked database and collection."""
+        mock_collection: MagicMock = mocker.MagicMock(spec=Collection)
+        mock_database: MagicMock = mocker.MagicMock(spec=Database)
+        mock_database.get_collection.return_value = mock_collection
+        return mock_database, mock_collection
+
+    def test_content_hash_is_stable(self) -> None:
+        """Should produce the same hash regardless of key order and storage-only fields."""
+        created_at = datetime(2025, 5, 1, tzinfo=timezone.utc)
+        document: dict[str, Any] = {'id': 1, 'team': 'Loki', 'created_at': created_at, 'fields': {'a': 1, 'b': 2}}
+        reordered: dict[str, Any] = {'fields': {'b': 2, 'a': 1}, 'created_at': created_at, 'team': 'Loki', 'id': 1}
+        stored = {**document, '_id': 'abc', 'content_hash': 'old'}
+
+        assert FakeDocumentRepository.content_hash(document) == FakeDocumentRepository.content_hash(reordered)
+        assert FakeDocumentRepository.content_hash(document) == FakeDocumentRepository.content_hash(stored)
+        assert FakeDocumentRepository.content_hash(document) != FakeDocumentRepository.content_hash(
+            {**document, 'fields': {'a': 1, 'b': 3}}
+        )
+
+    def test_save_many_skips_unchanged_documents(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should only write documents whose stored content hash differs."""
+        mock_database, mock_collection = mock_dependencies
+        unchanged: dict[str, Any] = {'id': 1, 'team': 'Loki', 'name': 'same'}
+        changed: dict[str, Any] = {'id': 2, 'team': 'Loki', 'name': 'new'}
+        created: dict[str, Any] = {'id': 3, 'team': 'Loki', 'name': 'created'}
+        mock_collection.find.return_value = [
+            {'id': 1, 'team': 'Loki', 'content_hash': FakeDocumentRepository.content_hash(unchanged)},
+            {'id': 2, 'team': 'Loki', 'content_hash': 'outdated'},
+        ]
+
+        repository = FakeDocumentRepository(mock_database)
+        summary = repository.save_many([unchanged, changed, created])
+
+        assert summary == WriteSummary(written=2, skipped=1)
+        mock_collection.find.assert_called_once()
+        query = mock_collection.find.call_args[0][0]
+        assert query == {'id': {'$in': [1, 2, 3]}, 'team': {'$in': ['Loki']}}
+        operations = mock_collection.bulk_write.call_args[0][0]
+        assert operations == [
+            ReplaceOne(
+                {'id': 2, 'team': 'Loki'},
+                {**changed, 'content_hash': FakeDocumentRepository.content_hash(changed)},
+                upsert=True,
+            ),
+            ReplaceOne(
+                {'id': 3, 'team': 'Loki'},
+                {**created, 'content_hash': FakeDocumentRepository.content_hash(created)},
+                upsert=True,
+            ),
+        ]
+
+    def test_save_many_without_changes_does_not_write(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should not issue a bulk write when every document is unchanged."""
+        mock_database, mock_collection = mock_dependencies
+        document: dict[str, Any] = {'id': 1, 'team': 'Loki'}
+        mock_collection.find.return_value = [
+            {'id': 1, 'team': 'Loki', 'content_hash': FakeDocumentRepository.content_hash(document)}
+        ]
+
+        repository = FakeDocumentRepository(mock_database)
+        summary = repository.save_many([document])
+
+        assert summary == WriteSummary(written=0, skipped=1)
+        mock_collection.bulk_write.assert_not_called()
+
+    def test_save_many_queries_once_per_batch(
+        self, mock_dependencies: tuple[MagicMock, MagicMock], mocker: MockerFixture
+    ) -> None:
+        """Should compare hashes with a single query per batch."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.find.return_value = []
+        mocker.patch.object(FakeDocumentRepository, 'BATCH_SIZE', 2)
+        documents: list[dict[str, Any]] = [{'id': index, 'team': 'Loki'} for index in range(5)]
+
+        repository = FakeDocumentRepository(mock_database)
+        summary = repository.save_many(documents)
+
+        assert summary == WriteSummary(written=5, skipped=0)
+        assert mock_collection.find.call_count == 3
+        assert mock_collection.bulk_write.call_count == 3
+
+    def test_save_many_empty(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should not touch the collection when there is nothing to save."""
+        mock_database, mock_collection = mock_dependencies
+
+        repository = FakeDocumentRepository(mock_database)
+
+        assert repository.save_many([]) == WriteSummary()
+        mock_collection.find.assert_not_called()
+        mock_collection.bulk_write.assert_not_called()
+
+    def test_insert_many_adds_the_content_hash(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should insert the documents in one unordered bulk, each with its content hash."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.insert_many.return_value.inserted_ids = ['a', 'b']
+        documents: list[dict[str, Any]] = [{'id': 1, 'team': 'Loki'}, {'id': 2, 'team': 'Loki', '_id': 'old'}]
+
+        repository = FakeDocumentRepository(mock_database)
+
+        assert repository.insert_many(documents) == 2
+        inserted = mock_collection.insert_many.call_args.args[0]
+        assert inserted == [
+            {'id': 1, 'team': 'Loki', 'content_hash': FakeDocumentRepository.content_hash(documents[0])},
+            {'id': 2, 'team': 'Loki', 'content_hash': FakeDocumentRepository.content_hash(documents[1])},
+        ]
+        assert mock_collection.insert_many.call_args.kwargs == {'ordered': False}
+
+    def test_insert_many_empty(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should not touch the collection when there is nothing to insert."""
+        mock_database, mock_collection = mock_dependencies
+
+        assert FakeDocumentRepository(mock_database).insert_many([]) == 0
+        mock_collection.insert_many.assert_not_called()
+
+    def test_delete_by_team_name(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should delete the documents of the team only."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.delete_many.return_value.deleted_count = 3
+
+        assert FakeDocumentRepository(mock_database).delete_by_team_name('Loki') == 3
+        mock_collection.delete_many.assert_called_once_with({'team': 'Loki'})
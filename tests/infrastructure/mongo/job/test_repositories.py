@@ -1,10 +1,13 @@
+import asyncio
 from datetime import datetime
 
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 from pytest_mock import MockerFixture
 
-from rebelist.streamline.infrastructure.mongo.job import Job, JobRepository
+from rebelist.streamline.infrastructure.mongo.job import AsyncJobRepository, Job, JobRepository
 
 
 def test_job_to_dict():
@@ -60,8 +63,9 @@ def test_job_repository_save(mocker: MockerFixture):
     repository.save(job)
 
     mock_database.get_collection.assert_called_once_with(JobRepository.COLLECTION_NAME)
-    mock_collection.delete_one.assert_called_once_with({'team': 'DataTeam', 'name': 'sync_data'})
-    mock_collection.insert_one.assert_called_once_with(job.to_dict())
+    mock_collection.update_one.assert_called_once_with(
+        {'team': 'DataTeam', 'name': 'sync_data'}, {'$set': job.to_dict()}, upsert=True
+    )
 
 
 def test_job_repository_find_found(mocker: MockerFixture):
@@ -120,3 +124,69 @@ def test_job_repository_find_empty_criteria(mocker: MockerFixture):
     job_empty_team = repository.find('SomeJob', '')
     mock_collection.find_one.assert_not_called()
     assert job_empty_team is None
+
+
+def test_job_repository_mark_changed(mocker: MockerFixture):
+    """Test that JobRepository.mark_changed only sets a new data version."""
+    mock_collection = mocker.MagicMock(spec=Collection)
+    mock_database = mocker.MagicMock(spec=Database)
+    mock_database.get_collection.return_value = mock_collection
+    repository = JobRepository(mock_database)
+
+    repository.mark_changed('sync_data', 'DataTeam')
+    repository.mark_changed('sync_data', 'DataTeam')
+
+    versions = [call.args[1]['$set']['data_version'] for call in mock_collection.update_one.call_args_list]
+    assert mock_collection.update_one.call_args.args[0] == {'name': 'sync_data', 'team': 'DataTeam'}
+    assert list(mock_collection.update_one.call_args.args[1]) == ['$set']
+    assert mock_collection.update_one.call_args.kwargs == {'upsert': True}
+    assert len(set(versions)) == 2
+
+
+def test_job_repository_advance(mocker: MockerFixture):
+    """Test that JobRepository.advance only moves the given cursors forward."""
+    mock_collection = mocker.MagicMock(spec=Collection)
+    mock_database = mocker.MagicMock(spec=Database)
+    mock_database.get_collection.return_value = mock_collection
+
+    JobRepository(mock_database).advance('sync_data', 'DataTeam', {'sprint_offset': 42})
+
+    mock_collection.update_one.assert_called_once_with(
+        {'name': 'sync_data', 'team': 'DataTeam'}, {'$max': {'metadata.sprint_offset': 42}}
+    )
+
+
+def test_job_repository_find_versions(mocker: MockerFixture):
+    """Test that JobRepository.find_versions reads every job at once and defaults missing ones to None."""
+    mock_collection = mocker.MagicMock(spec=Collection)
+    mock_database = mocker.MagicMock(spec=Database)
+    mock_database.get_collection.return_value = mock_collection
+    mock_collection.find.return_value = [{'name': 'sync_sprints', 'data_version': 'abc'}]
+
+    versions = JobRepository(mock_database).find_versions(['sync_sprints', 'sync_tickets'], 'DataTeam')
+
+    assert versions == {'sync_sprints': 'abc', 'sync_tickets': None}
+    mock_collection.find.assert_called_once()
+    assert mock_collection.find.call_args[0][0] == {
+        'name': {'$in': ['sync_sprints', 'sync_tickets']},
+        'team': 'DataTeam',
+    }
+
+
+def test_async_job_repository_find_versions(mocker: MockerFixture):
+    """Test that AsyncJobRepository.find_versions shares the query of the synchronous repository."""
+    mock_collection = mocker.MagicMock(spec=AsyncCollection)
+    mock_database = mocker.MagicMock(spec=AsyncDatabase)
+    mock_database.get_collection.return_value = mock_collection
+    mock_collection.find.return_value.to_list = mocker.AsyncMock(
+        return_value=[{'name': 'sync_sprints', 'data_version': 'abc'}]
+    )
+
+    versions = asyncio.run(
+        AsyncJobRepository(mock_database).find_versions(['sync_sprints', 'sync_tickets'], 'DataTeam')
+    )
+
+    assert versions == {'sync_sprints': 'abc', 'sync_tickets': None}
+    mock_collection.find.assert_called_once_with(
+        *JobRepository.versions_query(['sync_sprints', 'sync_tickets'], 'DataTeam')
+    )
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.mongo.queue import (
+    IngestQueueRepository,
+    WorkUnit,
+    WorkUnitKind,
+    WorkUnitStatus,
+)
+
+
+def test_work_unit_round_trip() -> None:
+    """Test that a work unit survives serialization."""
+    visible_at = datetime(2025, 5, 6, 19, 39, tzinfo=timezone.utc)
+    unit = WorkUnit(WorkUnitKind.ISSUE_PAGE, 'Loki', {'start_at': 100}, visible_at=visible_at, batch='b1')
+
+    document = {**unit.to_dict(), '_id': ObjectId()}
+    restored = WorkUnit.from_dict(document)
+
+    assert restored.kind == WorkUnitKind.ISSUE_PAGE
+    assert restored.team == 'Loki'
+    assert restored.payload == {'start_at': 100}
+    assert restored.status == WorkUnitStatus.PENDING
+    assert restored.attempts == 0
+    assert restored.visible_at == visible_at
+    assert restored.batch == 'b1'
+    assert restored.id == document['_id']
+
+
+class TestIngestQueueRepository:
+    """Tests for the IngestQueueRepository class."""
+
+    @pytest.fixture
+    def mock_dependencies(self, mocker: MockerFixture) -> tuple[MagicMock, MagicMock]:
+        """Fixture that sets up mocked database and collection."""
+        mock_collection: MagicMock = mocker.MagicMock(spec=Collection)
+        mock_database: MagicMock = mocker.MagicMock(spec=Database)
+        mock_database.get_collection.return_value = mock_collection
+        return mock_database, mock_collection
+
+    def test_enqueue(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should insert all units at once."""
+        mock_database, mock_collection = mock_dependencies
+        units = [WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': offset}) for offset in (0, 5)]
+
+        IngestQueueRepository(mock_database).enqueue(units)
+
+        mock_database.get_collection.assert_called_once_with(IngestQueueRepository.COLLECTION_NAME)
+        mock_collection.insert_many.assert_called_once_with([unit.to_dict() for unit in units], ordered=False)
+
+    def test_enqueue_nothing(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should not hit the database without units."""
+        mock_database, mock_collection = mock_dependencies
+
+        IngestQueueRepository(mock_database).enqueue([])
+
+        mock_collection.insert_many.assert_not_called()
+
+    def test_claim(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should atomically claim the oldest visible unit and extend its visibility."""
+        mock_database, mock_collection = mock_dependencies
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', {'start_at': 0}, attempts=1)
+        mock_collection.find_one_and_update.return_value = {**unit.to_dict(), '_id': ObjectId()}
+
+        claimed = IngestQueueRepository(mock_database).claim('worker-1', timedelta(minutes=5))
+
+        assert claimed is not None
+        assert claimed.attempts == 1
+        query, update = mock_collection.find_one_and_update.call_args[0]
+        kwargs = mock_collection.find_one_and_update.call_args[1]
+        assert query['status'] == WorkUnitStatus.PENDING.value
+        assert '$lte' in query['visible_at']
+        assert update['$set']['claimed_by'] == 'worker-1'
+        assert update['$set']['visible_at'] - query['visible_at']['$lte'] == timedelta(minutes=5)
+        assert update['$inc'] == {'attempts': 1}
+        assert kwargs['sort'] == [('visible_at', ASCENDING)]
+        assert kwargs['return_document'] == ReturnDocument.AFTER
+
+    def test_claim_empty_queue(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should return None when there is nothing to claim."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.find_one_and_update.return_value = None
+
+        assert IngestQueueRepository(mock_database).claim('worker-1', timedelta(minutes=5)) is None
+
+    def test_ack(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should delete the processed unit."""
+        mock_database, mock_collection = mock_dependencies
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', id=ObjectId())
+
+        IngestQueueRepository(mock_database).ack(unit)
+
+        mock_collection.delete_one.assert_called_once_with({'_id': unit.id})
+
+    def test_retry_delays_unit(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should make the unit visible again after the delay."""
+        mock_database, mock_collection = mock_dependencies
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', attempts=1, id=ObjectId())
+
+        IngestQueueRepository(mock_database).retry(unit, 'boom', timedelta(seconds=30), 3)
+
+        query, update = mock_collection.update_one.call_args[0]
+        assert query == {'_id': unit.id}
+        assert update['$set']['error'] == 'boom'
+        assert update['$set']['visible_at'] > datetime.now(timezone.utc)
+        assert 'status' not in update['$set']
+
+    def test_retry_fails_exhausted_unit(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should mark the unit as failed once it runs out of attempts."""
+        mock_database, mock_collection = mock_dependencies
+        unit = WorkUnit(WorkUnitKind.SPRINT_PAGE, 'Loki', attempts=3, id=ObjectId())
+
+        IngestQueueRepository(mock_database).retry(unit, 'boom', timedelta(seconds=30), 3)
+
+        update = mock_collection.update_one.call_args[0][1]
+        assert update['$set']['status'] == WorkUnitStatus.FAILED.value
+
+    def test_count(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should count units by status."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.count_documents.return_value = 4
+
+        assert IngestQueueRepository(mock_database).count() == 4
+        mock_collection.count_documents.assert_called_once_with({'status': WorkUnitStatus.PENDING.value})
+
+    def test_remaining(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should count the units of a batch whatever their status."""
+        mock_database, mock_collection = mock_dependencies
+        mock_collection.count_documents.return_value = 2
+
+        assert IngestQueueRepository(mock_database).remaining('b1') == 2
+        mock_collection.count_documents.assert_called_once_with({'batch': 'b1'})
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.synchronous.collection import Collection
+from pymongo.synchronous.database import Database
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.mongo.run import SyncRun, SyncRunRepository
+
+
+def test_sync_run_round_trip() -> None:
+    """Test that a run report survives serialization."""
+    started_at = datetime(2025, 5, 6, 19, 39, tzinfo=timezone.utc)
+    run = SyncRun('0.7.1', 12.5, [{'job': 'Sprint Job', 'items': 10}], started_at)
+
+    document = {**run.to_dict(), '_id': ObjectId()}
+    restored = SyncRun.from_dict(document)
+
+    assert restored.version == '0.7.1'
+    assert restored.duration == 12.5
+    assert restored.jobs == [{'job': 'Sprint Job', 'items': 10}]
+    assert restored.started_at == started_at
+    assert restored.id == document['_id']
+
+
+class TestSyncRunRepository:
+    """Tests for the SyncRunRepository class."""
+
+    @pytest.fixture
+    def mock_dependencies(self, mocker: MockerFixture) -> tuple[MagicMock, MagicMock]:
+        """Fixture that sets up mocked database and collection."""
+        mock_collection: MagicMock = mocker.MagicMock(spec=Collection)
+        mock_database: MagicMock = mocker.MagicMock(spec=Database)
+        mock_database.get_collection.return_value = mock_collection
+        return mock_database, mock_collection
+
+    def test_save(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should insert the run report."""
+        mock_database, mock_collection = mock_dependencies
+        run = SyncRun('0.7.1', 3.0)
+
+        SyncRunRepository(mock_database).save(run)
+
+        mock_database.get_collection.assert_called_once_with(SyncRunRepository.COLLECTION_NAME)
+        mock_collection.insert_one.assert_called_once_with(run.to_dict())
+
+    def test_find_recent(self, mock_dependencies: tuple[MagicMock, MagicMock]) -> None:
+        """Should return the newest run reports first."""
+        mock_database, mock_collection = mock_dependencies
+        started_at = datetime(2025, 5, 6, tzinfo=timezone.utc)
+        cursor = mock_collection.find.return_value
+        cursor.sort.return_value.limit.return_value = [{'version': '0.7.1', 'duration': 1.0, 'started_at': started_at}]
+
+        runs = SyncRunRepository(mock_database).find_recent(5)
+
+        assert [run.version for run in runs] == ['0.7.1']
+        cursor.sort.assert_called_once_with('started_at', DESCENDING)
+        cursor.sort.return_value.limit.assert_called_once_with(5)
@@ -1,14 +1,23 @@
+import asyncio
 from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock
 
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 from pytest_mock import MockerFixture
 
 from rebelist.streamline.domain.sprint import Sprint
 from rebelist.streamline.domain.ticket import Ticket
-from rebelist.streamline.infrastructure.mongo.sprint import MongoSprintDocumentRepository, MongoSprintRepository
+from rebelist.streamline.domain.time import TimeRange
+from rebelist.streamline.infrastructure.mongo.sprint import (
+    AsyncMongoSprintRepository,
+    MongoSprintDocumentRepository,
+    MongoSprintRepository,
+)
 from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
 
 
@@ -90,11 +99,81 @@ def test_mongo_sprint_repository_find_by_team_name(mocker: MockerFixture, mock_d
     )
 
 
+def test_mongo_sprint_repository_find_by_team_name_within_time_range(
+    mocker: MockerFixture, mock_datetime_normalizer: MagicMock
+) -> None:
+    """Test that a time range is matched before the lookup and replaces the default window."""
+    mock_collection = mocker.MagicMock(spec=Collection)
+    mock_database = mocker.MagicMock(spec=Database)
+    mock_database.get_collection.return_value = mock_collection
+    mock_collection.aggregate.return_value = []
+    time_range = TimeRange(datetime(2025, 1, 1), datetime(2025, 7, 1))
+
+    repository = MongoSprintRepository(mock_database, mock_datetime_normalizer)
+
+    assert repository.find_by_team_name('TestTeam', time_range) == []
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {'$match': {'closed_at': {'$gte': time_range.start, '$lt': time_range.end}}}
+    assert '$lookup' in pipeline[1]
+    assert not any('$limit' in stage for stage in pipeline)
+    assert pipeline[-1] == {'$sort': {'closed_at': ASCENDING}}
+
+
+def test_async_mongo_sprint_repository_find_by_team_name(
+    mocker: MockerFixture, mock_datetime_normalizer: MagicMock
+) -> None:
+    """Test that the async repository awaits the shared pipeline and maps the documents to sprints."""
+    mock_collection = mocker.MagicMock(spec=AsyncCollection)
+    mock_database = mocker.MagicMock(spec=AsyncDatabase)
+    mock_database.get_collection.return_value = mock_collection
+    mock_cursor = mocker.MagicMock()
+    mock_cursor.__aiter__.return_value = [
+        {
+            'name': 'Sprint 1',
+            'opened_at': datetime(2025, 1, 1),
+            'closed_at': datetime(2025, 1, 15),
+            'issues': [],
+        }
+    ]
+    mock_collection.aggregate = mocker.AsyncMock(return_value=mock_cursor)
+
+    repository = AsyncMongoSprintRepository(mock_database, mock_datetime_normalizer)
+    sprints = asyncio.run(repository.find_by_team_name('TestTeam'))
+
+    assert [sprint.name for sprint in sprints] == ['Sprint 1']
+    mock_database.get_collection.assert_called_once_with(MongoSprintRepository.COLLECTION_NAME)
+    mock_collection.aggregate.assert_awaited_once_with(MongoSprintRepository.pipeline('TestTeam', None))
+
+
+def test_async_mongo_sprint_repository_iter_by_team_name(
+    mocker: MockerFixture, mock_datetime_normalizer: MagicMock
+) -> None:
+    """Test that the whole sprint history is read from a batched cursor without the default window."""
+    mock_collection = mocker.MagicMock(spec=AsyncCollection)
+    mock_database = mocker.MagicMock(spec=AsyncDatabase)
+    mock_database.get_collection.return_value = mock_collection
+    mock_cursor = mocker.MagicMock()
+    mock_cursor.__aiter__.return_value = [
+        {'name': 'Sprint 1', 'opened_at': datetime(2025, 1, 1), 'closed_at': datetime(2025, 1, 15), 'issues': []}
+    ]
+    mock_collection.aggregate = mocker.AsyncMock(return_value=mock_cursor)
+
+    async def collect() -> list[Sprint]:
+        repository = AsyncMongoSprintRepository(mock_database, mock_datetime_normalizer)
+        return [sprint async for sprint in repository.iter_by_team_name('TestTeam')]
+
+    assert [sprint.name for sprint in asyncio.run(collect())] == ['Sprint 1']
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert not any('$limit' in stage for stage in pipeline)
+    assert mock_collection.aggregate.call_args[1] == {'batchSize': MongoSprintRepository.BATCH_SIZE}
+
+
 def test_mongo_sprint_document_repository_save(mocker: MockerFixture) -> None:
     """Test the MongoSprintDocumentRepository.save method."""
     mock_collection: MagicMock = mocker.MagicMock(spec=Collection)
     mock_database: MagicMock = mocker.MagicMock(spec=Database)
     mock_database.get_collection.return_value = mock_collection
+    mock_collection.find.return_value = []
 
     repository: MongoSprintDocumentRepository = MongoSprintDocumentRepository(mock_database)
     sprint_document: dict[str, Any] = {
@@ -108,5 +187,8 @@ def test_mongo_sprint_document_repository_save(mocker: MockerFixture) -> None:
     repository.save(sprint_document)
 
     mock_database.get_collection.assert_called_once_with(MongoSprintDocumentRepository.COLLECTION_NAME)
-    mock_collection.delete_one.assert_called_once_with({'id': 123, 'team': 'Bimbo'})
-    mock_collection.insert_one.assert_called_once_with(sprint_document)
+    content_hash = MongoSprintDocumentRepository.content_hash(sprint_document)
+    mock_collection.bulk_write.assert_called_once_with(
+        [ReplaceOne({'id': 123, 'team': 'Bimbo'}, {**sprint_document, 'content_hash': content_hash}, True)],
+        ordered=False,
+    )
@@ -1,15 +1,22 @@
+import asyncio
+from datetime import datetime, timezone
 from typing import Any, Generator
 from unittest.mock import MagicMock
 
 import pytest
-from pymongo import DESCENDING
+from pymongo import DESCENDING, ReplaceOne
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.database import Database
 from pytest_mock import MockerFixture
 
 from rebelist.streamline.domain.ticket import Ticket
+from rebelist.streamline.domain.time import TimeRange
 from rebelist.streamline.infrastructure.mongo.ticket import MongoTicketDocumentRepository
-from rebelist.streamline.infrastructure.mongo.ticket.repositories import MongoTicketRepository
+from rebelist.streamline.infrastructure.mongo.ticket.repositories import (
+    AsyncMongoTicketRepository,
+    MongoTicketRepository,
+)
 
 
 class TestMongoTicketDocumentRepository:
@@ -27,8 +34,9 @@ class TestMongoTicketDocumentRepository:
         self,
         mock_dependencies: tuple[MagicMock, MagicMock],
     ) -> None:
-        """Should delete and insert the ticket document correctly."""
+        """Should upsert the ticket document with its content hash."""
         mock_database, mock_collection = mock_dependencies
+        mock_collection.find.return_value = []
         repository = MongoTicketDocumentRepository(mock_database)
 
         ticket_document: dict[str, Any] = {
@@ -42,8 +50,11 @@ class TestMongoTicketDocumentRepository:
         repository.save(ticket_document)
 
         mock_database.get_collection.assert_called_once_with(MongoTicketDocumentRepository.COLLECTION_NAME)
-        mock_collection.delete_one.assert_called_once_with({'id': 'TEST-115', 'team': 'Tito'})
-        mock_collection.insert_one.assert_called_once_with(ticket_document)
+        content_hash = MongoTicketDocumentRepository.content_hash(ticket_document)
+        mock_collection.bulk_write.assert_called_once_with(
+            [ReplaceOne({'id': 'TEST-115', 'team': 'Tito'}, {**ticket_document, 'content_hash': content_hash}, True)],
+            ordered=False,
+        )
 
 
 class TestMongoTicketRepository:
@@ -117,3 +128,74 @@ class TestMongoTicketRepository:
         mock_collection.find.assert_called_once_with({'team': 'GhostTeam'})
         mock_find_result.sort.assert_called_once_with('resolved_at', DESCENDING)
         mock_find_result.sort.return_value.limit.assert_called_once()
+
+    def test_find_by_team_name_within_time_range(
+        self, mock_database: MagicMock, mock_datetime_normalizer: MagicMock
+    ) -> None:
+        """Should push the time range down to the query and drop the default limit."""
+        mock_collection: MagicMock = mock_database.get_collection.return_value
+        mock_find_result = MagicMock()
+        mock_collection.find.return_value = mock_find_result
+        mock_find_result.sort.return_value = []
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        repo: MongoTicketRepository = MongoTicketRepository(mock_database, mock_datetime_normalizer)
+
+        assert repo.find_by_team_name('Team Alpha', TimeRange(start=start)) == []
+        mock_collection.find.assert_called_once_with({'team': 'Team Alpha', 'resolved_at': {'$gte': start}})
+        mock_find_result.sort.assert_called_once_with('resolved_at', DESCENDING)
+
+
+class TestAsyncMongoTicketRepository:
+    """Tests for the AsyncMongoTicketRepository class."""
+
+    DOCUMENT: dict[str, Any] = {
+        'key': 'TICKET-1',
+        'created_at': '2023-01-01T00:00:00Z',
+        'started_at': '2023-01-02T00:00:00Z',
+        'resolved_at': '2023-01-05T00:00:00Z',
+        'story_points': 3,
+    }
+
+    @pytest.fixture
+    def mock_database(self, mocker: MockerFixture) -> MagicMock:
+        """Fixture that returns a mocked asynchronous MongoDB database with a mocked collection."""
+        mock_db: MagicMock = mocker.Mock()
+        mock_db.get_collection.return_value = mocker.MagicMock(spec=AsyncCollection)
+        return mock_db
+
+    def test_find_by_team_name(self, mock_database: MagicMock, mock_datetime_normalizer: MagicMock) -> None:
+        """Should read the latest tickets of the team with the shared query and projection."""
+        mock_collection: MagicMock = mock_database.get_collection.return_value
+        mock_cursor = mock_collection.find.return_value.sort.return_value.limit.return_value
+        mock_cursor.__aiter__.return_value = [self.DOCUMENT]
+
+        repo = AsyncMongoTicketRepository(mock_database, mock_datetime_normalizer)
+        tickets = asyncio.run(repo.find_by_team_name('Team Alpha'))
+
+        assert [ticket.id for ticket in tickets] == ['TICKET-1']
+        mock_collection.find.assert_called_once_with(
+            {'team': 'Team Alpha'}, projection=MongoTicketRepository.PROJECTION
+        )
+        mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(
+            MongoTicketRepository.LIMIT_TICKETS
+        )
+
+    def test_iter_by_team_name(self, mock_database: MagicMock, mock_datetime_normalizer: MagicMock) -> None:
+        """Should yield the tickets resolved within the time range from a batched cursor."""
+        mock_collection: MagicMock = mock_database.get_collection.return_value
+        mock_cursor = mock_collection.find.return_value.sort.return_value.batch_size.return_value
+        mock_cursor.__aiter__.return_value = [self.DOCUMENT]
+        start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+        async def collect() -> list[Ticket]:
+            repo = AsyncMongoTicketRepository(mock_database, mock_datetime_normalizer)
+            return [ticket async for ticket in repo.iter_by_team_name('Team Alpha', TimeRange(start=start))]
+
+        assert [ticket.id for ticket in asyncio.run(collect())] == ['TICKET-1']
+        mock_collection.find.assert_called_once_with(
+            {'team': 'Team Alpha', 'resolved_at': {'$gte': start}}, projection=MongoTicketRepository.PROJECTION
+        )
+        mock_collection.find.return_value.sort.return_value.batch_size.assert_called_once_with(
+            MongoTicketRepository.BATCH_SIZE
+        )
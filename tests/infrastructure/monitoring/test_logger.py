@@ -1,12 +1,17 @@
+import json
+from pathlib import Path
+
+import loguru
 from pytest_mock import MockerFixture
 
+from rebelist.streamline.config.settings import LoggingSettings
 from rebelist.streamline.infrastructure.monitoring import Logger
 
 
 def test_logger_info_calls_loguru_info(mocker: MockerFixture) -> None:
     """Test that Logger.info() correctly delegates to loguru's info() method."""
     mock_loguru_logger = mocker.MagicMock()
-    logger = Logger(mock_loguru_logger)
+    logger = Logger(mock_loguru_logger, LoggingSettings())
 
     logger.info('Test message')
 
@@ -16,10 +21,20 @@ def test_logger_info_calls_loguru_info(mocker: MockerFixture) -> None:
     mock_loguru_logger.opt.return_value.info.assert_called_once_with('Test message')
 
 
+def test_logger_debug_calls_loguru_debug(mocker: MockerFixture) -> None:
+    """Test that Logger.debug() correctly delegates to loguru's debug() method."""
+    mock_loguru_logger = mocker.MagicMock()
+    logger = Logger(mock_loguru_logger, LoggingSettings())
+
+    logger.debug('Debug message', duration_ms=1.5)
+
+    mock_loguru_logger.opt.return_value.debug.assert_called_once_with('Debug message', duration_ms=1.5)
+
+
 def test_logger_warning_calls_loguru_warning(mocker: MockerFixture) -> None:
     """Test that Logger.warning() correctly delegates to loguru's warning() method."""
     mock_loguru_logger = mocker.MagicMock()
-    logger = Logger(mock_loguru_logger)
+    logger = Logger(mock_loguru_logger, LoggingSettings())
 
     logger.warning('Warning message')
 
@@ -29,8 +44,43 @@ def test_logger_warning_calls_loguru_warning(mocker: MockerFixture) -> None:
 def test_logger_error_calls_loguru_error(mocker: MockerFixture) -> None:
     """Test that Logger.error() correctly delegates to loguru's error() method."""
     mock_loguru_logger = mocker.MagicMock()
-    logger = Logger(mock_loguru_logger)
+    logger = Logger(mock_loguru_logger, LoggingSettings())
 
     logger.error('Error message')
 
     mock_loguru_logger.opt.return_value.error.assert_called_once_with('Error message')
+
+
+def test_logger_adds_a_queued_sink_filtered_per_module(mocker: MockerFixture) -> None:
+    """Test that the sink is written by a background thread and filtered at the level of each module."""
+    mock_loguru_logger = mocker.MagicMock()
+    settings = LoggingSettings(
+        file='app.log', level='WARNING', modules={'rebelist.streamline.infrastructure.jira': 'DEBUG'}
+    )
+
+    Logger(mock_loguru_logger, settings)
+
+    options = mock_loguru_logger.opt.return_value.add.call_args.kwargs
+    assert mock_loguru_logger.opt.return_value.add.call_args.args == ('app.log',)
+    assert options['enqueue'] is True
+    assert options['serialize'] is True
+    assert options['filter'] == {'': 'WARNING', 'rebelist.streamline.infrastructure.jira': 'DEBUG'}
+
+
+def test_logger_writes_structured_records(tmp_path: Path) -> None:
+    """Test that the records are written as JSON with their extra fields, and filtered out below the module level."""
+    path = tmp_path / 'app.log'
+    logger = Logger(loguru.logger, LoggingSettings(file=str(path), level='INFO', modules={__name__: 'WARNING'}))
+
+    try:
+        logger.info('Dropped.')
+        logger.warning('Queried tickets.', issues=3, duration_ms=12.5)
+        logger.complete()
+    finally:
+        loguru.logger.remove()
+
+    [line] = path.read_text().splitlines()
+    record = json.loads(line)['record']
+    assert record['message'] == 'Queried tickets.'
+    assert record['extra'] == {'issues': 3, 'duration_ms': 12.5}
+    assert record['name'] == __name__
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from pymongo import monitoring
+from pymongo.errors import ServerSelectionTimeoutError
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.mongo.run import SyncRun, SyncRunRepository
+from rebelist.streamline.infrastructure.monitoring import CommandMetricsListener, Metrics, SyncRunCollector
+
+
+def test_metrics_export_the_instruments(mocker: MockerFixture) -> None:
+    """Test that the recorded observations are rendered in the Prometheus text format."""
+    mocker.patch('rebelist.streamline.infrastructure.monitoring.metrics.perf_counter', side_effect=[1.0, 1.25])
+    metrics = Metrics()
+
+    metrics.observe_request('GET', '/v1/metrics/flow/cycle-time', 200, 0.3)
+    metrics.observe_command('jira_tickets', 'find', True, 0.002)
+    metrics.count_cache_lookup('etag', True)
+    metrics.count_cache_lookup('etag', False)
+    with metrics.measure_compute('cycle_time'):
+        pass
+
+    exposition = metrics.export().decode()
+
+    assert (
+        'streamline_http_request_duration_seconds_count{method="GET",route="/v1/metrics/flow/cycle-time",status="200"}'
+        ' 1.0' in exposition
+    )
+    assert (
+        'streamline_mongo_command_duration_seconds_sum{collection="jira_tickets",command="find",outcome="success"}'
+        ' 0.002' in exposition
+    )
+    assert 'streamline_compute_duration_seconds_sum{metric="cycle_time"} 0.25' in exposition
+    assert 'streamline_cache_lookups_total{cache="etag",result="hit"} 1.0' in exposition
+    assert 'streamline_cache_lookups_total{cache="etag",result="miss"} 1.0' in exposition
+
+
+def test_command_listener_records_commands_per_collection() -> None:
+    """Test that command durations are recorded with the collection named in the started event."""
+    metrics = MagicMock(spec=Metrics)
+    listener = CommandMetricsListener(metrics)
+
+    def started(name: str, command: dict[str, object], request_id: int) -> MagicMock:
+        return MagicMock(
+            spec=monitoring.CommandStartedEvent,
+            command_name=name,
+            command=command,
+            connection_id=('localhost', 27017),
+            request_id=request_id,
+            operation_id=request_id,
+        )
+
+    listener.started(started('aggregate', {'aggregate': 'jira_sprints', 'pipeline': []}, 1))
+    listener.started(started('getMore', {'getMore': 123, 'collection': 'jira_tickets'}, 2))
+    listener.succeeded(
+        MagicMock(
+            spec=monitoring.CommandSucceededEvent,
+            command_name='getMore',
+            connection_id=('localhost', 27017),
+            request_id=2,
+            operation_id=2,
+            duration_micros=1500,
+        )
+    )
+    listener.failed(
+        MagicMock(
+            spec=monitoring.CommandFailedEvent,
+            command_name='aggregate',
+            connection_id=('localhost', 27017),
+            request_id=1,
+            operation_id=1,
+            duration_micros=250_000,
+        )
+    )
+
+    assert metrics.observe_command.call_args_list == [
+        (('jira_tickets', 'getMore', True, 0.0015),),
+        (('jira_sprints', 'aggregate', False, 0.25),),
+    ]
+
+
+def test_sync_run_collector_publishes_the_latest_run(mocker: MockerFixture) -> None:
+    """Test that the jobs of the latest run are published, and registering the collector does not read them."""
+    run_repository = mocker.Mock(spec=SyncRunRepository)
+    started_at = datetime(2025, 5, 6, 19, 0, tzinfo=timezone.utc)
+    run_repository.find_recent.return_value = [
+        SyncRun('0.7.1', 12.5, [{'job': 'Sprints', 'duration': 2.5}, {'job': 'Tickets', 'duration': 10.0}], started_at)
+    ]
+    metrics = Metrics()
+
+    metrics.register(SyncRunCollector(run_repository))
+    run_repository.find_recent.assert_not_called()
+    exposition = metrics.export().decode()
+
+    run_repository.find_recent.assert_called_once_with(1)
+    assert 'streamline_sync_last_run_timestamp_seconds{job="Sprints"} 1.746558e+09' in exposition
+    assert 'streamline_sync_last_run_duration_seconds{job="Tickets"} 10.0' in exposition
+
+
+def test_sync_run_collector_survives_an_unreachable_database(mocker: MockerFixture) -> None:
+    """Test that the other metrics are still exported while the database is down."""
+    run_repository = mocker.Mock(spec=SyncRunRepository)
+    run_repository.find_recent.side_effect = ServerSelectionTimeoutError('down')
+    metrics = Metrics()
+    metrics.register(SyncRunCollector(run_repository))
+
+    exposition = metrics.export().decode()
+
+    assert '# TYPE streamline_sync_last_run_duration_seconds gauge' in exposition
+    assert 'streamline_sync_last_run_duration_seconds{' not in exposition
@@ -0,0 +1,96 @@
+import json
+import threading
+from collections import Counter
+from time import perf_counter
+
+import pytest
+
+from rebelist.streamline.infrastructure.monitoring import Profile, ProfileFormat, SamplingProfiler
+
+ROOT = ('<module>', 'main.py', 1)
+CALCULATE = ('WorkTimeCalculator.get_working_days_delta', 'time.py', 40)
+DECODE = ('decode_all', 'bson.py', 10)
+
+
+@pytest.fixture
+def profile() -> Profile:
+    """Creates a profile of two threads sampled 100 times over a second."""
+    return Profile(
+        'sync',
+        duration=1.0,
+        rounds=100,
+        samples={
+            'MainThread': Counter({(ROOT, CALCULATE): 60, (ROOT, DECODE): 30}),
+            'worker': Counter({(ROOT,): 100}),
+        },
+    )
+
+
+def spin(seconds: float) -> None:
+    """Keeps the CPU busy for a while."""
+    started_at = perf_counter()
+    while perf_counter() - started_at < seconds:
+        sum(range(100))
+
+
+def test_profiler_samples_the_running_threads() -> None:
+    """Test that the stacks of the other threads are sampled, outermost call first, without the profiler thread."""
+    profiler = SamplingProfiler(interval=0.001)
+    worker = threading.Thread(target=spin, args=(0.2,), name='busy')
+
+    profiler.start('test')
+    assert profiler.running
+    worker.start()
+    worker.join()
+    profile = profiler.stop()
+
+    assert not profiler.running
+    assert profile.name == 'test'
+    assert profile.rounds > 0 and profile.duration > 0
+    assert 'streamline-profiler' not in profile.samples
+    assert any(stack[-1][0] == 'spin' for stack in profile.samples['busy'])
+
+
+def test_profiler_takes_one_profile_at_a_time() -> None:
+    """Test that a second profile cannot start while one is taken, nor stop when none is."""
+    profiler = SamplingProfiler()
+
+    with pytest.raises(RuntimeError):
+        profiler.stop()
+
+    profiler.start('first')
+    try:
+        with pytest.raises(RuntimeError):
+            profiler.start('second')
+    finally:
+        profiler.stop()
+
+
+def test_profile_renders_speedscope_document(profile: Profile) -> None:
+    """Test that every thread is a sampled profile sharing the frames, weighted by the measured sampling period."""
+    document = json.loads(profile.render(ProfileFormat.SPEEDSCOPE))
+
+    assert document['$schema'] == 'https://www.speedscope.app/file-format-schema.json'
+    assert [frame['name'] for frame in document['shared']['frames']] == [
+        '<module>',
+        'WorkTimeCalculator.get_working_days_delta',
+        'decode_all',
+    ]
+    main, worker = document['profiles']
+    assert (main['name'], main['type'], main['unit']) == ('MainThread', 'sampled', 'seconds')
+    assert main['samples'] == [[0, 1], [0, 2]]
+    assert main['weights'] == pytest.approx([0.6, 0.3])
+    assert main['endValue'] == pytest.approx(0.9)
+    assert worker['samples'] == [[0]]
+
+
+def test_profile_renders_folded_stacks(profile: Profile) -> None:
+    """Test that each stack is a line of frames joined by semicolons, after its thread and before its count."""
+    lines = profile.render(ProfileFormat.COLLAPSED).splitlines()
+
+    assert lines == [
+        'MainThread;<module> (main.py:1);WorkTimeCalculator.get_working_days_delta (time.py:40) 60',
+        'MainThread;<module> (main.py:1);decode_all (bson.py:10) 30',
+        'worker;<module> (main.py:1) 100',
+    ]
+    assert profile.sample_count == 190
@@ -0,0 +1,203 @@
+import threading
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from pymongo import monitoring
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.config.settings import QueriesSettings, Settings
+from rebelist.streamline.infrastructure.mongo.sprint.repositories import MongoSprintRepository
+from rebelist.streamline.infrastructure.monitoring import Logger, QueryStatsListener, query_shape
+from rebelist.streamline.infrastructure.monitoring.queries import summarize_plan
+
+ADDRESS = ('localhost', 27017)
+
+
+class Commands:
+    """Publishes the events of the commands run through a listener."""
+
+    def __init__(self, listener: QueryStatsListener) -> None:
+        self.__listener = listener
+        self.__request_id = 0
+
+    def run(self, command: dict[str, Any], reply: dict[str, Any], duration_ms: float = 1.0) -> None:
+        """Publishes a command and its success."""
+        self.__request_id += 1
+        name = next(iter(command))
+        self.__listener.started(monitoring.CommandStartedEvent(command, 'streamline', self.__request_id, ADDRESS, 1))
+        duration = timedelta(milliseconds=duration_ms)
+        self.__listener.succeeded(
+            monitoring.CommandSucceededEvent(duration, reply, name, self.__request_id, ADDRESS, 1)
+        )
+
+    def fail(self, command: dict[str, Any]) -> None:
+        """Publishes a command and its failure."""
+        self.__request_id += 1
+        name = next(iter(command))
+        self.__listener.started(monitoring.CommandStartedEvent(command, 'streamline', self.__request_id, ADDRESS, 1))
+        failure = {'ok': 0, 'errmsg': 'boom'}
+        self.__listener.failed(
+            monitoring.CommandFailedEvent(timedelta(milliseconds=2), failure, name, self.__request_id, ADDRESS, 1)
+        )
+
+
+@pytest.fixture
+def settings(mocker: MockerFixture) -> Any:
+    """Mocks settings enabling the query statistics, without explaining the slow queries."""
+    settings = mocker.MagicMock(spec=Settings)
+    settings.queries = QueriesSettings(enabled=True, slow_ms=50, explain=False)
+    return settings
+
+
+@pytest.fixture
+def logger(mocker: MockerFixture) -> Any:
+    """Mocks the logger."""
+    return mocker.MagicMock(spec=Logger)
+
+
+@pytest.fixture
+def listener(settings: Any, logger: Any) -> QueryStatsListener:
+    """Creates a listener resolving the mocked settings and logger."""
+    return QueryStatsListener(lambda: settings, lambda: logger, 'mongodb://localhost:27017/streamline')
+
+
+def test_query_shape_leaves_the_compared_values_out() -> None:
+    """Test that queries differing only by their values share a shape, while the structure of a pipeline is kept."""
+    loki = query_shape('find', {'find': 'jira_tickets', 'filter': {'team': 'Loki'}, 'limit': 500, '$db': 'streamline'})
+    thor = query_shape('find', {'find': 'jira_tickets', 'filter': {'team': 'Thor'}, 'limit': 500, 'lsid': {'id': 1}})
+    pipeline = MongoSprintRepository.pipeline('Loki', None)
+    sprints = query_shape('aggregate', {'aggregate': 'jira_sprints', 'pipeline': pipeline, 'cursor': {}})
+
+    assert loki == thor == 'find jira_tickets {"filter": {"team": "?"}, "limit": 500}'
+    assert sprints.startswith('aggregate jira_sprints {"pipeline": [{"$lookup": {"from": "jira_tickets", ')
+    assert '{"$match": {"issues": {"$elemMatch": {"team": "?"}}}}' in sprints
+
+
+def test_query_shape_hides_replacement_documents() -> None:
+    """Test that a bulk of replacements has the shape of a single one."""
+    updates = [{'q': {'key': f'HIVE-{i}'}, 'u': {'key': f'HIVE-{i}', 'team': 'Loki'}, 'upsert': True} for i in range(3)]
+
+    shape = query_shape('update', {'update': 'jira_tickets', 'updates': updates, 'ordered': False})
+
+    assert shape == 'update jira_tickets {"updates": [{"q": {"key": "?"}, "u": "?", "upsert": "?"}]}'
+
+
+def test_listener_aggregates_commands_per_shape(listener: QueryStatsListener) -> None:
+    """Test that commands of a shape are counted with their cursor round trips, documents and bytes."""
+    commands = Commands(listener)
+    find = {'find': 'jira_tickets', 'filter': {'team': 'Loki'}}
+    first_batch = {'cursor': {'id': 42, 'firstBatch': [{'key': 'HIVE-1'}, {'key': 'HIVE-2'}]}, 'ok': 1}
+    next_batch = {'cursor': {'id': 0, 'nextBatch': [{'key': 'HIVE-3'}]}, 'ok': 1}
+
+    commands.run(find, first_batch, duration_ms=3)
+    commands.run({'getMore': 42, 'collection': 'jira_tickets'}, next_batch, duration_ms=2)
+    commands.run({'find': 'jira_tickets', 'filter': {'team': 'Thor'}}, {'cursor': {'id': 0, 'firstBatch': []}})
+    commands.run({'getMore': 42, 'collection': 'jira_tickets'}, next_batch)  # The cursor is exhausted already.
+    commands.fail({'count': 'jira_sprints', 'query': {}})
+    commands.run({'ping': 1}, {'ok': 1})
+
+    tickets, sprints = listener.stats()
+
+    assert tickets['shape'] == 'find jira_tickets {"filter": {"team": "?"}}'
+    assert (tickets['count'], tickets['round_trips'], tickets['documents']) == (2, 3, 3)
+    assert tickets['total_ms'] == 6.0 and tickets['max_ms'] == 3.0 and tickets['mean_ms'] == 3.0
+    assert tickets['bytes'] > 0
+    assert (sprints['command'], sprints['count'], sprints['failures']) == ('count', 1, 1)
+    assert [figure['command'] for figure in listener.stats(sort='failures')] == ['count', 'find']
+
+    listener.reset()
+    assert listener.stats() == []
+
+
+def test_listener_logs_slow_commands(listener: QueryStatsListener, logger: Any) -> None:
+    """Test that only the commands above the threshold are logged, with their shape and filter."""
+    commands = Commands(listener)
+    find = {'find': 'jira_tickets', 'filter': {'team': 'Loki'}}
+
+    commands.run(find, {'cursor': {'id': 0, 'firstBatch': []}}, duration_ms=10)
+    commands.run(find, {'cursor': {'id': 0, 'firstBatch': []}}, duration_ms=75)
+
+    logger.warning.assert_called_once()
+    fields = logger.warning.call_args.kwargs
+    assert fields['shape'] == 'find jira_tickets {"filter": {"team": "?"}}'
+    assert fields['duration_ms'] == 75.0
+    assert fields['command'] == '{"find": "jira_tickets", "filter": {"team": "Loki"}}'
+    assert listener.stats()[0]['slow'] == 1
+
+
+def test_listener_records_nothing_while_disabled(listener: QueryStatsListener, settings: Any) -> None:
+    """Test that the statistics are off unless enabled, following the current settings."""
+    settings.queries = QueriesSettings()
+
+    Commands(listener).run({'find': 'jira_tickets', 'filter': {}}, {'cursor': {'id': 0, 'firstBatch': []}})
+
+    assert listener.stats() == []
+
+
+def test_listener_skips_replies_while_disabled(logger: Any, mocker: MockerFixture) -> None:
+    """Test that a disabled listener reads its settings once per command and never encodes the replies."""
+    settings = mocker.MagicMock(spec=Settings)
+    settings.queries = QueriesSettings()
+    resolve = mocker.Mock(return_value=settings)
+    encode = mocker.patch('rebelist.streamline.infrastructure.monitoring.queries.encode')
+    listener = QueryStatsListener(resolve, lambda: logger, 'mongodb://localhost:27017/streamline')
+
+    Commands(listener).run({'find': 'jira_tickets', 'filter': {}}, {'cursor': {'id': 0, 'firstBatch': []}})
+    Commands(listener).fail({'find': 'jira_tickets', 'filter': {}})
+
+    assert resolve.call_count == 2
+    encode.assert_not_called()
+
+
+def test_listener_reads_settings_once_per_command(logger: Any, mocker: MockerFixture) -> None:
+    """Test that a followed command uses the settings read when it started."""
+    settings = mocker.MagicMock(spec=Settings)
+    settings.queries = QueriesSettings(enabled=True, slow_ms=50, explain=False)
+    resolve = mocker.Mock(return_value=settings)
+    listener = QueryStatsListener(resolve, lambda: logger, 'mongodb://localhost:27017/streamline')
+
+    Commands(listener).run({'find': 'jira_tickets', 'filter': {}}, {'cursor': {'id': 0, 'firstBatch': []}}, 80)
+
+    assert resolve.call_count == 1
+    assert listener.stats()[0]['slow'] == 1
+
+
+def test_listener_explains_slow_commands_once_per_shape(
+    listener: QueryStatsListener, settings: Any, logger: Any, mocker: MockerFixture
+) -> None:
+    """Test that a slow query is explained in the background by a client of its own and logged with its plan."""
+    settings.queries = QueriesSettings(enabled=True, slow_ms=0)
+    client = mocker.patch('rebelist.streamline.infrastructure.monitoring.queries.MongoClient').return_value
+    client.__getitem__.return_value.command.return_value = {
+        'queryPlanner': {'winningPlan': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'team_1'}}}
+    }
+    logged = threading.Event()
+    logger.warning.side_effect = lambda *_, **__: logged.set()
+
+    Commands(listener).run({'find': 'jira_tickets', 'filter': {'team': 'Loki'}}, {'cursor': {'id': 0}})
+
+    assert logged.wait(timeout=5)
+
+    client.__getitem__.assert_called_once_with('streamline')
+    client.__getitem__.return_value.command.assert_called_once_with(
+        {'explain': {'find': 'jira_tickets', 'filter': {'team': 'Loki'}}, 'verbosity': 'queryPlanner'}
+    )
+    assert logger.warning.call_args.kwargs['plan'] == 'FETCH > IXSCAN team_1'
+    assert listener.stats()[0]['plan'] == 'FETCH > IXSCAN team_1'
+
+
+def test_summarize_plan_reads_find_and_aggregate_explains() -> None:
+    """Test that the winning plan is condensed, including the stages of an aggregation after its cursor."""
+    aggregate: dict[str, Any] = {
+        'stages': [
+            {'$cursor': {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}},
+            {'$lookup': {'from': 'jira_tickets'}},
+            {'$match': {}},
+        ]
+    }
+    sbe = {'queryPlanner': {'winningPlan': {'queryPlan': {'stage': 'IXSCAN', 'indexName': 'closed_at_1'}}}}
+
+    assert summarize_plan(aggregate) == 'COLLSCAN > $lookup > $match'
+    assert summarize_plan(sbe) == 'IXSCAN closed_at_1'
+    assert summarize_plan({}) == 'unknown'
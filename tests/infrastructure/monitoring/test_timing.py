@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.monitoring import PhaseTimer
+
+
+def test_phase_timer_accumulates_durations(mocker: MockerFixture) -> None:
+    """Test that repeated measurements of a phase are added up."""
+    mocker.patch(
+        'rebelist.streamline.infrastructure.monitoring.timing.perf_counter', side_effect=[0.0, 1.5, 2.0, 2.5, 3.0, 4.0]
+    )
+    timer = PhaseTimer()
+
+    with timer.measure('fetch'):
+        pass
+    with timer.measure('fetch'):
+        pass
+    with timer.measure('write'):
+        pass
+
+    assert timer.durations == {'fetch': 2.0, 'write': 1.0}
+
+
+def test_phase_timer_measures_failed_blocks(mocker: MockerFixture) -> None:
+    """Test that a block raising an exception is still measured."""
+    mocker.patch('rebelist.streamline.infrastructure.monitoring.timing.perf_counter', side_effect=[0.0, 0.5])
+    timer = PhaseTimer()
+
+    try:
+        with timer.measure('fetch'):
+            raise RuntimeError('boom')
+    except RuntimeError:
+        pass
+
+    assert timer.durations == {'fetch': 0.5}
+
+
+def test_phase_timer_yields_the_block_duration(mocker: MockerFixture) -> None:
+    """Test that a measurement holds the duration of its own block once it exits."""
+    mocker.patch('rebelist.streamline.infrastructure.monitoring.timing.perf_counter', side_effect=[0.0, 1.0, 2.0, 2.25])
+    timer = PhaseTimer()
+
+    with timer.measure('fetch'):
+        pass
+    with timer.measure('fetch') as measurement:
+        pass
+
+    assert measurement.seconds == 0.25
+    assert timer.durations == {'fetch': 1.25}
+
+
+@pytest.mark.usefixtures('frequent_thread_switches')
+def test_phase_timer_adds_up_measurements_of_several_threads() -> None:
+    """Test that no measurement is lost when several threads share the timer."""
+    timer = PhaseTimer()
+
+    def measure(_: int) -> float:
+        seconds = 0.0
+        for _ in range(10000):
+            with timer.measure('fetch') as measurement:
+                pass
+            seconds += measurement.seconds
+        return seconds
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        total = sum(executor.map(measure, range(8)))
+
+    assert timer.durations['fetch'] == pytest.approx(total)
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rebelist.streamline.infrastructure.monitoring import (
+    TRACER,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    PhaseTimer,
+    Span,
+    Tracer,
+    traced,
+)
+
+
+@pytest.fixture
+def collector() -> Generator[InMemorySpanExporter]:
+    """Enables the process tracer with an in-memory exporter, disabling it again afterward."""
+    collector = InMemorySpanExporter(100)
+    TRACER.configure([collector])
+    yield collector
+    TRACER.configure([])
+
+
+def test_tracer_nests_spans_within_the_current_one() -> None:
+    """Test that a span opened inside another one joins its trace as a child."""
+    collector = InMemorySpanExporter(10)
+    tracer = Tracer()
+    tracer.configure([collector])
+
+    with tracer.span('request') as root:
+        with tracer.span('query', {'collection': 'tickets'}) as child:
+            assert tracer.current_span() is child
+        assert tracer.current_span() is root
+
+    assert root and child
+    assert tracer.current_span() is None
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert root.parent_id is None
+    assert child.attributes == {'collection': 'tickets'}
+    assert [span.name for span in collector.trace(root.trace_id)] == ['request', 'query']
+
+
+def test_tracer_continues_remote_trace() -> None:
+    """Test that a valid traceparent header makes the span a child of the remote one, an invalid one is ignored."""
+    tracer = Tracer()
+    tracer.configure([InMemorySpanExporter(10)])
+    trace_id, parent_id = '4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7'
+
+    with tracer.span('request', traceparent=f'00-{trace_id}-{parent_id}-01') as remote:
+        pass
+    with tracer.span('request', traceparent='garbage') as local:
+        pass
+
+    assert remote and local
+    assert (remote.trace_id, remote.parent_id) == (trace_id, parent_id)
+    assert remote.traceparent == f'00-{trace_id}-{remote.span_id}-01'
+    assert local.trace_id != trace_id and local.parent_id is None
+
+
+def test_tracer_records_errors() -> None:
+    """Test that a span ended by an exception records it and lets it propagate."""
+    collector = InMemorySpanExporter(10)
+    tracer = Tracer()
+    tracer.configure([collector])
+
+    with pytest.raises(RuntimeError), tracer.span('request'):
+        raise RuntimeError('boom')
+
+    [summary] = collector.traces()
+    assert summary['error'] == 'RuntimeError: boom'
+
+
+def test_tracer_without_exporters_records_nothing() -> None:
+    """Test that a disabled tracer yields no span and leaves the context untouched."""
+    tracer = Tracer()
+
+    with tracer.span('request') as span:
+        assert tracer.current_span() is None
+
+    assert span is None
+    assert not tracer.enabled
+
+
+def test_traced_records_functions_and_coroutines(collector: InMemorySpanExporter) -> None:
+    """Test that decorated functions and coroutines are recorded under their qualified name."""
+
+    class Repository:
+        @traced
+        def find(self) -> str:
+            return 'found'
+
+        @traced
+        async def find_async(self) -> str:
+            return 'found'
+
+    repository = Repository()
+    with TRACER.span('job') as root:
+        assert repository.find() == 'found'
+        assert asyncio.run(repository.find_async()) == 'found'
+
+    assert root
+    names = [span.name for span in collector.trace(root.trace_id)]
+    assert names == ['job', f'{Repository.__qualname__}.find', f'{Repository.__qualname__}.find_async']
+
+
+def test_phase_timer_records_phases_as_spans(collector: InMemorySpanExporter) -> None:
+    """Test that every measured phase is recorded as a span."""
+    with PhaseTimer().measure('fetch'):
+        pass
+
+    assert [summary['name'] for summary in collector.traces()] == ['fetch']
+
+
+def test_in_memory_exporter_summarizes_slowest_traces() -> None:
+    """Test that traces are summarized by their root span, slowest first, and the oldest spans are dropped."""
+    collector = InMemorySpanExporter(3)
+    collector.export(Span('dropped', 'a' * 32, '1' * 16, None, 0, 1_000_000))
+    collector.export(Span('fast', 'b' * 32, '2' * 16, None, 0, 2_000_000))
+    collector.export(Span('slow', 'c' * 32, '3' * 16, None, 0, 9_000_000))
+    collector.export(Span('child', 'c' * 32, '4' * 16, '3' * 16, 1_000_000, 5_000_000))
+
+    summaries = collector.traces()
+
+    assert [(summary['name'], summary['spans'], summary['duration_ms']) for summary in summaries] == [
+        ('slow', 2, 9.0),
+        ('fast', 1, 2.0),
+    ]
+    assert [summary['name'] for summary in collector.traces(min_duration_ms=5.0)] == ['slow']
+    assert collector.traces(limit=1)[0]['name'] == 'slow'
+    assert collector.trace('a' * 32) == []
+
+
+def test_file_exporter_writes_otlp_json_lines(tmp_path: Path) -> None:
+    """Test that every span is appended to the file as an OTLP JSON export request."""
+    path = tmp_path / 'traces' / 'spans.jsonl'
+    exporter = FileSpanExporter(path)
+    exporter.export(Span('job', 'a' * 32, '1' * 16, None, 10, 20, {'team': 'loki', 'tickets': 3}))
+    exporter.export(Span('query', 'a' * 32, '2' * 16, '1' * 16, 12, 18, error='TimeoutError: slow'))
+    exporter.flush()
+
+    requests = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert len(requests) == 2
+    resource_spans = requests[0]['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'][0] == {
+        'key': 'service.name',
+        'value': {'stringValue': 'streamline'},
+    }
+    job = resource_spans['scopeSpans'][0]['spans'][0]
+    assert job['startTimeUnixNano'] == '10'
+    assert job['attributes'] == [
+        {'key': 'team', 'value': {'stringValue': 'loki'}},
+        {'key': 'tickets', 'value': {'intValue': '3'}},
+    ]
+    assert 'parentSpanId' not in job
+    query = requests[1]['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+    assert query['parentSpanId'] == '1' * 16
+    assert query['status'] == {'code': 'STATUS_CODE_ERROR', 'message': 'TimeoutError: slow'}
+
+
+def test_file_exporter_writes_from_a_background_thread(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that exporting a span only queues it, the span is serialized and written by another thread."""
+    path = tmp_path / 'spans.jsonl'
+    exporter = FileSpanExporter(path)
+    release = threading.Event()
+    writers: list[str] = []
+    to_otlp = Span.to_otlp
+
+    def record_writer(span: Span) -> dict[str, Any]:
+        writers.append(threading.current_thread().name)
+        release.wait(5)
+        return to_otlp(span)
+
+    mocker.patch.object(Span, 'to_otlp', record_writer)
+
+    exporter.export(Span('job', 'a' * 32, '1' * 16, None, 10, 20))
+    assert not path.exists()
+    release.set()
+    exporter.flush()
+
+    assert writers == ['streamline-spans']
+    assert len(path.read_text().splitlines()) == 1
+
+
+def test_file_exporter_drops_spans_when_full(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that a full queue drops the spans instead of blocking the caller."""
+    mocker.patch.object(FileSpanExporter, 'QUEUE_SIZE', 1)
+    mocker.patch.object(FileSpanExporter, '_FileSpanExporter__start_writer')
+    exporter = FileSpanExporter(tmp_path / 'spans.jsonl')
+
+    for _ in range(3):
+        exporter.export(Span('job', 'a' * 32, '1' * 16, None, 10, 20))
+
+    assert exporter.dropped == 2